@@ -1,4 +1,12 @@
 
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import requests
 from pydantic import BaseModel
 from fastapi import HTTPException
 from jose import jwt, jwk, JWTError
@@ -7,6 +15,8 @@ from jose.utils import base64url_decode
 from starlette.status import HTTP_403_FORBIDDEN
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from core.concurrency import run_sync
+
 JWK = dict[str, str]
 
 
@@ -23,23 +33,121 @@ class JWTAuthorizationCredentials(BaseModel):
 
 
 class JWTBearer(HTTPBearer):
-    def __init__(self, jwks: JWKS, auto_error: bool = True):
+    """Bearer dependency verifying Cognito-issued JWTs.
+
+    Keys are constructed once per `kid`. The JWKS is either passed in or
+    fetched lazily from `jwks_url` on first use, and refetched when a token
+    carries an unknown `kid` (key rotation), at most once per
+    `JWKS_REFRESH_INTERVAL` seconds. Tokens whose signature already checked
+    out are remembered (by SHA-256 digest) in a bounded LRU until their
+    `exp`, so repeat requests skip the RSA verify.
+    """
+
+    def __init__(
+        self,
+        jwks: JWKS | None = None,
+        auto_error: bool = True,
+        jwks_url: str | None = None,
+        jwks_headers: dict[str, str] | None = None,
+    ):
         super().__init__(auto_error=auto_error)
 
-        self.kid_to_jwk = {jwk["kid"]: jwk for jwk in jwks.keys}
-
-    def verify_jwk_token(self, jwt_credentials: JWTAuthorizationCredentials) -> bool:
-        try:
-            public_key = self.kid_to_jwk[jwt_credentials.header["kid"]]
-        except KeyError:
+        self.jwks_url = jwks_url
+        self.jwks_headers = jwks_headers or {}
+        self.kid_to_key: dict[str, Any] = {}
+        self._jwks_loaded_at: float | None = None
+        self._jwks_lock = threading.Lock()
+        self._refresh_interval = float(os.getenv("JWKS_REFRESH_INTERVAL", "60"))
+
+        self._verified: OrderedDict[str, float] = OrderedDict()
+        self._verified_lock = threading.Lock()
+        self._verified_max = int(os.getenv("JWT_VERIFIED_CACHE_SIZE", "1024"))
+
+        if jwks is not None:
+            self._load_keys(jwks)
+
+    # ── JWKS ─────────────────────────────────────────────────────────
+
+    def _load_keys(self, jwks: JWKS) -> None:
+        self.kid_to_key = {k["kid"]: jwk.construct(k) for k in jwks.keys}
+        self._jwks_loaded_at = time.monotonic()
+
+    def _refresh_jwks(self) -> None:
+        if not self.jwks_url:
+            return
+        with self._jwks_lock:
+            loaded_at = self._jwks_loaded_at
+            if loaded_at is not None and time.monotonic() - loaded_at < self._refresh_interval:
+                return
+            resp = requests.get(self.jwks_url, headers=self.jwks_headers, timeout=5)
+            resp.raise_for_status()
+            self._load_keys(JWKS.parse_obj(resp.json()))
+
+    def _needs_fetch(self, kid: str | None) -> bool:
+        return kid not in self.kid_to_key and self.jwks_url is not None
+
+    def _get_key(self, kid: str | None) -> Any:
+        key = self.kid_to_key.get(kid)
+        if key is None and self.jwks_url:
+            try:
+                self._refresh_jwks()
+            except (requests.RequestException, ValueError):
+                pass
+            key = self.kid_to_key.get(kid)
+        if key is None:
             raise HTTPException(
                 status_code=HTTP_403_FORBIDDEN, detail="JWK public key not found"
             )
+        return key
+
+    # ── Verified-token cache ─────────────────────────────────────────
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _is_verified(self, digest: str) -> bool:
+        with self._verified_lock:
+            expires_at = self._verified.get(digest)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._verified[digest]
+                return False
+            self._verified.move_to_end(digest)
+            return True
+
+    def _remember(self, digest: str, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+        with self._verified_lock:
+            self._verified[digest] = float(exp)
+            self._verified.move_to_end(digest)
+            while len(self._verified) > self._verified_max:
+                self._verified.popitem(last=False)
+
+    def _is_fast_path(self, jwt_credentials: JWTAuthorizationCredentials) -> bool:
+        """True when verification needs no network call (cached token or known kid)."""
+        return (
+            not self._needs_fetch(jwt_credentials.header.get("kid"))
+            or self._is_verified(self._digest(jwt_credentials.jwt_token))
+        )
+
+    # ── Verification ─────────────────────────────────────────────────
+
+    def verify_jwk_token(self, jwt_credentials: JWTAuthorizationCredentials) -> bool:
+        digest = self._digest(jwt_credentials.jwt_token)
+        if self._is_verified(digest):
+            return True
 
-        key = jwk.construct(public_key)
+        key = self._get_key(jwt_credentials.header.get("kid"))
         decoded_signature = base64url_decode(jwt_credentials.signature.encode())
 
-        return key.verify(jwt_credentials.message.encode(), decoded_signature)
+        if not key.verify(jwt_credentials.message.encode(), decoded_signature):
+            return False
+        self._remember(digest, jwt_credentials.claims)
+        return True
 
     async def __call__(self, request: Request) -> JWTAuthorizationCredentials | None:
         credentials: HTTPAuthorizationCredentials | None = await super().__call__(request)
@@ -65,7 +173,12 @@ class JWTBearer(HTTPBearer):
             except JWTError as e:
                 raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="JWK invalid")
 
-            if not self.verify_jwk_token(jwt_credentials):
+            if self._is_fast_path(jwt_credentials):
+                valid = self.verify_jwk_token(jwt_credentials)
+            else:
+                # Unknown kid: the JWKS (re)fetch is blocking I/O.
+                valid = await run_sync(self.verify_jwk_token, jwt_credentials)
+            if not valid:
                 raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="JWK invalid")
 
             return jwt_credentials
\ No newline at end of file
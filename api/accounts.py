@@ -3,6 +3,7 @@ from auth import PermissionChecker, get_account_id, get_current_user
 from di import get_account_service
 from services.account_service import AccountService
 from api.schemas.accounts import CreateAccount, UpdateAccount
+from core.concurrency import aio
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
@@ -13,7 +14,7 @@ async def get_current_account(
     svc: AccountService = Depends(get_account_service)
 ):
     """Get current account details"""
-    account = svc.get(account_id)
+    account = await aio(svc).get(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
@@ -26,7 +27,7 @@ async def update_current_account(
     svc: AccountService = Depends(get_account_service)
 ):
     """Update current account (admin only)"""
-    account = svc.update(account_id, update_account)
+    account = await aio(svc).update(account_id, update_account)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     return account
@@ -40,7 +41,7 @@ async def create_account(
 ):
     """Create new account (admin only)"""
     user_id = user["sub"]
-    account = svc.create(create_account, owner_user_id=user_id)
+    account = await aio(svc).create(create_account, owner_user_id=user_id)
     return account
 
 
@@ -51,5 +52,5 @@ async def get_my_accounts(
 ):
     """Get all accounts the current user belongs to"""
     user_id = user["sub"]
-    accounts = svc.get_user_accounts(user_id)
+    accounts = await aio(svc).get_user_accounts(user_id)
     return accounts
@@ -5,6 +5,7 @@ from auth import PermissionChecker, WorkspacePermissionChecker, get_current_user
 from di import get_calendar_service
 from services.calendar_service import CalendarService
 from services.tour_service import TourService
+from core.concurrency import aio
 
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
@@ -15,7 +16,7 @@ async def get_calendar(
     account_id: str = Depends(get_account_id),
     svc: CalendarService = Depends(get_calendar_service)
 ):
-    items = svc.list_calendar_events(account_id, group=workspace_id)
+    items = await aio(svc).list_calendar_events(account_id, group=workspace_id)
     return items
 
 @router.post(
@@ -38,7 +39,7 @@ async def create_calendar_event(
             detail="Event group must match workspace_id"
         )
     
-    calendar_item = calendar_svc.create(put_calendar_event, account_id)
+    calendar_item = await aio(calendar_svc).create(put_calendar_event, account_id)
     return calendar_item
 
 @router.put(
@@ -53,7 +54,7 @@ async def update_calendar_event(
 ):
     """Update calendar event (requires workspace admin permission)"""
     # Fetch and verify event exists
-    existing_item = svc.get(put_calendar_event.id, account_id)
+    existing_item = await aio(svc).get(put_calendar_event.id, account_id)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"Event {put_calendar_event.id} not found")
     
@@ -64,7 +65,7 @@ async def update_calendar_event(
             detail=f"Event does not belong to workspace {workspace_id}"
         )
     
-    svc.update(put_calendar_event.id, account_id, put_calendar_event)
+    await aio(svc).update(put_calendar_event.id, account_id, put_calendar_event)
     return {"updated_event_id": put_calendar_event.id}
 
 @router.delete(
@@ -79,7 +80,7 @@ async def delete_calendar_event(
 ):
     """Delete calendar event (requires workspace admin permission)"""
     # Fetch and verify event exists
-    event = svc.get(calendar_event_id, account_id)
+    event = await aio(svc).get(calendar_event_id, account_id)
     if not event:
         raise HTTPException(status_code=404, detail=f"Event {calendar_event_id} not found")
     
@@ -90,7 +91,7 @@ async def delete_calendar_event(
             detail=f"Event does not belong to workspace {workspace_id}"
         )
     
-    svc.delete(calendar_event_id, account_id)
+    await aio(svc).delete(calendar_event_id, account_id)
     return {"deleted_event_id": calendar_event_id}
 
 @router.post(
@@ -107,7 +108,7 @@ async def participate_calendar_event(
 ) -> dict:
     """Participate in calendar event (requires workspace membership)"""
     # Fetch and verify event exists
-    event = svc.get(calendar_event_id, account_id)
+    event = await aio(svc).get(calendar_event_id, account_id)
     if not event:
         raise HTTPException(status_code=404, detail=f"Event {calendar_event_id} not found")
     
@@ -118,5 +119,5 @@ async def participate_calendar_event(
             detail=f"Event does not belong to workspace {workspace_id}"
         )
     
-    result = svc.participate(calendar_event_id, account_id, user, participate_data)
+    result = await aio(svc).participate(calendar_event_id, account_id, user, participate_data)
     return {"participated_event_id": calendar_event_id}
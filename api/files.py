@@ -5,6 +5,7 @@ from api.schemas.files import FileCreate, FileOut, FileUpdate, FileSpec
 from auth import PermissionChecker, get_account_id
 from di import get_file_service
 from services.file_service import FileService
+from core.concurrency import aio
 
 
 router = APIRouter(prefix="/files", tags=["files"])
@@ -16,7 +17,7 @@ async def list_files(
     svc: FileService = Depends(get_file_service)
 ):
     """List all files for the account"""
-    return svc.list_files(account_id)
+    return await aio(svc).list_files(account_id)
 
 
 @router.post("", response_model=FileOut, dependencies=[Depends(PermissionChecker(required_permissions=["admin"]))])
@@ -26,7 +27,7 @@ async def create_file(
     svc: FileService = Depends(get_file_service)
 ):
     """Create file metadata (URLs will be added after upload)"""
-    file = svc.create_file(payload, account_id)
+    file = await aio(svc).create_file(payload, account_id)
     return file
 
 
@@ -37,7 +38,7 @@ async def get_file(
     svc: FileService = Depends(get_file_service)
 ):
     """Get single file by ID"""
-    file = svc.get_file(file_id, account_id)
+    file = await aio(svc).get_file(file_id, account_id)
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
     return file
@@ -51,7 +52,7 @@ async def update_file(
     svc: FileService = Depends(get_file_service)
 ):
     """Update file metadata (name, tags, favorited)"""
-    item = svc.update_file(file_id, account_id, payload)
+    item = await aio(svc).update_file(file_id, account_id, payload)
     if not item:
         raise HTTPException(status_code=404, detail="File not found or not updated")
     return item
@@ -64,7 +65,7 @@ async def delete_file(
     svc: FileService = Depends(get_file_service)
 ):
     """Delete file from both DynamoDB and S3"""
-    existing = svc.delete_file(file_id, account_id)
+    existing = await aio(svc).delete_file(file_id, account_id)
     if not existing:
         raise HTTPException(status_code=404, detail="File not found")
     return
@@ -78,12 +79,12 @@ async def generate_file_presigned_url(
     svc: FileService = Depends(get_file_service)
 ):
     """Generate presigned URL for uploading file to S3"""
-    file = svc.get_file(file_id, account_id, get_presigned_url=False)
+    file = await aio(svc).get_file(file_id, account_id, get_presigned_url=False)
     if not file:
         raise HTTPException(status_code=404, detail=f"File {file_id} not found")
     
     try:
-        result = svc.generate_put_presigned_url(file_id=file_id, account_id=account_id, file_spec=file_spec)
+        result = await aio(svc).generate_put_presigned_url(file_id=file_id, account_id=account_id, file_spec=file_spec)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error generating presigned URL: {str(e)}")
     
@@ -99,7 +100,7 @@ async def add_file(
 ):
     """Add file key to file record after successful upload"""
     try:
-        key = svc.add_file(file_id, account_id, file_name)
+        key = await aio(svc).add_file(file_id, account_id, file_name)
         return {"key": key}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
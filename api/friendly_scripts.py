@@ -2,6 +2,7 @@ from di import get_user_service
 from auth import PermissionChecker, get_current_user, get_account_id
 from fastapi import APIRouter, Depends, HTTPException, Query
 from services.user_service import UserService
+from core.concurrency import aio
 
 
 router = APIRouter(tags=["friendly_scripts"])
@@ -11,7 +12,7 @@ async def send_christmas_greetings(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.send_christmas_greetings(account_id)
+    await aio(svc).send_christmas_greetings(account_id)
     return {"message": "Christmas greetings sent successfully."}
 
 @router.get("/health_check")
@@ -25,7 +26,7 @@ async def get_assists_stats(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    return svc.get_assists_stats(user["sub"], account_id, workspace_id)
+    return await aio(svc).get_assists_stats(user["sub"], account_id, workspace_id)
 
 @router.get("/top_goals_and_assists", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
 async def get_top_goals_and_assists(
@@ -33,7 +34,7 @@ async def get_top_goals_and_assists(
     workspace_id: str = Query(None), 
     svc: UserService = Depends(get_user_service)
 ):
-    return svc.get_top_goals_and_assists(account_id, workspace_id)
+    return await aio(svc).get_top_goals_and_assists(account_id, workspace_id)
 
 @router.get("/workspace_assists_stats", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
 async def get_workspace_assists_stats(
@@ -41,7 +42,7 @@ async def get_workspace_assists_stats(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    return svc.get_workspace_assists_stats(account_id, workspace_id)
+    return await aio(svc).get_workspace_assists_stats(account_id, workspace_id)
 
 @router.get("/raise_error", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
 async def raise_error():
@@ -54,4 +55,4 @@ async def get_wins_draws_loses(
     workspace_id: str = Query(None), 
     svc: UserService = Depends(get_user_service)
 ):
-    return svc.get_wins_draws_loses(account_id, workspace_id)
\ No newline at end of file
+    return await aio(svc).get_wins_draws_loses(account_id, workspace_id)
\ No newline at end of file
@@ -3,6 +3,7 @@ from di import get_membership_service
 from services.membership_service import MembershipService
 from auth import get_current_user, PermissionChecker, get_account_id
 from api.schemas.memberships import UpdateMembershipRole
+from core.concurrency import aio
 
 router = APIRouter(prefix="/memberships", tags=["memberships"])
 
@@ -13,7 +14,7 @@ async def get_my_memberships(
 ):
     """Get active memberships for the current user"""
     user_id = user.get("sub")
-    return svc.get_user_memberships(user_id)
+    return await aio(svc).get_user_memberships(user_id)
 
 
 @router.get("/{user_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
@@ -23,7 +24,7 @@ async def list_user_memberships(
     svc: MembershipService = Depends(get_membership_service),
 ):
     """List all memberships for a target user in the current account (admin only)."""
-    return svc.get_user_account_memberships(user_id, account_id)
+    return await aio(svc).get_user_account_memberships(user_id, account_id)
 
 @router.post("/{user_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
 async def create_membership(
@@ -35,7 +36,7 @@ async def create_membership(
 ):
     """Create a membership for a user in a specific workspace (admin only)"""
     try:
-        svc.create_membership(user_id, account_id, workspace_id, role, "active")
+        await aio(svc).create_membership(user_id, account_id, workspace_id, role, "active")
         return {
             "message": f"Membership created for user {user_id} in workspace {workspace_id}",
             "user_id": user_id,
@@ -54,7 +55,7 @@ async def delete_membership(
 ):
     """Delete a user's membership from a specific workspace (admin only)"""
     try:
-        svc.delete_membership(user_id, account_id, workspace_id)
+        await aio(svc).delete_membership(user_id, account_id, workspace_id)
         return {
             "message": f"Membership deleted for user {user_id} from workspace {workspace_id}",
             "user_id": user_id,
@@ -72,7 +73,7 @@ async def enable_membership(
 ):
     """Enable a user's membership in a specific workspace (admin only)"""
     try:
-        svc.enable_membership(user_id, account_id, workspace_id)
+        await aio(svc).enable_membership(user_id, account_id, workspace_id)
         return {
             "message": f"Membership enabled for user {user_id} in workspace {workspace_id}",
             "user_id": user_id,
@@ -90,7 +91,7 @@ async def disable_membership(
 ):
     """Disable a user's membership in a specific workspace (admin only)"""
     try:
-        svc.disable_membership(user_id, account_id, workspace_id)
+        await aio(svc).disable_membership(user_id, account_id, workspace_id)
         return {
             "message": f"Membership disabled for user {user_id} in workspace {workspace_id}",
             "user_id": user_id,
@@ -110,6 +111,6 @@ async def patch_membership_role(
 ):
     """Change a user's role in a specific workspace (admin only). Non-destructive."""
     try:
-        return svc.update_role(user_id, account_id, workspace_id, body.role)
+        return await aio(svc).update_role(user_id, account_id, workspace_id, body.role)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
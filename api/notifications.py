@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 
 from api.schemas.notifications import NotificationOut
 from auth import get_current_user
+from core.concurrency import aio
 from di import get_notification_repo
 from repositories.notification_repo_ddb import NotificationRepo
 
@@ -24,7 +25,7 @@ async def list_notifications(
     user: dict = Depends(get_current_user),
     repo: NotificationRepo = Depends(get_notification_repo),
 ):
-    items = repo.list_by_user(user["email"])
+    items = await aio(repo).list_by_user(user["email"])
     return {"notifications": [_to_out(item) for item in items]}
 
 
@@ -34,7 +35,7 @@ async def mark_all_notifications_read(
     user: dict = Depends(get_current_user),
     repo: NotificationRepo = Depends(get_notification_repo),
 ):
-    repo.mark_all_read(user["email"])
+    await aio(repo).mark_all_read(user["email"])
     return {"ok": True}
 
 
@@ -44,5 +45,5 @@ async def mark_notification_read(
     user: dict = Depends(get_current_user),
     repo: NotificationRepo = Depends(get_notification_repo),
 ):
-    repo.mark_read(notification_id, user["email"])
+    await aio(repo).mark_read(notification_id, user["email"])
     return {"ok": True}
@@ -4,6 +4,7 @@ from api.schemas.orders import Order, OrderCreate, OrderUpdate, OrderCheckUpdate
 from services.order_service import OrderService
 from di import get_order_service
 from auth import PermissionChecker, get_account_id, get_current_user
+from core.concurrency import aio
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -13,7 +14,7 @@ async def list_orders(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service),
 ):
-    return svc.list_orders(account_id, workspace_id=workspace_id)
+    return await aio(svc).list_orders(account_id, workspace_id=workspace_id)
 
 @router.get("/{order_id}", response_model=Order, dependencies=[Depends(PermissionChecker(required_permissions=["admin", "user"]))])
 async def get_order(
@@ -21,7 +22,7 @@ async def get_order(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service)
 ):
-    order = svc.get_order(order_id, account_id)
+    order = await aio(svc).get_order(order_id, account_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -32,7 +33,7 @@ async def create_order(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service)
 ):
-    return svc.create_order(payload, account_id)
+    return await aio(svc).create_order(payload, account_id)
 
 @router.put("/{order_id}", response_model=Order, dependencies=[Depends(PermissionChecker(required_permissions=["admin"]))])
 async def update_order(
@@ -42,7 +43,7 @@ async def update_order(
     svc: OrderService = Depends(get_order_service)
 ):
     try:
-        order = svc.update_order(order_id, account_id, payload)
+        order = await aio(svc).update_order(order_id, account_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not order:
@@ -62,7 +63,7 @@ async def set_provider_check(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service),
 ):
-    order = svc.set_provider_check(order_id, account_id, user["sub"], payload)
+    order = await aio(svc).set_provider_check(order_id, account_id, user["sub"], payload)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -80,7 +81,7 @@ async def set_delivery_check(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service),
 ):
-    order = svc.set_delivery_check(order_id, account_id, user["sub"], payload)
+    order = await aio(svc).set_delivery_check(order_id, account_id, user["sub"], payload)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -91,7 +92,7 @@ async def delete_order(
     account_id: str = Depends(get_account_id),
     svc: OrderService = Depends(get_order_service)
 ):
-    success = svc.delete_order(order_id, account_id)
+    success = await aio(svc).delete_order(order_id, account_id)
     if not success:
         raise HTTPException(status_code=404, detail="Order not found")
     return {"message": "Order deleted"}
@@ -1,37 +1,36 @@
-from datetime import datetime, timedelta
+import json
 
 from pydantic import BaseModel
 
 from auth import PermissionChecker, WorkspacePermissionChecker, get_account_id, get_current_user, get_account_role
 from api.schemas.files import FileSpec
 from di import (
-    get_account_service,
-    get_match_event_service,
     get_match_service,
     get_payment_request_service,
-    get_tournament_player_service,
+    get_tournament_charge_service,
     get_tournament_service,
-    get_tournament_team_service,
-    get_user_service,
 )
-from fastapi import APIRouter, Body, Depends, Form, HTTPException, Query
-from api.schemas.payments import BulkPutPaymentRequest
-from services.account_service import AccountService
+from fastapi import APIRouter, Body, Depends, Form, HTTPException, Query, Response
+from api.schemas.payments import BulkPutPaymentRequest, PaymentRequestStatus
 from services.payment_request_service import PaymentRequestService
-from services.tournament_match_event_service import TournamentMatchEventService
+from services.tournament_charge_service import TournamentChargeService
 from services.tournament_match_service import TournamentMatchService
-from services.tournament_player_service import TournamentPlayerService
 from services.tournament_service import TournamentService
-from services.tournament_team_service import TournamentTeamService
-from services.user_service import UserService
+from core.concurrency import aio, gather
 
 
 router = APIRouter(prefix="/payment_requests", tags=["payment_requests"])
 
+# Workspace guards only compare the request's group — read just that.
+_WORKSPACE_FIELDS = ["user_group"]
+
 @router.get("", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user', 'team_owner']))])
 async def list_payment_requests(
     user_id: str | None = None, 
     workspace_id: str | None = None,
+    status: PaymentRequestStatus | None = None,
+    limit: int | None = Query(None, ge=1, le=200, description="Page size; when set, returns {items, next_cursor}"),
+    cursor: str | None = None,
     account_id: str = Depends(get_account_id),
     current_user: dict = Depends(get_current_user),
     role: str = Depends(get_account_role),
@@ -41,8 +40,14 @@ async def list_payment_requests(
     if role != 'admin':
         user_id = current_user.get("sub")
     
-    items = svc.list_payment_requests(account_id, user_id=user_id, group=workspace_id)
-    return items
+    if limit is None and cursor is None:
+        return await aio(svc).list_payment_requests(account_id, user_id=user_id, group=workspace_id, status=status)
+    try:
+        return await aio(svc).list_payment_requests_page(
+            account_id, user_id=user_id, group=workspace_id, status=status, limit=limit or 50, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post(
     "",
@@ -50,11 +55,16 @@ async def list_payment_requests(
 )
 async def create_payment_requests(
     put_payment_request: BulkPutPaymentRequest,
+    response: Response,
     workspace_id: str = Query(..., description="Workspace ID for payment requests"),
     account_id: str = Depends(get_account_id),
     svc: PaymentRequestService = Depends(get_payment_request_service)
 ):
-    """Create payment requests (requires workspace admin permission)"""
+    """Create payment requests (requires workspace admin permission).
+
+    Returns the created payment requests. Users that could not be charged
+    are listed in the `X-Failed-Recipients` header (a JSON array of
+    `{"user_id", "email", "error"}`), present only when there are any."""
     # Set workspace in request data if not already set
     if not put_payment_request.group:
         put_payment_request.group = workspace_id
@@ -64,8 +74,10 @@ async def create_payment_requests(
             detail="Payment request group must match workspace_id"
         )
     
-    items = svc.bulk_create(put_payment_request, account_id)
-    return items
+    result = await aio(svc).bulk_create(put_payment_request, account_id)
+    if result["failed"]:
+        response.headers["X-Failed-Recipients"] = json.dumps(result["failed"])
+    return result["created"]
 
 @router.get(
     "/{payment_request_id}",
@@ -76,7 +88,7 @@ async def get_payment_request(
     account_id: str = Depends(get_account_id),
     svc: PaymentRequestService = Depends(get_payment_request_service)
 ):
-    item = svc.get(payment_request_id, account_id)
+    item = await aio(svc).get(payment_request_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Payment Request {payment_request_id} not found")
     return item
@@ -95,7 +107,7 @@ async def update_payment_request(
 ):
     """Update payment request (requires workspace admin permission)"""
     # Fetch and verify payment request exists
-    existing_item = svc.get(payment_request_id, account_id)
+    existing_item = await aio(svc).get(payment_request_id, account_id, fields=_WORKSPACE_FIELDS)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"Payment Request {payment_request_id} not found")
     
@@ -106,7 +118,7 @@ async def update_payment_request(
             detail=f"Payment request does not belong to workspace {workspace_id}"
         )
     
-    svc.update(payment_request_id, account_id, put_payment_request)
+    await aio(svc).update(payment_request_id, account_id, put_payment_request)
     return {"updated_payment_request_id": payment_request_id}
 
 @router.delete(
@@ -121,7 +133,7 @@ async def delete_payment_request(
 ):
     """Delete payment request (requires workspace admin permission)"""
     # Fetch and verify payment request exists
-    payment_request = svc.get(payment_request_id, account_id)
+    payment_request = await aio(svc).get(payment_request_id, account_id, fields=_WORKSPACE_FIELDS)
     if not payment_request:
         raise HTTPException(status_code=404, detail=f"Payment Request {payment_request_id} not found")
     
@@ -132,7 +144,7 @@ async def delete_payment_request(
             detail=f"Payment request does not belong to workspace {workspace_id}"
         )
     
-    svc.delete(payment_request_id, account_id)
+    await aio(svc).delete(payment_request_id, account_id)
     return {"deleted_payment_request_id": payment_request_id}
 
 @router.post(
@@ -148,7 +160,7 @@ async def generate_payment_request_presigned_urls(
 ):
     """Generate presigned URLs for payment request (requires workspace membership)"""
     # Fetch and verify payment request exists
-    payment_request = svc.get(payment_request_id, account_id)
+    payment_request = await aio(svc).get(payment_request_id, account_id, fields=_WORKSPACE_FIELDS)
     if not payment_request:
         raise HTTPException(status_code=404, detail=f"Payment Request {payment_request_id} not found")
     
@@ -160,7 +172,7 @@ async def generate_payment_request_presigned_urls(
         )
 
     try:
-        result = svc.generate_put_presigned_urls(payment_request_id=payment_request_id, account_id=account_id, files=files)
+        result = await aio(svc).generate_put_presigned_urls(payment_request_id=payment_request_id, account_id=account_id, files=files)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Error generating presigned URLs: {str(e)}")
 
@@ -179,7 +191,10 @@ async def request_payment_request_approval(
 ):
     """Request payment approval (requires workspace membership)"""
     # Fetch and verify payment request exists
-    payment_request = svc.get(payment_request_id, account_id)
+    payment_request = await aio(svc).get(
+        payment_request_id, account_id,
+        fields=[*_WORKSPACE_FIELDS, "payment_status", "payment_request_to"],
+    )
     if not payment_request:
         raise HTTPException(status_code=404, detail=f"Payment Request {payment_request_id} not found")
     
@@ -196,11 +211,7 @@ async def request_payment_request_approval(
     if not file_names:
         raise HTTPException(status_code=400, detail="No files were uploaded")
     
-    return {"requested_payment_request_approval_id": svc.request_payment_request_approval(payment_request_id, account_id, file_names)}
-
-
-_CARD_YELLOW_TYPES = {"yellow_card"}
-_CARD_RED_TYPES = {"red_card", "second_yellow"}
+    return {"requested_payment_request_approval_id": await aio(svc).request_payment_request_approval(payment_request_id, account_id, file_names)}
 
 
 class TournamentMatchChargesRequest(BaseModel):
@@ -217,138 +228,22 @@ async def create_tournament_match_charges(
     account_id: str = Depends(get_account_id),
     t_svc: TournamentService = Depends(get_tournament_service),
     m_svc: TournamentMatchService = Depends(get_match_service),
-    ev_svc: TournamentMatchEventService = Depends(get_match_event_service),
-    team_svc: TournamentTeamService = Depends(get_tournament_team_service),
-    user_svc: UserService = Depends(get_user_service),
-    pr_svc: PaymentRequestService = Depends(get_payment_request_service),
-    account_svc: AccountService = Depends(get_account_service),
-    player_svc: TournamentPlayerService = Depends(get_tournament_player_service),
+    charge_svc: TournamentChargeService = Depends(get_tournament_charge_service),
 ):
-    tournament = t_svc.get_tournament(body.tournamentId, account_id)
+    tournament, match = await gather(
+        aio(t_svc).get_tournament(body.tournamentId, account_id),
+        aio(m_svc).get_match(body.matchId),
+    )
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     if not tournament.get("payments_enabled"):
         raise HTTPException(status_code=400, detail="Payments not enabled for this tournament")
-
-    match = m_svc.get_match(body.matchId)
     if not match or match.get("tournament_id") != body.tournamentId:
         raise HTTPException(status_code=404, detail="Match not found")
     if match.get("status") != "finished":
         raise HTTPException(status_code=400, detail="Match is not finished")
 
-    # Charges must land in the account's real workspace (same convention as
-    # tournament_invitation_service._accept: "group" everywhere else means
-    # workspace_id, and tournaments have no workspace_id of their own), so the
-    # normal Pagos/Pagos Totales pages pick them up without a tournament-specific view.
-    account = account_svc.get(account_id)
-    workspace_id = (account.get("settings") or {}).get("default_workspace") if account else None
-    if not workspace_id:
-        raise HTTPException(status_code=400, detail="Account has no default workspace configured")
-
-    rules = tournament.get("rules") or {}
-    yellow_fee = int(rules.get("yellow_card_fee") or 0)
-    red_fee = int(rules.get("red_card_fee") or 0)
-
-    events = ev_svc.list_events(body.matchId)
-    card_events = [ev for ev in events if ev.get("type") in (_CARD_YELLOW_TYPES | _CARD_RED_TYPES)]
-
-    existing_prs = pr_svc.list_payment_requests(account_id, group=workspace_id)
-    charged_event_ids = {pr.get("reference") for pr in existing_prs if pr.get("reference")}
-
-    today = datetime.utcnow().date().isoformat()
-    due = (datetime.utcnow() + timedelta(days=30)).date().isoformat()
-    tournament_name = tournament.get("name", "Torneo")
-
-    team_cache: dict[str, dict] = {}
-    for team_id in {ev.get("team_id") for ev in card_events if ev.get("team_id")}:
-        team = team_svc.get_team(team_id)
-        if team:
-            team_cache[team_id] = team
-
-    player_cache: dict[str, dict] = {}
-    for player_id in {ev.get("player_id") for ev in card_events if ev.get("player_id")}:
-        player = player_svc.repo.get(player_id)
-        if player:
-            player_cache[player_id] = player
-
-    # Build recipient info per team.
-    # Priority: owner_user_id (invitation-accepted) → contact_email user lookup → contact_email direct.
-    RecipientInfo = tuple  # (id, email, name)
-    recipient_by_team: dict[str, RecipientInfo] = {}
-    for tid, team in team_cache.items():
-        owner_id = team.get("owner_user_id")
-        if owner_id:
-            user = user_svc.repo.get(owner_id, account_id)
-            if user:
-                recipient_by_team[tid] = (user["id"], user.get("email", ""), user.get("name") or team.get("name", "Equipo"))
-                continue
-        contact_email = (team.get("contact_email") or "").strip()
-        if contact_email:
-            user = user_svc.repo.get_by_email(contact_email)
-            if user:
-                recipient_by_team[tid] = (user["id"], user.get("email", contact_email), user.get("name") or team.get("name", "Equipo"))
-            else:
-                recipient_by_team[tid] = (tid, contact_email, team.get("name", "Equipo"))
-
-    created = 0
-    skipped_already_charged = 0
-    skipped_no_team = 0
-    skipped_no_manager = 0
-    skipped_fee_zero = 0
-
-    for ev in card_events:
-        if ev.get("id") in charged_event_ids:
-            skipped_already_charged += 1
-            continue
-
-        team_id = ev.get("team_id")
-        team = team_cache.get(team_id)
-        if not team:
-            skipped_no_team += 1
-            continue
-
-        recipient = recipient_by_team.get(team_id)
-        if not recipient:
-            skipped_no_manager += 1
-            continue
-
-        ev_type = ev.get("type")
-        is_red = ev_type in _CARD_RED_TYPES
-        fee = red_fee if is_red else yellow_fee
-        if fee == 0:
-            skipped_fee_zero += 1
-            continue
-
-        card_label = "Tarjeta Roja" if is_red else "Tarjeta Amarilla"
-        recipient_id, recipient_email, recipient_name = recipient
-        home_team = team_cache.get(match.get("home_team_id", ""))
-        away_team = team_cache.get(match.get("away_team_id", ""))
-        home_name = (home_team or {}).get("name") or match.get("home_team_id", "")
-        away_name = (away_team or {}).get("name") or match.get("away_team_id", "")
-        player_name = (player_cache.get(ev.get("player_id")) or {}).get("name") or "Jugador sin nombre"
-
-        bulk_item = BulkPutPaymentRequest(
-            createDate=today,
-            dueDate=due,
-            concept=f"{card_label} - {player_name} ({team.get('name', 'Equipo')})",
-            description=f"{tournament_name} - Partido {match.get('date', '')[:10]}: {home_name} vs {away_name}",
-            category="tournament_fine",
-            group=workspace_id,
-            paymentRequestTo=[{"id": recipient_id, "name": recipient_name, "email": recipient_email}],
-            userPrice=fee,
-            reference=ev["id"],
-        )
-        try:
-            pr_svc.bulk_create(bulk_item, account_id)
-            created += 1
-        except Exception as exc:
-            print(f"[payments] failed to create charge for team {team_id} event {ev.get('id')}: {exc}")
-
-    return {
-        "created": created,
-        "card_events_found": len(card_events),
-        "skipped_already_charged": skipped_already_charged,
-        "skipped_no_team": skipped_no_team,
-        "skipped_no_manager": skipped_no_manager,
-        "skipped_fee_zero": skipped_fee_zero,
-    }
+    try:
+        return await aio(charge_svc).charge_match(tournament, match, account_id, check_legacy=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
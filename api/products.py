@@ -6,6 +6,7 @@ from api.schemas.files import FileSpec
 from auth import PermissionChecker, get_account_id
 from di import get_product_service
 from services.product_service import ProductService
+from core.concurrency import aio
 
 
 search_router = APIRouter(prefix="/products_search", tags=["products"])
@@ -35,7 +36,7 @@ async def search_products(
         "max_price": maxPrice,
         "min_rating": minRating,
     }
-    result = svc.search_products(account_id, q, filters, sortBy, limit, nextToken)
+    result = await aio(svc).search_products(account_id, q, filters, sortBy, limit, nextToken)
     return result
     #return get_fake_response()
 
@@ -44,7 +45,7 @@ async def list_products(
     account_id: str = Depends(get_account_id),
     svc: ProductService = Depends(get_product_service)
 ):
-    return svc.list_products(account_id)
+    return await aio(svc).list_products(account_id)
 
 @router.post("", response_model=ProductOut, dependencies=[Depends(PermissionChecker(required_permissions=["admin"]))])
 async def create_product(
@@ -52,7 +53,7 @@ async def create_product(
     account_id: str = Depends(get_account_id),
     svc: ProductService = Depends(get_product_service)
 ):
-    product = svc.create_product(payload, account_id)
+    product = await aio(svc).create_product(payload, account_id)
     return product
 
 
@@ -62,7 +63,7 @@ async def get_product(
     account_id: str = Depends(get_account_id),
     svc: ProductService = Depends(get_product_service)
 ):
-    p = svc.get_product(product_id, account_id)
+    p = await aio(svc).get_product(product_id, account_id)
     if not p:
         raise HTTPException(status_code=404, detail="Product not found")
     return p
@@ -75,7 +76,7 @@ async def update_product(
     account_id: str = Depends(get_account_id),
     svc: ProductService = Depends(get_product_service)
 ):
-    item = svc.update_product(product_id, account_id, payload)
+    item = await aio(svc).update_product(product_id, account_id, payload)
     if not item:
         raise HTTPException(status_code=404, detail="Product not found or not updated")
     return item
@@ -87,7 +88,7 @@ async def delete_product(
     account_id: str = Depends(get_account_id),
     svc: ProductService = Depends(get_product_service)
 ):
-    existing = svc.delete_product(product_id, account_id)
+    existing = await aio(svc).delete_product(product_id, account_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Product not found")
     return
@@ -100,12 +101,12 @@ async def generate_product_presigned_urls(
     svc: ProductService = Depends(get_product_service)
 ):
     """Generate presigned URLs for uploading product images to S3"""
-    product = svc.get_product(product_id, account_id)
+    product = await aio(svc).get_product(product_id, account_id)
     if not product:
         raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
     
     try:
-        result = svc.generate_put_presigned_urls(product_id=product_id, account_id=account_id, files=files)
+        result = await aio(svc).generate_put_presigned_urls(product_id=product_id, account_id=account_id, files=files)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error generating presigned URLs: {str(e)}")
     
@@ -120,7 +121,7 @@ async def add_product_images(
 ):
     """Add image keys to product after successful upload to S3"""
     try:
-        added_images = svc.add_images(product_id, account_id, file_names)
+        added_images = await aio(svc).add_images(product_id, account_id, file_names)
         return {"added_images": added_images}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
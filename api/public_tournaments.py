@@ -4,9 +4,14 @@ Tournaments are accessible publicly only when `is_public=True`.
 No account_id or auth token required.
 """
 
-from typing import Optional
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 
 from di import (
     get_tournament_service,
@@ -16,25 +21,106 @@ from di import (
     get_match_service,
     get_match_event_service,
     get_tournament_player_service,
+    get_tournament_snapshot_service,
 )
 from services.standings_service import StandingsService
 from services.tournament_service import TournamentService
+from services.tournament_snapshot_service import TournamentSnapshotService
 from services.tournament_match_service import TournamentMatchService
 from services.tournament_match_event_service import TournamentMatchEventService
 from services.tournament_player_service import TournamentPlayerService
 from services.tournament_stats_service import TournamentStatsService
 from services.tournament_team_service import TournamentTeamService
+from core.cache import TTLCache
+from core.concurrency import aio, gather
 
 router = APIRouter(prefix="/public/tournaments", tags=["public"])
 
 
-def _get_public_or_404(tournament_id: str, svc: TournamentService) -> dict:
-    t = svc.get_public_tournament(tournament_id)
+async def _get_public_or_404(tournament_id: str, svc: TournamentService) -> dict:
+    # With groups and bracket: views read them off the (cached) item.
+    t = await aio(svc).get_public_tournament(tournament_id, detail=True)
     if not t:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return t
 
 
+# ── Versioned read cache ───────────────────────────────────────────────
+# Every write to a tournament (or its teams, players, matches, events)
+# bumps `version` on the tournament item. Per-tournament views are cached
+# here as rendered JSON keyed by (tournament, version, window, view), so a
+# hit costs one projected GetItem (the version probe) and no rendering.
+# The ETag carries the same key: a client revalidating with
+# If-None-Match gets a 304 until something in the tournament changes.
+# `window` rolls every PUBLIC_CACHE_WINDOW_SECONDS so presigned logo /
+# avatar URLs (valid for an hour) are re-issued well before they expire.
+
+_PUBLIC_CACHE_WINDOW = int(os.getenv("PUBLIC_CACHE_WINDOW_SECONDS", "300"))
+_view_cache: TTLCache = TTLCache(
+    maxsize=int(os.getenv("PUBLIC_CACHE_SIZE", "512")), ttl=_PUBLIC_CACHE_WINDOW
+)
+
+class _TournamentLoader:
+    """Async loader for the public tournament item at a probed `version`
+    (cached alongside the views). Passed to view builders."""
+
+    def __init__(self, tournament_id: str, version: int, window: int, svc: TournamentService) -> None:
+        self.tournament_id = tournament_id
+        self.version = version
+        self._key = (tournament_id, version, window, "__tournament__")
+        self._svc = svc
+
+    async def __call__(self) -> dict:
+        t = _view_cache.get(self._key)
+        if t is None:
+            t = await _get_public_or_404(self.tournament_id, self._svc)
+            _view_cache.set(self._key, t)
+        return t
+
+
+ViewBuilder = Callable[[_TournamentLoader], Awaitable[Any]]
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def _cached_view(
+    request: Request,
+    tournament_id: str,
+    view: str,
+    svc: TournamentService,
+    build: ViewBuilder,
+) -> Response:
+    """Serve `view` of a public tournament from the versioned cache.
+
+    `build(tournament)` renders the view on a miss; `tournament` is a
+    `_TournamentLoader` for the (also cached) public tournament item.
+    """
+    version = await aio(svc).get_public_version(tournament_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    window = int(time.time()) // _PUBLIC_CACHE_WINDOW
+    view_tag = hashlib.sha1(view.encode()).hexdigest()[:12]
+    etag = f'"{tournament_id}-{version}-{window}-{view_tag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    key = (tournament_id, version, window, view)
+    body = _view_cache.get(key)
+    if body is None:
+        payload = await build(_TournamentLoader(tournament_id, version, window, svc))
+        body = json.dumps(jsonable_encoder(payload)).encode()
+        _view_cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ── Tournaments ────────────────────────────────────────────────────────
 
 @router.get("")
@@ -42,15 +128,37 @@ async def list_public_tournaments(
     status: Optional[str] = Query(None),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    return svc.list_public_tournaments(status=status)
+    return await aio(svc).list_public_tournaments(status=status)
 
 
 @router.get("/{tournament_id}")
 async def get_public_tournament(
     tournament_id: str,
+    request: Request,
+    svc: TournamentService = Depends(get_tournament_service),
+):
+    async def build(tournament):
+        return await tournament()
+    return await _cached_view(request, tournament_id, "tournament", svc, build)
+
+
+# ── Snapshot (whole public page in one response) ─────────────────────
+
+@router.get("/{tournament_id}/snapshot")
+async def get_public_snapshot(
+    tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
+    snapshot_svc: TournamentSnapshotService = Depends(get_tournament_snapshot_service),
 ):
-    return _get_public_or_404(tournament_id, svc)
+    """Tournament, groups, bracket, teams, players, matches, standings,
+    stats and top scorers in one document (see TournamentSnapshotService)."""
+    async def build(tournament):
+        snapshot = await aio(snapshot_svc).get_snapshot(tournament_id, tournament.version)
+        if snapshot is None:
+            raise HTTPException(status_code=404, detail="Tournament not found")
+        return snapshot
+    return await _cached_view(request, tournament_id, "snapshot", svc, build)
 
 
 # ── Groups ─────────────────────────────────────────────────────────────
@@ -58,10 +166,12 @@ async def get_public_tournament(
 @router.get("/{tournament_id}/groups")
 async def get_public_groups(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    t = _get_public_or_404(tournament_id, svc)
-    return t.get("groups", [])
+    async def build(tournament):
+        return (await tournament()).get("groups", [])
+    return await _cached_view(request, tournament_id, "groups", svc, build)
 
 
 # ── Teams ──────────────────────────────────────────────────────────────
@@ -69,11 +179,13 @@ async def get_public_groups(
 @router.get("/{tournament_id}/teams")
 async def get_public_teams(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _get_public_or_404(tournament_id, svc)
-    return team_svc.list_teams(tournament_id)
+    async def build(tournament):
+        return await aio(team_svc).list_teams(tournament_id)
+    return await _cached_view(request, tournament_id, "teams", svc, build)
 
 
 # ── Matches ────────────────────────────────────────────────────────────
@@ -81,13 +193,16 @@ async def get_public_teams(
 @router.get("/{tournament_id}/matches")
 async def get_public_matches(
     tournament_id: str,
+    request: Request,
     matchweek: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     svc: TournamentService = Depends(get_tournament_service),
     match_svc: TournamentMatchService = Depends(get_match_service),
 ):
-    _get_public_or_404(tournament_id, svc)
-    return match_svc.list_matches(tournament_id, matchweek=matchweek, status=status)
+    async def build(tournament):
+        return await aio(match_svc).list_matches(tournament_id, matchweek=matchweek, status=status)
+    view = f"matches?matchweek={matchweek}&status={status}"
+    return await _cached_view(request, tournament_id, view, svc, build)
 
 
 # ── Standings ──────────────────────────────────────────────────────────
@@ -95,16 +210,24 @@ async def get_public_matches(
 @router.get("/{tournament_id}/standings")
 async def get_public_standings(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     s_svc: StandingsService = Depends(get_standings_service),
 ):
-    t = _get_public_or_404(tournament_id, svc)
-    groups = t.get("groups", [])
-    if groups:
-        teams = team_svc.list_teams(tournament_id)
-        return s_svc.get_all_standings(tournament_id, t.get("rules", {}), groups, teams)
-    return s_svc.get_standings(tournament_id, t.get("rules", {}))
+    async def build(tournament):
+        t, teams = await gather(tournament(), aio(team_svc).list_teams(tournament_id))
+        groups = t.get("groups", [])
+        if groups:
+            return await aio(s_svc).get_all_standings(
+                tournament_id, t.get("rules", {}), groups, teams,
+                tiebreaker_order=t.get("tiebreaker_order"), version=t.get("version"),
+            )
+        return await aio(s_svc).get_standings(
+            tournament_id, t.get("rules", {}), teams=teams,
+            tiebreaker_order=t.get("tiebreaker_order"), version=t.get("version"),
+        )
+    return await _cached_view(request, tournament_id, "standings", svc, build)
 
 
 # ── Stats ──────────────────────────────────────────────────────────────
@@ -112,16 +235,23 @@ async def get_public_standings(
 @router.get("/{tournament_id}/stats")
 async def get_public_stats(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    t = _get_public_or_404(tournament_id, svc)
-    return stats_svc.get_stats(
-        tournament_id,
-        current_matchweek=t.get("current_matchweek", 0),
-        total_matchweeks=t.get("rules", {}).get("total_matchweeks"),
-        tournament=t,
-    )
+    async def build(tournament):
+        t, teams = await gather(
+            tournament(),
+            aio(stats_svc.team_repo).list_by_tournament(tournament_id),
+        )
+        return await aio(stats_svc).get_stats(
+            tournament_id,
+            current_matchweek=t.get("current_matchweek", 0),
+            total_matchweeks=t.get("rules", {}).get("total_matchweeks"),
+            tournament=t,
+            teams=teams,
+        )
+    return await _cached_view(request, tournament_id, "stats", svc, build)
 
 
 # ── Top Scorers ────────────────────────────────────────────────────────
@@ -129,11 +259,13 @@ async def get_public_stats(
 @router.get("/{tournament_id}/top-scorers")
 async def get_public_top_scorers(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    _get_public_or_404(tournament_id, svc)
-    return stats_svc.get_top_scorers(tournament_id)
+    async def build(tournament):
+        return await aio(stats_svc).get_top_scorers(tournament_id)
+    return await _cached_view(request, tournament_id, "top-scorers", svc, build)
 
 
 # ── Bracket ────────────────────────────────────────────────────────────
@@ -141,10 +273,12 @@ async def get_public_top_scorers(
 @router.get("/{tournament_id}/bracket")
 async def get_public_bracket(
     tournament_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    t = _get_public_or_404(tournament_id, svc)
-    return t.get("bracket") or {}
+    async def build(tournament):
+        return (await tournament()).get("bracket") or {}
+    return await _cached_view(request, tournament_id, "bracket", svc, build)
 
 
 # ── Players ────────────────────────────────────────────────────────────
@@ -152,12 +286,14 @@ async def get_public_bracket(
 @router.get("/{tournament_id}/players")
 async def get_public_players(
     tournament_id: str,
+    request: Request,
     team_id: Optional[str] = Query(None),
     svc: TournamentService = Depends(get_tournament_service),
     player_svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _get_public_or_404(tournament_id, svc)
-    return player_svc.list_players(tournament_id, team_id=team_id)
+    async def build(tournament):
+        return await aio(player_svc).list_players(tournament_id, team_id=team_id)
+    return await _cached_view(request, tournament_id, f"players?team_id={team_id}", svc, build)
 
 
 # ── Match detail (single match with events) ────────────────────────────
@@ -166,13 +302,18 @@ async def get_public_players(
 async def get_public_match(
     tournament_id: str,
     match_id: str,
+    request: Request,
     svc: TournamentService = Depends(get_tournament_service),
     match_svc: TournamentMatchService = Depends(get_match_service),
     ev_svc: TournamentMatchEventService = Depends(get_match_event_service),
 ):
-    _get_public_or_404(tournament_id, svc)
-    item = match_svc.get_match(match_id)
-    if not item or item.get("tournament_id") != tournament_id:
-        raise HTTPException(status_code=404, detail="Match not found")
-    item["events"] = ev_svc.list_events(match_id)
-    return item
+    async def build(tournament):
+        item, events = await gather(
+            aio(match_svc).get_match(match_id),
+            aio(ev_svc).list_events(match_id),
+        )
+        if not item or item.get("tournament_id") != tournament_id:
+            raise HTTPException(status_code=404, detail="Match not found")
+        item["events"] = events
+        return item
+    return await _cached_view(request, tournament_id, f"match:{match_id}", svc, build)
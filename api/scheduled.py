@@ -3,6 +3,7 @@ from di import get_payment_request_service
 from fastapi import APIRouter, Depends, HTTPException
 from api.schemas.payments import BulkPutPaymentRequest
 from services.payment_request_service import PaymentRequestService
+from core.concurrency import aio
 
 
 router = APIRouter(tags=["scheduled"])
@@ -11,5 +12,5 @@ router = APIRouter(tags=["scheduled"])
 async def process_overdue_request_payments(
     svc: PaymentRequestService = Depends(get_payment_request_service),
     ):
-    processed_request_payments = svc.process_overdue_payments()
-    return {"processed_request_payments": processed_request_payments}
+    result = await aio(svc).process_overdue_payments()
+    return {"processed_request_payments": result["payments"]}
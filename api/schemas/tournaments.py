@@ -250,12 +250,17 @@ class GenerateScheduleRequest(BaseModel):
     match_interval_days: int = 7
     default_venue: str | None = None
     group_id: str | None = None
+    venues: list[str] | None = None  # venues to spread matches over (never double-booked)
+    time_slots: list[str] | None = None  # kickoff times per match day, "HH:MM"
+    dry_run: bool = False  # return the planned matches without saving them
 
 
 class GenerateBracketRequest(BaseModel):
     source: str = Field(..., pattern="^(seeds|groups)$")
     teams: list[dict] | None = None
     from_group_standings: bool | None = None
+    format: str = Field("single_elimination", pattern="^(single|double)_elimination$")
+    third_place: bool = False  # semi-final losers play for 3rd (single elimination)
 
 
 class BulkMatchesRequest(BaseModel):
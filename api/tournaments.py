@@ -24,17 +24,21 @@ from di import (
     get_match_event_service,
     get_standings_service,
     get_tournament_stats_service,
-    get_payment_request_service,
+    get_tournament_charge_service,
+    get_tournament_repo,
+    get_tournament_team_repo,
+    get_tournament_player_repo,
+    get_tournament_match_repo,
+    get_tournament_match_event_repo,
 )
 from services.tournament_service import TournamentService
 from services.tournament_team_service import TournamentTeamService
 from services.tournament_player_service import TournamentPlayerService
-from services.tournament_match_service import TournamentMatchService
+from services.tournament_match_service import MatchStatusConflict, TournamentMatchService
 from services.tournament_match_event_service import TournamentMatchEventService
 from services.standings_service import StandingsService
 from services.tournament_stats_service import TournamentStatsService
-from services.payment_request_service import PaymentRequestService
-from api.schemas.payments import BulkPutPaymentRequest
+from services.tournament_charge_service import TournamentChargeService
 
 from api.schemas.tournaments import (
     CreateTournament,
@@ -61,6 +65,7 @@ from api.schemas.tournaments import (
     BulkMatchesRequest,
     BracketOverride,
 )
+from core.concurrency import aio, gather, run_sync
 
 
 ADMIN = PermissionChecker(required_permissions=["admin", "user"])
@@ -82,7 +87,7 @@ async def list_tournaments(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    return svc.list_tournaments(account_id, status=status)
+    return await aio(svc).list_tournaments(account_id, status=status)
 
 
 @router.post("", dependencies=[Depends(ADMIN)])
@@ -91,7 +96,7 @@ async def create_tournament(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    return svc.create_tournament(body, account_id)
+    return await aio(svc).create_tournament(body, account_id)
 
 
 @router.get("/{tournament_id}", dependencies=[Depends(ALL_ROLES_INCL_TEAM_OWNER)])
@@ -100,7 +105,7 @@ async def get_tournament(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    item = svc.get_tournament(tournament_id, account_id)
+    item = await aio(svc).get_tournament_detail(tournament_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return item
@@ -113,7 +118,7 @@ async def update_tournament(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    result = svc.update_tournament(tournament_id, account_id, body)
+    result = await aio(svc).update_tournament(tournament_id, account_id, body)
     if not result:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return result
@@ -125,7 +130,7 @@ async def delete_tournament(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    if not svc.delete_tournament(tournament_id, account_id):
+    if not await aio(svc).delete_tournament(tournament_id, account_id):
         raise HTTPException(status_code=404, detail="Tournament not found")
     return {"deleted": tournament_id}
 
@@ -137,10 +142,10 @@ async def get_tournament_logo_upload_url(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    t = svc.get_tournament(tournament_id, account_id)
+    t = await aio(svc).get_tournament(tournament_id, account_id)
     if not t:
         raise HTTPException(status_code=404, detail="Tournament not found")
-    return svc.generate_logo_upload_url(tournament_id, account_id, body.filename, body.content_type)
+    return await aio(svc).generate_logo_upload_url(tournament_id, account_id, body.filename, body.content_type)
 
 
 # ╔══════════════════════════════════════════════════════════════════════╗
@@ -153,7 +158,7 @@ async def list_groups(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    groups = svc.list_groups(tournament_id, account_id)
+    groups = await aio(svc).list_groups(tournament_id, account_id)
     if groups is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return groups
@@ -166,7 +171,7 @@ async def create_group(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    group = svc.create_group(tournament_id, account_id, body)
+    group = await aio(svc).create_group(tournament_id, account_id, body)
     if group is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return group
@@ -180,7 +185,7 @@ async def update_group(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    result = svc.update_group(tournament_id, account_id, group_id, body)
+    result = await aio(svc).update_group(tournament_id, account_id, group_id, body)
     if result is None:
         raise HTTPException(status_code=404, detail="Group not found")
     return result
@@ -193,7 +198,7 @@ async def delete_group(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    if not svc.delete_group(tournament_id, account_id, group_id):
+    if not await aio(svc).delete_group(tournament_id, account_id, group_id):
         raise HTTPException(status_code=404, detail="Group not found")
     return {"deleted": group_id}
 
@@ -206,7 +211,7 @@ async def assign_team_to_group(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    result = svc.assign_team_to_group(tournament_id, account_id, group_id, body.team_id, body.seed)
+    result = await aio(svc).assign_team_to_group(tournament_id, account_id, group_id, body.team_id, body.seed)
     if result is None:
         raise HTTPException(status_code=404, detail="Tournament or group not found")
     return result
@@ -220,7 +225,7 @@ async def remove_team_from_group(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    if not svc.remove_team_from_group(tournament_id, account_id, group_id, team_id):
+    if not await aio(svc).remove_team_from_group(tournament_id, account_id, group_id, team_id):
         raise HTTPException(status_code=404, detail="Team not found in group")
     return {"removed": team_id}
 
@@ -234,15 +239,16 @@ async def group_standings(
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     s_svc: StandingsService = Depends(get_standings_service),
 ):
-    t = t_svc.get_tournament(tournament_id, account_id)
-    if not t:
-        raise HTTPException(status_code=404, detail="Tournament not found")
     # Use team table's group_id index — authoritative source set during team assignment
-    group_teams = team_svc.list_teams(tournament_id, group_id=group_id)
+    t, group_teams = await gather(
+        _require_tournament(t_svc, tournament_id, account_id, fields=_STANDINGS_FIELDS),
+        aio(team_svc).list_teams(tournament_id, group_id=group_id),
+    )
     group_team_ids = [tm["id"] for tm in group_teams]
-    return s_svc.get_standings(
+    return await aio(s_svc).get_standings(
         tournament_id, t.get("rules", {}),
-        group_id=group_id, group_team_ids=group_team_ids
+        group_id=group_id, group_team_ids=group_team_ids, teams=group_teams,
+        tiebreaker_order=t.get("tiebreaker_order"), version=t.get("version"),
     )
 
 
@@ -258,8 +264,8 @@ async def list_teams(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return svc.list_teams(tournament_id, group_id=group_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    return await aio(svc).list_teams(tournament_id, group_id=group_id)
 
 
 @router.post("/{tournament_id}/teams", dependencies=[Depends(ADMIN)])
@@ -270,8 +276,8 @@ async def create_team(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return svc.create_team(tournament_id, body)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    return await aio(svc).create_team(tournament_id, body)
 
 
 @router.get("/{tournament_id}/teams/{team_id}", dependencies=[Depends(ALL_ROLES_INCL_TEAM_OWNER)])
@@ -282,8 +288,8 @@ async def get_team(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    item = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    item = await aio(svc).get_team(team_id)
     if not item or item.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
     return item
@@ -298,11 +304,11 @@ async def update_team(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    return svc.update_team(team_id, body)
+    return await aio(svc).update_team(team_id, body)
 
 
 @router.delete("/{tournament_id}/teams/{team_id}", dependencies=[Depends(ADMIN)])
@@ -313,11 +319,11 @@ async def delete_team(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    svc.delete_team(team_id)
+    await aio(svc).delete_team(team_id)
     return {"deleted": team_id}
 
 
@@ -330,11 +336,11 @@ async def get_team_logo_upload_url(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    return svc.generate_logo_upload_url(team_id, account_id, body.filename, body.content_type)
+    return await aio(svc).generate_logo_upload_url(team_id, account_id, body.filename, body.content_type)
 
 
 @router.post("/{tournament_id}/teams/{team_id}/documents/upload-url", dependencies=[Depends(ADMIN)])
@@ -346,11 +352,11 @@ async def get_team_document_upload_url(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    return svc.generate_document_upload_url(team_id, account_id, body.doc_type, body.filename, body.content_type)
+    return await aio(svc).generate_document_upload_url(team_id, account_id, body.doc_type, body.filename, body.content_type)
 
 
 @router.post("/{tournament_id}/teams/{team_id}/documents", dependencies=[Depends(ADMIN)])
@@ -362,11 +368,11 @@ async def confirm_team_document(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    updated = svc.add_document(team_id, body.doc_type, body.name, body.key)
+    updated = await aio(svc).add_document(team_id, body.doc_type, body.name, body.key)
     if not updated:
         raise HTTPException(status_code=404, detail="Team not found")
     return updated
@@ -381,11 +387,11 @@ async def delete_team_document(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentTeamService = Depends(get_tournament_team_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_team(team_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_team(team_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Team not found")
-    updated = svc.remove_document(team_id, body.doc_type, body.key)
+    updated = await aio(svc).remove_document(team_id, body.doc_type, body.key)
     if not updated:
         raise HTTPException(status_code=404, detail="Team not found")
     return updated
@@ -404,8 +410,8 @@ async def list_players(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return svc.list_players(tournament_id, team_id=team_id, sort_by=sort)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    return await aio(svc).list_players(tournament_id, team_id=team_id, sort_by=sort)
 
 
 @router.post("/{tournament_id}/teams/{team_id}/players", dependencies=[Depends(ADMIN_OR_TEAM_OWNER)])
@@ -420,11 +426,11 @@ async def create_player(
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    if not team_svc.belongs_to_tournament(team_id, tournament_id):
+    await _check_tournament(t_svc, tournament_id, account_id)
+    if not await aio(team_svc).belongs_to_tournament(team_id, tournament_id):
         raise HTTPException(status_code=404, detail="Team not found in tournament")
     try:
-        return svc.create_player(
+        return await aio(svc).create_player(
             tournament_id, team_id, body,
             acting_user_id=user["sub"], acting_role=account_role,
         )
@@ -440,8 +446,8 @@ async def get_player(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    item = svc.get_player(player_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    item = await aio(svc).get_player(player_id)
     if not item or item.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Player not found")
     return item
@@ -458,12 +464,12 @@ async def update_player(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_player(player_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_player(player_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Player not found")
     try:
-        return svc.update_player(
+        return await aio(svc).update_player(
             player_id, body,
             acting_user_id=user["sub"], acting_role=account_role,
         )
@@ -482,12 +488,12 @@ async def get_player_avatar_upload_url(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_player(player_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_player(player_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Player not found")
     try:
-        return svc.generate_avatar_upload_url(
+        return await aio(svc).generate_avatar_upload_url(
             player_id, account_id, body.filename, body.content_type,
             acting_user_id=user["sub"], acting_role=account_role,
         )
@@ -505,12 +511,12 @@ async def delete_player(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentPlayerService = Depends(get_tournament_player_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_player(player_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_player(player_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Player not found")
     try:
-        svc.delete_player(player_id, acting_user_id=user["sub"], acting_role=account_role)
+        await aio(svc).delete_player(player_id, acting_user_id=user["sub"], acting_role=account_role)
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     return {"deleted": player_id}
@@ -534,8 +540,8 @@ async def list_matches(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentMatchService = Depends(get_match_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return svc.list_matches(
+    await _check_tournament(t_svc, tournament_id, account_id)
+    return await aio(svc).list_matches(
         tournament_id,
         matchweek=matchweek,
         status=status,
@@ -556,14 +562,18 @@ async def create_match(
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     svc: TournamentMatchService = Depends(get_match_service),
 ):
-    t = _require_tournament(t_svc, tournament_id, account_id)
     # Validate both teams belong to tournament
-    if not team_svc.belongs_to_tournament(body.home_team_id, tournament_id):
+    t, home_ok, away_ok = await gather(
+        _require_tournament(t_svc, tournament_id, account_id, fields=["type"]),
+        aio(team_svc).belongs_to_tournament(body.home_team_id, tournament_id),
+        aio(team_svc).belongs_to_tournament(body.away_team_id, tournament_id),
+    )
+    if not home_ok:
         raise HTTPException(status_code=400, detail="Home team not in tournament")
-    if not team_svc.belongs_to_tournament(body.away_team_id, tournament_id):
+    if not away_ok:
         raise HTTPException(status_code=400, detail="Away team not in tournament")
     try:
-        return svc.create_match(tournament_id, body, t.get("type", "league"))
+        return await aio(svc).create_match(tournament_id, body, t.get("type", "league"))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -577,98 +587,29 @@ async def get_match(
     svc: TournamentMatchService = Depends(get_match_service),
     ev_svc: TournamentMatchEventService = Depends(get_match_event_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    item = svc.get_match(match_id)
+    _, item, events = await gather(
+        _check_tournament(t_svc, tournament_id, account_id),
+        aio(svc).get_match(match_id),
+        aio(ev_svc).list_events(match_id),
+    )
     if not item or item.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Match not found")
-    item["events"] = ev_svc.list_events(match_id)
+    item["events"] = events
     return item
 
 
-# Card event types that trigger charges
-_YELLOW_TYPES = {"yellow_card"}
-_RED_TYPES = {"red_card", "second_yellow"}
-
-
-def _create_card_charges(
+def _charge_finished_match(
+    charge_svc: TournamentChargeService,
     match: dict,
     tournament: dict,
-    ev_svc: TournamentMatchEventService,
-    team_svc: TournamentTeamService,
-    pr_svc: PaymentRequestService,
     account_id: str,
 ) -> None:
-    """Create one payment-request charge per card event on a finished match.
-
-    Silently skips teams with no contact_email and events with a zero fee.
-    """
-    from datetime import datetime, timedelta
-
-    rules = tournament.get("rules") or {}
-    yellow_fee = int(rules.get("yellow_card_fee") or 0)
-    red_fee = int(rules.get("red_card_fee") or 0)
-
-    if yellow_fee == 0 and red_fee == 0:
-        return
-
-    events = ev_svc.list_events(match["id"])
-    card_events = [
-        ev for ev in events
-        if ev.get("type") in (_YELLOW_TYPES | _RED_TYPES)
-    ]
-    if not card_events:
-        return
-
-    today = datetime.utcnow().date().isoformat()
-    due = (datetime.utcnow() + timedelta(days=30)).date().isoformat()
-    tournament_name = tournament.get("name", "Torneo")
-    tournament_id = tournament.get("id", "")
-
-    # Pre-fetch teams (at most two per match)
-    team_cache: dict[str, dict] = {}
-    for team_id in {ev.get("team_id") for ev in card_events if ev.get("team_id")}:
-        team = team_svc.get_team(team_id)
-        if team:
-            team_cache[team_id] = team
-
-    for ev in card_events:
-        team_id = ev.get("team_id")
-        team = team_cache.get(team_id)
-        if not team:
-            continue
-        contact_email = (team.get("contact_email") or "").strip()
-        if not contact_email:
-            continue
-
-        ev_type = ev.get("type")
-        is_red = ev_type in _RED_TYPES
-        fee = red_fee if is_red else yellow_fee
-        if fee == 0:
-            continue
-
-        card_label = "Tarjeta Roja" if is_red else "Tarjeta Amarilla"
-        recipient_name = team.get("manager_name") or team.get("name", "Equipo")
-
-        home_team = team_cache.get(match.get("home_team_id", ""))
-        away_team = team_cache.get(match.get("away_team_id", ""))
-        home_name = (home_team or {}).get("name") or match.get("home_team_id", "")
-        away_name = (away_team or {}).get("name") or match.get("away_team_id", "")
-
-        bulk_item = BulkPutPaymentRequest(
-            createDate=today,
-            dueDate=due,
-            concept=f"{card_label} - {tournament_name}",
-            description=f"Partido {match.get('date', '')[:10]}: {home_name} vs {away_name}",
-            category="tournament_fine",
-            group=tournament_id,
-            paymentRequestTo=[{"id": team_id, "name": recipient_name, "email": contact_email}],
-            userPrice=fee,
-            reference=ev["id"],
-        )
-        try:
-            pr_svc.bulk_create(bulk_item, account_id)
-        except Exception as exc:
-            print(f"[tournament] failed to create charge for team {team_id} event {ev.get('id')}: {exc}")
+    """Card charges for a match that just finished. Never fails the PATCH —
+    problems are logged and the match update stands."""
+    try:
+        charge_svc.charge_match(tournament, match, account_id)
+    except Exception as exc:
+        print(f"[tournament] failed to create card charges for match {match.get('id')}: {exc}")
 
 
 @router.patch("/{tournament_id}/matches/{match_id}", dependencies=[Depends(ADMIN)])
@@ -679,16 +620,18 @@ async def update_match(
     account_id: str = Depends(get_account_id),
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentMatchService = Depends(get_match_service),
-    ev_svc: TournamentMatchEventService = Depends(get_match_event_service),
-    team_svc: TournamentTeamService = Depends(get_tournament_team_service),
-    pr_svc: PaymentRequestService = Depends(get_payment_request_service),
+    charge_svc: TournamentChargeService = Depends(get_tournament_charge_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_match(match_id)
+    tournament, existing = await gather(
+        _require_tournament(t_svc, tournament_id, account_id),
+        aio(svc).get_match(match_id),
+    )
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Match not found")
     try:
-        result = svc.update_match(match_id, body)
+        result = await aio(svc).update_match(match_id, body)
+    except MatchStatusConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -697,15 +640,9 @@ async def update_match(
         body.status == "finished"
         and existing.get("status") != "finished"
     ):
-        tournament = t_svc.get_tournament(tournament_id, account_id)
-        if tournament and tournament.get("payments_enabled"):
-            _create_card_charges(
-                result or existing,
-                tournament,
-                ev_svc,
-                team_svc,
-                pr_svc,
-                account_id,
+        if tournament.get("payments_enabled"):
+            await run_sync(
+                _charge_finished_match, charge_svc, result or existing, tournament, account_id
             )
 
     return result
@@ -719,11 +656,11 @@ async def delete_match(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentMatchService = Depends(get_match_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    existing = svc.get_match(match_id)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    existing = await aio(svc).get_match(match_id)
     if not existing or existing.get("tournament_id") != tournament_id:
         raise HTTPException(status_code=404, detail="Match not found")
-    svc.delete_match(match_id)
+    await aio(svc).delete_match(match_id)
     return {"deleted": match_id}
 
 
@@ -740,55 +677,51 @@ async def generate_schedule(
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     svc: TournamentMatchService = Depends(get_match_service),
 ):
-    t = _require_tournament(t_svc, tournament_id, account_id)
+    t = await _require_tournament(t_svc, tournament_id, account_id)
     legs = t.get("rules", {}).get("legs", 2)
 
-    # For hybrid tournaments without a specific group, generate one round-robin
-    # per group so matches are never cross-group.
+    # For hybrid tournaments without a specific group, schedule every group
+    # in one pass so matches are never cross-group and groups sharing
+    # venues never clash. One team listing covers all groups.
     if t.get("type") == "hybrid" and not body.group_id:
-        groups = t.get("groups", [])
-        total_matches = 0
-        total_matchweeks = 0
-        for g in groups:
-            gid = g["id"]
-            group_teams = team_svc.list_teams(tournament_id, group_id=gid)
-            group_team_ids = [tm["id"] for tm in group_teams]
-            if len(group_team_ids) < 2:
-                continue
-            group_body = body.copy(update={"group_id": gid})
-            try:
-                result = svc.generate_schedule(tournament_id, group_team_ids, group_body, legs=legs)
-                total_matches += result["matches_created"]
-                total_matchweeks = max(total_matchweeks, result["matchweeks_generated"])
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-        if total_matches > 0:
-            rules_val = t.get("rules", {})
-            rules_val["total_matchweeks"] = total_matchweeks
-            
-            patch_data = {"rules": rules_val}
-            if t.get("current_matchweek", 0) == 0:
-                patch_data["current_matchweek"] = 1
-                
-            t_svc.update_tournament(tournament_id, account_id, PatchTournament(**patch_data))
-            
-        return {"matches_created": total_matches, "matchweeks_generated": total_matchweeks}
-
-    teams = team_svc.list_teams(tournament_id, group_id=body.group_id)
-    team_ids = [tm["id"] for tm in teams]
-    try:
-        result = svc.generate_schedule(tournament_id, team_ids, body, legs=legs)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        teams, tournament_groups = await gather(
+            aio(team_svc).list_teams(tournament_id),
+            aio(t_svc).get_groups(tournament_id),
+        )
+        team_ids_by_group: dict[str, list[str]] = {}
+        for tm in teams:
+            team_ids_by_group.setdefault(tm.get("group_id"), []).append(tm["id"])
+        groups = [
+            (g["id"], team_ids_by_group.get(g["id"], []))
+            for g in tournament_groups
+            if len(team_ids_by_group.get(g["id"], [])) >= 2
+        ]
+        if not groups:
+            return {"matches_created": 0, "matchweeks_generated": 0}
+        try:
+            result = await aio(svc).generate_group_schedules(tournament_id, groups, body, legs=legs)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        teams = await aio(team_svc).list_teams(tournament_id, group_id=body.group_id)
+        team_ids = [tm["id"] for tm in teams]
+        try:
+            result = await aio(svc).generate_schedule(tournament_id, team_ids, body, legs=legs)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if body.dry_run or not result["matches_created"]:
+        return result
+
     rules_val = t.get("rules", {})
     rules_val["total_matchweeks"] = result["matchweeks_generated"]
-    
+
     patch_data = {"rules": rules_val}
     if t.get("current_matchweek", 0) == 0:
         patch_data["current_matchweek"] = 1
-        
-    t_svc.update_tournament(tournament_id, account_id, PatchTournament(**patch_data))
-    
+
+    await aio(t_svc).update_tournament(tournament_id, account_id, PatchTournament(**patch_data))
+
     return result
 
 
@@ -799,7 +732,7 @@ async def generate_bracket(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    result = svc.generate_bracket(tournament_id, account_id, body)
+    result = await aio(svc).generate_bracket(tournament_id, account_id, body)
     if result is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return result
@@ -813,8 +746,8 @@ async def bulk_create_matches(
     t_svc: TournamentService = Depends(get_tournament_service),
     svc: TournamentMatchService = Depends(get_match_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return svc.bulk_create(tournament_id, body)
+    await _check_tournament(t_svc, tournament_id, account_id)
+    return await aio(svc).bulk_create(tournament_id, body)
 
 
 # ╔══════════════════════════════════════════════════════════════════════╗
@@ -828,7 +761,7 @@ async def create_event(
     svc: TournamentMatchEventService = Depends(get_match_event_service),
 ):
     try:
-        return svc.create_event(match_id, body)
+        return await aio(svc).create_event(match_id, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -841,7 +774,7 @@ async def update_event(
     svc: TournamentMatchEventService = Depends(get_match_event_service),
 ):
     try:
-        result = svc.update_event(event_id, body)
+        result = await aio(svc).update_event(event_id, body)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not result:
@@ -856,7 +789,7 @@ async def delete_event(
     svc: TournamentMatchEventService = Depends(get_match_event_service),
 ):
     try:
-        deleted = svc.delete_event(event_id)
+        deleted = await aio(svc).delete_event(event_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not deleted:
@@ -876,12 +809,20 @@ async def tournament_standings(
     team_svc: TournamentTeamService = Depends(get_tournament_team_service),
     s_svc: StandingsService = Depends(get_standings_service),
 ):
-    t = _require_tournament(t_svc, tournament_id, account_id)
-    groups = t.get("groups", [])
+    t, teams, groups = await gather(
+        _require_tournament(t_svc, tournament_id, account_id, fields=_STANDINGS_FIELDS),
+        aio(team_svc).list_teams(tournament_id),
+        aio(t_svc).get_groups(tournament_id),
+    )
     if groups:
-        teams = team_svc.list_teams(tournament_id)
-        return s_svc.get_all_standings(tournament_id, t.get("rules", {}), groups, teams)
-    return s_svc.get_standings(tournament_id, t.get("rules", {}))
+        return await aio(s_svc).get_all_standings(
+            tournament_id, t.get("rules", {}), groups, teams,
+            tiebreaker_order=t.get("tiebreaker_order"), version=t.get("version"),
+        )
+    return await aio(s_svc).get_standings(
+        tournament_id, t.get("rules", {}), teams=teams,
+        tiebreaker_order=t.get("tiebreaker_order"), version=t.get("version"),
+    )
 
 
 # NOTE: group_standings is defined above in the Groups section (§2)
@@ -897,7 +838,7 @@ async def get_bracket(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    bracket = svc.get_bracket(tournament_id, account_id)
+    bracket = await aio(svc).get_bracket(tournament_id, account_id)
     if bracket is None:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return bracket
@@ -913,7 +854,7 @@ async def override_bracket(
     account_id: str = Depends(get_account_id),
     svc: TournamentService = Depends(get_tournament_service),
 ):
-    result = svc.update_bracket(tournament_id, account_id, body)
+    result = await aio(svc).update_bracket(tournament_id, account_id, body)
     if result is None:
         raise HTTPException(status_code=404, detail="Bracket round/slot not found")
     return result
@@ -928,7 +869,7 @@ async def advance_winner(
     svc: TournamentService = Depends(get_tournament_service),
 ):
     try:
-        result = svc.advance_winner(tournament_id, account_id, match_id, winner_team_id)
+        result = await aio(svc).advance_winner(tournament_id, account_id, match_id, winner_team_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if result is None:
@@ -947,12 +888,18 @@ async def tournament_stats(
     t_svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    t = _require_tournament(t_svc, tournament_id, account_id)
-    return stats_svc.get_stats(
+    t, teams, bracket = await gather(
+        _require_tournament(t_svc, tournament_id, account_id),
+        aio(stats_svc.team_repo).list_by_tournament(tournament_id),
+        aio(t_svc).get_bracket_rounds(tournament_id, ["final"]),
+    )
+    return await aio(stats_svc).get_stats(
         tournament_id,
         current_matchweek=t.get("current_matchweek", 0),
         total_matchweeks=t.get("rules", {}).get("total_matchweeks"),
         tournament=t,
+        teams=teams,
+        bracket=bracket,
     )
 
 
@@ -964,8 +911,31 @@ async def top_scorers(
     t_svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return stats_svc.get_top_scorers(tournament_id, limit=limit)
+    _, scorers = await gather(
+        _check_tournament(t_svc, tournament_id, account_id),
+        aio(stats_svc).get_top_scorers(tournament_id, limit=limit),
+    )
+    return scorers
+
+
+@router.get("/{tournament_id}/leaderboards/{board}", dependencies=[Depends(ALL_ROLES_INCL_TEAM_OWNER)])
+async def leaderboard(
+    tournament_id: str,
+    board: str,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
+    account_id: str = Depends(get_account_id),
+    t_svc: TournamentService = Depends(get_tournament_service),
+    stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
+):
+    try:
+        _, page = await gather(
+            _check_tournament(t_svc, tournament_id, account_id),
+            aio(stats_svc).get_leaderboard(tournament_id, board, limit=limit, cursor=cursor),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page
 
 
 @router.get("/{tournament_id}/team-discipline", dependencies=[Depends(ALL_ROLES_INCL_TEAM_OWNER)])
@@ -975,8 +945,11 @@ async def team_discipline(
     t_svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return stats_svc.get_team_discipline(tournament_id)
+    _, discipline = await gather(
+        _check_tournament(t_svc, tournament_id, account_id),
+        aio(stats_svc).get_team_discipline(tournament_id),
+    )
+    return discipline
 
 
 @router.get(
@@ -990,8 +963,11 @@ async def team_cards(
     t_svc: TournamentService = Depends(get_tournament_service),
     stats_svc: TournamentStatsService = Depends(get_tournament_stats_service),
 ):
-    _require_tournament(t_svc, tournament_id, account_id)
-    return stats_svc.get_team_cards(tournament_id, team_id)
+    _, cards = await gather(
+        _check_tournament(t_svc, tournament_id, account_id),
+        aio(stats_svc).get_team_cards(tournament_id, team_id),
+    )
+    return cards
 
 
 @router.post(
@@ -1006,29 +982,39 @@ async def recompute_stats(
     """Admin: rebuild materialized stats for a tournament from raw matches
     and events. Use when DDB items are missing or out-of-sync (e.g., for
     pre-materialization local data)."""
-    _require_tournament(t_svc, tournament_id, account_id)
-    from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
-    from repositories.tournament_match_repo_ddb import TournamentMatchRepo
-    from repositories.tournament_player_repo_ddb import TournamentPlayerRepo
-    from repositories.tournament_repo_ddb import TournamentRepo
-    from repositories.tournament_team_repo_ddb import TournamentTeamRepo
+    await _check_tournament(t_svc, tournament_id, account_id)
     from services.tournament_aggregator import recompute_tournament as _recompute
 
-    return _recompute(
+    return await run_sync(
+        _recompute,
         tournament_id,
-        match_repo=TournamentMatchRepo(),
-        event_repo=TournamentMatchEventRepo(),
-        team_repo=TournamentTeamRepo(),
-        player_repo=TournamentPlayerRepo(),
-        tournament_repo=TournamentRepo(),
+        match_repo=get_tournament_match_repo(),
+        event_repo=get_tournament_match_event_repo(),
+        team_repo=get_tournament_team_repo(),
+        player_repo=get_tournament_player_repo(),
+        tournament_repo=get_tournament_repo(),
     )
 
 
 # ── Helpers ──────────────────────────────────────────────────────────
 
-def _require_tournament(t_svc: TournamentService, tournament_id: str, account_id: str) -> dict:
-    """Fetch tournament and raise 404 if not found or wrong account."""
-    t = t_svc.get_tournament(tournament_id, account_id)
+# What the standings routes read off the tournament.
+_STANDINGS_FIELDS = ["rules", "tiebreaker_order", "version"]
+
+
+async def _require_tournament(
+    t_svc: TournamentService, tournament_id: str, account_id: str, fields: list[str] | None = None
+) -> dict:
+    """Fetch tournament (or just `fields` of it) and raise 404 if not
+    found or wrong account."""
+    t = await aio(t_svc).get_tournament(tournament_id, account_id, fields=fields)
     if not t:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return t
+
+
+async def _check_tournament(t_svc: TournamentService, tournament_id: str, account_id: str) -> None:
+    """404 unless the tournament exists in this account. Reads only
+    `account_id` — for routes that don't use the tournament itself."""
+    if not await aio(t_svc).owns_tournament(tournament_id, account_id):
+        raise HTTPException(status_code=404, detail="Tournament not found")
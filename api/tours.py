@@ -4,12 +4,16 @@ from api.schemas.files import FileSpec
 from services.tour_service import TourService
 from api.schemas.tours import PatchProperty, PutTour
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from core.concurrency import aio
 
 
 
 
 router = APIRouter(prefix="/tours", tags=["tours"])
 
+# Workspace guards only compare the tour's group — don't read its bookers.
+_WORKSPACE_FIELDS = ["user_group"]
+
 @router.get("", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
 async def list_tours(
     workspace_id: str | None = None,
@@ -17,7 +21,7 @@ async def list_tours(
     account_id: str = Depends(get_account_id),
     svc: TourService = Depends(get_tour_service)
     ):
-    items = svc.list_tours(account_id, group=workspace_id, tour_type=tour_type)
+    items = await aio(svc).list_tours(account_id, group=workspace_id, tour_type=tour_type)
     return items
 
 @router.post(
@@ -40,7 +44,7 @@ async def create_tour(
             detail="Tour group must match workspace_id"
         )
     
-    item = svc.create(put_tour, account_id)
+    item = await aio(svc).create(put_tour, account_id)
     return item
 
 @router.get("/{tour_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
@@ -49,7 +53,7 @@ async def get_tour(
     account_id: str = Depends(get_account_id),
     svc: TourService = Depends(get_tour_service)
 ):
-    item = svc.get(tour_id, account_id)
+    item = await aio(svc).get(tour_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     return item
@@ -67,7 +71,7 @@ async def update_tour(
 ):
     """Update a tour (requires workspace admin permission)"""
     # Fetch and verify tour exists
-    existing_item = svc.get(tour_id, account_id)
+    existing_item = await aio(svc).get(tour_id, account_id, fields=_WORKSPACE_FIELDS)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     
@@ -78,7 +82,7 @@ async def update_tour(
             detail=f"Tour does not belong to workspace {workspace_id}"
         )
     
-    svc.update(tour_id, account_id, put_tour)
+    await aio(svc).update(tour_id, account_id, put_tour)
     return {"updated_tour_id": tour_id}
 
 
@@ -99,7 +103,7 @@ async def delete_tour(
     Account admins automatically bypass workspace checks.
     """
     # Fetch tour and verify it exists
-    tour = svc.get(tour_id, account_id)
+    tour = await aio(svc).get(tour_id, account_id, fields=_WORKSPACE_FIELDS)
     if not tour:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     
@@ -111,7 +115,7 @@ async def delete_tour(
             detail=f"Tour does not belong to workspace {workspace_id}"
         )
     
-    svc.delete(tour_id, account_id)
+    await aio(svc).delete(tour_id, account_id)
     return {"deleted_tour_id": tour_id}
 
 
@@ -128,7 +132,7 @@ async def generate_tour_presigned_urls(
 ):
     """Generate presigned URLs for tour (requires workspace admin permission)"""
     # Fetch and verify tour exists
-    tour = svc.get(tour_id, account_id)
+    tour = await aio(svc).get(tour_id, account_id, fields=_WORKSPACE_FIELDS)
     if not tour:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     
@@ -140,7 +144,7 @@ async def generate_tour_presigned_urls(
         )
 
     try:
-        result = svc.generate_put_presigned_urls(tour_id=tour_id, account_id=account_id, files=files)
+        result = await aio(svc).generate_put_presigned_urls(tour_id=tour_id, account_id=account_id, files=files)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Error generating presigned URLs: {str(e)}")
 
@@ -159,7 +163,7 @@ async def add_tour_images(
 ):
     """Add images to tour (requires workspace admin permission)"""
     # Fetch and verify tour exists
-    tour = svc.get(tour_id, account_id)
+    tour = await aio(svc).get(tour_id, account_id, fields=_WORKSPACE_FIELDS)
     if not tour:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     
@@ -170,7 +174,7 @@ async def add_tour_images(
             detail=f"Tour does not belong to workspace {workspace_id}"
         )
     
-    added_images = svc.add_images(tour_id, account_id, file_names)
+    added_images = await aio(svc).add_images(tour_id, account_id, file_names)
     return {"added_images": added_images}
 
 @router.patch(
@@ -187,7 +191,7 @@ async def update_booker_property(
 ):
     """Update tour booker property (requires workspace admin permission)"""
     # Fetch and verify tour exists
-    existing_item = svc.get(tour_id, account_id)
+    existing_item = await aio(svc).get(tour_id, account_id, fields=_WORKSPACE_FIELDS)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"Tour {tour_id} not found")
     
@@ -198,5 +202,5 @@ async def update_booker_property(
             detail=f"Tour does not belong to workspace {workspace_id}"
         )
 
-    updated_bookers = svc.update_booker_property(tour_id, account_id, booker_id, patch_property)
+    updated_bookers = await aio(svc).update_booker_property(tour_id, account_id, booker_id, patch_property)
     return {"updated_booker_properties": updated_bookers}
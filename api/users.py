@@ -1,12 +1,13 @@
 from auth import get_current_user
 from api.schemas.files import FileSpec
-from di import get_user_service
+from di import get_user_service, get_tournament_repo, get_tournament_team_repo
 from auth import PermissionChecker, get_account_id
 from services.user_service import UserService
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from api.schemas.users import PutUser, CreateUser, PutUserAvatar, PutUserMetrics, PutTourPreferences
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
 from repositories.tournament_repo_ddb import TournamentRepo
+from core.concurrency import aio
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -15,8 +16,8 @@ router = APIRouter(prefix="/users", tags=["users"])
 def my_team_owner_teams(
     user: dict = Depends(get_current_user),
     account_id: str = Depends(get_account_id),
-    tt_repo: TournamentTeamRepo = Depends(lambda: TournamentTeamRepo()),
-    t_repo: TournamentRepo = Depends(lambda: TournamentRepo()),
+    tt_repo: TournamentTeamRepo = Depends(get_tournament_team_repo),
+    t_repo: TournamentRepo = Depends(get_tournament_repo),
 ):
     user_id = user["sub"]
     # Approach (a): fetch all tournaments for the account, then all teams under
@@ -42,8 +43,8 @@ def my_team_owner_teams(
 @router.get("/team-owners", dependencies=[Depends(PermissionChecker(["admin", "user"]))])
 def list_team_owner_teams(
     account_id: str = Depends(get_account_id),
-    tt_repo: TournamentTeamRepo = Depends(lambda: TournamentTeamRepo()),
-    t_repo: TournamentRepo = Depends(lambda: TournamentRepo()),
+    tt_repo: TournamentTeamRepo = Depends(get_tournament_team_repo),
+    t_repo: TournamentRepo = Depends(get_tournament_repo),
 ):
     """Bulk version of /me/team-owner/teams — every team's owner, for the Usuarios
     list on tournament accounts (team ownership lives on the team record, not the
@@ -76,7 +77,7 @@ async def list_users(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
     ):
-    items = svc.list_users(account_id, group=workspace_id, include_disabled=include_disabled)
+    items = await aio(svc).list_users(account_id, group=workspace_id, include_disabled=include_disabled)
     return {"users": items}
 
 @router.post("") 
@@ -88,7 +89,7 @@ async def create_user(
     Public endpoint for user registration.
     Creates user and initial membership in the specified account.
     """
-    item = svc.create(create_user)
+    item = await aio(svc).create(create_user)
     return item
 
 @router.get("/{user_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user', 'team_owner']))])
@@ -97,7 +98,7 @@ async def get_user(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    item = svc.get(user_id, account_id)
+    item = await aio(svc).get(user_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
     return item
@@ -109,10 +110,10 @@ async def update_user(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    existing_item = svc.get(user_id, account_id)
+    existing_item = await aio(svc).get(user_id, account_id)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-    svc.update(user_id, account_id, put_user)
+    await aio(svc).update(user_id, account_id, put_user)
     return {"updated_user_id": user_id}
 
 @router.delete("/{user_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
@@ -121,7 +122,7 @@ async def delete_user(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.delete(user_id, account_id)
+    await aio(svc).delete(user_id, account_id)
     return {"deleted_user_id": user_id}
 
 @router.put("/{user_id}/enable", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
@@ -130,7 +131,7 @@ async def enable_user(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.enable(user_id, account_id)
+    await aio(svc).enable(user_id, account_id)
     return {"enabled_user_id": user_id}
 
 @router.put("/{user_id}/disable", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
@@ -139,7 +140,7 @@ async def disable_user(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.disable(user_id, account_id)
+    await aio(svc).disable(user_id, account_id)
     return {"disabled_user_id": user_id}
 
 @router.get("/{user_id}/tour-preferences", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
@@ -148,7 +149,7 @@ async def get_tour_preferences(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    return svc.get_tour_preferences(user_id, account_id)
+    return await aio(svc).get_tour_preferences(user_id, account_id)
 
 @router.put("/{user_id}/tour-preferences", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
 async def mark_tour_seen(
@@ -157,7 +158,7 @@ async def mark_tour_seen(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.mark_tour_seen(user_id, account_id, body.tourKey)
+    await aio(svc).mark_tour_seen(user_id, account_id, body.tourKey)
     return {"updated": True}
 
 @router.put("/{user_id}/avatar", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
@@ -167,7 +168,7 @@ async def update_user_avatar_url(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    svc.update_user_avatar_url(user_id, account_id, user_avatar)
+    await aio(svc).update_user_avatar_url(user_id, account_id, user_avatar)
     return {"updated_avatar_url": user_avatar.avatar_url}
 
 @router.post("/{user_id}/generate-presigned-url", dependencies=[Depends(PermissionChecker(required_permissions=['user', 'admin']))])
@@ -178,7 +179,7 @@ async def generate_user_presigned_url(
     svc: UserService = Depends(get_user_service)
 ):
     try:
-        result = svc.generate_presigned_urls(user_id=user_id, account_id=account_id, files=files)
+        result = await aio(svc).generate_presigned_urls(user_id=user_id, account_id=account_id, files=files)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error generating presigned URLs: {str(e)}")
     return {"urls": result}
@@ -189,7 +190,7 @@ async def get_user_metrics(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    item = svc.get_user_metrics(user_id, account_id)
+    item = await aio(svc).get_user_metrics(user_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
     return item
@@ -201,10 +202,10 @@ async def update_user_metrics(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    existing_item = svc.get(user_id, account_id)
+    existing_item = await aio(svc).get(user_id, account_id)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"User {user_id} not found")
-    dict_metrics = svc.update_metrics(user_id, account_id, put_user_metrics)
+    dict_metrics = await aio(svc).update_metrics(user_id, account_id, put_user_metrics)
     return {"updated_metrics": dict_metrics}
 
 # TODO: This should be improved to use group/workspace context
@@ -214,6 +215,6 @@ async def get_late_arrives(
     account_id: str = Depends(get_account_id),
     svc: UserService = Depends(get_user_service)
 ):
-    items = svc.get_late_arrives(user_id, account_id)
+    items = await aio(svc).get_late_arrives(user_id, account_id)
     return items
     
\ No newline at end of file
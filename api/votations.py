@@ -11,6 +11,7 @@ from auth import (
 from di import get_votation_service
 from services.votation_service import VotationService
 from api.schemas.votations import CastVote, CreateVotation
+from core.concurrency import aio
 
 
 ADMIN = WorkspacePermissionChecker(required_permissions=["admin"])
@@ -33,10 +34,10 @@ async def preview_candidates(
     if period_type == "semester":
         if not start_date or not end_date:
             raise HTTPException(status_code=400, detail="start_date and end_date are required for semester preview")
-        return svc.preview_candidates(workspace_id, min_pct, account_id, start_date=start_date, end_date=end_date)
+        return await aio(svc).preview_candidates(workspace_id, min_pct, account_id, start_date=start_date, end_date=end_date)
     if not month:
         raise HTTPException(status_code=400, detail="month is required for month preview")
-    return svc.preview_candidates(workspace_id, min_pct, account_id, month=month)
+    return await aio(svc).preview_candidates(workspace_id, min_pct, account_id, month=month)
 
 
 @router.get("", dependencies=[Depends(ALL_ROLES)])
@@ -45,7 +46,7 @@ async def list_votations(
     account_id: str = Depends(get_account_id),
     svc: VotationService = Depends(get_votation_service),
 ):
-    return svc.list_votations(workspace_id, account_id)
+    return await aio(svc).list_votations(workspace_id, account_id)
 
 
 @router.post("", dependencies=[Depends(ADMIN)])
@@ -55,7 +56,7 @@ async def create_votation(
     user: dict = Depends(get_current_user),
     svc: VotationService = Depends(get_votation_service),
 ):
-    return svc.create_votation(
+    return await aio(svc).create_votation(
         workspace_id=body.workspace_id,
         min_pct=body.min_pct,
         candidates=[c.model_dump() for c in body.candidates],
@@ -74,7 +75,7 @@ async def get_votation(
     account_id: str = Depends(get_account_id),
     svc: VotationService = Depends(get_votation_service),
 ):
-    item = svc.get_votation(votation_id, account_id)
+    item = await aio(svc).get_votation(votation_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail="Votation not found")
     return item
@@ -89,7 +90,7 @@ async def cast_vote(
     svc: VotationService = Depends(get_votation_service),
 ):
     try:
-        return svc.cast_vote(
+        return await aio(svc).cast_vote(
             votation_id=votation_id,
             voter_id=user["sub"],
             candidate_id=body.candidate_id,
@@ -106,10 +107,10 @@ async def delete_votation(
     account_id: str = Depends(get_account_id),
     svc: VotationService = Depends(get_votation_service),
 ):
-    item = svc.get_votation(votation_id, account_id)
+    item = await aio(svc).get_votation(votation_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail="Votation not found")
-    svc.delete_votation(votation_id, workspace_id, account_id)
+    await aio(svc).delete_votation(votation_id, workspace_id, account_id)
     return {"deleted_votation_id": votation_id}
 
 
@@ -121,7 +122,7 @@ async def create_tiebreaker(
     user: dict = Depends(get_current_user),
     svc: VotationService = Depends(get_votation_service),
 ):
-    result = svc.create_tiebreaker(votation_id, workspace_id, account_id, user.get("sub", ""))
+    result = await aio(svc).create_tiebreaker(votation_id, workspace_id, account_id, user.get("sub", ""))
     if not result:
         raise HTTPException(status_code=400, detail="Cannot create tiebreaker: votation not in tied state or tiebreaker already exists")
     return result
@@ -133,7 +134,7 @@ async def close_votation(
     account_id: str = Depends(get_account_id),
     svc: VotationService = Depends(get_votation_service),
 ):
-    item = svc.close_votation(votation_id, account_id)
+    item = await aio(svc).close_votation(votation_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail="Votation not found or not open")
     return item
@@ -4,6 +4,7 @@ from auth import PermissionChecker, get_current_user, get_account_id, get_accoun
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from services.workspace_service import WorkspaceService
+from core.concurrency import aio
 
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 
@@ -14,7 +15,7 @@ async def list_workspaces(
     account_id: str = Depends(get_account_id),
     svc: WorkspaceService = Depends(get_workspace_service)
     ):
-    return svc.get_related(user, account_id)
+    return await aio(svc).get_related(user, account_id)
 
 @router.get("/all", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user', 'team_owner']))])
 async def list_all_workspaces(
@@ -22,7 +23,7 @@ async def list_all_workspaces(
     svc: WorkspaceService = Depends(get_workspace_service)
     ):
     """List ALL workspaces in the account (not filtered by membership)"""
-    return svc.list_workspaces(account_id)
+    return await aio(svc).list_workspaces(account_id)
 
 @router.post("", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
 async def create_workspace(
@@ -30,7 +31,7 @@ async def create_workspace(
     account_id: str = Depends(get_account_id),
     svc: WorkspaceService = Depends(get_workspace_service)
 ):
-    item = svc.create(create_workspace, account_id)
+    item = await aio(svc).create(create_workspace, account_id)
     return item
 
 @router.get("/{workspace_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin', 'user']))])
@@ -39,7 +40,7 @@ async def get_workspace(
     account_id: str = Depends(get_account_id),
     svc: WorkspaceService = Depends(get_workspace_service)
 ):
-    item = svc.get(workspace_id, account_id)
+    item = await aio(svc).get(workspace_id, account_id)
     if not item:
         raise HTTPException(status_code=404, detail=f"Workspace {workspace_id} not found")
     return item
@@ -51,10 +52,10 @@ async def update_workspace(
     account_id: str = Depends(get_account_id),
     svc: WorkspaceService = Depends(get_workspace_service)
 ):
-    existing_item = svc.get(workspace_id, account_id)
+    existing_item = await aio(svc).get(workspace_id, account_id)
     if not existing_item:
         raise HTTPException(status_code=404, detail=f"Workspace {workspace_id} not found")
-    svc.update(workspace_id, account_id, put_workspace)
+    await aio(svc).update(workspace_id, account_id, put_workspace)
     return {"updated_workspace_id": workspace_id}
 
 @router.delete("/{workspace_id}", dependencies=[Depends(PermissionChecker(required_permissions=['admin']))])
@@ -63,5 +64,5 @@ async def delete_workspace(
     account_id: str = Depends(get_account_id),
     svc: WorkspaceService = Depends(get_workspace_service)
 ):
-    svc.delete(workspace_id, account_id)
+    await aio(svc).delete(workspace_id, account_id)
     return {"deleted_workspace_id": workspace_id}
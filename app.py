@@ -28,6 +28,28 @@ from core.error_handlers import install_error_handlers
 from core.logging_config import configure_logging
 from core.request_context import RequestContextMiddleware
 from utils.env_utils import _use_mangum
+from di import get_notification_outbox
+from starlette.background import BackgroundTask
+
+async def deliver_notifications(request, call_next):
+    """Deliver the notification intents a request recorded once its
+    response has gone out (`OUTBOX_WORKER=request`, see
+    services.notification_outbox). Mangum runs background tasks before
+    the invocation ends, so they aren't frozen with the container."""
+    outbox = get_notification_outbox()
+    with outbox.request_scope() as intents:
+        response = await call_next(request)
+    if intents:
+        previous = response.background
+        deliver = BackgroundTask(outbox.deliver, list(intents))
+        if previous is None:
+            response.background = deliver
+        else:
+            async def both() -> None:
+                await previous()
+                await deliver()
+            response.background = BackgroundTask(both)
+    return response
 
 def create_app() -> FastAPI:
     configure_logging()
@@ -47,9 +69,11 @@ def create_app() -> FastAPI:
         allow_origins=origins,
         allow_credentials=True,
         allow_methods=["*"],
-        allow_headers=["*"]
+        allow_headers=["*"],
+        expose_headers=["X-Failed-Recipients"],
     )
     app.add_middleware(RequestContextMiddleware)
+    app.middleware("http")(deliver_notifications)
     install_error_handlers(app)
     
     app.include_router(payments_router)
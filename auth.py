@@ -1,24 +1,22 @@
 import os
 
-import requests
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, Header, Query
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_401_UNAUTHORIZED
 from typing import Optional
 
-from JWTBearer import JWKS, JWTBearer, JWTAuthorizationCredentials
+from JWTBearer import JWTBearer, JWTAuthorizationCredentials
+from core.concurrency import aio
 
 load_dotenv()
 
-jwks = JWKS.parse_obj(
-    requests.get(
-        f"https://cognito-idp.us-west-2.amazonaws.com/{os.environ.get('USER_POOL_ID')}/.well-known/jwks.json",
-        headers={"x-api-key": os.environ.get("USER_POOL_API_CLIENT_ID")},
-    ).json()
+# JWKS is fetched lazily on the first authenticated request (and again on
+# key rotation) instead of blocking module import / cold start.
+auth = JWTBearer(
+    jwks_url=f"https://cognito-idp.us-west-2.amazonaws.com/{os.environ.get('USER_POOL_ID')}/.well-known/jwks.json",
+    jwks_headers={"x-api-key": os.environ.get("USER_POOL_API_CLIENT_ID")},
 )
 
-auth = JWTBearer(jwks)
-
 async def get_current_user(
     credentials: JWTAuthorizationCredentials = Depends(auth)
 ) -> dict:
@@ -44,12 +42,13 @@ async def get_user_accounts(
             - account_ids: list of account IDs user belongs to
             - accounts_roles: dict mapping account_id to role
             - user_id: user's ID from token
+            - memberships: the active membership rows (account, workspace, role)
     """
     user_id = credentials.claims.get('sub')
     if not user_id:
         raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="No user ID in token")
     
-    memberships = membership_service.get_user_memberships(user_id)
+    memberships = await aio(membership_service).get_user_memberships(user_id)
     
     if not memberships:
         raise HTTPException(
@@ -64,7 +63,8 @@ async def get_user_accounts(
     return {
         'account_ids': account_ids,
         'accounts_roles': accounts_roles,
-        'user_id': user_id
+        'user_id': user_id,
+        'memberships': memberships,
     }
 
 async def get_account_id(
@@ -132,17 +132,18 @@ async def get_workspace_id(
 
 async def get_workspace_role(
     workspace_id: Optional[str] = Depends(get_workspace_id),
-    user: dict = Depends(get_current_user),
     account_id: str = Depends(get_account_id),
-    membership_service: MembershipService = Depends(get_membership_service)
+    user_accounts: dict = Depends(get_user_accounts)
 ) -> Optional[str]:
     """Get user's role in the specified workspace
     
+    Derived from the memberships `get_user_accounts` already loaded for
+    this request — no extra DynamoDB query.
+    
     Args:
         workspace_id: Workspace ID from query parameter
-        user: Current authenticated user
         account_id: Current account ID
-        membership_service: Membership service for role lookup
+        user_accounts: User's account membership info
         
     Returns:
         User's role in the workspace, or None if workspace_id not provided
@@ -153,9 +154,9 @@ async def get_workspace_role(
     if not workspace_id:
         return None
     
-    role = membership_service.get_user_role_in_workspace(
-        user["sub"], 
-        account_id, 
+    role = MembershipService.role_in_workspace(
+        user_accounts['memberships'],
+        account_id,
         workspace_id
     )
     
@@ -0,0 +1,152 @@
+"""Async offload for the synchronous boto3 data path.
+
+Repositories and services are plain synchronous code (boto3 has no native
+asyncio support and aiobotocore isn't in our Lambda bundle). Routers are
+`async def`, so calling a repo directly from them blocks the event loop for
+the whole DynamoDB/S3 round-trip and stalls every other in-flight request
+on the worker.
+
+`run_sync` pushes a blocking call onto a bounded thread pool and awaits
+it; `aio(obj)` wraps a repository or service so every method call becomes
+awaitable:
+
+    item = await aio(svc).get_match(match_id)
+
+The pool size is `IO_THREADPOOL_SIZE` (default 32). boto3 clients and
+resources are thread-safe for request calls, so the process-wide repos from
+`di.py` can be shared across the pool.
+
+Independent calls should not be issued one after another. Routers await
+several of them at once with `gather`; services (which are synchronous and
+usually already running on the I/O pool) use `fan_out` / `fan_map`, which
+run on a separate fan-out pool so a service never waits on a slot of the
+pool it is occupying. Both cap the calls in flight per fan-out at
+`FANOUT_LIMIT` (default 8) so one request can't monopolise the pools.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+FANOUT_LIMIT = int(os.getenv("FANOUT_LIMIT", "8"))
+
+_io_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("IO_THREADPOOL_SIZE", "32")),
+    thread_name_prefix="io",
+)
+_fanout_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FANOUT_THREADPOOL_SIZE", "32")),
+    thread_name_prefix="fanout",
+)
+_fanout_worker = threading.local()
+
+
+async def run_sync(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the I/O pool without blocking the loop.
+
+    The caller's contextvars (request id, request-scoped dependencies) are
+    propagated into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(_io_executor, call)
+
+
+class AsyncProxy:
+    """Awaitable view over a synchronous object.
+
+    Callable attributes are returned as coroutine functions that run on the
+    I/O pool; anything else (e.g. `svc.repo`) is returned unchanged.
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            return await run_sync(attr, *args, **kwargs)
+
+        return _call
+
+
+def aio(target: Any) -> Any:
+    """Shorthand for `AsyncProxy(target)`."""
+    return AsyncProxy(target)
+
+
+async def gather(*aws: Awaitable[Any], limit: int | None = None) -> list[Any]:
+    """Await independent coroutines concurrently, at most `limit` at a time.
+
+    Results come back in argument order. Unlike `asyncio.gather`, every
+    coroutine is allowed to finish and the first failure *in argument
+    order* is re-raised, so e.g. a 404 from the ownership check always
+    wins over one from a lookup issued alongside it.
+    """
+    sem = asyncio.Semaphore(limit or FANOUT_LIMIT)
+
+    async def _bounded(aw: Awaitable[Any]) -> Any:
+        async with sem:
+            return await aw
+
+    results = await asyncio.gather(*(_bounded(aw) for aw in aws), return_exceptions=True)
+    for r in results:
+        if isinstance(r, BaseException):
+            raise r
+    return list(results)
+
+
+def _run_as_fanout_worker(ctx: contextvars.Context, fn: Callable[[], Any]) -> Any:
+    _fanout_worker.active = True
+    try:
+        return ctx.run(fn)
+    finally:
+        _fanout_worker.active = False
+
+
+def fan_out(*calls: Callable[[], Any], limit: int | None = None) -> list[Any]:
+    """Run independent blocking zero-arg callables concurrently.
+
+    Synchronous counterpart of `gather` for service code. Results come back
+    in argument order; the first failure in argument order is re-raised
+    once every call has settled. Nested fan-outs (a call that itself fans
+    out) run inline rather than queueing behind their parent.
+    """
+    if len(calls) <= 1 or getattr(_fanout_worker, "active", False):
+        return [c() for c in calls]
+
+    limit = limit or FANOUT_LIMIT
+    futures: list[Future] = []
+    pending: set[Future] = set()
+    for call in calls:
+        if len(pending) >= limit:
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        fut = _fanout_executor.submit(_run_as_fanout_worker, contextvars.copy_context(), call)
+        futures.append(fut)
+        pending.add(fut)
+    wait(pending)
+
+    for fut in futures:
+        exc = fut.exception()
+        if exc is not None:
+            raise exc
+    return [fut.result() for fut in futures]
+
+
+def fan_map(fn: Callable[[T], R], items: Iterable[T], limit: int | None = None) -> list[R]:
+    """`fan_out` over `fn(item)` for each item, results in item order."""
+    return fan_out(*(functools.partial(fn, item) for item in items), limit=limit)
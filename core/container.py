@@ -0,0 +1,109 @@
+"""Process-wide dependency container.
+
+`di.py` registers one factory per dependency together with its lifetime:
+
+- SINGLETON: built once per process (i.e. once per warm Lambda container)
+  and shared by every request. Use for boto3 clients/resources, repositories
+  and stateless services.
+- REQUEST: built once per HTTP request and discarded when it ends. Scoped
+  through `request_scope()`, which `RequestContextMiddleware` opens around
+  every request. Outside of a scope it behaves like TRANSIENT.
+- TRANSIENT: built on every resolve.
+
+Tests swap implementations with `container.override(key, instance)` (a
+context manager) instead of patching `di.py`.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Iterator
+
+
+class Lifetime(str, Enum):
+    SINGLETON = "singleton"
+    REQUEST = "request"
+    TRANSIENT = "transient"
+
+
+_request_instances: ContextVar[dict[str, Any] | None] = ContextVar("_request_instances", default=None)
+
+
+class Container:
+    def __init__(self) -> None:
+        self._factories: dict[str, tuple[Callable[[], Any], Lifetime]] = {}
+        self._singletons: dict[str, Any] = {}
+        self._overrides: dict[str, Any] = {}
+        # RLock: singleton factories resolve their own singleton dependencies.
+        self._lock = threading.RLock()
+
+    def register(self, key: str, factory: Callable[[], Any], lifetime: Lifetime = Lifetime.SINGLETON) -> None:
+        with self._lock:
+            self._factories[key] = (factory, lifetime)
+            self._singletons.pop(key, None)
+
+    def resolve(self, key: str) -> Any:
+        if key in self._overrides:
+            return self._overrides[key]
+        try:
+            factory, lifetime = self._factories[key]
+        except KeyError:
+            raise KeyError(f"No dependency registered for '{key}'") from None
+
+        if lifetime == Lifetime.SINGLETON:
+            if key in self._singletons:
+                return self._singletons[key]
+            with self._lock:
+                if key not in self._singletons:
+                    self._singletons[key] = factory()
+                return self._singletons[key]
+
+        if lifetime == Lifetime.REQUEST:
+            scope = _request_instances.get()
+            if scope is None:
+                return factory()
+            if key not in scope:
+                scope[key] = factory()
+            return scope[key]
+
+        return factory()
+
+    def provider(self, key: str) -> Callable[[], Any]:
+        """Zero-arg callable resolving `key` — usable as a FastAPI dependency."""
+        def _provide() -> Any:
+            return self.resolve(key)
+        _provide.__name__ = f"provide_{key}"
+        return _provide
+
+    @contextmanager
+    def override(self, key: str, instance: Any) -> Iterator[Any]:
+        """Temporarily replace `key` with `instance` (test hook)."""
+        previous = self._overrides.get(key, _MISSING)
+        self._overrides[key] = instance
+        try:
+            yield instance
+        finally:
+            if previous is _MISSING:
+                self._overrides.pop(key, None)
+            else:
+                self._overrides[key] = previous
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        token = _request_instances.set({})
+        try:
+            yield
+        finally:
+            _request_instances.reset(token)
+
+    def reset(self) -> None:
+        """Drop every cached singleton and override (tests / env changes)."""
+        with self._lock:
+            self._singletons.clear()
+            self._overrides.clear()
+
+
+_MISSING = object()
+
+container = Container()
@@ -0,0 +1,157 @@
+"""Shared HTTP transport for outbound API calls (Courier, OneSignal).
+
+A single `requests.Session` per process (per warm Lambda container), so
+calls to the same host reuse keep-alive connections from the adapter's
+pool instead of paying a TCP + TLS handshake each time. On top of it:
+
+- timeouts on every call (`HTTP_CONNECT_TIMEOUT` / `HTTP_READ_TIMEOUT`);
+- retries of connection errors, timeouts and 429/5xx responses, up to
+  `HTTP_MAX_RETRIES`, with exponential backoff and full jitter. Only safe
+  to retry what the remote side de-duplicates, so callers send an
+  idempotency key with their POSTs. Other 4xx responses are permanent
+  (`is_permanent`) and are not retried here or by the outbox;
+- a circuit breaker per host: after `HTTP_BREAKER_THRESHOLD` consecutive
+  failed calls the host is skipped (`CircuitOpenError`, no network) for
+  `HTTP_BREAKER_RESET_SECONDS`, then one trial call decides whether it
+  closes again. A provider outage then costs nothing per notification,
+  and the outbox retries the intents later.
+
+Base URLs are the callers' (e.g. `COURIER_BASE_URL`, `ONESIGNAL_API_URL`),
+so the senders can be pointed at a local stub server.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_permanent(exc: BaseException) -> bool:
+    """True for an HTTP error that retrying won't fix: a 4xx other than
+    429 (bad payload, bad credentials, unknown recipient, ...)."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return isinstance(exc, requests.HTTPError) and status is not None and 400 <= status < 500 and status != 429
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure breaker (closed → open → half-open)."""
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    def before_call(self, host: str) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_seconds or self._trial:
+                raise CircuitOpenError(host, max(self.reset_seconds - waited, 0))
+            # Half-open: let a single trial call through.
+            self._trial = True
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+class HttpTransport:
+    def __init__(
+        self,
+        *,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        max_retries: int | None = None,
+        breaker_threshold: int | None = None,
+        breaker_reset_seconds: float | None = None,
+        pool_size: int | None = None,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+    ) -> None:
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05")),
+            read_timeout if read_timeout is not None else float(os.getenv("HTTP_READ_TIMEOUT", "10")),
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self._breaker_threshold = (
+            breaker_threshold if breaker_threshold is not None else int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+        )
+        self._breaker_reset = (
+            breaker_reset_seconds if breaker_reset_seconds is not None
+            else float(os.getenv("HTTP_BREAKER_RESET_SECONDS", "30"))
+        )
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        # Pool per host as large as the fan-out pool, so concurrent sends
+        # don't queue for (or discard) connections.
+        pool_size = pool_size or int(os.getenv("FANOUT_THREADPOOL_SIZE", "32"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self._breaker_threshold, self._breaker_reset)
+            return self._breakers[host]
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """`session.request` with the transport's timeout, retries and
+        breaker. Returns the final response (whatever its status); raises
+        CircuitOpenError, or the last connection error / timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        breaker = self.breaker(url)
+        breaker.before_call(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    breaker.record(False)
+                    raise
+            except requests.RequestException:
+                breaker.record(False)
+                raise
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    breaker.record(True)
+                    return resp
+                if attempt >= self.max_retries:
+                    breaker.record(False)
+                    return resp
+            attempt += 1
+            time.sleep(random.uniform(0, min(self._backoff_max, self._backoff_base * 2 ** attempt)))
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
@@ -6,6 +6,8 @@ from starlette.requests import Request
 from starlette.responses import Response
 from jose import jwt
 
+from core.container import container
+
 logger = logging.getLogger(__name__)
 REQUEST_ID_HEADER = "X-Request-ID"
 
@@ -41,7 +43,9 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         start = time.perf_counter()
 
         try:
-            response: Response = await call_next(request)
+            # Per-request dependencies (Lifetime.REQUEST) live for exactly this call.
+            with container.request_scope():
+                response: Response = await call_next(request)
         except Exception:
             logger.exception(
                 "Unhandled exception pre-handler",
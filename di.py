@@ -1,3 +1,4 @@
+import logging
 import os
 import boto3
 from repositories.cognito_idp_actions import CognitoIdentityProviderWrapper
@@ -10,6 +11,8 @@ from repositories.user_repo_ddb import UserRepo
 from services.calendar_service import CalendarService
 from repositories.calendar_repo_ddb import CalendarRepo
 from services.notification_orchestator import Notifications
+from services.notification_outbox import InMemoryOutboxStore, NotificationOutbox
+from repositories.outbox_repo_ddb import OutboxRepo
 from services.payment_request_service import PaymentRequestService
 from repositories.payment_requests_repo_ddb import PaymentRequestsRepo
 from repositories.notifications.onesignal_impl import OneSignalNotificationSender
@@ -39,187 +42,362 @@ from services.tournament_match_service import TournamentMatchService
 from services.tournament_match_event_service import TournamentMatchEventService
 from services.standings_service import StandingsService
 from services.tournament_stats_service import TournamentStatsService
+from services.tournament_snapshot_service import TournamentSnapshotService
+from services.tournament_charge_service import TournamentChargeService
 from repositories.votation_repo_ddb import VotationRepo
 from services.votation_service import VotationService
 from services.tournament_invitation_service import TournamentInvitationService
 from repositories.tournament_invitation_repo_ddb import TournamentInvitationRepo
+from core.container import container
+from core.http_transport import HttpTransport
 
+logger = logging.getLogger(__name__)
 
-def get_notification_repo() -> NotificationRepo:
-    return NotificationRepo()
+# ── Clients & repositories ──────────────────────────────────────────
+# boto3 clients, third-party senders and repositories are stateless and
+# thread-safe, so they are built once per process (per warm Lambda
+# container) instead of on every request.
 
-def get_notification_orchestator() -> Notifications:
-    email_sender = CourierNotificationSender()
+def _build_cognito_wrapper() -> CognitoIdentityProviderWrapper:
+    return CognitoIdentityProviderWrapper(
+        boto3.client("cognito-idp"), os.environ.get("USER_POOL_ID"), os.environ.get("USER_POOL_API_CLIENT_ID")
+    )
+
+def _build_notification_orchestator() -> Notifications:
+    transport = get_http_transport()
+    email_sender = CourierNotificationSender(transport)
     # Tournaments live in their own Courier workspace — no fallback to the main token,
     # because routing tournament templates through the wrong workspace silently breaks email.
     tournaments_token = os.environ.get("COURIER_TOURNAMENTS_AUTH_TOKEN")
     tournaments_email_sender = (
-        CourierNotificationSender(auth_token=tournaments_token) if tournaments_token else None
+        CourierNotificationSender(transport, auth_token=tournaments_token) if tournaments_token else None
     )
-    repo = get_notification_repo()
-    in_app_sender = DdbInAppSender(repo=repo, onesignal=OneSignalNotificationSender())
+    in_app_sender = DdbInAppSender(repo=get_notification_repo(), onesignal=OneSignalNotificationSender(transport))
     return Notifications(
         email_sender=email_sender,
         in_app_sender=in_app_sender,
         tournaments_email_sender=tournaments_email_sender,
     )
 
+def _build_notification_outbox() -> NotificationOutbox:
+    if os.environ.get("NOTIFICATION_OUTBOX_TABLE_NAME"):
+        return NotificationOutbox(OutboxRepo(), get_notification_orchestator())
+    # Without a table (local development) intents live in process memory. On
+    # Lambda that can't outlive the invocation, so deliver them within it.
+    worker = None
+    if "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+        logger.warning("NOTIFICATION_OUTBOX_TABLE_NAME not set; notifications are not retried across invocations")
+        worker = "request"
+    return NotificationOutbox(InMemoryOutboxStore(), get_notification_orchestator(), worker=worker)
+
+container.register("http_transport", HttpTransport)
+container.register("s3_adapter", S3Adapter)
+container.register("cognito_wrapper", _build_cognito_wrapper)
+container.register("notification_repo", NotificationRepo)
+container.register("notifications", _build_notification_orchestator)
+container.register("notification_outbox", _build_notification_outbox)
+container.register("tour_repo", TourRepo)
+container.register("user_repo", UserRepo)
+container.register("calendar_repo", CalendarRepo)
+container.register("payment_requests_repo", PaymentRequestsRepo)
+container.register("workspace_repo", WorkspaceRepo)
+container.register("product_repo", ProductRepo)
+container.register("order_repo", OrderRepo)
+container.register("membership_repo", MembershipRepo)
+container.register("account_repo", AccountRepo)
+container.register("file_repo", FileRepo)
+container.register("votation_repo", VotationRepo)
+container.register("tournament_repo", TournamentRepo)
+container.register("tournament_team_repo", TournamentTeamRepo)
+container.register("tournament_player_repo", TournamentPlayerRepo)
+container.register("tournament_match_repo", TournamentMatchRepo)
+container.register("tournament_match_event_repo", TournamentMatchEventRepo)
+container.register("tournament_invitation_repo", TournamentInvitationRepo)
+
+
+def get_http_transport() -> HttpTransport:
+    return container.resolve("http_transport")
+
+def get_notification_repo() -> NotificationRepo:
+    return container.resolve("notification_repo")
+
+def get_notification_orchestator() -> Notifications:
+    return container.resolve("notifications")
+
+def get_notification_outbox() -> NotificationOutbox:
+    return container.resolve("notification_outbox")
+
 def get_cognito_wrapper() -> CognitoIdentityProviderWrapper:
-    return CognitoIdentityProviderWrapper(
-        boto3.client("cognito-idp"), os.environ.get("USER_POOL_ID"), os.environ.get("USER_POOL_API_CLIENT_ID")
-    )
+    return container.resolve("cognito_wrapper")
 
-def get_payment_request_service() -> PaymentRequestService:
+def get_s3_adapter() -> S3Adapter:
+    return container.resolve("s3_adapter")
+
+def get_tournament_repo() -> TournamentRepo:
+    return container.resolve("tournament_repo")
+
+def get_tournament_team_repo() -> TournamentTeamRepo:
+    return container.resolve("tournament_team_repo")
+
+def get_tournament_player_repo() -> TournamentPlayerRepo:
+    return container.resolve("tournament_player_repo")
+
+def get_tournament_match_repo() -> TournamentMatchRepo:
+    return container.resolve("tournament_match_repo")
+
+def get_tournament_match_event_repo() -> TournamentMatchEventRepo:
+    return container.resolve("tournament_match_event_repo")
+
+
+# ── Services ────────────────────────────────────────────────────────
+# Services only hold references to repositories/clients, so they are
+# process-wide singletons as well.
+
+def _build_payment_request_service() -> PaymentRequestService:
     return PaymentRequestService(
-        PaymentRequestsRepo(),
-        S3Adapter(),
+        container.resolve("payment_requests_repo"),
+        get_s3_adapter(),
         get_notification_orchestator(),
-        order_repo=OrderRepo(),
+        order_repo=container.resolve("order_repo"),
+        outbox=get_notification_outbox(),
     )
 
-def get_tournament_invitation_service() -> TournamentInvitationService | None:
+def _build_tournament_invitation_service() -> TournamentInvitationService | None:
     if not os.environ.get("TOURNAMENT_INVITATION_TABLE_NAME"):
         return None
     return TournamentInvitationService(
-        invitation_repo=TournamentInvitationRepo(),
-        tournament_repo=TournamentRepo(),
-        tournament_team_repo=TournamentTeamRepo(),
-        account_repo=AccountRepo(),
+        invitation_repo=container.resolve("tournament_invitation_repo"),
+        tournament_repo=container.resolve("tournament_repo"),
+        tournament_team_repo=container.resolve("tournament_team_repo"),
+        account_repo=container.resolve("account_repo"),
         membership_svc=get_membership_service(),
         cognito_wrapper=get_cognito_wrapper(),
         notifications=get_notification_orchestator(),
-        user_repo=UserRepo(),
+        user_repo=container.resolve("user_repo"),
     )
 
-def get_calendar_service() -> CalendarService:
-    repo = CalendarRepo()
-    s3 = S3Adapter()
-    tour_svc = get_tour_service()
-    user_svc = get_user_service()
-    return CalendarService(repo, s3, get_notification_orchestator(), tour_svc=tour_svc, user_svc=user_svc)
+def _build_calendar_service() -> CalendarService:
+    return CalendarService(
+        container.resolve("calendar_repo"),
+        get_s3_adapter(),
+        get_notification_orchestator(),
+        tour_svc=get_tour_service(),
+        user_svc=get_user_service(),
+        outbox=get_notification_outbox(),
+    )
 
-def get_tour_service() -> TourService:
-    repo = TourRepo()
-    s3 = S3Adapter()
-    return TourService(repo, s3, get_notification_orchestator())
+def _build_tour_service() -> TourService:
+    return TourService(container.resolve("tour_repo"), get_s3_adapter(), get_notification_orchestator())
 
-def get_user_service() -> UserService:
-    repo = UserRepo()
-    s3 = S3Adapter()
-    cog_wrapper = get_cognito_wrapper()
-    tour_svc = get_tour_service()
-    membership_svc = get_membership_service()
+def _build_user_service() -> UserService:
     # Pass getter function to avoid circular dependency for account_service
     return UserService(
-        repo, 
-        s3, 
-        get_notification_orchestator(), 
-        cog_wrapper, 
-        tour_svc=tour_svc, 
-        membership_svc=membership_svc, 
+        container.resolve("user_repo"),
+        get_s3_adapter(),
+        get_notification_orchestator(),
+        get_cognito_wrapper(),
+        tour_svc=get_tour_service(),
+        membership_svc=get_membership_service(),
         get_account_svc=get_account_service
     )
 
-def get_workspace_service() -> WorkspaceService:
-    repo = WorkspaceRepo()
-    membership_svc = get_membership_service()
-    return WorkspaceService(repo, membership_svc=membership_svc)
-
+def _build_workspace_service() -> WorkspaceService:
+    return WorkspaceService(container.resolve("workspace_repo"), membership_svc=get_membership_service())
 
-def get_product_service() -> ProductService:
-    repo = ProductRepo()
-    s3 = S3Adapter()
-    return ProductService(repo, s3)
+def _build_product_service() -> ProductService:
+    return ProductService(container.resolve("product_repo"), get_s3_adapter())
 
-def get_order_service() -> OrderService:
+def _build_order_service() -> OrderService:
     return OrderService(
-        OrderRepo(),
+        container.resolve("order_repo"),
         get_payment_request_service(),
         get_notification_orchestator(),
     )
 
+def _build_membership_service() -> MembershipService:
+    return MembershipService(container.resolve("membership_repo"))
+
+def _build_account_service() -> AccountService:
+    return AccountService(container.resolve("account_repo"), get_membership_service())
+
+def _build_file_service() -> FileService:
+    return FileService(container.resolve("file_repo"), get_s3_adapter())
+
+def _build_votation_service() -> VotationService:
+    return VotationService(
+        container.resolve("votation_repo"),
+        container.resolve("tour_repo"),
+        get_user_service(),
+        get_notification_orchestator(),
+        outbox=get_notification_outbox(),
+    )
+
+container.register("payment_request_service", _build_payment_request_service)
+container.register("tournament_invitation_service", _build_tournament_invitation_service)
+container.register("calendar_service", _build_calendar_service)
+container.register("tour_service", _build_tour_service)
+container.register("user_service", _build_user_service)
+container.register("workspace_service", _build_workspace_service)
+container.register("product_service", _build_product_service)
+container.register("order_service", _build_order_service)
+container.register("membership_service", _build_membership_service)
+container.register("account_service", _build_account_service)
+container.register("file_service", _build_file_service)
+container.register("votation_service", _build_votation_service)
+
+
+def get_payment_request_service() -> PaymentRequestService:
+    return container.resolve("payment_request_service")
+
+def get_tournament_invitation_service() -> TournamentInvitationService | None:
+    return container.resolve("tournament_invitation_service")
+
+def get_calendar_service() -> CalendarService:
+    return container.resolve("calendar_service")
+
+def get_tour_service() -> TourService:
+    return container.resolve("tour_service")
+
+def get_user_service() -> UserService:
+    return container.resolve("user_service")
+
+def get_workspace_service() -> WorkspaceService:
+    return container.resolve("workspace_service")
+
+def get_product_service() -> ProductService:
+    return container.resolve("product_service")
+
+def get_order_service() -> OrderService:
+    return container.resolve("order_service")
+
 def get_membership_service() -> MembershipService:
-    repo = MembershipRepo()
-    return MembershipService(repo)
+    return container.resolve("membership_service")
 
-def get_account_service():
-    repo = AccountRepo()
-    membership_svc = get_membership_service()
-    return AccountService(repo, membership_svc)
+def get_account_service() -> AccountService:
+    return container.resolve("account_service")
 
 def get_file_service() -> FileService:
-    repo = FileRepo()
-    s3 = S3Adapter()
-    return FileService(repo, s3)
+    return container.resolve("file_service")
+
+def get_votation_service() -> VotationService:
+    return container.resolve("votation_service")
+
 
 # ── Tournament domain ───────────────────────────────────────────────
-def get_tournament_service() -> TournamentService:
-    repo = TournamentRepo()
-    match_repo = TournamentMatchRepo()
-    team_repo = TournamentTeamRepo()
-    standings_svc = StandingsService(match_repo, team_repo=team_repo)
-    from repositories.s3_adapter import S3Adapter
-    return TournamentService(repo, standings_service=standings_svc, team_repo=team_repo, match_repo=match_repo, s3=S3Adapter())
+def _build_standings_service() -> StandingsService:
+    return StandingsService(
+        container.resolve("tournament_match_repo"),
+        team_repo=container.resolve("tournament_team_repo"),
+    )
 
-def get_tournament_team_service() -> TournamentTeamService:
-    repo = TournamentTeamRepo()
-    tournament_repo = TournamentRepo()
-    from repositories.s3_adapter import S3Adapter
+def _build_tournament_service() -> TournamentService:
+    return TournamentService(
+        container.resolve("tournament_repo"),
+        standings_service=get_standings_service(),
+        team_repo=container.resolve("tournament_team_repo"),
+        match_repo=container.resolve("tournament_match_repo"),
+        s3=get_s3_adapter(),
+    )
+
+def _build_tournament_team_service() -> TournamentTeamService:
     return TournamentTeamService(
-        repo,
-        tournament_repo=tournament_repo,
-        s3=S3Adapter(),
+        container.resolve("tournament_team_repo"),
+        tournament_repo=container.resolve("tournament_repo"),
+        s3=get_s3_adapter(),
         notifications=get_notification_orchestator(),
         invitation_svc=get_tournament_invitation_service(),
     )
 
-def get_tournament_player_service() -> TournamentPlayerService:
-    repo = TournamentPlayerRepo()
-    match_repo = TournamentMatchRepo()
-    event_repo = TournamentMatchEventRepo()
-    from repositories.s3_adapter import S3Adapter
-    return TournamentPlayerService(repo, match_repo, event_repo, s3=S3Adapter(), team_repo=TournamentTeamRepo())
+def _build_tournament_player_service() -> TournamentPlayerService:
+    return TournamentPlayerService(
+        container.resolve("tournament_player_repo"),
+        container.resolve("tournament_match_repo"),
+        container.resolve("tournament_match_event_repo"),
+        s3=get_s3_adapter(),
+        team_repo=container.resolve("tournament_team_repo"),
+        tournament_repo=container.resolve("tournament_repo"),
+    )
 
-def get_match_service() -> TournamentMatchService:
-    repo = TournamentMatchRepo()
-    event_repo = TournamentMatchEventRepo()
-    team_repo = TournamentTeamRepo()
-    tournament_repo = TournamentRepo()
+def _build_match_service() -> TournamentMatchService:
     return TournamentMatchService(
-        repo,
-        event_repo,
-        team_repo=team_repo,
-        tournament_repo=tournament_repo,
+        container.resolve("tournament_match_repo"),
+        container.resolve("tournament_match_event_repo"),
+        team_repo=container.resolve("tournament_team_repo"),
+        tournament_repo=container.resolve("tournament_repo"),
     )
 
-def get_match_event_service() -> TournamentMatchEventService:
-    repo = TournamentMatchEventRepo()
-    match_repo = TournamentMatchRepo()
-    team_repo = TournamentTeamRepo()
-    player_repo = TournamentPlayerRepo()
-    tournament_repo = TournamentRepo()
+def _build_match_event_service() -> TournamentMatchEventService:
     return TournamentMatchEventService(
-        repo,
-        match_repo=match_repo,
-        team_repo=team_repo,
-        player_repo=player_repo,
-        tournament_repo=tournament_repo,
+        container.resolve("tournament_match_event_repo"),
+        match_repo=container.resolve("tournament_match_repo"),
+        team_repo=container.resolve("tournament_team_repo"),
+        player_repo=container.resolve("tournament_player_repo"),
+        tournament_repo=container.resolve("tournament_repo"),
     )
 
-def get_standings_service() -> StandingsService:
-    match_repo = TournamentMatchRepo()
-    team_repo = TournamentTeamRepo()
-    return StandingsService(match_repo, team_repo=team_repo)
+def _build_tournament_stats_service() -> TournamentStatsService:
+    return TournamentStatsService(
+        container.resolve("tournament_match_repo"),
+        container.resolve("tournament_match_event_repo"),
+        container.resolve("tournament_team_repo"),
+        container.resolve("tournament_player_repo"),
+    )
 
-def get_votation_service() -> VotationService:
-    repo = VotationRepo()
-    tour_repo = TourRepo()
-    return VotationService(repo, tour_repo, get_user_service(), get_notification_orchestator())
+def _build_tournament_snapshot_service() -> TournamentSnapshotService:
+    return TournamentSnapshotService(
+        get_tournament_service(),
+        get_tournament_team_service(),
+        get_tournament_player_service(),
+        get_match_service(),
+        get_standings_service(),
+        get_tournament_stats_service(),
+        s3=get_s3_adapter(),
+    )
+
+def _build_tournament_charge_service() -> TournamentChargeService:
+    return TournamentChargeService(
+        container.resolve("tournament_match_event_repo"),
+        container.resolve("tournament_team_repo"),
+        container.resolve("tournament_player_repo"),
+        container.resolve("user_repo"),
+        get_account_service(),
+        get_payment_request_service(),
+    )
+
+container.register("standings_service", _build_standings_service)
+container.register("tournament_service", _build_tournament_service)
+container.register("tournament_team_service", _build_tournament_team_service)
+container.register("tournament_player_service", _build_tournament_player_service)
+container.register("match_service", _build_match_service)
+container.register("match_event_service", _build_match_event_service)
+container.register("tournament_stats_service", _build_tournament_stats_service)
+container.register("tournament_snapshot_service", _build_tournament_snapshot_service)
+container.register("tournament_charge_service", _build_tournament_charge_service)
+
+
+def get_tournament_service() -> TournamentService:
+    return container.resolve("tournament_service")
+
+def get_tournament_team_service() -> TournamentTeamService:
+    return container.resolve("tournament_team_service")
+
+def get_tournament_player_service() -> TournamentPlayerService:
+    return container.resolve("tournament_player_service")
+
+def get_match_service() -> TournamentMatchService:
+    return container.resolve("match_service")
+
+def get_match_event_service() -> TournamentMatchEventService:
+    return container.resolve("match_event_service")
 
+def get_standings_service() -> StandingsService:
+    return container.resolve("standings_service")
 
 def get_tournament_stats_service() -> TournamentStatsService:
-    match_repo = TournamentMatchRepo()
-    event_repo = TournamentMatchEventRepo()
-    team_repo = TournamentTeamRepo()
-    player_repo = TournamentPlayerRepo()
-    return TournamentStatsService(match_repo, event_repo, team_repo, player_repo)
\ No newline at end of file
+    return container.resolve("tournament_stats_service")
+
+def get_tournament_snapshot_service() -> TournamentSnapshotService:
+    return container.resolve("tournament_snapshot_service")
+
+def get_tournament_charge_service() -> TournamentChargeService:
+    return container.resolve("tournament_charge_service")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Migration: Stamp tournament_id on existing match events
+
+Match events used to carry only `match_id`, so every tournament-wide read
+(recompute, card drill-downs) had to query events one match at a time. New
+events are written with their match's `tournament_id` and are reachable
+through the event table's `tournament_index` GSI
+(`TournamentMatchEventRepo.list_by_tournament`); this script backfills the
+events written before that.
+
+Also removes `team_id` / `tournament_id` attributes stored as NULL — a GSI
+key can't be NULL, so those rows would otherwise be rejected by (or left
+out of) the `team_index` / `tournament_index` GSIs.
+
+Scans the MatchEvent table for events without a tournament_id, resolves it
+from the Match table and updates them in place. Idempotent — re-running
+after a partial/failed run only touches events still missing the field.
+Events whose match no longer exists are reported and left alone.
+
+Once every event is stamped, the tournaments involved are flagged
+`events_indexed`; until then `recompute_tournament` lists their events
+match by match instead of from the index.
+
+Create the GSIs (partition key `tournament_id` / `team_id`, projection ALL;
+names from EVENT_TOURNAMENT_GSI / EVENT_TEAM_GSI) before running this.
+
+Usage:
+    source .venv/bin/activate
+    python migrations/backfill_event_tournament_id.py                  # Dry-run
+    python migrations/backfill_event_tournament_id.py --execute        # Apply
+    python migrations/backfill_event_tournament_id.py --tournament-id X  # Scope to one tournament
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+from repositories.ddb_session import (  # noqa: E402
+    tournament_match_event_table,
+    tournament_match_table,
+    tournament_table,
+)
+
+
+def _scan_all(table, **kwargs) -> list[dict]:
+    items: list[dict] = []
+    start_key = None
+    while True:
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key:
+            break
+    return items
+
+
+def run(tournament_id: str | None, execute: bool) -> None:
+    event_table = tournament_match_event_table()
+    match_table = tournament_match_table()
+
+    match_filter = Attr("tournament_id").eq(tournament_id) if tournament_id else None
+    match_kwargs = {
+        "ProjectionExpression": "#id, tournament_id",
+        "ExpressionAttributeNames": {"#id": "id"},
+    }
+    if match_filter is not None:
+        match_kwargs["FilterExpression"] = match_filter
+    match_to_tournament = {
+        m["id"]: m.get("tournament_id") for m in _scan_all(match_table, **match_kwargs)
+    }
+    print(f"Loaded {len(match_to_tournament)} match(es)"
+          + (f" for tournament {tournament_id}" if tournament_id else " across all tournaments"))
+
+    events = _scan_all(
+        event_table,
+        FilterExpression=(
+            Attr("tournament_id").not_exists()
+            | Attr("tournament_id").attribute_type("NULL")
+            | Attr("team_id").attribute_type("NULL")
+        ),
+    )
+
+    to_update: list[tuple[str, str | None, bool]] = []  # (event_id, tournament_id to set, drop null team_id)
+    orphaned: list[str] = []
+    for ev in events:
+        match_id = ev.get("match_id")
+        if tournament_id and match_id not in match_to_tournament:
+            continue  # other tournament
+        needs_tournament = ev.get("tournament_id") is None
+        resolved = match_to_tournament.get(match_id) if needs_tournament else None
+        if needs_tournament and not resolved:
+            orphaned.append(ev["id"])
+            continue
+        drop_null_team = "team_id" in ev and ev["team_id"] is None
+        to_update.append((ev["id"], resolved, drop_null_team))
+
+    print(f"{len(to_update)} event(s) need an update; "
+          f"{len(orphaned)} skipped (match missing)")
+    for event_id, resolved, drop_null_team in to_update:
+        changes = []
+        if resolved:
+            changes.append(f"tournament_id -> {resolved!r}")
+        if drop_null_team:
+            changes.append("remove NULL team_id")
+        print(f"  {event_id}: {', '.join(changes)}")
+
+    if orphaned:
+        print(f"⚠️  Skipped (match not found): {orphaned}")
+
+    if not execute:
+        print("\n[DRY RUN] Run with --execute to apply.")
+        return
+
+    updated = 0
+    for event_id, resolved, drop_null_team in to_update:
+        set_parts, remove_parts, eav = [], [], {}
+        if resolved:
+            set_parts.append("tournament_id = :t")
+            eav[":t"] = resolved
+        if drop_null_team:
+            remove_parts.append("team_id")
+        expression = ""
+        if set_parts:
+            expression += "SET " + ", ".join(set_parts)
+        if remove_parts:
+            expression += " REMOVE " + ", ".join(remove_parts)
+        kwargs = {
+            "Key": {"id": event_id},
+            "UpdateExpression": expression.strip(),
+            # Skip events deleted since the scan.
+            "ConditionExpression": "attribute_exists(id)",
+        }
+        if eav:
+            kwargs["ExpressionAttributeValues"] = eav
+        try:
+            event_table.update_item(**kwargs)
+            updated += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    print(f"✅ Updated {updated} event(s)")
+
+    flagged = 0
+    tournament_table_ = tournament_table()
+    for tid in sorted({t for t in match_to_tournament.values() if t}):
+        try:
+            tournament_table_.update_item(
+                Key={"id": tid},
+                UpdateExpression="SET events_indexed = :t",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeValues={":t": True},
+            )
+            flagged += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    print(f"✅ Flagged {flagged} tournament(s) as events_indexed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Backfill tournament_id on match events from their match"
+    )
+    parser.add_argument("--tournament-id", help="Limit to a single tournament (default: all tournaments)")
+    parser.add_argument("--execute", action="store_true", help="Apply the updates (default: dry run)")
+    args = parser.parse_args()
+    run(args.tournament_id, args.execute)
+
+
+if __name__ == "__main__":
+    main()
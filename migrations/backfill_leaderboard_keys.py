@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Migration: Backfill leaderboard sort keys on teams and players
+
+Top scorers / assists / discipline are now read from sparse GSIs sorted by
+top-level `lb_*` attributes (see repositories/ddb_leaderboard.py), which
+every stats write keeps in step with the `stats` map. Items whose stats
+were written before that have no `lb_*` attributes and are invisible to
+the leaderboards; this script derives them from each item's `stats`.
+
+The write is conditioned on `stats` still being the map that was read, so
+an item scored on mid-run is reported and left for a re-run (its keys
+are already being maintained by then). Idempotent — re-running only
+touches items whose keys don't match their stats.
+
+Create the GSIs first (partition key `tournament_id` (S), sort key the
+`lb_*` attribute (N), projection ALL; names from PLAYER_GOALS_GSI,
+PLAYER_ASSISTS_GSI, PLAYER_CARDS_GSI and TEAM_CARDS_GSI).
+
+Usage:
+    source .venv/bin/activate
+    python migrations/backfill_leaderboard_keys.py                  # Dry-run
+    python migrations/backfill_leaderboard_keys.py --execute        # Apply
+    python migrations/backfill_leaderboard_keys.py --tournament-id X  # Scope to one tournament
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+from repositories.ddb_leaderboard import sort_key_values  # noqa: E402
+from repositories.tournament_player_repo_ddb import TournamentPlayerRepo  # noqa: E402
+from repositories.tournament_team_repo_ddb import TournamentTeamRepo  # noqa: E402
+
+
+def _scan_all(table, **kwargs) -> list[dict]:
+    items: list[dict] = []
+    start_key = None
+    while True:
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key:
+            break
+    return items
+
+
+def _pending(items: list[dict], boards: dict) -> list[tuple[dict, dict]]:
+    """(item, keys to set) for items whose stored keys are off."""
+    attributes = [b.attribute for b in boards.values()]
+    pending = []
+    for item in items:
+        target = sort_key_values(item.get("stats"), boards)
+        keys = {a: target.get(a, 0) for a in attributes}
+        if any((item.get(a) or 0) != v for a, v in keys.items()):
+            pending.append((item, keys))
+    return pending
+
+
+def _apply(table, item: dict, keys: dict) -> bool:
+    names = {f"#k{i}": a for i, a in enumerate(keys)}
+    values = {f":k{i}": v for i, v in enumerate(keys.values())}
+    try:
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression="SET " + ", ".join(f"#k{i} = :k{i}" for i in range(len(keys))),
+            ConditionExpression="#s = :stats",
+            ExpressionAttributeNames={**names, "#s": "stats"},
+            ExpressionAttributeValues={**values, ":stats": item["stats"]},
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        return False
+
+
+def run(tournament_id: str | None, execute: bool) -> None:
+    repos = {"team": TournamentTeamRepo(), "player": TournamentPlayerRepo()}
+    scan_filter = Attr("stats").exists()
+    if tournament_id:
+        scan_filter = scan_filter & Attr("tournament_id").eq(tournament_id)
+
+    work = {}
+    for kind, repo in repos.items():
+        items = _scan_all(repo._table, FilterExpression=scan_filter)
+        work[kind] = _pending(items, repo.leaderboards)
+        print(f"{len(items)} {kind}(s) with stats, {len(work[kind])} need leaderboard keys"
+              + (f" (scoped to {tournament_id})" if tournament_id else ""))
+        for item, keys in work[kind][:20]:
+            print(f"  {item['id']}: {keys}")
+
+    if not execute:
+        print("\n[DRY RUN] Run with --execute to apply.")
+        return
+
+    for kind, repo in repos.items():
+        updated, changed = 0, []
+        for item, keys in work[kind]:
+            if _apply(repo._table, item, keys):
+                updated += 1
+            else:
+                changed.append(item["id"])
+        print(f"✅ Updated {updated} {kind}(s)")
+        if changed:
+            print(f"⚠️  Stats changed during the run, re-run to check: {changed}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Backfill lb_* leaderboard sort keys from team/player stats"
+    )
+    parser.add_argument("--tournament-id", help="Limit to a single tournament (default: all tournaments)")
+    parser.add_argument("--execute", action="store_true", help="Apply the updates (default: dry run)")
+    args = parser.parse_args()
+    run(args.tournament_id, args.execute)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,12 @@ Usage (from jmanage-api/):
     source .venv/bin/activate
     python -m migrations.recompute_tournament_stats              # all tournaments
     python -m migrations.recompute_tournament_stats --id trn_xx  # one tournament
-    python -m migrations.recompute_tournament_stats --dry-run    # show what would run
+    python -m migrations.recompute_tournament_stats --dry-run    # show what would change
+    python -m migrations.recompute_tournament_stats --workers 8  # tournaments in parallel
+
+Tournaments are recomputed on a pool of `--workers` threads (each one
+also fans out its own reads), and only items whose stats actually changed
+are written.
 
 The HTTP endpoint POST /tournaments/{id}:recompute-stats does the same
 thing per-tournament but requires admin auth; this script bypasses HTTP
@@ -15,6 +20,8 @@ for local seeding.
 
 import argparse
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -43,6 +50,15 @@ def _list_all_tournament_ids(repo: TournamentRepo) -> list[str]:
     return ids
 
 
+def _format(summary: dict[str, int]) -> str:
+    return (
+        f"teams={summary['teams_updated']} (unchanged {summary['teams_unchanged']}), "
+        f"players={summary['players_updated']} (unchanged {summary['players_unchanged']}), "
+        f"matches={summary['matches_processed']}, "
+        f"events={summary['events_processed']}"
+    )
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Recompute tournament stats")
     parser.add_argument(
@@ -53,7 +69,13 @@ def main() -> int:
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="List tournaments that would be processed, but don't write.",
+        help="Recompute and report what would change, but don't write.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Tournaments recomputed concurrently (default 4).",
     )
     args = parser.parse_args()
 
@@ -72,45 +94,46 @@ def main() -> int:
         print("no tournaments found")
         return 0
 
-    print(f"recomputing {len(tournament_ids)} tournament(s)…")
-    totals = {"teams_updated": 0, "players_updated": 0, "events_processed": 0, "matches_processed": 0}
+    mode = " [dry-run]" if args.dry_run else ""
+    print(f"recomputing {len(tournament_ids)} tournament(s) with {args.workers} worker(s){mode}…")
+    totals = {
+        "teams_updated": 0, "players_updated": 0,
+        "teams_unchanged": 0, "players_unchanged": 0,
+        "tournament_updated": 0, "events_processed": 0, "matches_processed": 0,
+    }
     failures: list[tuple[str, str]] = []
-
-    for tid in tournament_ids:
-        if args.dry_run:
-            print(f"  [dry-run] {tid}")
-            continue
-        try:
-            summary = recompute_tournament(
-                tid,
-                match_repo=match_repo,
-                event_repo=event_repo,
-                team_repo=team_repo,
-                player_repo=player_repo,
-                tournament_repo=tournament_repo,
-            )
+    started = time.monotonic()
+    done = 0
+
+    def _recompute(tid: str) -> dict[str, int]:
+        return recompute_tournament(
+            tid,
+            match_repo=match_repo,
+            event_repo=event_repo,
+            team_repo=team_repo,
+            player_repo=player_repo,
+            tournament_repo=tournament_repo,
+            dry_run=args.dry_run,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(_recompute, tid): tid for tid in tournament_ids}
+        for future in as_completed(futures):
+            tid = futures[future]
+            done += 1
+            progress = f"[{done}/{len(tournament_ids)} {time.monotonic() - started:.1f}s]"
+            try:
+                summary = future.result()
+            except Exception as e:  # noqa: BLE001
+                failures.append((tid, str(e)))
+                print(f"  {progress} {tid}: FAILED — {e}")
+                continue
             for k, v in summary.items():
                 totals[k] = totals.get(k, 0) + v
-            print(
-                f"  {tid}: teams={summary['teams_updated']}, "
-                f"players={summary['players_updated']}, "
-                f"matches={summary['matches_processed']}, "
-                f"events={summary['events_processed']}"
-            )
-        except Exception as e:  # noqa: BLE001
-            failures.append((tid, str(e)))
-            print(f"  {tid}: FAILED — {e}")
-
-    if args.dry_run:
-        return 0
+            print(f"  {progress} {tid}: {_format(summary)}")
 
     print("---")
-    print(
-        f"done. totals: teams={totals['teams_updated']}, "
-        f"players={totals['players_updated']}, "
-        f"matches={totals['matches_processed']}, "
-        f"events={totals['events_processed']}"
-    )
+    print(f"done in {time.monotonic() - started:.1f}s{mode}. totals: {_format(totals)}")
     if failures:
         print(f"failures: {len(failures)}")
         for tid, err in failures:
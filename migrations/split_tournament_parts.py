@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Migration: Move embedded groups / bracket out of tournament items
+
+Tournament items used to embed `groups` (with their team lists) and
+`bracket` (plus `bracket_index`), so every ownership check read them and
+every group or bracket change rewrote the whole item. They now live in the
+TournamentParts table as an adjacency list under the tournament's id:
+
+    tournament_id = <id>, sk = GROUP#<group_id>   one item per group
+    tournament_id = <id>, sk = BRACKET            bracket + bracket_index
+
+This script copies each tournament's embedded groups / bracket into part
+items, then REMOVEs the attributes from the tournament item. The REMOVE is
+conditioned on the item's `version` being the one that was read, so a
+tournament written to mid-run is reported and left for a re-run.
+Part items are written with `attribute_not_exists(sk)` puts, so a group or
+bracket the app has already written to the parts table since the deploy
+is never overwritten with the stale embedded copy. Idempotent — re-running
+only touches tournaments still carrying embedded data.
+
+Create the table first (TOURNAMENT_PARTS_TABLE_NAME; partition key
+`tournament_id` (S), sort key `sk` (S)) and run this right after deploying.
+
+Usage:
+    source .venv/bin/activate
+    python migrations/split_tournament_parts.py                  # Dry-run
+    python migrations/split_tournament_parts.py --execute        # Apply
+    python migrations/split_tournament_parts.py --tournament-id X  # Scope to one tournament
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+from repositories.ddb_session import tournament_parts_table, tournament_table  # noqa: E402
+
+_EMBEDDED = ("groups", "bracket", "bracket_index")
+
+
+def _scan_all(table, **kwargs) -> list[dict]:
+    items: list[dict] = []
+    start_key = None
+    while True:
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        resp = table.scan(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key:
+            break
+    return items
+
+
+def _part_items(tournament: dict) -> list[dict]:
+    tid = tournament["id"]
+    items = [
+        {**group, "tournament_id": tid, "sk": f"GROUP#{group['id']}", "position": i}
+        for i, group in enumerate(tournament.get("groups") or [])
+    ]
+    if tournament.get("bracket"):
+        items.append({
+            "tournament_id": tid,
+            "sk": "BRACKET",
+            "bracket": tournament["bracket"],
+            "bracket_index": tournament.get("bracket_index") or {},
+        })
+    return items
+
+
+def _put_new(table, item: dict) -> bool:
+    """Put a part item unless one with its key exists; True if written."""
+    try:
+        table.put_item(Item=item, ConditionExpression="attribute_not_exists(sk)")
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        return False
+
+
+def run(tournament_id: str | None, execute: bool) -> None:
+    header_table = tournament_table()
+    parts_table = tournament_parts_table()
+
+    embedded = Attr(_EMBEDDED[0]).exists()
+    for name in _EMBEDDED[1:]:
+        embedded = embedded | Attr(name).exists()
+    if tournament_id:
+        embedded = Attr("id").eq(tournament_id) & embedded
+    tournaments = _scan_all(header_table, FilterExpression=embedded)
+    print(f"{len(tournaments)} tournament(s) with embedded groups/bracket"
+          + (f" (scoped to {tournament_id})" if tournament_id else ""))
+
+    for t in tournaments:
+        groups = t.get("groups") or []
+        teams = sum(len(g.get("teams") or []) for g in groups)
+        rounds = len(t.get("bracket") or {})
+        print(f"  {t['id']}: {len(groups)} group(s) / {teams} team entr(ies), "
+              f"{rounds} bracket round(s)")
+
+    if not execute:
+        print("\n[DRY RUN] Run with --execute to apply.")
+        return
+
+    moved, kept, changed = 0, 0, []
+    for t in tournaments:
+        for part in _part_items(t):
+            if not _put_new(parts_table, part):
+                kept += 1
+        present = [name for name in _EMBEDDED if name in t]
+        kwargs = {
+            "Key": {"id": t["id"]},
+            "UpdateExpression": "REMOVE " + ", ".join(f"#a{i}" for i in range(len(present))),
+            "ExpressionAttributeNames": {
+                **{f"#a{i}": name for i, name in enumerate(present)},
+                "#ver": "version",
+            },
+        }
+        if "version" in t:
+            kwargs["ConditionExpression"] = "#ver = :ver"
+            kwargs["ExpressionAttributeValues"] = {":ver": t["version"]}
+        else:
+            kwargs["ConditionExpression"] = "attribute_not_exists(#ver)"
+        try:
+            header_table.update_item(**kwargs)
+            moved += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            changed.append(t["id"])
+
+    print(f"✅ Moved {moved} tournament(s)")
+    if kept:
+        print(f"   Kept {kept} part item(s) already in the parts table")
+    if changed:
+        print(f"⚠️  Changed during the run, re-run to finish: {changed}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move embedded groups/bracket into the TournamentParts table"
+    )
+    parser.add_argument("--tournament-id", help="Limit to a single tournament (default: all tournaments)")
+    parser.add_argument("--execute", action="store_true", help="Apply the changes (default: dry run)")
+    args = parser.parse_args()
+    run(args.tournament_id, args.execute)
+
+
+if __name__ == "__main__":
+    main()
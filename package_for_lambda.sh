@@ -7,7 +7,7 @@ BUILD_DIR=".lambda_build"
 
 # Use space-separated strings (not arrays)
 SRC_DIRS="api builders core repositories services utils"
-ROOT_PY_FILES="app.py auth.py di.py JWTBearer.py"
+ROOT_PY_FILES="app.py auth.py di.py JWTBearer.py scheduled_handler.py"
 
 IMAGE="public.ecr.aws/sam/build-python3.12:latest"
 # Match your Lambda architecture: X86_64 -> linux/amd64, ARM_64 -> linux/arm64
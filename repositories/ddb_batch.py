@@ -0,0 +1,116 @@
+"""Chunked BatchWriteItem with retry of unprocessed items.
+
+`BatchWriteItem` takes at most 25 requests per call and may hand some of
+them back as `UnprocessedItems` when the table is throttled. `batch_put`
+splits a write into 25-item chunks, sends the chunks concurrently
+(bounded by FANOUT_LIMIT), and re-sends whatever comes back unprocessed
+with exponential backoff and jitter. Items still unprocessed after the
+last attempt raise `BatchWriteError` listing them, so callers can decide
+whether a partial write is acceptable.
+
+BatchWriteItem is not a transaction: chunks that succeeded stay written.
+
+`batch_get` is the read counterpart: 100-key BatchGetItem chunks, with
+`UnprocessedKeys` retried the same way.
+"""
+
+import random
+import time
+from typing import Any
+
+from core.concurrency import fan_map
+from .ddb_projection import projection
+from .ddb_session import dynamodb
+
+BATCH_SIZE = 25
+GET_BATCH_SIZE = 100
+_MAX_ATTEMPTS = 6
+_BASE_DELAY = 0.05
+_MAX_DELAY = 2.0
+
+
+class BatchWriteError(RuntimeError):
+    def __init__(self, table_name: str, unprocessed: list[dict[str, Any]]):
+        super().__init__(f"{len(unprocessed)} item(s) left unprocessed writing to {table_name}")
+        self.table_name = table_name
+        self.unprocessed = unprocessed
+
+
+class BatchGetError(RuntimeError):
+    def __init__(self, table_name: str, unprocessed: list[dict[str, Any]]):
+        super().__init__(f"{len(unprocessed)} key(s) left unprocessed reading {table_name}")
+        self.table_name = table_name
+        self.unprocessed = unprocessed
+
+
+def _backoff(attempt: int) -> None:
+    if attempt:
+        delay = min(_MAX_DELAY, _BASE_DELAY * (2 ** attempt))
+        time.sleep(random.uniform(0, delay))
+
+
+def _chunks(items: list[Any], size: int = BATCH_SIZE) -> list[list[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _write_chunk(table_name: str, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Send one chunk, retrying unprocessed requests. Returns the ones that
+    never went through."""
+    pending = requests
+    for attempt in range(_MAX_ATTEMPTS):
+        _backoff(attempt)
+        resp = dynamodb.batch_write_item(RequestItems={table_name: pending})
+        pending = (resp.get("UnprocessedItems") or {}).get(table_name) or []
+        if not pending:
+            return []
+    return pending
+
+
+def batch_write(table: Any, requests: list[dict[str, Any]], limit: int | None = None) -> None:
+    """Write `PutRequest` / `DeleteRequest` entries to `table`."""
+    if not requests:
+        return
+    leftovers = fan_map(
+        lambda chunk: _write_chunk(table.name, chunk), _chunks(requests), limit=limit
+    )
+    unprocessed = [r for chunk in leftovers for r in chunk]
+    if unprocessed:
+        raise BatchWriteError(table.name, unprocessed)
+
+
+def batch_put(table: Any, items: list[dict[str, Any]], limit: int | None = None) -> None:
+    """Put every item in `items` (plain Python values, as with `put_item`)."""
+    batch_write(table, [{"PutRequest": {"Item": item}} for item in items], limit=limit)
+
+
+def _get_chunk(table_name: str, keys: list[dict[str, Any]], extra: dict[str, Any]) -> list[dict[str, Any]]:
+    items: list[dict[str, Any]] = []
+    pending = keys
+    for attempt in range(_MAX_ATTEMPTS):
+        _backoff(attempt)
+        resp = dynamodb.batch_get_item(RequestItems={table_name: {"Keys": pending, **extra}})
+        items.extend((resp.get("Responses") or {}).get(table_name) or [])
+        pending = ((resp.get("UnprocessedKeys") or {}).get(table_name) or {}).get("Keys") or []
+        if not pending:
+            return items
+    raise BatchGetError(table_name, pending)
+
+
+def batch_get(
+    table: Any,
+    keys: list[dict[str, Any]],
+    fields: list[str] | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Items for `keys` (missing ones are simply absent, order is not
+    kept). `fields` projects as in `ddb_projection.projection`; include
+    the key attributes if the caller needs to match items back to keys."""
+    if not keys:
+        return []
+    extra = projection(fields)
+    found = fan_map(
+        lambda chunk: _get_chunk(table.name, chunk, extra),
+        _chunks(keys, GET_BATCH_SIZE),
+        limit=limit,
+    )
+    return [item for chunk in found for item in chunk]
@@ -0,0 +1,68 @@
+"""Opaque pagination cursors.
+
+Paged reads hand the client a cursor instead of a raw DynamoDB
+LastEvaluatedKey: base64url JSON of the key plus whatever the caller needs
+to resume (a rank offset, ...). Key numbers come back from boto3 as
+Decimal and are written as plain JSON numbers; decoding turns fractional
+numbers back into Decimal so the key can be passed straight to
+`ExclusiveStartKey`.
+
+`query_page` reads one page of at most `limit` matching items. With a
+FilterExpression a single Query may come back short, so it keeps reading
+until the page is full or the index is exhausted.
+"""
+
+import base64
+import binascii
+import json
+from decimal import Decimal
+from typing import Any
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_cursor(payload: dict[str, Any] | None) -> str | None:
+    if not payload:
+        return None
+    raw = json.dumps(payload, default=_plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> dict[str, Any] | None:
+    """Inverse of `encode_cursor`. Raises ValueError on a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw, parse_float=Decimal)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def query_page(
+    table: Any,
+    limit: int | None = None,
+    start_key: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Up to `limit` items of `table.query(**kwargs)` from `start_key`, and
+    the key to resume from (None once exhausted). Without `limit`, reads
+    every page."""
+    items: list[dict[str, Any]] = []
+    while True:
+        if limit is not None:
+            kwargs["Limit"] = limit - len(items)
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        resp = table.query(**kwargs)
+        items.extend(resp.get("Items", []))
+        start_key = resp.get("LastEvaluatedKey")
+        if not start_key or (limit is not None and len(items) >= limit):
+            return items, start_key
@@ -0,0 +1,83 @@
+"""Leaderboards as sorted indexes.
+
+A leaderboard is a top-level Number attribute on team / player items
+(`lb_goals`, `lb_cards`, ...) holding a weighted sum of `stats` counters,
+plus a GSI per leaderboard with partition key `tournament_id` and that
+attribute as sort key. Items only get the attribute once one of its
+counters moves, and reads ask for `> 0`, so the index is effectively
+sparse: a page of the top N is one Query returning N items, however many
+players the tournament has.
+
+Keeping them ordered costs no extra write: `StatsDelta.sort_keys` makes
+the `ADD` that moves the counters move the keys too, and full stats
+writes (recompute's `update_stats`) set them from `sort_key_values`. Items
+written before leaderboards existed are backfilled by
+`migrations/backfill_leaderboard_keys.py`.
+
+Pages are addressed by an opaque cursor (see `ddb_cursor`) holding the
+page's LastEvaluatedKey and the rank reached so far.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from boto3.dynamodb.conditions import Key
+
+from .ddb_cursor import query_page as cursor_query_page
+
+# Cards rank by total, then by reds: total * CARD_WEIGHT + reds, i.e. a
+# yellow weighs CARD_WEIGHT and a red CARD_WEIGHT + 1.
+CARD_WEIGHT = 10_000
+CARD_WEIGHTS = {"yellow_cards": CARD_WEIGHT, "red_cards": CARD_WEIGHT + 1}
+
+
+@dataclass
+class Leaderboard:
+    attribute: str
+    index: str
+    weights: dict[str, int]
+
+
+def sort_keys(boards: dict[str, Leaderboard]) -> dict[str, dict[str, int]]:
+    """`StatsDelta.sort_keys` for a repo's leaderboards."""
+    return {b.attribute: b.weights for b in boards.values()}
+
+
+def sort_key_values(stats: dict[str, Any] | None, boards: dict[str, Leaderboard]) -> dict[str, int]:
+    """Leaderboard attributes for an item holding `stats`; zero keys are
+    left out so the item stays off that index."""
+    values = {}
+    for b in boards.values():
+        value = sum(int((stats or {}).get(c) or 0) * w for c, w in b.weights.items())
+        if value:
+            values[b.attribute] = value
+    return values
+
+
+def with_sort_keys(item: dict[str, Any], boards: dict[str, Leaderboard]) -> dict[str, Any]:
+    """`item` with its leaderboard attributes recomputed from its `stats`
+    (for full-item writes)."""
+    if "stats" not in item:
+        return item
+    item = {k: v for k, v in item.items() if k not in {b.attribute for b in boards.values()}}
+    item.update(sort_key_values(item["stats"], boards))
+    return item
+
+
+def query_page(
+    table: Any,
+    board: Leaderboard,
+    tournament_id: str,
+    limit: int | None = None,
+    start_key: dict[str, Any] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """One page of `board`, highest first, and the key to resume from
+    (None on the last page). Without `limit`, reads to the end."""
+    return cursor_query_page(
+        table,
+        limit,
+        start_key,
+        IndexName=board.index,
+        KeyConditionExpression=Key("tournament_id").eq(tournament_id) & Key(board.attribute).gt(0),
+        ScanIndexForward=False,
+    )
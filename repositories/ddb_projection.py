@@ -0,0 +1,22 @@
+"""`ProjectionExpression` arguments for partial reads.
+
+Ownership checks and lookups that only need a couple of attributes pass
+`fields=[...]` to a repo's `get`, which reads just those attributes
+instead of the whole item (tours carry a `bookers` map, tournaments their
+stats, teams their rosters). Every name goes through a placeholder, so
+reserved words (`status`, `name`, ...) are fine.
+"""
+
+from typing import Any, Iterable
+
+
+def projection(fields: Iterable[str] | None) -> dict[str, Any]:
+    """`get_item` / `query` kwargs reading only `fields` (top-level
+    attributes); empty when `fields` is None, i.e. read everything."""
+    if fields is None:
+        return {}
+    names = {f"#p{i}": field for i, field in enumerate(dict.fromkeys(fields))}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
@@ -49,6 +49,10 @@ def tournament_table():
     return dynamodb.Table(os.getenv("TOURNAMENT_TABLE_NAME"))
 
 
+def tournament_parts_table():
+    return dynamodb.Table(os.getenv("TOURNAMENT_PARTS_TABLE_NAME"))
+
+
 def tournament_team_table():
     return dynamodb.Table(os.getenv("TOURNAMENT_TEAM_TABLE_NAME"))
 
@@ -69,6 +73,10 @@ def notification_table():
     return dynamodb.Table(os.getenv("NOTIFICATION_TABLE_NAME"))
 
 
+def notification_outbox_table():
+    return dynamodb.Table(os.getenv("NOTIFICATION_OUTBOX_TABLE_NAME"))
+
+
 def votation_table():
     return dynamodb.Table(os.getenv("VOTATION_TABLE_NAME"))
 
@@ -0,0 +1,345 @@
+"""Atomic writes for the materialized `stats` map on tournament items.
+
+Stats deltas (see `services.tournament_aggregator`) are applied with
+`ADD stats.<counter> :d` instead of get → merge → SET, so concurrent
+scorers never lose each other's updates and no read is needed first.
+
+- `StatsDelta` describes one item's delta. Repos build them via
+  `*Repo.stats_delta(id, delta)`.
+- `apply_stats_deltas` writes a batch of them: a single `UpdateItem` for
+  one item, one `TransactWriteItems` for several (so a goal lands on the
+  player, team and tournament together or not at all). Other writes that
+  must commit with the stats (e.g. the event itself, built with
+  `put_op` / `delete_op`) ride along in the same transaction.
+- `update_form` handles the `form` list, which can't be expressed as an
+  ADD: it rewrites the list conditioned on the value it read and retries
+  on conflict.
+- `StatsDelta.sort_keys` moves leaderboard sort keys (top-level weighted
+  sums of counters, see `ddb_leaderboard`) in the same `ADD`.
+
+Items created before stats were materialized have no `stats` map, and
+DynamoDB rejects `ADD stats.x` on a missing map. Every counter update is
+therefore conditioned on `attribute_exists(stats)`; on failure an empty
+map is seeded (ADD treats absent counters as 0, and readers already
+default missing keys) and the write is retried. Deltas for items that no
+longer exist are dropped rather than upserting a stats-only item.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+from .ddb_session import dynamodb
+
+FORM_WINDOW = 5
+_MAX_ATTEMPTS = 3
+
+_serializer = TypeSerializer()
+
+
+@dataclass
+class StatsDelta:
+    table: Any
+    item_id: str
+    delta: dict[str, Any]
+    # Also ADD 1 to the item's top-level `version` (tournament read-cache
+    # version, see TournamentRepo.bump_version) in the same write.
+    bump_version: bool = False
+    # Top-level attribute -> {counter: weight}; each attribute gets
+    # sum(weight * delta[counter]) added alongside the counters.
+    sort_keys: dict[str, dict[str, int]] | None = None
+
+
+# ── Expression building ────────────────────────────────────────────────
+
+
+def _counter(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _add_expression(
+    delta: dict[str, Any],
+    bump_version: bool = False,
+    sort_keys: dict[str, dict[str, int]] | None = None,
+) -> tuple[str, dict[str, str], dict[str, Any]] | None:
+    """`ADD #s.#a1 :a1, ...` for every non-zero numeric field in `delta`
+    (plus `version :one` and the moved `sort_keys` when asked). Returns
+    None when there is nothing to add."""
+    parts, ean, eav = [], {"#s": "stats"}, {}
+    if bump_version:
+        ean["#ver"] = "version"
+        eav[":one"] = 1
+        parts.append("#ver :one")
+    i = 0
+    for field, value in delta.items():
+        if not _counter(value) or value == 0:
+            continue
+        i += 1
+        ean[f"#a{i}"] = field
+        eav[f":a{i}"] = value
+        parts.append(f"#s.#a{i} :a{i}")
+    for j, (attribute, weights) in enumerate((sort_keys or {}).items(), start=1):
+        moved = sum(w * delta[c] for c, w in weights.items() if _counter(delta.get(c)))
+        if moved:
+            ean[f"#k{j}"] = attribute
+            eav[f":k{j}"] = moved
+            parts.append(f"#k{j} :k{j}")
+    if not parts:
+        return None
+    return "ADD " + ", ".join(parts), ean, eav
+
+
+def _serialize(values: dict[str, Any]) -> dict[str, Any]:
+    return {k: _serializer.serialize(v) for k, v in values.items()}
+
+
+def _merge(deltas: list[StatsDelta | None]) -> list[StatsDelta]:
+    """Fold deltas for the same item together — a transaction may touch
+    each item only once (e.g. reversing and re-applying an edited event
+    for the same player). Their `sort_keys` are unioned, so every
+    leaderboard key moves with the summed counters."""
+    merged: dict[tuple[str, str], StatsDelta] = {}
+    for d in deltas:
+        if d is None:
+            continue
+        key = (d.table.name, d.item_id)
+        if key not in merged:
+            merged[key] = StatsDelta(d.table, d.item_id, dict(d.delta), d.bump_version, dict(d.sort_keys or {}))
+            continue
+        merged[key].bump_version = merged[key].bump_version or d.bump_version
+        merged[key].sort_keys.update(d.sort_keys or {})
+        acc = merged[key].delta
+        for field, value in d.delta.items():
+            if _counter(value):
+                acc[field] = (acc.get(field) or 0) + value
+    return list(merged.values())
+
+
+def put_op(table: Any, item: dict[str, Any]) -> dict[str, Any]:
+    """TransactWriteItems `Put` for `item` (fails if the id already exists)."""
+    return {
+        "Put": {
+            "TableName": table.name,
+            "Item": _serialize(item),
+            "ConditionExpression": "attribute_not_exists(#id)",
+            "ExpressionAttributeNames": {"#id": "id"},
+        }
+    }
+
+
+def replace_op(table: Any, item: dict[str, Any]) -> dict[str, Any]:
+    """TransactWriteItems `Put` overwriting an existing item."""
+    return {
+        "Put": {
+            "TableName": table.name,
+            "Item": _serialize(item),
+            "ConditionExpression": "attribute_exists(#id)",
+            "ExpressionAttributeNames": {"#id": "id"},
+        }
+    }
+
+
+def update_op(table: Any, item_id: str, updates: dict[str, Any], expected: dict[str, Any] | None = None) -> dict[str, Any]:
+    """TransactWriteItems `Update` SETting `updates` on an existing item
+    whose `expected` attributes hold the given values."""
+    names = {"#id": "id"}
+    values: dict[str, Any] = {}
+    sets, conditions = [], ["attribute_exists(#id)"]
+    for i, (field, value) in enumerate(updates.items()):
+        names[f"#u{i}"] = field
+        values[f":u{i}"] = value
+        sets.append(f"#u{i} = :u{i}")
+    for i, (field, value) in enumerate((expected or {}).items()):
+        names[f"#c{i}"] = field
+        values[f":c{i}"] = value
+        conditions.append(f"#c{i} = :c{i}")
+    return {
+        "Update": {
+            "TableName": table.name,
+            "Key": _serialize({"id": item_id}),
+            "UpdateExpression": "SET " + ", ".join(sets),
+            "ConditionExpression": " AND ".join(conditions),
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": _serialize(values),
+        }
+    }
+
+
+def delete_op(table: Any, item_id: str) -> dict[str, Any]:
+    """TransactWriteItems `Delete` by id."""
+    return {"Delete": {"TableName": table.name, "Key": _serialize({"id": item_id})}}
+
+
+def transact_write(items: list[dict[str, Any]]) -> None:
+    """`TransactWriteItems` with a fresh `ClientRequestToken`, so the SDK
+    retrying a call that already committed doesn't apply it twice."""
+    dynamodb.meta.client.transact_write_items(TransactItems=items, ClientRequestToken=uuid4().hex)
+
+
+# ── Counters ───────────────────────────────────────────────────────────
+
+
+def _update_one(d: StatsDelta, expr: tuple[str, dict[str, str], dict[str, Any]]) -> None:
+    update, ean, eav = expr
+    d.table.update_item(
+        Key={"id": d.item_id},
+        UpdateExpression=update,
+        ConditionExpression="attribute_exists(#s)",
+        ExpressionAttributeNames=ean,
+        ExpressionAttributeValues=eav,
+    )
+
+
+def _transact(pending: list[tuple[StatsDelta, tuple]], extra_items: list[dict[str, Any]]) -> None:
+    items = list(extra_items)
+    for d, (update, ean, eav) in pending:
+        items.append({
+            "Update": {
+                "TableName": d.table.name,
+                "Key": _serialize({"id": d.item_id}),
+                "UpdateExpression": update,
+                "ConditionExpression": "attribute_exists(#s)",
+                "ExpressionAttributeNames": ean,
+                "ExpressionAttributeValues": _serialize(eav),
+            }
+        })
+    transact_write(items)
+
+
+def _seed_stats(d: StatsDelta) -> bool:
+    """Create an empty `stats` map on an existing item. Returns False if the
+    item itself is gone."""
+    try:
+        d.table.update_item(
+            Key={"id": d.item_id},
+            UpdateExpression="SET #s = if_not_exists(#s, :empty)",
+            ConditionExpression="attribute_exists(#id)",
+            ExpressionAttributeNames={"#s": "stats", "#id": "id"},
+            ExpressionAttributeValues={":empty": {}},
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def apply_stats_deltas(
+    deltas: list[StatsDelta | None],
+    extra_items: list[dict[str, Any]] | None = None,
+) -> None:
+    """Atomically ADD each delta into its item's `stats` map.
+
+    One item → `UpdateItem`; several, or any `extra_items` (TransactItems
+    from `put_op` / `replace_op` / `delete_op`) → one `TransactWriteItems`
+    (all or nothing). Non-numeric keys (`form`, `form_remove`) are ignored
+    here — see `update_form`.
+    """
+    extra_items = list(extra_items or [])
+    pending = []
+    for d in _merge(deltas):
+        expr = _add_expression(d.delta, d.bump_version, d.sort_keys)
+        if expr is not None:
+            pending.append((d, expr))
+
+    for _ in range(_MAX_ATTEMPTS):
+        if not pending and not extra_items:
+            return
+        try:
+            if len(pending) == 1 and not extra_items:
+                _update_one(*pending[0])
+            elif not pending:
+                transact_write(extra_items)
+            else:
+                _transact(pending, extra_items)
+            return
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code == "ConditionalCheckFailedException":
+                failed = [0]
+            elif code == "TransactionCanceledException":
+                # Reasons are positional: extra items first, then the stats.
+                reasons = e.response.get("CancellationReasons") or []
+                if any(
+                    r.get("Code") == "ConditionalCheckFailed"
+                    for r in reasons[:len(extra_items)]
+                ):
+                    raise
+                failed = [
+                    i - len(extra_items) for i, r in enumerate(reasons)
+                    if i >= len(extra_items) and r.get("Code") == "ConditionalCheckFailed"
+                ]
+                if not failed:
+                    if any(r.get("Code") == "TransactionConflict" for r in reasons):
+                        continue
+                    raise
+            else:
+                raise
+        missing = {i for i in failed if not _seed_stats(pending[i][0])}
+        pending = [p for i, p in enumerate(pending) if i not in missing]
+    raise RuntimeError("Could not apply stats deltas after seeding stats maps")
+
+
+# ── Form (rolling last-N results) ──────────────────────────────────────
+
+
+def _next_form(current: list[Any], delta: dict[str, Any]) -> list[Any]:
+    form = list(current)
+    remove_match_id = delta.get("form_remove")
+    if remove_match_id is not None:
+        form = [
+            e for e in form
+            if not (isinstance(e, dict) and e.get("match_id") == remove_match_id)
+        ]
+    form.extend(delta.get("form") or [])
+    return form[-FORM_WINDOW:]
+
+
+def update_form(table: Any, item_id: str, delta: dict[str, Any]) -> None:
+    """Apply the `form` / `form_remove` part of a team delta.
+
+    Read-then-conditional-write: the new list is only written if the
+    stored list still equals the one it was derived from; a concurrent
+    change triggers a re-read and retry. Expects the `stats` map to exist
+    (apply the counter delta first).
+    """
+    if not delta.get("form") and delta.get("form_remove") is None:
+        return
+
+    for _ in range(_MAX_ATTEMPTS):
+        resp = table.get_item(
+            Key={"id": item_id},
+            ProjectionExpression="#id, #s.#f",
+            ExpressionAttributeNames={"#id": "id", "#s": "stats", "#f": "form"},
+        )
+        item = resp.get("Item")
+        if item is None:
+            return
+        stored = (item.get("stats") or {}).get("form")
+        current = stored or []
+        new_form = _next_form(current, delta)
+        if new_form == current:
+            return
+
+        eav: dict[str, Any] = {":new": new_form}
+        if stored is None:
+            condition = "attribute_not_exists(#s.#f)"
+        else:
+            condition = "#s.#f = :old"
+            eav[":old"] = stored
+        try:
+            table.update_item(
+                Key={"id": item_id},
+                UpdateExpression="SET #s.#f = :new",
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#s": "stats", "#f": "form"},
+                ExpressionAttributeValues=eav,
+            )
+            return
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    raise RuntimeError(f"Form update for {item_id} kept conflicting")
@@ -2,15 +2,22 @@ import time
 import uuid
 
 from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 
 from repositories.ddb_session import notification_table
 
 
 class NotificationRepo:
-    def put(self, user_email: str, title: str, content: str, category: str | None, action_url: str) -> dict:
+    def put(
+        self, user_email: str, title: str, content: str, category: str | None, action_url: str,
+        notification_id: str | None = None,
+    ) -> dict:
+        """Store an in-app notification. With a `notification_id` the put is
+        conditional, so a repeated send keeps the first copy (and its
+        `read_at`) instead of duplicating it."""
         now_ms = int(time.time() * 1000)
         item = {
-            "id": str(uuid.uuid4()),
+            "id": notification_id or str(uuid.uuid4()),
             "user_email": user_email,
             "title": title,
             "content": content,
@@ -18,7 +25,14 @@ class NotificationRepo:
             "action_url": action_url,
             "sent_at": now_ms,
         }
-        notification_table().put_item(Item=item)
+        if notification_id is None:
+            notification_table().put_item(Item=item)
+            return item
+        try:
+            notification_table().put_item(Item=item, ConditionExpression=Attr("id").not_exists())
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
         return item
 
     def list_by_user(self, user_email: str) -> list[dict]:
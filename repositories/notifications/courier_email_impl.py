@@ -1,22 +1,30 @@
 import os
-from trycourier import Courier
+from uuid import uuid4
 from typing import Mapping, Any
+
+from core.http_transport import HttpTransport
 from repositories.notifications.ports import EmailSender
 
 
 class CourierNotificationSender(EmailSender):
     """
-    Thin adapter for TryCourier. Compatible with both modern and legacy client methods.
-    Prefers client.send_message(message=...) if available; falls back to client.send(...).
+    Thin adapter for Courier's Send API (POST /send), over the shared
+    HttpTransport (pooled connections, retries, circuit breaker) instead of
+    a client of its own. Each send carries an Idempotency-Key — the caller's
+    `idempotency_key` when given, so a send repeated later (e.g. an outbox
+    retry) is de-duplicated too; a fresh one otherwise, which still covers
+    the transport's own retries of the POST.
     """
-    def __init__(self, client: Courier | None = None, auth_token: str | None = None):
-        if client:
-            self._client = client
-        else:
-            token = auth_token or os.environ.get("COURIER_AUTH_TOKEN")
-            if not token:
-                raise RuntimeError("COURIER_AUTH_TOKEN is not configured")
-            self._client = Courier(auth_token=token)
+    def __init__(self, transport: HttpTransport | None = None, auth_token: str | None = None):
+        token = auth_token or os.environ.get("COURIER_AUTH_TOKEN")
+        if not token:
+            raise RuntimeError("COURIER_AUTH_TOKEN is not configured")
+        self._transport = transport or HttpTransport()
+        self._url = os.environ.get("COURIER_BASE_URL", "https://api.courier.com").rstrip("/") + "/send"
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
 
     def send_template(
         self,
@@ -24,6 +32,7 @@ class CourierNotificationSender(EmailSender):
         template_id: str,
         to_email: str | None = None,
         data: Mapping[str, Any] | None = None,
+        idempotency_key: str | None = None,
     ) -> str:
         if not to_email:
             raise ValueError("Must provide to_email")
@@ -34,9 +43,14 @@ class CourierNotificationSender(EmailSender):
             "data": dict(data or {}),
         }
 
-        # Modern Courier API:
-        # https://docs.courier.com/reference/send/
-        resp = self._client.send_message(message=message)
+        # https://www.courier.com/docs/reference/send/message/
+        resp = self._transport.post(
+            self._url,
+            json={"message": message},
+            headers={**self._headers, "Idempotency-Key": idempotency_key or uuid4().hex},
+        )
+        resp.raise_for_status()
 
         # Courier typically returns {"requestId": "..."} (sometimes "messageId")
-        return resp.get("requestId") or resp.get("messageId") or "unknown"
\ No newline at end of file
+        body = resp.json()
+        return body.get("requestId") or body.get("messageId") or "unknown"
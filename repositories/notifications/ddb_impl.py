@@ -1,35 +1,43 @@
 import os
+from uuid import NAMESPACE_URL, uuid5
 
 from repositories.notifications.ports import InAppSender
 from repositories.notification_repo_ddb import NotificationRepo
 from repositories.notifications.onesignal_impl import OneSignalNotificationSender
 
 
+def _notification_id(idempotency_key: str | None, user_email: str) -> str | None:
+    # Same key and recipient → same in-app item, so a repeated send doesn't duplicate it.
+    return str(uuid5(NAMESPACE_URL, f"{idempotency_key}:{user_email}")) if idempotency_key else None
+
+
 class DdbInAppSender(InAppSender):
     def __init__(self, repo: NotificationRepo, onesignal: OneSignalNotificationSender):
         self._repo = repo
         self._onesignal = onesignal
         self._base_action_url = os.environ.get("BASE_ACTION_URL", "")
 
-    def publish(self, *, user_email: str, title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/") -> str:
+    def publish(self, *, user_email: str, title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/", idempotency_key: str | None = None) -> str:
         action_url = f"{self._base_action_url.rstrip('/')}/{action_url_path}"
-        self._repo.put(user_email, title, content, category, action_url)
+        self._repo.put(user_email, title, content, category, action_url, _notification_id(idempotency_key, user_email))
         return self._onesignal.publish(
             user_email=user_email,
             title=title,
             content=content,
             category=category,
             action_url_path=action_url_path,
+            idempotency_key=idempotency_key,
         )
 
-    def publish_bulk(self, *, user_emails: list[str], title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/") -> str:
+    def publish_bulk(self, *, user_emails: list[str], title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/", idempotency_key: str | None = None) -> str:
         action_url = f"{self._base_action_url.rstrip('/')}/{action_url_path}"
         for email in user_emails:
-            self._repo.put(email, title, content, category, action_url)
+            self._repo.put(email, title, content, category, action_url, _notification_id(idempotency_key, email))
         return self._onesignal.publish_bulk(
             user_emails=user_emails,
             title=title,
             content=content,
             category=category,
             action_url_path=action_url_path,
+            idempotency_key=idempotency_key,
         )
@@ -1,5 +1,7 @@
 import os
-import requests
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+from core.http_transport import HttpTransport
 from repositories.notifications.ports import InAppSender
 
 
@@ -7,47 +9,56 @@ class OneSignalNotificationSender(InAppSender):
     """
     Thin adapter for OneSignal. Implements the InAppSender protocol.
     Targets users by external_user_id (assumed to be their email).
+    Calls go through the shared HttpTransport (pooled connections, retries,
+    circuit breaker); each notification carries an idempotency_key so a
+    retried POST is not delivered twice. OneSignal wants a UUID, so a
+    caller's `idempotency_key` is mapped to one with uuid5.
     """
 
-    def __init__(self):
+    def __init__(self, transport: HttpTransport | None = None):
         self.app_id = os.environ.get("ONESIGNAL_APP_ID")
         self.rest_api_key = os.environ.get("ONESIGNAL_REST_API_KEY")
         self.base_action_url = os.environ.get("BASE_ACTION_URL")
-        self.url = "https://onesignal.com/api/v1/notifications"
+        self.url = os.environ.get("ONESIGNAL_API_URL", "https://onesignal.com/api/v1/notifications")
         self.headers = {
             "Authorization": f"Key {self.rest_api_key}",
             "Content-Type": "application/json",
         }
+        self._transport = transport or HttpTransport()
         if not self.app_id or not self.rest_api_key:
             print("WARNING: ONESIGNAL_APP_ID or ONESIGNAL_REST_API_KEY not configured")
 
-    def publish(self, *, user_email: str, title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/") -> str:
+    def publish(self, *, user_email: str, title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/", idempotency_key: str | None = None) -> str:
         payload = self._build_payload(
             external_user_ids=[user_email],
             title=title,
             content=content,
             category=category,
             action_url_path=action_url_path,
+            idempotency_key=idempotency_key,
         )
-        response = requests.post(self.url, json=payload, headers=self.headers)
-        print(response.json())
-        return response.json().get("id", "")
+        return self._send(payload)
 
-    def publish_bulk(self, *, user_emails: list[str], title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/") -> str:
+    def publish_bulk(self, *, user_emails: list[str], title: str, content: str, category: str | None = None, action_url_path: str = "dashboard/", idempotency_key: str | None = None) -> str:
         payload = self._build_payload(
             external_user_ids=user_emails,
             title=title,
             content=content,
             category=category,
             action_url_path=action_url_path,
+            idempotency_key=idempotency_key,
         )
-        response = requests.post(self.url, json=payload, headers=self.headers)
-        print(response.json())
+        return self._send(payload)
+
+    def _send(self, payload: dict) -> str:
+        response = self._transport.post(self.url, json=payload, headers=self.headers)
+        response.raise_for_status()
         return response.json().get("id", "")
 
-    def _build_payload(self, *, external_user_ids: list[str], title: str, content: str, category: str | None, action_url_path: str) -> dict:
+    def _build_payload(self, *, external_user_ids: list[str], title: str, content: str, category: str | None, action_url_path: str, idempotency_key: str | None) -> dict:
         payload = {
             "app_id": self.app_id,
+            "idempotency_key": str(uuid5(NAMESPACE_URL, idempotency_key) if idempotency_key else uuid4()),
             "headings": {"en": title},
             "contents": {"en": content},
             "include_aliases": {"external_id": external_user_ids},
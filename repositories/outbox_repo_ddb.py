@@ -0,0 +1,108 @@
+import os
+import time
+from typing import Any
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from core.concurrency import fan_map
+from .ddb_session import notification_outbox_table
+from .ddb_stats import put_op, transact_write
+
+# Delivered / dead intents are kept this long (DynamoDB TTL on `expires_at`).
+_RETENTION_SECONDS = 30 * 24 * 3600
+
+
+def _conditional_failed(e: ClientError) -> bool:
+    return e.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+class OutboxRepo:
+    """DynamoDB store for notification intents (see services.notification_outbox).
+
+    Pending intents carry `queue = "pending"`, the partition key of the sparse
+    `pending_index` GSI (sort key `next_attempt_at`), so the drain worker reads
+    only what is due. Delivered and dead intents drop `queue` and leave the index.
+    """
+
+    def __init__(self):
+        self._table = notification_outbox_table()
+        self._pending_gsi = os.getenv("OUTBOX_PENDING_GSI", "pending_index")
+
+    def add(self, item: dict[str, Any]) -> bool:
+        """Record an intent. Returns False if its id (dedup key) is already
+        recorded."""
+        try:
+            self._table.put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(#id)",
+                ExpressionAttributeNames={"#id": "id"},
+            )
+            return True
+        except ClientError as e:
+            if _conditional_failed(e):
+                return False
+            raise
+
+    def add_many(self, items: list[dict[str, Any]]) -> None:
+        fan_map(self.add, items)
+
+    def commit(self, ops: list[dict[str, Any]], items: list[dict[str, Any]]) -> None:
+        """One TransactWriteItems: the domain `ops` plus a Put per intent."""
+        transact_write([*ops, *(put_op(self._table, item) for item in items)])
+
+    def list_ready(self, now_ms: int, limit: int) -> list[dict[str, Any]]:
+        resp = self._table.query(
+            IndexName=self._pending_gsi,
+            KeyConditionExpression=Key("queue").eq("pending") & Key("next_attempt_at").lte(now_ms),
+            Limit=limit,
+        )
+        return resp.get("Items", [])
+
+    def claim(self, intent_id: str, now_ms: int, lease_until_ms: int) -> bool:
+        """Take a due intent by pushing its `next_attempt_at` to the end of
+        the lease (so it comes back if the worker dies). False if another
+        worker got it first."""
+        try:
+            self._table.update_item(
+                Key={"id": intent_id},
+                UpdateExpression="SET #n = :lease ADD #a :one",
+                ConditionExpression="#q = :pending AND #n <= :now",
+                ExpressionAttributeNames={"#n": "next_attempt_at", "#a": "attempts", "#q": "queue"},
+                ExpressionAttributeValues={":lease": lease_until_ms, ":one": 1, ":pending": "pending", ":now": now_ms},
+            )
+            return True
+        except ClientError as e:
+            if _conditional_failed(e):
+                return False
+            raise
+
+    def complete(self, intent_id: str) -> None:
+        self._finish(intent_id, "sent", None)
+
+    def fail(self, intent_id: str, error: str) -> None:
+        self._finish(intent_id, "failed", error)
+
+    def retry_at(self, intent_id: str, next_attempt_ms: int, error: str, done: list[str]) -> None:
+        """Reschedule an intent, keeping the channels it already delivered."""
+        self._table.update_item(
+            Key={"id": intent_id},
+            UpdateExpression="SET #n = :n, #e = :e, #d = :d",
+            ExpressionAttributeNames={"#n": "next_attempt_at", "#e": "last_error", "#d": "done"},
+            ExpressionAttributeValues={":n": next_attempt_ms, ":e": error, ":d": done},
+        )
+
+    def _finish(self, intent_id: str, status: str, error: str | None) -> None:
+        names = {"#s": "status", "#q": "queue", "#x": "expires_at"}
+        values: dict[str, Any] = {":s": status, ":x": int(time.time()) + _RETENTION_SECONDS}
+        update = "SET #s = :s, #x = :x"
+        if error is not None:
+            names["#e"] = "last_error"
+            values[":e"] = error
+            update += ", #e = :e"
+        self._table.update_item(
+            Key={"id": intent_id},
+            UpdateExpression=update + " REMOVE #q",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
@@ -1,7 +1,12 @@
 import os
 from .ddb_session import payment_request_table
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
 from typing import Iterable, Any
+from .ddb_projection import projection
+from .ddb_batch import batch_get, batch_put
+from .ddb_cursor import query_page
+from .ddb_stats import update_op
 
 def _scan_all(table, **kwargs) -> list[dict[str, Any]]:
     items: list[dict[str, Any]] = []
@@ -20,13 +25,23 @@ class PaymentRequestsRepo:
     """DynamoDB-backed repository for payment requests table. No business rules here."""
     def __init__(self):
         self._table = payment_request_table()
-        self._user_gsi = os.getenv("PAYMENT_REQUEST_USER_GSI", "user_index")
-        self._status_gsi = os.getenv("PAYMENT_REQUEST_STATUS_GSI", "status_index")
         self._account_gsi = os.getenv("PAYMENT_REQUEST_ACCOUNT_GSI", "account_id_index")
+        # Composite GSIs: partition account_id, sort key the attribute.
+        # Order is the preference when several filters apply.
+        self._account_indexes = {
+            "user_id": os.getenv("PAYMENT_REQUEST_ACCOUNT_USER_GSI", "account_user_index"),
+            "user_group": os.getenv("PAYMENT_REQUEST_ACCOUNT_GROUP_GSI", "account_group_index"),
+            "payment_status": os.getenv("PAYMENT_REQUEST_ACCOUNT_STATUS_GSI", "account_status_index"),
+        }
+        # Across accounts: partition payment_status, sort key due_date.
+        self._status_due_gsi = os.getenv("PAYMENT_REQUEST_STATUS_DUE_GSI", "status_due_index")
 
-    def get(self, payment_request_id: str, account_id: str) -> dict[str, Any] | None:
-        """Get payment request by ID, validating it belongs to the account"""
-        resp = self._table.get_item(Key={"id": payment_request_id})
+    def get(self, payment_request_id: str, account_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """Get payment request by ID, validating it belongs to the account. With
+        `fields`, only those attributes are read (plus account_id)."""
+        if fields is not None:
+            fields = [*fields, "account_id"]
+        resp = self._table.get_item(Key={"id": payment_request_id}, **projection(fields))
         item = resp.get("Item")
         
         # Validate account ownership
@@ -35,47 +50,92 @@ class PaymentRequestsRepo:
             
         return item
 
+    def exists_for_account(self, payment_request_id: str, account_id: str) -> bool:
+        """Ownership check reading only `account_id`."""
+        return self.get(payment_request_id, account_id, fields=[]) is not None
+
     def list_all(self, account_id: str) -> Iterable[dict[str, Any]]:
         """List all payment requests for the specified account"""
-        try:
-            resp = self._table.query(
-                IndexName=self._account_gsi,
-                KeyConditionExpression=Key("account_id").eq(account_id)
-            )
-            return resp.get("Items", [])
-        except Exception:
-            # Fallback to scan with filter
-            return _scan_all(
-                self._table,
-                FilterExpression=Attr("account_id").eq(account_id)
-            )
+        return self.list_page(account_id)[0]
 
     def list_filtered(self, account_id: str, user_id: str | None = None, group: str | None = None) -> Iterable[dict[str, Any]]:
         """List payment requests with optional filters within the specified account"""
-        filter_expr = Attr("account_id").eq(account_id)
-        if user_id:
-            filter_expr = filter_expr & Attr("user_id").eq(user_id)
-        if group:
-            filter_expr = filter_expr & Attr("user_group").eq(group)
-        
-        return _scan_all(
-            self._table,
-            FilterExpression=filter_expr
-        )
+        return self.list_page(account_id, user_id=user_id, group=group)[0]
 
-    
     def list_by_status(self, status: str, account_id: str) -> Iterable[dict[str, Any]]:
         """List payment requests by status within the specified account"""
-        try:
-            resp = self._table.query(
-                IndexName=self._status_gsi,
-                KeyConditionExpression=Key("payment_status").eq(status),
-                FilterExpression=Attr("account_id").eq(account_id)
-            )
-            return resp.get("Items", [])
-        except Exception:
-            return [i for i in self.list_all(account_id) if i.get("payment_status") == status]
+        return self.list_page(account_id, status=status)[0]
+
+    def list_page(
+        self,
+        account_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+        start_key: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Up to `limit` payment requests of the account (all of them without
+        `limit`) and the key to resume from.
+
+        Always a Query on one of the account-partitioned GSIs — the most
+        selective filter picks the index (user, then group, then status)
+        and the others become a FilterExpression.
+        """
+        status = status.value if hasattr(status, "value") else status
+        filters = {"user_id": user_id, "user_group": group, "payment_status": status}
+        sort_attr, index = next(
+            ((attr, self._account_indexes[attr]) for attr in self._account_indexes if filters[attr]),
+            (None, self._account_gsi),
+        )
+        key = Key("account_id").eq(account_id)
+        if sort_attr:
+            key = key & Key(sort_attr).eq(filters[sort_attr])
+        kwargs: dict[str, Any] = {"IndexName": index, "KeyConditionExpression": key}
+        rest = [Attr(attr).eq(value) for attr, value in filters.items() if value and attr != sort_attr]
+        if rest:
+            condition = rest[0]
+            for c in rest[1:]:
+                condition = condition & c
+            kwargs["FilterExpression"] = condition
+        return query_page(self._table, limit, start_key, **kwargs)
 
+    def list_due(
+        self,
+        status: str,
+        before: str,
+        *,
+        limit: int | None = None,
+        start_key: dict[str, Any] | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Payment requests of every account in `status` whose `due_date`
+        sorts before `before` (ISO), oldest first, and the key to resume
+        from. Only rows already past `before` are read."""
+        status = status.value if hasattr(status, "value") else status
+        return query_page(
+            self._table,
+            limit,
+            start_key,
+            IndexName=self._status_due_gsi,
+            KeyConditionExpression=Key("payment_status").eq(status) & Key("due_date").lt(before),
+            **projection(fields),
+        )
+
+    def list_references(self, account_id: str, references: list[str]) -> set[str]:
+        """Which of `references` some payment request of the account carries.
+        A filtered scan — only for rows whose id doesn't derive from their
+        reference (see `PaymentRequestService.charge_id`)."""
+        if not references:
+            return set()
+        items = _scan_all(
+            self._table,
+            FilterExpression=Attr("account_id").eq(account_id) & Attr("reference").is_in(list(references)),
+            ProjectionExpression="#r",
+            ExpressionAttributeNames={"#r": "reference"},
+        )
+        return {i["reference"] for i in items}
 
     # ------------- Writes -------------
     def put(self, item: dict[str, Any]) -> None:
@@ -84,11 +144,22 @@ class PaymentRequestsRepo:
             raise ValueError("account_id is required")
         self._table.put_item(Item=item)
 
+    def put_batch(self, items: list[dict[str, Any]]) -> None:
+        """Put many payment requests with BatchWriteItem (see
+        `ddb_batch.batch_put`); every item must carry its account_id."""
+        if any("account_id" not in item for item in items):
+            raise ValueError("account_id is required")
+        batch_put(self._table, items)
+
+    def existing_ids(self, payment_request_ids: list[str]) -> set[str]:
+        """The subset of `payment_request_ids` already stored."""
+        keys = [{"id": pid} for pid in dict.fromkeys(payment_request_ids)]
+        return {item["id"] for item in batch_get(self._table, keys, fields=["id"])}
+
     def update(self, payment_request_id: str, account_id: str, updates: dict[str, Any]) -> None:
         """Update payment request, validating it belongs to the account"""
         # Verify ownership
-        current = self.get(payment_request_id, account_id)
-        if not current:
+        if not self.exists_for_account(payment_request_id, account_id):
             raise ValueError(f"Payment request {payment_request_id} not found in account {account_id}")
         
         # Prevent account_id from being changed
@@ -115,10 +186,38 @@ class PaymentRequestsRepo:
             ReturnValues="ALL_NEW",
         )
 
+    def update_op(self, payment_request_id: str, account_id: str, updates: dict[str, Any]) -> dict[str, Any]:
+        """`update` as a TransactWriteItems item, conditioned on the request
+        belonging to the account."""
+        updates = {k: v for k, v in updates.items() if k != "account_id"}
+        return update_op(self._table, payment_request_id, updates, expected={"account_id": account_id})
+
+    def mark_overdue(self, payment_request_id: str, account_id: str, user_price: Any) -> bool:
+        """Move a pending payment request of the account to overdue at
+        `user_price`. False when it is no longer pending (paid or edited
+        since it was read) or belongs to another account."""
+        try:
+            self._table.update_item(
+                Key={"id": payment_request_id},
+                UpdateExpression="SET #s = :overdue, #p = :price",
+                ConditionExpression="#a = :account AND #s = :pending",
+                ExpressionAttributeNames={"#s": "payment_status", "#p": "user_price", "#a": "account_id"},
+                ExpressionAttributeValues={
+                    ":overdue": "overdue",
+                    ":pending": "pending",
+                    ":price": user_price,
+                    ":account": account_id,
+                },
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+
     def delete(self, payment_request_id: str, account_id: str) -> None:
         """Delete payment request, validating it belongs to the account"""
         # Verify ownership before deleting
-        current = self.get(payment_request_id, account_id)
-        if not current:
+        if not self.exists_for_account(payment_request_id, account_id):
             raise ValueError(f"Payment request {payment_request_id} not found in account {account_id}")
         self._table.delete_item(Key={"id": payment_request_id})
\ No newline at end of file
@@ -1,5 +1,7 @@
+import json
 import os
 import boto3
+from botocore.exceptions import ClientError
 from repositories.s3_keys import KeyBuilder
 from utils.env_utils import _env
 
@@ -167,4 +169,28 @@ class S3Adapter:
 
     def delete_file(self, key: str) -> None:
         """Delete a file from S3"""
-        self._s3.delete_object(Bucket=_bucket_name(), Key=key)
\ No newline at end of file
+        self._s3.delete_object(Bucket=_bucket_name(), Key=key)
+
+    def put_tournament_snapshot(self, tournament_id: str, body: bytes) -> None:
+        """Store the rendered public snapshot of a tournament (JSON bytes)."""
+        self._s3.put_object(
+            Bucket=_bucket_name(),
+            Key=self._kb.tournament_snapshot(tournament_id),
+            Body=body,
+            ContentType="application/json",
+        )
+
+    def get_tournament_snapshot(self, tournament_id: str) -> dict | None:
+        """Stored public snapshot of a tournament, or None if there is none."""
+        try:
+            resp = self._s3.get_object(
+                Bucket=_bucket_name(), Key=self._kb.tournament_snapshot(tournament_id)
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        return json.loads(resp["Body"].read())
+
+    def delete_tournament_snapshot(self, tournament_id: str) -> None:
+        self.delete_file(self._kb.tournament_snapshot(tournament_id))
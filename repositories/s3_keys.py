@@ -92,3 +92,10 @@ class KeyBuilder:
         {env}/accounts/{account_id}/teams/{team_id}/logo/{filename}
         """
         return join(self.account_root(account_id), "teams", _clean(team_id), "logo", _clean(filename))
+
+    def tournament_snapshot(self, tournament_id: str) -> str:
+        """
+        Object key for the materialized public tournament snapshot.
+        {env}/snapshots/tournaments/{tournament_id}.json
+        """
+        return join(self.env, "snapshots", "tournaments", _clean(tournament_id) + ".json")
@@ -2,6 +2,7 @@ import os
 from .ddb_session import tour_table
 from boto3.dynamodb.conditions import Attr
 from typing import Iterable, Any
+from .ddb_projection import projection
 
 def _scan_all(table, **kwargs) -> list[dict[str, Any]]:
     items: list[dict[str, Any]] = []
@@ -23,9 +24,12 @@ class TourRepo:
         self._user_gsi = os.getenv("TOUR_USER_GSI", "user_index")
         self._account_gsi = os.getenv("TOUR_ACCOUNT_GSI", "account_id_index")
 
-    def get(self, tour_id: str, account_id: str) -> dict[str, Any] | None:
-        """Get tour by ID, validating it belongs to the account"""
-        resp = self._table.get_item(Key={"id": tour_id})
+    def get(self, tour_id: str, account_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """Get tour by ID, validating it belongs to the account. With
+        `fields`, only those attributes are read (plus account_id)."""
+        if fields is not None:
+            fields = [*fields, "account_id"]
+        resp = self._table.get_item(Key={"id": tour_id}, **projection(fields))
         item = resp.get("Item")
         
         # Validate account ownership
@@ -34,6 +38,10 @@ class TourRepo:
             
         return item
 
+    def exists_for_account(self, tour_id: str, account_id: str) -> bool:
+        """Ownership check reading only `account_id`."""
+        return self.get(tour_id, account_id, fields=[]) is not None
+
     def list_all(self, account_id: str) -> Iterable[dict[str, Any]]:
         """List all tours for the specified account"""
         try:
@@ -73,8 +81,7 @@ class TourRepo:
     def update(self, tour_id: str, account_id: str, updates: dict[str, Any]) -> None:
         """Update tour, validating it belongs to the account"""
         # Verify ownership
-        current = self.get(tour_id, account_id)
-        if not current:
+        if not self.exists_for_account(tour_id, account_id):
             raise ValueError(f"Tour {tour_id} not found in account {account_id}")
         
         # Prevent account_id from being changed
@@ -105,7 +112,6 @@ class TourRepo:
     def delete(self, tour_id: str, account_id: str) -> None:
         """Delete tour, validating it belongs to the account"""
         # Verify ownership before deleting
-        current = self.get(tour_id, account_id)
-        if not current:
+        if not self.exists_for_account(tour_id, account_id):
             raise ValueError(f"Tour {tour_id} not found in account {account_id}")
         self._table.delete_item(Key={"id": tour_id})
\ No newline at end of file
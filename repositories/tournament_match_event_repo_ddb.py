@@ -3,6 +3,9 @@ from .ddb_session import tournament_match_event_table
 from boto3.dynamodb.conditions import Key
 from typing import Any
 
+from core.concurrency import fan_map
+from .ddb_stats import delete_op, put_op, replace_op
+
 
 def _query_all(table, **kwargs) -> list[dict[str, Any]]:
     items: list[dict[str, Any]] = []
@@ -18,23 +21,52 @@ def _query_all(table, **kwargs) -> list[dict[str, Any]]:
     return items
 
 
+# Keys of the tournament/team GSIs. An index key can't be stored as NULL,
+# so these are left off the item rather than written as None.
+_INDEX_KEYS = ("tournament_id", "team_id")
+
+
+def _indexable(item: dict[str, Any]) -> dict[str, Any]:
+    if all(item.get(k) is not None for k in _INDEX_KEYS if k in item):
+        return item
+    return {k: v for k, v in item.items() if not (k in _INDEX_KEYS and v is None)}
+
+
 class TournamentMatchEventRepo:
-    """DynamoDB-backed repository for the MatchEvent table."""
+    """DynamoDB-backed repository for the MatchEvent table.
+
+    Events carry their match's `tournament_id` (stamped by the event
+    service) and the `team_id` they belong to, so tournament- and
+    team-wide reads are one query each instead of one per match.
+    """
 
     def __init__(self):
         self._table = tournament_match_event_table()
         self._match_gsi = os.getenv("EVENT_MATCH_GSI", "match_index")
+        self._tournament_gsi = os.getenv("EVENT_TOURNAMENT_GSI", "tournament_index")
+        self._team_gsi = os.getenv("EVENT_TEAM_GSI", "team_index")
 
     def get(self, event_id: str) -> dict[str, Any] | None:
         resp = self._table.get_item(Key={"id": event_id})
         return resp.get("Item")
 
     def put(self, item: dict[str, Any]) -> None:
-        self._table.put_item(Item=item)
+        self._table.put_item(Item=_indexable(item))
 
     def delete(self, event_id: str) -> None:
         self._table.delete_item(Key={"id": event_id})
 
+    # ── Transaction items (see ddb_stats.apply_stats_deltas) ─────────
+
+    def put_op(self, item: dict[str, Any]) -> dict[str, Any]:
+        return put_op(self._table, _indexable(item))
+
+    def replace_op(self, item: dict[str, Any]) -> dict[str, Any]:
+        return replace_op(self._table, _indexable(item))
+
+    def delete_op(self, event_id: str) -> dict[str, Any]:
+        return delete_op(self._table, event_id)
+
     def list_by_match(self, match_id: str) -> list[dict[str, Any]]:
         return _query_all(
             self._table,
@@ -42,9 +74,37 @@ class TournamentMatchEventRepo:
             KeyConditionExpression=Key("match_id").eq(match_id),
         )
 
+    def list_by_tournament(self, tournament_id: str) -> list[dict[str, Any]]:
+        """Every event in a tournament — one query. Events written before
+        `tournament_id` was stamped are missing until
+        `migrations/backfill_event_tournament_id.py` has run."""
+        return _query_all(
+            self._table,
+            IndexName=self._tournament_gsi,
+            KeyConditionExpression=Key("tournament_id").eq(tournament_id),
+        )
+
+    def list_by_team(self, team_id: str) -> list[dict[str, Any]]:
+        return _query_all(
+            self._table,
+            IndexName=self._team_gsi,
+            KeyConditionExpression=Key("team_id").eq(team_id),
+        )
+
+    @staticmethod
+    def group_by_match(events: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """Bucket a flat event list by `match_id`, ordered by `event_index`."""
+        by_match: dict[str, list[dict[str, Any]]] = {}
+        for ev in sorted(events, key=lambda e: e.get("event_index") or 0):
+            by_match.setdefault(ev.get("match_id"), []).append(ev)
+        return by_match
+
     def batch_list_by_matches(self, match_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
-        """Fetch events for multiple matches. Returns dict keyed by match_id."""
-        return {mid: self.list_by_match(mid) for mid in match_ids}
+        """Fetch events for multiple matches. Returns dict keyed by match_id.
+
+        One query per match, issued concurrently (bounded by FANOUT_LIMIT).
+        """
+        return dict(zip(match_ids, fan_map(self.list_by_match, match_ids)))
 
     def update(self, event_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
         if not updates:
@@ -1,6 +1,8 @@
 import os
 from .ddb_session import tournament_match_table
+from .ddb_batch import batch_get, batch_put
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 from typing import Any
 
 
@@ -35,9 +37,14 @@ class TournamentMatchRepo:
         self._table.put_item(Item=item)
 
     def put_batch(self, items: list[dict[str, Any]]) -> None:
-        with self._table.batch_writer() as batch:
-            for item in items:
-                batch.put_item(Item=item)
+        """BatchWriteItem in 25-item chunks, retrying unprocessed items
+        (see `ddb_batch.batch_put`)."""
+        batch_put(self._table, items)
+
+    def existing_ids(self, match_ids: list[str]) -> set[str]:
+        """The subset of `match_ids` already stored."""
+        keys = [{"id": mid} for mid in dict.fromkeys(match_ids)]
+        return {item["id"] for item in batch_get(self._table, keys, fields=["id"])}
 
     def delete(self, match_id: str) -> None:
         self._table.delete_item(Key={"id": match_id})
@@ -100,7 +107,12 @@ class TournamentMatchRepo:
 
         return items
 
-    def update(self, match_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
+    def update(
+        self, match_id: str, updates: dict[str, Any], expected_status: str | None = None
+    ) -> dict[str, Any] | None:
+        """SET `updates` and return the new item. With `expected_status`,
+        only while the match still has that status (a missing status reads
+        as "scheduled"); returns None when it doesn't."""
         if not updates:
             return self.get(match_id)
 
@@ -112,11 +124,81 @@ class TournamentMatchRepo:
             eav[vk] = value
             parts.append(f"{nk} = {vk}")
 
-        resp = self._table.update_item(
-            Key={"id": match_id},
-            UpdateExpression="SET " + ", ".join(parts),
-            ExpressionAttributeValues=eav,
-            ExpressionAttributeNames=ean,
-            ReturnValues="ALL_NEW",
-        )
+        kwargs: dict[str, Any] = {}
+        if expected_status is not None:
+            ean["#status"] = "status"
+            eav[":expected_status"] = expected_status
+            condition = "#status = :expected_status"
+            if expected_status == "scheduled":
+                condition = f"attribute_not_exists(#status) OR {condition}"
+            kwargs["ConditionExpression"] = condition
+        try:
+            resp = self._table.update_item(
+                Key={"id": match_id},
+                UpdateExpression="SET " + ", ".join(parts),
+                ExpressionAttributeValues=eav,
+                ExpressionAttributeNames=ean,
+                ReturnValues="ALL_NEW",
+                **kwargs,
+            )
+        except ClientError as e:
+            if expected_status is not None and e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
         return resp.get("Attributes")
+
+    def record_event(
+        self,
+        match_id: str,
+        *,
+        next_index: bool = True,
+        index_base: int = 0,
+        score_home_delta: int = 0,
+        score_away_delta: int = 0,
+    ) -> dict[str, Any] | None:
+        """Reserve the next `event_index` and/or move the score, in one
+        conditional update that only succeeds while the match is `live`.
+
+        `event_seq` is a per-match counter; `index_base` seeds it for
+        matches whose events predate the counter. Returns the updated
+        counter/score attributes, or None if the match isn't live (or is
+        gone).
+        """
+        sets, adds = [], []
+        ean = {"#st": "status"}
+        eav: dict[str, Any] = {":live": "live"}
+        if next_index:
+            ean["#seq"] = "event_seq"
+            eav[":base"] = index_base
+            eav[":one"] = 1
+            sets.append("#seq = if_not_exists(#seq, :base) + :one")
+        if score_home_delta:
+            ean["#sh"] = "score_home"
+            eav[":dh"] = score_home_delta
+            adds.append("#sh :dh")
+        if score_away_delta:
+            ean["#sa"] = "score_away"
+            eav[":da"] = score_away_delta
+            adds.append("#sa :da")
+        if not sets and not adds:
+            return {}
+
+        expr = []
+        if sets:
+            expr.append("SET " + ", ".join(sets))
+        if adds:
+            expr.append("ADD " + ", ".join(adds))
+        try:
+            resp = self._table.update_item(
+                Key={"id": match_id},
+                UpdateExpression=" ".join(expr),
+                ConditionExpression="#st = :live",
+                ExpressionAttributeNames=ean,
+                ExpressionAttributeValues=eav,
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+        return resp.get("Attributes") or {}
@@ -2,6 +2,8 @@ import os
 from .ddb_session import tournament_player_table
 from boto3.dynamodb.conditions import Key
 from typing import Any
+from .ddb_stats import StatsDelta, apply_stats_deltas
+from .ddb_leaderboard import Leaderboard, query_page, sort_key_values, sort_keys, with_sort_keys, CARD_WEIGHTS
 
 
 def _query_all(table, **kwargs) -> list[dict[str, Any]]:
@@ -25,13 +27,19 @@ class TournamentPlayerRepo:
         self._table = tournament_player_table()
         self._tournament_gsi = os.getenv("PLAYER_TOURNAMENT_GSI", "tournament_index")
         self._team_gsi = os.getenv("PLAYER_TEAM_GSI", "team_index")
+        # Sparse GSIs (tournament_id, lb_*) — see `ddb_leaderboard`.
+        self.leaderboards = {
+            "scorers": Leaderboard("lb_goals", os.getenv("PLAYER_GOALS_GSI", "goals_index"), {"goals": 1}),
+            "assists": Leaderboard("lb_assists", os.getenv("PLAYER_ASSISTS_GSI", "assists_index"), {"assists": 1}),
+            "cards": Leaderboard("lb_cards", os.getenv("PLAYER_CARDS_GSI", "cards_index"), CARD_WEIGHTS),
+        }
 
     def get(self, player_id: str) -> dict[str, Any] | None:
         resp = self._table.get_item(Key={"id": player_id})
         return resp.get("Item")
 
     def put(self, item: dict[str, Any]) -> None:
-        self._table.put_item(Item=item)
+        self._table.put_item(Item=with_sort_keys(item, self.leaderboards))
 
     def delete(self, player_id: str) -> None:
         self._table.delete_item(Key={"id": player_id})
@@ -50,7 +58,8 @@ class TournamentPlayerRepo:
             KeyConditionExpression=Key("team_id").eq(team_id),
         )
 
-    def update(self, player_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
+    def update(self, player_id: str, updates: dict[str, Any], remove: list[str] | None = None) -> dict[str, Any] | None:
+        """SET `updates` (and REMOVE the `remove` attributes)."""
         if not updates:
             return self.get(player_id)
 
@@ -61,10 +70,15 @@ class TournamentPlayerRepo:
             ean[nk] = field
             eav[vk] = value
             parts.append(f"{nk} = {vk}")
+        expression = "SET " + ", ".join(parts)
+        if remove:
+            for i, field in enumerate(remove, start=1):
+                ean[f"#r{i}"] = field
+            expression += " REMOVE " + ", ".join(f"#r{i}" for i in range(1, len(remove) + 1))
 
         resp = self._table.update_item(
             Key={"id": player_id},
-            UpdateExpression="SET " + ", ".join(parts),
+            UpdateExpression=expression,
             ExpressionAttributeValues=eav,
             ExpressionAttributeNames=ean,
             ReturnValues="ALL_NEW",
@@ -72,4 +86,27 @@ class TournamentPlayerRepo:
         return resp.get("Attributes")
 
     def update_stats(self, player_id: str, stats: dict[str, Any]) -> dict[str, Any] | None:
-        return self.update(player_id, {"stats": stats})
+        """Replace `stats`, SETting the leaderboard keys that are non-zero
+        and REMOVEing the rest, so the player leaves those sparse indexes."""
+        keys = sort_key_values(stats, self.leaderboards)
+        zero = [b.attribute for b in self.leaderboards.values() if b.attribute not in keys]
+        return self.update(player_id, {"stats": stats, **keys}, remove=zero)
+
+    def stats_delta(self, player_id: str, delta: dict[str, Any]) -> StatsDelta:
+        """Describe an additive `stats` delta for `apply_stats_deltas`
+        (moving the leaderboard keys along)."""
+        return StatsDelta(self._table, player_id, delta, sort_keys=sort_keys(self.leaderboards))
+
+    def leaderboard_page(
+        self,
+        tournament_id: str,
+        board: str,
+        limit: int | None = None,
+        start_key: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Players of `board` ("scorers", "assists", "cards"), best first."""
+        return query_page(self._table, self.leaderboards[board], tournament_id, limit, start_key)
+
+    def apply_stats_delta(self, player_id: str, delta: dict[str, Any]) -> None:
+        """Atomically ADD `delta`'s counters into this player's `stats`."""
+        apply_stats_deltas([self.stats_delta(player_id, delta)])
@@ -1,7 +1,19 @@
 import os
-from .ddb_session import tournament_table
+import time
+from .ddb_session import tournament_parts_table, tournament_table
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
 from typing import Any
+from .ddb_batch import batch_write
+from .ddb_projection import projection
+from .ddb_stats import StatsDelta, apply_stats_deltas
+
+_GROUP_PREFIX = "GROUP#"
+_BRACKET_SK = "BRACKET"
+# Key / bookkeeping attributes of part items, not part of the group itself.
+_PART_KEYS = ("tournament_id", "sk", "position")
+# Header attributes that held groups / bracket before the TournamentParts split.
+_EMBEDDED = ("groups", "bracket", "bracket_index")
 
 
 def _query_all(table, **kwargs) -> list[dict[str, Any]]:
@@ -22,18 +34,44 @@ def _query_all(table, **kwargs) -> list[dict[str, Any]]:
 class TournamentRepo:
     """DynamoDB-backed repository for the Tournament table.
 
-    Groups and bracket data are stored as embedded JSON attributes
-    on the tournament item.
+    The tournament item is the header (settings, rules, stats, counters)
+    read on nearly every route. Groups and the bracket live in the
+    TournamentParts table as an adjacency list under the tournament's id —
+    partition key `tournament_id`, sort key `GROUP#<group_id>` per group
+    and `BRACKET` for the bracket — so ownership checks don't pay for them
+    and group / bracket writes don't rewrite the header.
+
+    Tournaments that `migrations/split_tournament_parts.py` hasn't reached
+    yet still carry `groups` / `bracket` / `bracket_index` on the header.
+    Group and bracket reads fall back to those while the tournament has no
+    part items, and the first write that finds no part item to update
+    moves them into part items (what the migration does) and retries.
     """
 
     def __init__(self):
         self._table = tournament_table()
+        self._parts = tournament_parts_table()
         self._account_gsi = os.getenv("TOURNAMENT_ACCOUNT_GSI", "account_id_index")
 
     # ── Single-item operations ───────────────────────────────────────
 
-    def get(self, tournament_id: str) -> dict[str, Any] | None:
-        resp = self._table.get_item(Key={"id": tournament_id})
+    def get(self, tournament_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """The tournament item, or only `fields` of it."""
+        resp = self._table.get_item(Key={"id": tournament_id}, **projection(fields))
+        return resp.get("Item")
+
+    def exists_for_account(self, tournament_id: str, account_id: str) -> bool:
+        """Ownership check reading only `account_id`."""
+        item = self.get(tournament_id, fields=["account_id"])
+        return bool(item) and item.get("account_id") == account_id
+
+    def get_version(self, tournament_id: str) -> dict[str, Any] | None:
+        """Just `id`, `version` and `is_public` — the read-cache probe."""
+        resp = self._table.get_item(
+            Key={"id": tournament_id},
+            ProjectionExpression="#id, #ver, is_public",
+            ExpressionAttributeNames={"#id": "id", "#ver": "version"},
+        )
         return resp.get("Item")
 
     def put(self, item: dict[str, Any]) -> None:
@@ -41,6 +79,12 @@ class TournamentRepo:
 
     def delete(self, tournament_id: str) -> None:
         self._table.delete_item(Key={"id": tournament_id})
+        keys = _query_all(
+            self._parts,
+            KeyConditionExpression=Key("tournament_id").eq(tournament_id),
+            ProjectionExpression="tournament_id, sk",
+        )
+        batch_write(self._parts, [{"DeleteRequest": {"Key": k}} for k in keys])
 
     # ── List / query ─────────────────────────────────────────────────
 
@@ -72,16 +116,357 @@ class TournamentRepo:
     def increment_team_count(self, tournament_id: str) -> None:
         self._table.update_item(
             Key={"id": tournament_id},
-            UpdateExpression="ADD team_count :one",
+            UpdateExpression="ADD team_count :one, #ver :one",
+            ExpressionAttributeNames={"#ver": "version"},
             ExpressionAttributeValues={":one": 1},
         )
 
     def decrement_team_count(self, tournament_id: str) -> None:
         self._table.update_item(
             Key={"id": tournament_id},
-            UpdateExpression="ADD team_count :neg",
-            ExpressionAttributeValues={":neg": -1},
+            UpdateExpression="ADD team_count :neg, #ver :one",
+            ExpressionAttributeNames={"#ver": "version"},
+            ExpressionAttributeValues={":neg": -1, ":one": 1},
+        )
+
+    # ── Read-cache version ───────────────────────────────────────────
+    # `version` is bumped by every write to the tournament or anything in
+    # it (teams, players, matches, events). Public reads are cached per
+    # version, so a bump is what invalidates them.
+
+    def bump_version(self, tournament_id: str) -> None:
+        try:
+            self._table.update_item(
+                Key={"id": tournament_id},
+                UpdateExpression="ADD #ver :one",
+                ConditionExpression="attribute_exists(#id)",
+                ExpressionAttributeNames={"#ver": "version", "#id": "id"},
+                ExpressionAttributeValues={":one": 1},
+            )
+        except ClientError as e:
+            # Tournament already deleted — nothing left to invalidate.
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    # ── Open matches per matchweek ───────────────────────────────────
+    # `matchweek_open` maps matchweek (as a string) to the number of its
+    # matches not yet finished; the match service keeps it current and
+    # derives `current_matchweek` from it without listing matches.
+
+    def adjust_open_matches(self, tournament_id: str, deltas: dict[int, int]) -> dict[str, Any] | None:
+        """ADD `deltas` into `matchweek_open` and return the updated item.
+        Returns None when the tournament predates the counters (no map yet
+        — see `seed_open_matches`) or no longer exists."""
+        parts, ean, eav = [], {"#o": "matchweek_open"}, {}
+        for i, (matchweek, delta) in enumerate(deltas.items(), start=1):
+            ean[f"#w{i}"] = str(matchweek)
+            eav[f":d{i}"] = delta
+            parts.append(f"#o.#w{i} :d{i}")
+        if not parts:
+            return None
+        try:
+            resp = self._table.update_item(
+                Key={"id": tournament_id},
+                UpdateExpression="ADD " + ", ".join(parts),
+                ConditionExpression="attribute_exists(#o)",
+                ExpressionAttributeNames=ean,
+                ExpressionAttributeValues=eav,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+        return resp.get("Attributes")
+
+    def seed_open_matches(self, tournament_id: str, counts: dict[int, int]) -> dict[str, Any] | None:
+        """Create `matchweek_open` from a full count, unless another writer
+        got there first. Returns the item either way (None if it's gone)."""
+        try:
+            resp = self._table.update_item(
+                Key={"id": tournament_id},
+                UpdateExpression="SET #o = :m",
+                ConditionExpression="attribute_exists(#id) AND attribute_not_exists(#o)",
+                ExpressionAttributeNames={"#o": "matchweek_open", "#id": "id"},
+                ExpressionAttributeValues={":m": {str(k): v for k, v in counts.items()}},
+                ReturnValues="ALL_NEW",
+            )
+            return resp.get("Attributes")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+        return self.get(tournament_id)
+
+    # ── Groups (part items) ──────────────────────────────────────────
+    # Ordered by `position`: the list index for groups moved out of the
+    # header by the migration, the creation time in ms for new ones.
+    # Every write bumps the header's `version`.
+
+    def list_groups(self, tournament_id: str) -> list[dict[str, Any]]:
+        items = _query_all(
+            self._parts,
+            KeyConditionExpression=(
+                Key("tournament_id").eq(tournament_id) & Key("sk").begins_with(_GROUP_PREFIX)
+            ),
+        )
+        if not items:
+            return self._embedded_groups(tournament_id)
+        items.sort(key=lambda i: i.get("position") or 0)
+        return [_strip_part(i) for i in items]
+
+    def get_group(self, tournament_id: str, group_id: str) -> dict[str, Any] | None:
+        resp = self._parts.get_item(Key=_group_key(tournament_id, group_id))
+        item = resp.get("Item")
+        if item:
+            return _strip_part(item)
+        return next((g for g in self._embedded_groups(tournament_id) if g.get("id") == group_id), None)
+
+    def put_group(self, tournament_id: str, group: dict[str, Any], position: int | None = None) -> None:
+        # A new group part would hide the embedded ones from `list_groups`.
+        self._move_embedded(tournament_id)
+        if position is None:
+            position = int(time.time() * 1000)
+        self._parts.put_item(
+            Item={**_group_key(tournament_id, group["id"]), "position": position, **group}
         )
+        self.bump_version(tournament_id)
+
+    def update_group(self, tournament_id: str, group_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
+        """SET `updates` on an existing group; None if it doesn't exist."""
+        if not updates:
+            return self.get_group(tournament_id, group_id)
+        result = self._update_group(tournament_id, group_id, updates)
+        if result is None and self._move_embedded(tournament_id):
+            result = self._update_group(tournament_id, group_id, updates)
+        return result
+
+    def _update_group(self, tournament_id: str, group_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
+        parts, eav, ean = [], {}, {"#sk": "sk"}
+        for i, (field, value) in enumerate(updates.items(), start=1):
+            ean[f"#n{i}"] = field
+            eav[f":v{i}"] = value
+            parts.append(f"#n{i} = :v{i}")
+        try:
+            resp = self._parts.update_item(
+                Key=_group_key(tournament_id, group_id),
+                UpdateExpression="SET " + ", ".join(parts),
+                ConditionExpression="attribute_exists(#sk)",
+                ExpressionAttributeNames=ean,
+                ExpressionAttributeValues=eav,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+        self.bump_version(tournament_id)
+        return _strip_part(resp["Attributes"])
+
+    def delete_group(self, tournament_id: str, group_id: str) -> bool:
+        resp = self._parts.delete_item(
+            Key=_group_key(tournament_id, group_id), ReturnValues="ALL_OLD"
+        )
+        if not resp.get("Attributes"):
+            if not self._move_embedded(tournament_id):
+                return False
+            return self.delete_group(tournament_id, group_id)
+        self.bump_version(tournament_id)
+        return True
+
+    def add_group_team(self, tournament_id: str, group_id: str, entry: dict[str, Any]) -> dict[str, Any] | None:
+        """Append `entry` ({"team_id", "seed"?}) to the group's `teams`.
+        None if the group doesn't exist."""
+        return self._update_group_teams(
+            tournament_id, group_id,
+            "SET #t = list_append(if_not_exists(#t, :empty), :entry)",
+            "attribute_exists(sk)",
+            {":empty": [], ":entry": [entry]},
+        )
+
+    def remove_group_team(self, tournament_id: str, group_id: str, index: int, team_id: str) -> dict[str, Any] | None:
+        """Remove `teams[index]`, provided it's still `team_id` (another
+        removal may have shifted the list since it was read). None if the
+        group or that entry is gone."""
+        return self._update_group_teams(
+            tournament_id, group_id,
+            f"REMOVE #t[{int(index)}]",
+            f"#t[{int(index)}].team_id = :team",
+            {":team": team_id},
+        )
+
+    def _update_group_teams(
+        self, tournament_id: str, group_id: str, update: str, condition: str, eav: dict[str, Any],
+        retry: bool = True,
+    ) -> dict[str, Any] | None:
+        try:
+            resp = self._parts.update_item(
+                Key=_group_key(tournament_id, group_id),
+                UpdateExpression=update,
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#t": "teams"},
+                ExpressionAttributeValues=eav,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            if retry and self._move_embedded(tournament_id):
+                return self._update_group_teams(tournament_id, group_id, update, condition, eav, retry=False)
+            return None
+        self.bump_version(tournament_id)
+        return _strip_part(resp["Attributes"])
+
+    # ── Bracket (part item) ──────────────────────────────────────────
+    # The bracket item holds `bracket` (round -> list of slots) and
+    # `bracket_index` (match_id -> {"round", "index"}). Advancing a
+    # winner SETs only the slot fields that changed
+    # (`bracket.<round>[i].<field>`), so concurrent advances on different
+    # slots don't overwrite each other and nothing is rewritten whole.
+
+    def get_bracket(self, tournament_id: str, rounds: list[str] | None = None) -> dict[str, Any] | None:
+        """The bracket item (`bracket`, `bracket_index`), or None if the
+        tournament has no bracket. With `rounds`, only those rounds of
+        `bracket` are read (e.g. `["final"]` for the champion)."""
+        kwargs: dict[str, Any] = {"Key": {"tournament_id": tournament_id, "sk": _BRACKET_SK}}
+        if rounds:
+            ean = {"#b": "bracket"}
+            paths = []
+            for i, round_name in enumerate(rounds):
+                ean[f"#r{i}"] = round_name
+                paths.append(f"#b.#r{i}")
+            kwargs["ProjectionExpression"] = ", ".join(paths)
+            kwargs["ExpressionAttributeNames"] = ean
+        item = self._parts.get_item(**kwargs).get("Item")
+        if item is None:
+            return self._embedded_bracket(tournament_id, rounds)
+        item.setdefault("bracket", {})
+        return item
+
+    def put_bracket(self, tournament_id: str, bracket: dict[str, Any]) -> None:
+        """Replace the bracket (and reset its index)."""
+        self._parts.put_item(Item={
+            "tournament_id": tournament_id,
+            "sk": _BRACKET_SK,
+            "bracket": bracket,
+            "bracket_index": {},
+        })
+        self.bump_version(tournament_id)
+
+    def update_bracket_slots(
+        self,
+        tournament_id: str,
+        slots: dict[tuple[str, int], dict[str, Any]],
+        index_entries: dict[str, dict[str, Any]] | None = None,
+        replace_index: bool = False,
+    ) -> dict[str, Any] | None:
+        """SET `{(round, index): {field: value}}` on bracket slots and add
+        `index_entries` to `bracket_index` (or write it whole with
+        `replace_index`, for brackets that don't have one yet). Returns
+        the updated bracket item, or None if there is no bracket."""
+        updated = self._update_bracket_slots(tournament_id, slots, index_entries, replace_index)
+        if updated is None and self._move_embedded(tournament_id):
+            updated = self._update_bracket_slots(tournament_id, slots, index_entries, replace_index)
+        return updated
+
+    def _update_bracket_slots(
+        self,
+        tournament_id: str,
+        slots: dict[tuple[str, int], dict[str, Any]],
+        index_entries: dict[str, dict[str, Any]] | None,
+        replace_index: bool,
+    ) -> dict[str, Any] | None:
+        parts, ean = [], {"#b": "bracket"}
+        eav: dict[str, Any] = {}
+        names: dict[str, str] = {}
+
+        def name(prefix: str, value: str) -> str:
+            if value not in names:
+                names[value] = f"#{prefix}{len(names)}"
+                ean[names[value]] = value
+            return names[value]
+
+        for (round_name, index), fields in slots.items():
+            rk = name("r", round_name)
+            for field, value in fields.items():
+                vk = f":v{len(eav)}"
+                eav[vk] = value
+                parts.append(f"#b.{rk}[{int(index)}].{name('f', field)} = {vk}")
+
+        if index_entries:
+            ean["#ix"] = "bracket_index"
+            if replace_index:
+                eav[":ix"] = index_entries
+                parts.append("#ix = :ix")
+            else:
+                for match_id, loc in index_entries.items():
+                    vk = f":v{len(eav)}"
+                    eav[vk] = loc
+                    parts.append(f"#ix.{name('m', match_id)} = {vk}")
+
+        if not parts:
+            return self.get_bracket(tournament_id)
+        try:
+            resp = self._parts.update_item(
+                Key={"tournament_id": tournament_id, "sk": _BRACKET_SK},
+                UpdateExpression="SET " + ", ".join(parts),
+                ConditionExpression="attribute_exists(#b)",
+                ExpressionAttributeNames=ean,
+                ExpressionAttributeValues=eav,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+        self.bump_version(tournament_id)
+        return resp.get("Attributes")
+
+    # ── Embedded groups / bracket (not yet migrated) ─────────────────
+
+    def _embedded_groups(self, tournament_id: str) -> list[dict[str, Any]]:
+        item = self.get(tournament_id, fields=["groups"])
+        return (item or {}).get("groups") or []
+
+    def _embedded_bracket(self, tournament_id: str, rounds: list[str] | None = None) -> dict[str, Any] | None:
+        """`get_bracket` of the header's embedded bracket; None if it has none."""
+        item = self.get(tournament_id, fields=["bracket", "bracket_index"])
+        if not item or not item.get("bracket"):
+            return None
+        if rounds:
+            item = {"bracket": {r: item["bracket"][r] for r in rounds if r in item["bracket"]}}
+        return item
+
+    def _move_embedded(self, tournament_id: str) -> bool:
+        """Move the header's embedded groups / bracket into part items, as
+        `split_tournament_parts` does (part items that already exist are
+        kept). False if there was nothing to move."""
+        item = self.get(tournament_id, fields=list(_EMBEDDED))
+        present = [name for name in _EMBEDDED if item and name in item]
+        if not present:
+            return False
+        parts = [
+            {**group, **_group_key(tournament_id, group["id"]), "position": i}
+            for i, group in enumerate(item.get("groups") or [])
+        ]
+        if item.get("bracket"):
+            parts.append({
+                "tournament_id": tournament_id,
+                "sk": _BRACKET_SK,
+                "bracket": item["bracket"],
+                "bracket_index": item.get("bracket_index") or {},
+            })
+        for part in parts:
+            try:
+                self._parts.put_item(Item=part, ConditionExpression="attribute_not_exists(sk)")
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+        self._table.update_item(
+            Key={"id": tournament_id},
+            UpdateExpression="REMOVE " + ", ".join(f"#a{i}" for i in range(len(present))),
+            ExpressionAttributeNames={f"#a{i}": name for i, name in enumerate(present)},
+        )
+        return True
 
     # ── Partial update ───────────────────────────────────────────────
 
@@ -97,9 +482,11 @@ class TournamentRepo:
             eav[vk] = value
             parts.append(f"{nk} = {vk}")
 
+        ean["#ver"] = "version"
+        eav[":one"] = 1
         resp = self._table.update_item(
             Key={"id": tournament_id},
-            UpdateExpression="SET " + ", ".join(parts),
+            UpdateExpression="SET " + ", ".join(parts) + " ADD #ver :one",
             ExpressionAttributeValues=eav,
             ExpressionAttributeNames=ean,
             ReturnValues="ALL_NEW",
@@ -108,3 +495,19 @@ class TournamentRepo:
 
     def update_stats(self, tournament_id: str, stats: dict[str, Any]) -> dict[str, Any] | None:
         return self.update(tournament_id, {"stats": stats})
+
+    def stats_delta(self, tournament_id: str, delta: dict[str, Any]) -> StatsDelta:
+        """Describe an additive `stats` delta for `apply_stats_deltas`."""
+        return StatsDelta(self._table, tournament_id, delta, bump_version=True)
+
+    def apply_stats_delta(self, tournament_id: str, delta: dict[str, Any]) -> None:
+        """Atomically ADD `delta`'s counters into this tournament's `stats`."""
+        apply_stats_deltas([self.stats_delta(tournament_id, delta)])
+
+
+def _group_key(tournament_id: str, group_id: str) -> dict[str, str]:
+    return {"tournament_id": tournament_id, "sk": f"{_GROUP_PREFIX}{group_id}"}
+
+
+def _strip_part(item: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in item.items() if k not in _PART_KEYS}
@@ -1,7 +1,11 @@
 import os
 from .ddb_session import tournament_team_table
+from .ddb_batch import batch_get
+from .ddb_projection import projection
 from boto3.dynamodb.conditions import Key
 from typing import Any
+from .ddb_stats import StatsDelta, apply_stats_deltas, update_form
+from .ddb_leaderboard import Leaderboard, query_page, sort_key_values, sort_keys, with_sort_keys, CARD_WEIGHTS
 
 
 def _query_all(table, **kwargs) -> list[dict[str, Any]]:
@@ -25,13 +29,24 @@ class TournamentTeamRepo:
         self._table = tournament_team_table()
         self._tournament_gsi = os.getenv("TEAM_TOURNAMENT_GSI", "tournament_index")
         self._group_gsi = os.getenv("TEAM_GROUP_GSI", "group_index")
+        # Sparse GSI (tournament_id, lb_cards) — see `ddb_leaderboard`.
+        self.leaderboards = {
+            "cards": Leaderboard("lb_cards", os.getenv("TEAM_CARDS_GSI", "cards_index"), CARD_WEIGHTS),
+        }
 
-    def get(self, team_id: str) -> dict[str, Any] | None:
-        resp = self._table.get_item(Key={"id": team_id})
+    def get(self, team_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """The team, or only `fields` of it."""
+        resp = self._table.get_item(Key={"id": team_id}, **projection(fields))
         return resp.get("Item")
 
+    def get_many(self, team_ids: list[str], fields: list[str] | None = None) -> list[dict[str, Any]]:
+        """The teams among `team_ids` that exist, in no particular order
+        (BatchGetItem). Include "id" in `fields` to tell them apart."""
+        keys = [{"id": t} for t in dict.fromkeys(team_ids)]
+        return batch_get(self._table, keys, fields=fields)
+
     def put(self, item: dict[str, Any]) -> None:
-        self._table.put_item(Item=item)
+        self._table.put_item(Item=with_sort_keys(item, self.leaderboards))
 
     def delete(self, team_id: str) -> None:
         self._table.delete_item(Key={"id": team_id})
@@ -76,7 +91,8 @@ class TournamentTeamRepo:
             ExpressionAttributeNames={"#g": "group_id"},
         )
 
-    def update(self, team_id: str, updates: dict[str, Any]) -> dict[str, Any] | None:
+    def update(self, team_id: str, updates: dict[str, Any], remove: list[str] | None = None) -> dict[str, Any] | None:
+        """SET `updates` (and REMOVE the `remove` attributes)."""
         if not updates:
             return self.get(team_id)
 
@@ -87,10 +103,15 @@ class TournamentTeamRepo:
             ean[nk] = field
             eav[vk] = value
             parts.append(f"{nk} = {vk}")
+        expression = "SET " + ", ".join(parts)
+        if remove:
+            for i, field in enumerate(remove, start=1):
+                ean[f"#r{i}"] = field
+            expression += " REMOVE " + ", ".join(f"#r{i}" for i in range(1, len(remove) + 1))
 
         resp = self._table.update_item(
             Key={"id": team_id},
-            UpdateExpression="SET " + ", ".join(parts),
+            UpdateExpression=expression,
             ExpressionAttributeValues=eav,
             ExpressionAttributeNames=ean,
             ReturnValues="ALL_NEW",
@@ -98,4 +119,31 @@ class TournamentTeamRepo:
         return resp.get("Attributes")
 
     def update_stats(self, team_id: str, stats: dict[str, Any]) -> dict[str, Any] | None:
-        return self.update(team_id, {"stats": stats})
+        """Replace `stats`, SETting the leaderboard keys that are non-zero
+        and REMOVEing the rest, so the team leaves those sparse indexes."""
+        keys = sort_key_values(stats, self.leaderboards)
+        zero = [b.attribute for b in self.leaderboards.values() if b.attribute not in keys]
+        return self.update(team_id, {"stats": stats, **keys}, remove=zero)
+
+    def stats_delta(self, team_id: str, delta: dict[str, Any]) -> StatsDelta:
+        """Describe an additive `stats` delta for `apply_stats_deltas`
+        (moving the leaderboard keys along)."""
+        return StatsDelta(self._table, team_id, delta, sort_keys=sort_keys(self.leaderboards))
+
+    def leaderboard_page(
+        self,
+        tournament_id: str,
+        board: str,
+        limit: int | None = None,
+        start_key: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """Teams of `board` ("cards"), best first."""
+        return query_page(self._table, self.leaderboards[board], tournament_id, limit, start_key)
+
+    def apply_stats_delta(self, team_id: str, delta: dict[str, Any]) -> None:
+        """Atomically ADD `delta`'s counters into this team's `stats`."""
+        apply_stats_deltas([self.stats_delta(team_id, delta)])
+
+    def update_form(self, team_id: str, delta: dict[str, Any]) -> None:
+        """Apply the `form` / `form_remove` part of a match-outcome delta."""
+        update_form(self._table, team_id, delta)
@@ -1,25 +1,57 @@
 import json
 import logging
 import os
+import time
 import urllib.request
 
-from di import get_payment_request_service
+from di import get_notification_outbox, get_payment_request_service
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
+def _deadline(context, reserve_s: float) -> float | None:
+    """time.monotonic() deadline leaving `reserve_s` of the invocation's
+    remaining time for wrapping up (None when run outside Lambda)."""
+    if not context:
+        return None
+    remaining_s = context.get_remaining_time_in_millis() / 1000
+    return time.monotonic() + max(remaining_s - reserve_s, 1)
+
+
 def handler(event, context):
     try:
         svc = get_payment_request_service()
-        result = svc.process_overdue_payments()
-        logger.info("Processed %d overdue payments", len(result))
-        return {"processed": len(result), "payments": result}
+        result = svc.process_overdue_payments(deadline=_deadline(context, reserve_s=15))
+        payments = result["payments"]
+        logger.info(
+            "Processed %d overdue payments across %d account(s)%s",
+            len(payments), len(result["accounts"]), "" if result["complete"] else " (stopped at deadline)",
+        )
+        if result["errors"]:
+            failed = "\n".join(f"{a}: {e}" for a, e in result["errors"].items())
+            _notify_slack(f":warning: *Overdue payments failed for some accounts*\n```{failed}```")
+        return {
+            "processed": len(payments),
+            "payments": payments,
+            "accounts": result["accounts"],
+            "complete": result["complete"],
+        }
     except Exception as e:
         _notify_slack(f":red_circle: *Scheduled payment processor failed*\n```{e}```")
         raise
 
 
+def drain_outbox(event, context):
+    """Deliver pending notification intents, stopping well before the
+    invocation times out (whatever is left waits for the next run)."""
+    summary = get_notification_outbox().drain(
+        limit=int(os.environ.get("OUTBOX_DRAIN_LIMIT", "500")), deadline=_deadline(context, reserve_s=10)
+    )
+    logger.info("Outbox drain: %s", summary)
+    return summary
+
+
 def _notify_slack(message: str):
     url = os.environ.get("SLACK_WEBHOOK_URL")
     if not url:
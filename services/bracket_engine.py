@@ -0,0 +1,376 @@
+"""Bracket engine — pure functions over a tournament's knockout bracket
+(its `BRACKET` part item, see TournamentRepo). No I/O; TournamentService
+reads the bracket and writes back only the slot fields returned here.
+
+The bracket keeps its shape — `{round_name: [slot, ...]}` — and every
+slot now says where its teams go next:
+
+    {"team1_id", "team2_id", "match_id", "winner_team_id", "score",
+     "status": "pending" | "finished" | "bye",
+     "winner_to": {"round", "index", "side"} | None,
+     "loser_to":  {"round", "index", "side"} | None,
+     "team1_bye" / "team2_bye": True when that side will never be filled}
+
+so advancing is a lookup instead of positional arithmetic over a sorted
+round list, and the same code drives single elimination, the third-place
+match (semi-final losers) and double elimination (winners-bracket losers
+drop into `losersRoundN`; the grand final is `final`, so the champion is
+still `final[0].winner_team_id`). There is no bracket-reset match.
+
+Byes: an empty first-round side is marked as a bye and the slot's other
+team advances at generation time. A side fed by a bye is itself a bye,
+so byes cascade (e.g. into the losers bracket) until a real match.
+
+`match_id -> (round, index)` lives next to the bracket in the part item's
+`bracket_index` map (see `build_index` / `locate`).
+
+Brackets generated before the links existed advance positionally (slot i
+of a round feeds slot i // 2 of the next round in `ROUND_ORDER`).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Canonical progression order — used to sort rounds of brackets without
+# links, regardless of the key order DynamoDB returns (which is not
+# guaranteed to match insertion order).
+ROUND_ORDER = [
+    "roundOf64", "roundOf32", "roundOf16", "quarterFinals", "semiFinals",
+    "winnersFinal", "thirdPlace", "final",
+]
+
+SINGLE_ELIMINATION = "single_elimination"
+DOUBLE_ELIMINATION = "double_elimination"
+
+Location = tuple[str, int]
+SlotChanges = dict[Location, dict[str, Any]]
+
+
+# ── Generation ─────────────────────────────────────────────────────────
+
+
+def seed_positions(size: int) -> list[int]:
+    """Return the position indices for standard bracket seeding.
+
+    Produces the ordering so that consecutive pairs give:
+      (seed 1 vs seed N), (seed 4 vs seed N-3), (seed 2 vs seed N-1), ...
+    ensuring top seeds never meet until later rounds.
+    """
+    if size == 1:
+        return [0]
+    half = size // 2
+    top = seed_positions(half)
+    bottom = [size - 1 - i for i in top]
+    return [x for pair in zip(top, bottom) for x in pair]
+
+
+def _round_name(matches: int) -> str:
+    if matches == 1:
+        return "final"
+    if matches == 2:
+        return "semiFinals"
+    if matches == 4:
+        return "quarterFinals"
+    return f"roundOf{matches * 2}"
+
+
+def _target(round_name: str, index: int, side: str) -> dict[str, Any]:
+    return {"round": round_name, "index": index, "side": side}
+
+
+def _side(index: int) -> str:
+    return "team1" if index % 2 == 0 else "team2"
+
+
+def _slot() -> dict[str, Any]:
+    return {
+        "team1_id": None,
+        "team2_id": None,
+        "match_id": None,
+        "winner_team_id": None,
+        "score": {"team1": None, "team2": None},
+        "status": "pending",
+        "winner_to": None,
+        "loser_to": None,
+    }
+
+
+def build_bracket(
+    team_ids: list[str],
+    seed_map: dict | None = None,
+    fmt: str = SINGLE_ELIMINATION,
+    third_place: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    """Build a linked bracket for `team_ids`, padded with byes to the next
+    power of two, with byes already advanced.
+
+    When seed_map is provided teams are reordered using standard bracket
+    seeding so that seed 1 faces the lowest seed, seed 2 faces the second
+    lowest, etc.  This produces correct cross-group matchups for hybrid
+    tournaments (e.g. Group A 1st vs Group B 2nd). Without one, the order
+    of `team_ids` is the seed order; either way the byes go to the top
+    seeds, so no first-round slot is bye against bye. Double elimination and
+    `third_place` need at least 3 teams; in double elimination the losers
+    bracket already decides third place, so `third_place` is ignored.
+    """
+    n = len(team_ids)
+    if n < 2:
+        return {}
+
+    # Pad to next power of 2
+    size = 1
+    while size < n:
+        size *= 2
+
+    seeded_teams = [t for t in team_ids if t is not None]
+    if seed_map:
+        # Sort teams by seed (unseeded / None last).
+        seeded_teams.sort(key=lambda t: seed_map.get(t, 9999))
+    # Standard bracket seeding order: top seeds on opposite sides, and the
+    # byes (the lowest "seeds") each facing a top seed.
+    seed_ordered = seeded_teams + [None] * (size - len(seeded_teams))
+    padded = [seed_ordered[i] for i in seed_positions(size)]
+
+    double = fmt == DOUBLE_ELIMINATION and size >= 4
+    winners = _winners_rounds(size, double)
+
+    bracket: dict[str, list[dict[str, Any]]] = {}
+    for r, (name, count) in enumerate(winners):
+        slots = [_slot() for _ in range(count)]
+        if r + 1 < len(winners):
+            next_name = winners[r + 1][0]
+            for i, slot in enumerate(slots):
+                slot["winner_to"] = _target(next_name, i // 2, _side(i))
+        bracket[name] = slots
+
+    for i, slot in enumerate(bracket[winners[0][0]]):
+        slot["team1_id"], slot["team2_id"] = padded[2 * i], padded[2 * i + 1]
+        if seed_map:
+            slot["seed1"] = seed_map.get(slot["team1_id"]) if slot["team1_id"] else None
+            slot["seed2"] = seed_map.get(slot["team2_id"]) if slot["team2_id"] else None
+
+    if double:
+        _add_losers_bracket(bracket, winners, size)
+    elif third_place and size >= 4:
+        bracket["thirdPlace"] = [_slot()]
+        for i, slot in enumerate(bracket["semiFinals"]):
+            slot["loser_to"] = _target("thirdPlace", 0, _side(i))
+
+    # Empty first-round sides are byes; advance whoever faces one.
+    changes: SlotChanges = {}
+    for i, slot in enumerate(bracket[winners[0][0]]):
+        for side in ("team1", "team2"):
+            if slot[f"{side}_id"] is None:
+                slot[f"{side}_bye"] = True
+        _settle(bracket, changes, (winners[0][0], i))
+    return bracket
+
+
+def _winners_rounds(size: int, double: bool) -> list[tuple[str, int]]:
+    rounds = []
+    count = size // 2
+    while count >= 1:
+        rounds.append((_round_name(count), count))
+        count //= 2
+    if double:
+        # The winners bracket ends in `winnersFinal`; `final` is the grand
+        # final against the losers-bracket winner.
+        rounds[-1] = ("winnersFinal", 1)
+        rounds.append(("final", 1))
+    return rounds
+
+
+def _add_losers_bracket(
+    bracket: dict[str, list[dict[str, Any]]],
+    winners: list[tuple[str, int]],
+    size: int,
+) -> None:
+    """Losers rounds for a double-elimination bracket of `size` (>= 4).
+
+    With k winners rounds before the grand final there are 2(k-1) losers
+    rounds: odd ones pair up survivors (the first pairs up round-1
+    losers), even ones play those survivors against the losers dropping
+    from winners round i+1 — in mirrored order, to avoid early rematches.
+    """
+    wb = winners[:-1]  # without the grand final
+    k = len(wb)
+    losers: list[str] = []
+    for i in range(1, k):
+        count = size // 2 ** (i + 1)
+        odd, even = f"losersRound{2 * i - 1}", f"losersRound{2 * i}"
+        bracket[odd] = [_slot() for _ in range(count)]
+        bracket[even] = [_slot() for _ in range(count)]
+        losers += [odd, even]
+
+        # Feeds into the odd round: winners round 1 losers, or the previous
+        # even round's winners.
+        feeders = bracket[wb[0][0]] if i == 1 else bracket[losers[-3]]
+        key = "loser_to" if i == 1 else "winner_to"
+        for j, slot in enumerate(feeders):
+            slot[key] = _target(odd, j // 2, _side(j))
+        for j, slot in enumerate(bracket[odd]):
+            slot["winner_to"] = _target(even, j, "team1")
+        for j, slot in enumerate(bracket[wb[i][0]]):
+            slot["loser_to"] = _target(even, count - 1 - j, "team2")
+
+    bracket[wb[-1][0]][0]["winner_to"] = _target("final", 0, "team1")
+    bracket[losers[-1]][0]["winner_to"] = _target("final", 0, "team2")
+    # Keep the grand final last in insertion order.
+    bracket["final"] = bracket.pop("final")
+
+
+def build_index(bracket: dict[str, list[dict[str, Any]]]) -> dict[str, dict[str, Any]]:
+    """`match_id -> {"round", "index"}` for every slot with a match."""
+    return {
+        slot["match_id"]: {"round": round_name, "index": i}
+        for round_name, slots in bracket.items()
+        for i, slot in enumerate(slots)
+        if slot.get("match_id")
+    }
+
+
+# ── Lookup ─────────────────────────────────────────────────────────────
+
+
+def round_order(bracket: dict[str, list[dict[str, Any]]]) -> list[str]:
+    known = [r for r in ROUND_ORDER if r in bracket]
+    return known + [r for r in bracket if r not in ROUND_ORDER]
+
+
+def _slot_at(bracket: dict[str, list[dict[str, Any]]], loc: Location) -> dict[str, Any] | None:
+    slots = bracket.get(loc[0]) or []
+    return slots[loc[1]] if 0 <= loc[1] < len(slots) else None
+
+
+def locate(
+    bracket: dict[str, list[dict[str, Any]]],
+    index: dict[str, Any] | None,
+    match_id: str,
+    teams: tuple[str | None, str | None] | None = None,
+) -> tuple[Location | None, bool]:
+    """Find the slot of `match_id`. Returns (location, from_index).
+
+    Uses `index` first; falls back to scanning for the slot's match_id,
+    then (slots linked before match_ids were stored) for a pending slot
+    with the same two teams. `from_index` is False when the caller should
+    add the location to the index.
+    """
+    entry = (index or {}).get(match_id)
+    if entry:
+        loc = (entry["round"], int(entry["index"]))
+        slot = _slot_at(bracket, loc)
+        if slot is not None and slot.get("match_id") in (match_id, None):
+            return loc, True
+
+    for round_name, slots in bracket.items():
+        for i, slot in enumerate(slots):
+            if slot.get("match_id") == match_id:
+                return (round_name, i), False
+
+    if teams and all(teams):
+        for round_name in round_order(bracket):
+            for i, slot in enumerate(bracket[round_name]):
+                if {slot.get("team1_id"), slot.get("team2_id")} == set(teams):
+                    return (round_name, i), False
+    return None, False
+
+
+# ── Advancing ──────────────────────────────────────────────────────────
+
+
+def _set(bracket: dict[str, list[dict[str, Any]]], changes: SlotChanges, loc: Location, field: str, value: Any) -> None:
+    """Apply one slot field both in memory and to the change set."""
+    _slot_at(bracket, loc)[field] = value
+    changes.setdefault(loc, {})[field] = value
+
+
+def _next(bracket: dict[str, list[dict[str, Any]]], loc: Location, key: str) -> dict[str, Any] | None:
+    slot = _slot_at(bracket, loc)
+    if key in slot:
+        return slot[key]
+    if key == "loser_to":
+        return None
+    # Legacy bracket without links: positional single elimination.
+    order = round_order(bracket)
+    r = order.index(loc[0])
+    if r + 1 >= len(order):
+        return None
+    return _target(order[r + 1], loc[1] // 2, _side(loc[1]))
+
+
+def _place(bracket, changes: SlotChanges, target: dict[str, Any] | None, team_id: str | None) -> None:
+    """Put `team_id` into `target`'s side, or mark the side as a bye when
+    no team will ever come from there."""
+    if not target:
+        return
+    loc = (target["round"], int(target["index"]))
+    slot = _slot_at(bracket, loc)
+    if slot is None:
+        return
+    side = target["side"]
+    _set(bracket, changes, loc, f"{side}_id", team_id)
+    if team_id is None:
+        _set(bracket, changes, loc, f"{side}_bye", True)
+    elif slot.get(f"{side}_bye"):
+        _set(bracket, changes, loc, f"{side}_bye", False)
+    _settle(bracket, changes, loc)
+
+
+def _settle(bracket, changes: SlotChanges, loc: Location) -> None:
+    """Resolve a slot that one or both sides can only reach as a bye."""
+    slot = _slot_at(bracket, loc)
+    if slot.get("status") != "pending":
+        return
+    byes = [bool(slot.get("team1_bye")), bool(slot.get("team2_bye"))]
+    if not any(byes):
+        return
+    teams = [slot.get("team1_id"), slot.get("team2_id")]
+    if byes[0] and byes[1]:
+        winner = None
+    elif byes[0] and teams[1]:
+        winner = teams[1]
+    elif byes[1] and teams[0]:
+        winner = teams[0]
+    else:
+        return  # still waiting for the other side
+    _set(bracket, changes, loc, "winner_team_id", winner)
+    _set(bracket, changes, loc, "status", "bye")
+    _place(bracket, changes, _next(bracket, loc, "winner_to"), winner)
+    _place(bracket, changes, _next(bracket, loc, "loser_to"), None)
+
+
+def advance(
+    bracket: dict[str, list[dict[str, Any]]],
+    loc: Location,
+    winner_team_id: str,
+    match_id: str | None = None,
+    score: dict[str, int] | None = None,
+) -> SlotChanges:
+    """Record `winner_team_id` for the slot at `loc` and move the winner
+    (and, where the slot says so, the loser) on. Mutates `bracket` and
+    returns `{(round, index): {field: value}}` for every slot touched —
+    the fields to write back, nothing else.
+
+    Raises ValueError if the winner isn't one of the slot's teams.
+    """
+    slot = _slot_at(bracket, loc)
+    participants = [t for t in (slot.get("team1_id"), slot.get("team2_id")) if t]
+    if participants and winner_team_id not in participants:
+        raise ValueError(
+            f"winner_team_id '{winner_team_id}' is not a participant in this match"
+        )
+    changes: SlotChanges = {}
+    # Self-heal: persist match_id if it was missing from the slot
+    if match_id and not slot.get("match_id"):
+        _set(bracket, changes, loc, "match_id", match_id)
+    _set(bracket, changes, loc, "winner_team_id", winner_team_id)
+    _set(bracket, changes, loc, "status", "finished")
+    if score is not None:
+        _set(bracket, changes, loc, "score", score)
+
+    loser = next((t for t in participants if t != winner_team_id), None)
+    _place(bracket, changes, _next(bracket, loc, "winner_to"), winner_team_id)
+    if loser:
+        _place(bracket, changes, _next(bracket, loc, "loser_to"), loser)
+    return changes
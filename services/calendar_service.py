@@ -7,13 +7,15 @@ from services.tour_service import TourService
 from api.schemas.calendar import ParticipationRequest, PutCalendarEvent
 from repositories.calendar_repo_ddb import CalendarRepo
 from services.notification_orchestator import Notifications
+from services.notification_outbox import NotificationOutbox
 from builders.tour_builder import build_tour_from_calendar_event
 
 
 class CalendarService:
-    def __init__(self, repo: CalendarRepo, s3: S3Adapter, notifier: Notifications, tour_svc: TourService, user_svc: UserService):
+    def __init__(self, repo: CalendarRepo, s3: S3Adapter, notifier: Notifications, tour_svc: TourService, user_svc: UserService, outbox: NotificationOutbox):
         self.repo = repo
         self.notifier = notifier
+        self.outbox = outbox
         self.s3 = s3
         self.tour_svc = tour_svc
         self.user_svc = user_svc
@@ -42,7 +44,12 @@ class CalendarService:
 
         users = self.user_svc.list_users(account_id, group=calendar_item.group, include_disabled=False)
         user_emails = [user["email"] for user in users]
-        self.notifier.calendar_event_created(user_emails=user_emails, calendar_event=calendar_item)
+        self.outbox.enqueue(
+            "calendar_event_created",
+            dedup_key=f"calendar_event_created:{new_calendar_event['id']}",
+            user_emails=user_emails,
+            calendar_event=calendar_item,
+        )
         
         put_tour.calendarEventId = new_calendar_event["id"]
         self.tour_svc.create(put_tour, account_id)
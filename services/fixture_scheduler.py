@@ -0,0 +1,184 @@
+"""Fixture scheduler — pure functions that turn team lists into dated,
+venue-assigned round-robin fixtures. No I/O; the match service fetches
+inputs and persists the result.
+
+- `round_robin` builds the rounds for one group (circle method). Odd
+  team counts get a bye each round. Home/away is assigned greedily from
+  each team's running home-minus-away balance, which keeps it within ±1
+  (±2 with byes) per leg and avoids long home or away streaks. Later
+  legs mirror the first with home/away swapped.
+- `SlotPlanner` places each matchweek on the calendar. All groups'
+  round N share matchweek N, so the planner sees every group at once and
+  never books a venue + kickoff slot twice, nor a team twice on one
+  day. Matches that don't fit a match day spill onto the following days,
+  and later matchweeks shift accordingly. Existing matches can be passed
+  as already booked.
+
+Without an explicit `venues` list the venue is not a constrained
+resource (every match gets `default_venue`, as before) and only team
+clashes are checked.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable
+
+# A planner never looks further than this past a matchweek's nominal day
+# for a free slot — a guard against impossible constraints.
+_MAX_SPILL_DAYS = 366
+
+
+# ── Round robin ────────────────────────────────────────────────────────
+
+
+def round_robin(
+    team_ids: list[str], legs: int = 1
+) -> tuple[list[list[tuple[str, str]]], list[list[str]]]:
+    """Return (rounds, byes) for a single round-robin group.
+
+    `rounds[i]` is the list of (home, away) pairs of round i; `byes[i]`
+    the teams sitting that round out (at most one). With `legs=2` the
+    second half mirrors the first with home and away swapped.
+    """
+    teams: list[str | None] = list(team_ids)
+    if len(teams) < 2:
+        return [], []
+    if len(teams) % 2 == 1:
+        teams.append(None)
+    n = len(teams)
+
+    balance = {t: 0 for t in team_ids}  # home games minus away games
+    last_home: dict[str, bool] = {}
+
+    def orient(a: str, b: str) -> tuple[str, str]:
+        # The team further behind on home games hosts; on a tie, whoever
+        # was away last time.
+        key_a = (balance[a], last_home.get(a, False))
+        key_b = (balance[b], last_home.get(b, False))
+        home, away = (b, a) if key_b < key_a else (a, b)
+        balance[home] += 1
+        balance[away] -= 1
+        last_home[home], last_home[away] = True, False
+        return home, away
+
+    first_leg: list[list[tuple[str, str]]] = []
+    byes: list[list[str]] = []
+    fixed, rotating = teams[0], teams[1:]
+    for _ in range(n - 1):
+        line = [fixed] + rotating
+        pairs, bye = [], []
+        for i in range(n // 2):
+            a, b = line[i], line[n - 1 - i]
+            if a is None or b is None:
+                bye.append(a if b is None else b)
+                continue
+            pairs.append(orient(a, b))
+        first_leg.append(pairs)
+        byes.append([t for t in bye if t is not None])
+        rotating = rotating[-1:] + rotating[:-1]
+
+    rounds = list(first_leg)
+    all_byes = list(byes)
+    for leg in range(1, int(legs)):
+        for pairs, bye in zip(first_leg, byes):
+            rounds.append([(away, home) if leg % 2 else (home, away) for home, away in pairs])
+            all_byes.append(list(bye))
+    return rounds, all_byes
+
+
+def merge_groups(
+    groups: list[tuple[str, list[str]]], legs: int = 1
+) -> list[dict[str, Any]]:
+    """Round robins for several groups merged by matchweek.
+
+    Returns one entry per matchweek: {"matchweek", "fixtures":
+    [(group_id, home, away)], "byes": [(group_id, team_id)]}.
+    """
+    per_group = [(gid, *round_robin(team_ids, legs)) for gid, team_ids in groups]
+    total = max((len(rounds) for _, rounds, _ in per_group), default=0)
+    weeks = []
+    for i in range(total):
+        fixtures, byes = [], []
+        for gid, rounds, group_byes in per_group:
+            if i < len(rounds):
+                fixtures.extend((gid, home, away) for home, away in rounds[i])
+                byes.extend((gid, t) for t in group_byes[i])
+        weeks.append({"matchweek": i + 1, "fixtures": fixtures, "byes": byes})
+    return weeks
+
+
+# ── Calendar ───────────────────────────────────────────────────────────
+
+
+class SlotPlanner:
+    """Assigns (kickoff, venue) to fixtures without double-booking.
+
+    `time_slots` are kickoff times ("HH:MM") available on each match day;
+    without them a match day is a single slot and kickoffs carry no time.
+    """
+
+    def __init__(
+        self,
+        start: date,
+        interval_days: int,
+        venues: list[str] | None = None,
+        time_slots: list[str] | None = None,
+        default_venue: str = "",
+    ) -> None:
+        self.start = start
+        self.interval = max(0, int(interval_days))
+        self.constrain_venues = bool(venues)
+        self.venues = list(venues) if venues else [default_venue]
+        self.slots: list[time | None] = (
+            [time.fromisoformat(s) for s in time_slots] if time_slots else [None]
+        )
+        self._venue_taken: set[tuple[date, time | None, str]] = set()
+        self._team_days: set[tuple[str, date]] = set()
+        self._next_day = start
+
+    def book_existing(self, matches: Iterable[dict[str, Any]]) -> None:
+        """Mark already-scheduled matches as taken."""
+        for m in matches:
+            try:
+                kickoff = datetime.fromisoformat(str(m.get("date") or ""))
+            except ValueError:
+                continue
+            day = kickoff.date()
+            for team in (m.get("home_team_id"), m.get("away_team_id")):
+                if team:
+                    self._team_days.add((team, day))
+            if self.constrain_venues and m.get("venue") in self.venues:
+                slot = kickoff.time() if self.slots != [None] else None
+                self._venue_taken.add((day, slot, m["venue"]))
+
+    def place_matchweek(self, matchweek: int, fixtures: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """(kickoff ISO string, venue) for each (home, away) fixture, in
+        order. The next matchweek starts after this one's last day."""
+        nominal = self.start + timedelta(days=self.interval * (matchweek - 1))
+        first_day = max(nominal, self._next_day)
+        placed, last_day = [], first_day
+        for home, away in fixtures:
+            day, slot, venue = self._find(first_day, home, away)
+            self._team_days.add((home, day))
+            self._team_days.add((away, day))
+            if self.constrain_venues:
+                self._venue_taken.add((day, slot, venue))
+            kickoff = datetime.combine(day, slot or time())
+            placed.append((kickoff.isoformat(), venue))
+            last_day = max(last_day, day)
+        self._next_day = last_day + timedelta(days=1)
+        return placed
+
+    def _find(self, first_day: date, home: str, away: str) -> tuple[date, time | None, str]:
+        for offset in range(_MAX_SPILL_DAYS):
+            day = first_day + timedelta(days=offset)
+            if (home, day) in self._team_days or (away, day) in self._team_days:
+                continue
+            for slot in self.slots:
+                for venue in self.venues:
+                    if not self.constrain_venues or (day, slot, venue) not in self._venue_taken:
+                        return day, slot, venue
+        raise ValueError(
+            f"No free venue/slot within {_MAX_SPILL_DAYS} days for {home} vs {away}"
+        )
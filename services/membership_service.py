@@ -1,16 +1,36 @@
+import os
+
+from core.cache import TTLCache
 from repositories.membership_repo_ddb import MembershipRepo
 from typing import Dict, Any, List
 
 VALID_ROLES = {"admin", "user", "team_owner", "coach"}
 
+# Active memberships per user `sub`, read by auth on every request. Writes
+# through this service invalidate the user's entry; writes from other
+# containers (or straight to the table) show up after the TTL.
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "30"))
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "2048"))
+
 
 class MembershipService:
-    def __init__(self, repo: MembershipRepo):
+    def __init__(self, repo: MembershipRepo, cache: TTLCache | None = None):
         self.repo = repo
+        self._cache = cache if cache is not None else TTLCache(
+            maxsize=MEMBERSHIP_CACHE_SIZE, ttl=MEMBERSHIP_CACHE_TTL
+        )
 
     def get_user_memberships(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get active memberships for a user across all accounts"""
-        return self.repo.get_active_memberships(user_id)
+        """Get active memberships for a user across all accounts (cached per `sub`)"""
+        memberships = self._cache.get(user_id)
+        if memberships is None:
+            memberships = self.repo.get_active_memberships(user_id)
+            self._cache.set(user_id, memberships)
+        return [dict(m) for m in memberships]
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop the cached memberships for a user"""
+        self._cache.invalidate(user_id)
     
     def get_user_account_memberships(self, user_id: str, account_id: str) -> List[Dict[str, Any]]:
         """Get all memberships for a user in a specific account"""
@@ -27,24 +47,29 @@ class MembershipService:
     def create_membership(self, user_id: str, account_id: str, workspace_id: str, role: str = "user", status: str = "active") -> None:
         """Create a new membership - workspace_id is now REQUIRED"""
         self.repo.create(user_id, account_id, workspace_id, role, status)
+        self.invalidate_user(user_id)
     
     def delete_membership(self, user_id: str, account_id: str, workspace_id: str) -> None:
         """Delete a specific membership - now requires workspace_id"""
         self.repo.delete(user_id, account_id, workspace_id)
+        self.invalidate_user(user_id)
     
     def enable_membership(self, user_id: str, account_id: str, workspace_id: str) -> None:
         """Enable a membership - now requires workspace_id"""
         self.repo.update_status(user_id, account_id, workspace_id, "active")
+        self.invalidate_user(user_id)
     
     def disable_membership(self, user_id: str, account_id: str, workspace_id: str) -> None:
         """Disable a membership - now requires workspace_id"""
         self.repo.update_status(user_id, account_id, workspace_id, "disabled")
+        self.invalidate_user(user_id)
 
     def update_role(self, user_id: str, account_id: str, workspace_id: str, role: str) -> Dict[str, Any]:
         """Change a membership's role. Non-destructive — only the role attribute changes."""
         if role not in VALID_ROLES:
             raise ValueError(f"Invalid role '{role}'. Must be one of: {sorted(VALID_ROLES)}")
         self.repo.update_role(user_id, account_id, workspace_id, role)
+        self.invalidate_user(user_id)
         return {
             "user_id": user_id,
             "account_id": account_id,
@@ -55,6 +80,7 @@ class MembershipService:
     def delete_all_user_memberships(self, user_id: str) -> None:
         """Delete all memberships for a user (used when deleting user)"""
         self.repo.delete_all_for_user(user_id)
+        self.invalidate_user(user_id)
     
     def get_user_workspaces(self, user_id: str, account_id: str) -> List[str]:
         """Get all workspace IDs user has access to in an account"""
@@ -62,9 +88,13 @@ class MembershipService:
         return [m["workspace_id"] for m in memberships if m.get("workspace_id")]
     
     def get_user_role_in_workspace(self, user_id: str, account_id: str, workspace_id: str) -> str | None:
-        """Get user's role in a specific workspace"""
-        memberships = self.repo.get_user_account_memberships(user_id, account_id)
+        """Get user's role in a specific workspace (active memberships only)"""
+        return self.role_in_workspace(self.get_user_memberships(user_id), account_id, workspace_id)
+
+    @staticmethod
+    def role_in_workspace(memberships: List[Dict[str, Any]], account_id: str, workspace_id: str) -> str | None:
+        """Pick the role for (account, workspace) out of an already-loaded membership list"""
         for m in memberships:
-            if m.get("workspace_id") == workspace_id:
+            if m.get("account_id") == account_id and m.get("workspace_id") == workspace_id:
                 return m.get("role")
         return None
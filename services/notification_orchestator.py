@@ -1,10 +1,14 @@
 
 import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from api.schemas.calendar import PutCalendarEvent
+from core.http_transport import is_permanent
 from repositories.notifications.ports import EmailSender
 from repositories.notifications.ports import InAppSender
-from typing import Mapping, Any
+from typing import Mapping, Any, Callable, Iterable, Iterator
 from utils.datetime_utils import format_datetime_pretty_es, parse_timestamp_to_datetime, try_parsing_date
 from utils.env_utils import _env
 from utils.slack_alerts import send_overdue_summary
@@ -12,6 +16,47 @@ from utils.slack_alerts import send_overdue_summary
 logger = logging.getLogger(__name__)
 
 
+class Delivery:
+    """Channels already handled for one outbox intent.
+
+    A `Notifications` method sends on several channels (email, in-app, one
+    per recipient). When the outbox retries an intent, the channels that
+    went through on an earlier attempt are skipped, and every send carries
+    the idempotency key `<intent id>:<channel>`, so a provider that did get
+    a request whose response was lost de-duplicates the resend.
+    """
+
+    def __init__(self, intent_id: str, done: Iterable[str] = ()) -> None:
+        self.intent_id = intent_id
+        self._done = set(done)
+        self._lock = threading.Lock()
+
+    def is_done(self, channel: str) -> bool:
+        with self._lock:
+            return channel in self._done
+
+    def mark_done(self, channel: str) -> None:
+        with self._lock:
+            self._done.add(channel)
+
+    def done(self) -> list[str]:
+        with self._lock:
+            return sorted(self._done)
+
+
+_delivery: ContextVar[Delivery | None] = ContextVar("notification_delivery", default=None)
+
+
+@contextmanager
+def delivering(delivery: Delivery) -> Iterator[Delivery]:
+    """Run `Notifications` calls on behalf of an outbox intent."""
+    token = _delivery.set(delivery)
+    try:
+        yield delivery
+    finally:
+        _delivery.reset(token)
+
+
 class Notifications:
     """
     Domain-friendly facade. Keeps template IDs and payload shapes in one place.
@@ -48,17 +93,42 @@ class Notifications:
             self._admin_email_notifications_enabled = False
 
 
+    def _once(self, channel: str, send: Callable[[str | None], Any]) -> Any:
+        """`send(idempotency_key)` unless the current outbox intent already
+        delivered `channel` (see `Delivery`). Outside a delivery the key is
+        None and the sender picks its own."""
+        delivery = _delivery.get()
+        if delivery is None:
+            return send(None)
+        if delivery.is_done(channel):
+            return "already sent"
+        try:
+            result = send(f"{delivery.intent_id}:{channel}")
+        except Exception as e:
+            # Retrying won't fix a permanent error; don't repeat it either.
+            if is_permanent(e):
+                delivery.mark_done(channel)
+            raise
+        delivery.mark_done(channel)
+        return result
+
     def _send_email(
         self,
         *,
         template_id: str,
         to_email: str,
         data: Mapping[str, Any] | None = None,
+        sender: EmailSender | None = None,
     ) -> str:
-        return self._email_sender.send_template(
-            template_id=template_id,
-            to_email=to_email,
-            data=data,
+        sender = sender or self._email_sender
+        return self._once(
+            f"email:{template_id}:{to_email}",
+            lambda key: sender.send_template(
+                template_id=template_id,
+                to_email=to_email,
+                data=data,
+                idempotency_key=key,
+            ),
         )
     
     def _send_in_app_notification(
@@ -70,12 +140,16 @@ class Notifications:
         category: str | None = None,
         action_url_path: str = "dashboard/"
     ) -> str:
-        return self._in_app_sender.publish(
-            user_email=user_email,
-            title=title,
-            content=content,
-            category=category,
-            action_url_path=action_url_path
+        return self._once(
+            f"in_app:{category}:{user_email}",
+            lambda key: self._in_app_sender.publish(
+                user_email=user_email,
+                title=title,
+                content=content,
+                category=category,
+                action_url_path=action_url_path,
+                idempotency_key=key,
+            ),
         )
     
     def _send_bulk_in_app_notification(
@@ -88,12 +162,16 @@ class Notifications:
         action_url_path: str = "dashboard/"
     ) -> str:
 
-        return self._in_app_sender.publish_bulk(
-            user_emails=user_emails,
-            title=title,
-            content=content,
-            category=category,
-            action_url_path=action_url_path
+        return self._once(
+            f"in_app_bulk:{category}",
+            lambda key: self._in_app_sender.publish_bulk(
+                user_emails=user_emails,
+                title=title,
+                content=content,
+                category=category,
+                action_url_path=action_url_path,
+                idempotency_key=key,
+            ),
         )
 
     def send_user_welcome(self, *, email: str, name: str) -> str:
@@ -236,7 +314,9 @@ class Notifications:
                     results[email] = e
         try:
             print("Sending Slack summary...")
-            send_overdue_summary(account_id=account_id, user_name=user_name, pending_count=pending_count, overdue_payments=overdue_payments)
+            self._once("slack_summary", lambda _key: send_overdue_summary(
+                account_id=account_id, user_name=user_name, pending_count=pending_count, overdue_payments=overdue_payments
+            ))
             results["slack_summary"] = "sent"
         except Exception as e:
             results["slack_summary"] = e
@@ -318,7 +398,10 @@ class Notifications:
             results["in_app"] = e
         return results
 
-    def calendar_event_created(self, *, user_emails: list[str], calendar_event: PutCalendarEvent) -> str:
+    def calendar_event_created(self, *, user_emails: list[str], calendar_event: PutCalendarEvent | dict[str, Any]) -> str:
+        if isinstance(calendar_event, dict):
+            # Replayed from the notification outbox.
+            calendar_event = PutCalendarEvent(**calendar_event)
         title = "Nuevo evento: " + calendar_event.title
         event_datetime = parse_timestamp_to_datetime(calendar_event.start)
         event_day = format_datetime_pretty_es(event_datetime)
@@ -340,7 +423,8 @@ class Notifications:
         results: dict[str, str | Exception] = {}
         try:
             # Tournament-related template lives in the tournaments Courier workspace.
-            results["email"] = self._tournaments_email_sender.send_template(
+            results["email"] = self._send_email(
+                sender=self._tournaments_email_sender,
                 template_id=self.COURIER_TEMPLATE_TEAM_REGISTERED,
                 to_email=email,
                 data={
@@ -372,7 +456,8 @@ class Notifications:
         results: dict[str, str | Exception] = {}
         try:
             # Tournament invites go through the tournaments Courier workspace (separate auth token).
-            request_id = self._tournaments_email_sender.send_template(
+            request_id = self._send_email(
+                sender=self._tournaments_email_sender,
                 template_id=self.COURIER_TEMPLATE_TEAM_OWNER_INVITE,
                 to_email=email,
                 data={
@@ -405,7 +490,8 @@ class Notifications:
         try:
             # Same Courier workspace as team_owner_invited — the admin-invite template
             # was created there too (separate auth token from the main workspace).
-            request_id = self._tournaments_email_sender.send_template(
+            request_id = self._send_email(
+                sender=self._tournaments_email_sender,
                 template_id=self.COURIER_TEMPLATE_ADMIN_INVITE,
                 to_email=email,
                 data={
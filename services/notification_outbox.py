@@ -0,0 +1,309 @@
+"""Notification outbox — durable intents, delivered off the request path.
+
+Services used to call `Notifications` inline, so every write that
+notified someone waited on Courier, OneSignal and the in-app table before
+responding. They now record an *intent* (a `Notifications` method name
+plus its keyword arguments) and return:
+
+- `enqueue(method, **kwargs)` records it on its own, right after the
+  domain write;
+- `commit(ops, [intent(...)])` records it in the same TransactWriteItems
+  as the domain write (`ops`), so the write and its notification land
+  together or not at all.
+
+A drain worker delivers due intents: it claims one (a conditional write,
+so two workers never deliver the same intent at once), calls the
+`Notifications` method, and marks it sent. The channels that went out are
+kept on the intent (`done`) across retries, so a retry only resends the
+ones that failed, each with the idempotency key `<intent id>:<channel>`
+(see `notification_orchestator.Delivery`). Failures are retried with
+exponential backoff and jitter up to `OUTBOX_MAX_ATTEMPTS`, then the intent
+is marked failed and kept for inspection. Permanent provider errors (a
+4xx other than 429, see `core.http_transport.is_permanent`) fail it at
+once. A `dedup_key` makes recording idempotent: a second intent with the
+same key is dropped.
+
+The store is pluggable: `OutboxRepo` (DynamoDB,
+`NOTIFICATION_OUTBOX_TABLE_NAME`) or `InMemoryOutboxStore`, which is
+what local development and tests use when no table is configured. Who
+delivers a freshly recorded intent is `OUTBOX_WORKER`:
+
+- `request` (the default on Lambda): the intents a request recorded are
+  delivered by a background task attached to its response (see
+  `app.deliver_notifications`), which Mangum runs before the invocation
+  ends — a thread would be frozen with the container. Outside a request
+  (scripts, scheduled handlers) they are delivered inline;
+- `local` (the default elsewhere): a daemon thread woken on every record;
+- `inline`: delivered in the recording call itself;
+- `off`: left to the sweep alone.
+
+Retries wait for `scheduled_handler.drain_outbox`, which an EventBridge
+schedule invokes (see the README); it also sweeps up intents whose
+delivery was cut short. Without a table nothing outlives the process, so
+on Lambda a failed send is only retried within the same invocation.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Iterator, Protocol
+from uuid import uuid4
+
+from core.http_transport import is_permanent
+from repositories.ddb_stats import transact_write
+from services.notification_orchestator import Delivery, Notifications, delivering
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+_BASE_DELAY_MS = 5_000
+_MAX_DELAY_MS = 30 * 60_000
+_LEASE_MS = 60_000
+# The local worker re-checks this often for intents waiting on a retry.
+_POLL_SECONDS = 5.0
+
+
+# Intents recorded by the current request, delivered when it completes
+# (`OUTBOX_WORKER=request`). None outside `NotificationOutbox.request_scope`.
+_request_intents: ContextVar[list[dict[str, Any]] | None] = ContextVar("outbox_request_intents", default=None)
+
+
+def _default_worker() -> str:
+    return "request" if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else "local"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class OutboxStore(Protocol):
+    def add(self, item: dict[str, Any]) -> bool: ...
+
+    def add_many(self, items: list[dict[str, Any]]) -> None: ...
+
+    def commit(self, ops: list[dict[str, Any]], items: list[dict[str, Any]]) -> None: ...
+
+    def list_ready(self, now_ms: int, limit: int) -> list[dict[str, Any]]: ...
+
+    def claim(self, intent_id: str, now_ms: int, lease_until_ms: int) -> bool: ...
+
+    def complete(self, intent_id: str) -> None: ...
+
+    def fail(self, intent_id: str, error: str) -> None: ...
+
+    def retry_at(self, intent_id: str, next_attempt_ms: int, error: str, done: list[str]) -> None: ...
+
+
+class InMemoryOutboxStore:
+    """Single-process store. Not durable — for local development and tests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: dict[str, dict[str, Any]] = {}
+
+    def add(self, item: dict[str, Any]) -> bool:
+        with self._lock:
+            if item["id"] in self._items:
+                return False
+            self._items[item["id"]] = dict(item)
+            return True
+
+    def add_many(self, items: list[dict[str, Any]]) -> None:
+        for item in items:
+            self.add(item)
+
+    def commit(self, ops: list[dict[str, Any]], items: list[dict[str, Any]]) -> None:
+        # The domain write still goes to DynamoDB; only the intents stay here.
+        if ops:
+            transact_write(ops)
+        self.add_many(items)
+
+    def list_ready(self, now_ms: int, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            ready = [
+                dict(i) for i in self._items.values()
+                if i.get("queue") == "pending" and i["next_attempt_at"] <= now_ms
+            ]
+        return sorted(ready, key=lambda i: i["next_attempt_at"])[:limit]
+
+    def claim(self, intent_id: str, now_ms: int, lease_until_ms: int) -> bool:
+        with self._lock:
+            item = self._items.get(intent_id)
+            if not item or item.get("queue") != "pending" or item["next_attempt_at"] > now_ms:
+                return False
+            item["next_attempt_at"] = lease_until_ms
+            item["attempts"] = item.get("attempts", 0) + 1
+            return True
+
+    def complete(self, intent_id: str) -> None:
+        self._finish(intent_id, "sent", None)
+
+    def fail(self, intent_id: str, error: str) -> None:
+        self._finish(intent_id, "failed", error)
+
+    def retry_at(self, intent_id: str, next_attempt_ms: int, error: str, done: list[str]) -> None:
+        with self._lock:
+            self._items[intent_id].update(next_attempt_at=next_attempt_ms, last_error=error, done=list(done))
+
+    def _finish(self, intent_id: str, status: str, error: str | None) -> None:
+        with self._lock:
+            item = self._items[intent_id]
+            item.pop("queue", None)
+            item["status"] = status
+            if error is not None:
+                item["last_error"] = error
+
+    def items(self) -> list[dict[str, Any]]:
+        """Every recorded intent (for tests)."""
+        with self._lock:
+            return [dict(i) for i in self._items.values()]
+
+
+class NotificationOutbox:
+    def __init__(self, store: OutboxStore, notifier: Notifications, worker: str | None = None) -> None:
+        self.store = store
+        self.notifier = notifier
+        self.worker = worker or os.getenv("OUTBOX_WORKER") or _default_worker()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    # ── Recording ──────────────────────────────────────────────────────
+
+    def intent(self, method: str, *, dedup_key: str | None = None, **kwargs: Any) -> dict[str, Any]:
+        """A pending intent to call `Notifications.<method>(**kwargs)`."""
+        if method.startswith("_") or not callable(getattr(self.notifier, method, None)):
+            raise ValueError(f"Unknown notification: {method}")
+        now = _now_ms()
+        return {
+            "id": dedup_key or uuid4().hex,
+            "method": method,
+            "payload": json.dumps(kwargs, default=_plain),
+            "status": "pending",
+            "queue": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+
+    def enqueue(self, method: str, *, dedup_key: str | None = None, **kwargs: Any) -> None:
+        self.enqueue_many([self.intent(method, dedup_key=dedup_key, **kwargs)])
+
+    def enqueue_many(self, intents: list[dict[str, Any]]) -> None:
+        if intents:
+            self.store.add_many(intents)
+            self._kick(intents)
+
+    def commit(self, ops: list[dict[str, Any]], intents: list[dict[str, Any]]) -> None:
+        """Write the TransactWriteItems `ops` and record `intents` atomically."""
+        self.store.commit(ops, intents)
+        if intents:
+            self._kick(intents)
+
+    # ── Delivery ───────────────────────────────────────────────────────
+
+    def drain(self, limit: int = 100, deadline: float | None = None) -> dict[str, int]:
+        """Deliver due intents until none are left, `limit` have been
+        handled, or time.monotonic() passes `deadline`."""
+        summary = {"sent": 0, "retried": 0, "failed": 0}
+        handled = 0
+        while handled < limit and (deadline is None or time.monotonic() < deadline):
+            now = _now_ms()
+            ready = self.store.list_ready(now, min(25, limit - handled))
+            if not ready:
+                break
+            for item in ready:
+                if not self.store.claim(item["id"], now, now + _LEASE_MS):
+                    continue
+                handled += 1
+                summary[self._deliver(item, int(item.get("attempts") or 0) + 1)] += 1
+        return summary
+
+    def deliver(self, intents: list[dict[str, Any]]) -> dict[str, int]:
+        """Deliver these just-recorded intents now (each one claimed first,
+        so a concurrent drain doesn't send it too)."""
+        summary = {"sent": 0, "retried": 0, "failed": 0}
+        for item in intents:
+            now = _now_ms()
+            if self.store.claim(item["id"], now, now + _LEASE_MS):
+                summary[self._deliver(item, int(item.get("attempts") or 0) + 1)] += 1
+        return summary
+
+    @contextmanager
+    def request_scope(self) -> Iterator[list[dict[str, Any]]]:
+        """Collect the intents recorded inside the block (by the request
+        being handled) for `deliver`, instead of delivering them inline."""
+        intents: list[dict[str, Any]] = []
+        token = _request_intents.set(intents)
+        try:
+            yield intents
+        finally:
+            _request_intents.reset(token)
+
+    def _deliver(self, item: dict[str, Any], attempt: int) -> str:
+        delivery = Delivery(item["id"], item.get("done") or ())
+        try:
+            with delivering(delivery):
+                result = getattr(self.notifier, item["method"])(**json.loads(item["payload"]))
+            # Notifications methods report per-channel failures in their result.
+            errors = [v for v in (result.values() if isinstance(result, dict) else ()) if isinstance(v, Exception)]
+            if errors:
+                # Retry only for a transient failure; permanent ones alone fail the intent.
+                raise next((e for e in errors if not is_permanent(e)), errors[0])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:1000]
+            if attempt >= MAX_ATTEMPTS or is_permanent(e):
+                logger.error("outbox: giving up on %s %s after %d attempt(s): %s", item["method"], item["id"], attempt, error)
+                self.store.fail(item["id"], error)
+                return "failed"
+            delay = min(_MAX_DELAY_MS, _BASE_DELAY_MS * 2 ** (attempt - 1))
+            self.store.retry_at(item["id"], _now_ms() + int(random.uniform(delay / 2, delay)), error, delivery.done())
+            return "retried"
+        self.store.complete(item["id"])
+        return "sent"
+
+    # ── Workers ────────────────────────────────────────────────────────
+
+    def _kick(self, intents: list[dict[str, Any]]) -> None:
+        if self.worker == "request":
+            pending = _request_intents.get()
+            if pending is not None:
+                pending.extend(intents)
+                return
+        if self.worker in ("request", "inline"):
+            try:
+                self.deliver(intents)
+            except Exception:
+                logger.exception("outbox: delivery failed")
+            return
+        if self.worker != "local":
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(_POLL_SECONDS)
+            self._wake.clear()
+            try:
+                while sum(self.drain().values()):
+                    pass
+            except Exception:
+                logger.exception("outbox: drain failed")
@@ -217,7 +217,7 @@ class OrderService:
             orderId=order_item["id"],
         )
         try:
-            created = self.payment_request_svc.bulk_create(bulk, account_id)
+            created = self.payment_request_svc.bulk_create(bulk, account_id)["created"]
             if created:
                 return created[0].get("id")
         except Exception as e:
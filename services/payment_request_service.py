@@ -1,11 +1,17 @@
-from time import time
-from uuid import uuid4
-from typing import Any
+import os
+from time import monotonic, time
+from uuid import UUID, uuid4, uuid5
+from typing import Any, Iterable
+from botocore.exceptions import ClientError
+from core.concurrency import fan_map
+from repositories.ddb_cursor import decode_cursor, encode_cursor
 from datetime import datetime, timezone
 from api.schemas.files import FileSpec
 from repositories.s3_adapter import S3Adapter
 from repositories.order_repo_ddb import OrderRepo
 from services.notification_orchestator import Notifications
+from services.notification_outbox import NotificationOutbox
+from repositories.ddb_batch import BatchWriteError
 from repositories.payment_requests_repo_ddb import PaymentRequestsRepo
 from api.schemas.payments import PaymentRequestStatus, BulkPutPaymentRequest
 
@@ -18,6 +24,25 @@ PR_STATUS_TO_ORDER_EVENT = {
     PaymentRequestStatus.PENDING.value: ("payment_pending", "Pago pendiente"),
 }
 
+# Overdue processing: past-due rows read per page, and how many are marked
+# at once (bounded by the fan-out pool, see core.concurrency).
+OVERDUE_WORKERS = int(os.getenv("OVERDUE_WORKERS", "16"))
+_OVERDUE_PAGE_SIZE = 200
+_OVERDUE_FIELDS = [
+    "id", "account_id", "due_date", "user_price", "overdue_price", "order_id", "concept", "payment_request_to",
+]
+
+# Namespace for charge ids derived from their reference (see `charge_id`).
+_CHARGE_NAMESPACE = UUID("5b0c1f0e-6a43-4c52-9d0e-3f1c2a7b8e61")
+
+# Stored name of each field `_get_notification_fields_changed` compares.
+_NOTIFIED_FIELDS = {
+    "dueDate": "due_date",
+    "totalAmount": "user_price",
+    "concept": "concept",
+    "status": "payment_status",
+}
+
 
 class PaymentRequestService:
     def __init__(
@@ -26,9 +51,11 @@ class PaymentRequestService:
         s3: S3Adapter,
         notifier: Notifications,
         order_repo: OrderRepo,
+        outbox: NotificationOutbox,
     ):
         self.repo = repo
         self.notifier = notifier
+        self.outbox = outbox
         self.s3 = s3
         self.order_repo = order_repo
         #TODO Important! Fix mapping userPrice, user_price, totalAmount
@@ -42,39 +69,143 @@ class PaymentRequestService:
         }
         self._payments_username = "Vittoria CD Pagos"
 
-    def get(self, payment_request_id: str, account_id: str) -> dict[str, Any] | None:
-        item = self.repo.get(payment_request_id, account_id)
+    def get(self, payment_request_id: str, account_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """The mapped payment request; with `fields` (stored names), only
+        those are read and no image URLs are presigned — for guards."""
+        item = self.repo.get(payment_request_id, account_id, fields=fields)
         if item:
-            return self._map_payment_request(item)
+            return self._map_payment_request(item, get_presigned_url=fields is None)
         return None
 
-    def list_payment_requests(self, account_id: str, *, user_id: str | None = None, group: str | None = None) -> list[dict[str, Any]]:
-        """List payment requests with optional filtering by user_id and/or group (workspace_id)"""
-        if user_id or group:
-            items = self.repo.list_filtered(account_id, user_id=user_id, group=group)
-        else:
-            items = self.repo.list_all(account_id)
+    def list_payment_requests(self, account_id: str, *, user_id: str | None = None, group: str | None = None, status: str | None = None) -> list[dict[str, Any]]:
+        """List payment requests with optional filtering by user_id, group (workspace_id) and/or status"""
+        items, _ = self.repo.list_page(account_id, user_id=user_id, group=group, status=status)
         return [self._map_payment_request(i, get_presigned_url=False) for i in items]
 
-    def bulk_create(self, bulk_item: BulkPutPaymentRequest, account_id: str) -> list[dict[str, Any]]:
+    def list_payment_requests_page(
+        self,
+        account_id: str,
+        *,
+        user_id: str | None = None,
+        group: str | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """One page of `list_payment_requests`: {"items", "next_cursor"};
+        pass `next_cursor` back to continue (None on the last page). Raises
+        ValueError for a malformed cursor."""
+        state = decode_cursor(cursor) or {}
+        start_key = state.get("key")
+        if start_key is not None and not isinstance(start_key, dict):
+            raise ValueError("Invalid cursor")
+        items, last_key = self.repo.list_page(
+            account_id, user_id=user_id, group=group, status=status, limit=limit, start_key=start_key
+        )
+        return {
+            "items": [self._map_payment_request(i, get_presigned_url=False) for i in items],
+            "next_cursor": encode_cursor({"key": last_key}) if last_key else None,
+        }
+
+    def bulk_create(self, bulk_item: BulkPutPaymentRequest, account_id: str) -> dict[str, Any]:
+        """Create one payment request per `paymentRequestTo` user.
+
+        The items go out in BatchWriteItem chunks (unprocessed ones are
+        retried, see `ddb_batch`) and every user that got one is notified
+        through a `payment_created` intent of their own, keyed by the
+        payment request id. A user without an `id`,
+        or whose item was still unprocessed after the retries, is reported
+        in `failed` instead of failing the whole request.
+
+        Returns `{"created": [...], "failed": [{"user_id", "email",
+        "error"}]}`.
+        """
         if bulk_item is None or not hasattr(bulk_item, "paymentRequestTo") or not bulk_item.paymentRequestTo:
             raise ValueError("No users provided for payment request creation.")
 
-        new_payment_requests = []
         created_time = int(time())
+        items: list[dict[str, Any]] = []
+        failed: list[dict[str, Any]] = []
         for user in bulk_item.paymentRequestTo:
+            if not user.get("id"):
+                failed.append({"user_id": None, "email": user.get("email"), "error": "User has no id"})
+                continue
             #TODO User URL is create with GET presigned url, should be populated later with a GET user with other attributes
-            new_payment_request = self._get_new_payment_request(bulk_item, user, created_time, account_id)
-            self.repo.put(new_payment_request)
-            self.notifier.payment_created(
-                email=user["email"],
-                user_name=user["name"],
+            items.append(self._get_new_payment_request(bulk_item, user, created_time, account_id))
+
+        unprocessed: set[str] = set()
+        try:
+            self.repo.put_batch(items)
+        except BatchWriteError as e:
+            unprocessed = {r["PutRequest"]["Item"]["id"] for r in e.unprocessed}
+        created = [i for i in items if i["id"] not in unprocessed]
+        failed.extend(
+            {"user_id": i["user_id"], "email": i["payment_request_to"].get("email"), "error": "Write was throttled, retry"}
+            for i in items if i["id"] in unprocessed
+        )
+
+        self.outbox.enqueue_many([
+            self.outbox.intent(
+                "payment_created",
+                dedup_key=f"payment_created:{i['id']}",
+                email=i["payment_request_to"]["email"],
+                user_name=i["payment_request_to"].get("name", ""),
                 concept=bulk_item.concept,
                 amount=bulk_item.userPrice,
-                due_date=bulk_item.dueDate
+                due_date=bulk_item.dueDate,
             )
-            new_payment_requests.append(self._map_payment_request(new_payment_request, get_presigned_url=False))
-        return new_payment_requests
+            for i in created if i["payment_request_to"].get("email")
+        ])
+        return {
+            "created": [self._map_payment_request(i, get_presigned_url=False) for i in created],
+            "failed": failed,
+        }
+
+    @staticmethod
+    def charge_id(account_id: str, reference: str) -> str:
+        """Deterministic id for the charge of `reference` (e.g. a card event
+        id): creating the same charge twice targets the same item."""
+        return uuid5(_CHARGE_NAMESPACE, f"{account_id}:{reference}").hex
+
+    def create_charges(self, bulk_items: list[BulkPutPaymentRequest], account_id: str) -> list[dict[str, Any]]:
+        """Batch-create single-recipient charges, idempotent on `reference`.
+
+        Ids come from `charge_id`, so charges that already exist are skipped
+        and the rest go out in BatchWriteItem chunks. Nothing is notified —
+        the caller records notices with `notify_payment_created`.
+        Returns the new payment requests.
+        """
+        created_time = int(time())
+        items = []
+        for bulk_item in bulk_items:
+            if not bulk_item.reference or len(bulk_item.paymentRequestTo) != 1:
+                raise ValueError("Charges need a reference and exactly one recipient.")
+            item = self._get_new_payment_request(bulk_item, dict(bulk_item.paymentRequestTo[0]), created_time, account_id)
+            item["id"] = self.charge_id(account_id, bulk_item.reference)
+            items.append(item)
+        existing = self.repo.existing_ids([i["id"] for i in items])
+        new_items = list({i["id"]: i for i in items if i["id"] not in existing}.values())
+        self.repo.put_batch(new_items)
+        return [self._map_payment_request(i, get_presigned_url=False) for i in new_items]
+
+    def notify_payment_created(self, notices: list[dict[str, Any]]) -> None:
+        """Record a `payment_created` intent per notice in the outbox. A
+        notice is the intent's kwargs plus `payment_request_ids`, the
+        requests it covers, which key the intent so recording it twice
+        (e.g. a retried run) notifies once."""
+        self.outbox.enqueue_many([
+            self.outbox.intent(
+                "payment_created",
+                dedup_key=self._dedup_key("payment_created", n["payment_request_ids"]),
+                **{k: v for k, v in n.items() if k != "payment_request_ids"},
+            )
+            for n in notices
+        ])
+
+    @staticmethod
+    def _dedup_key(event: str, ids: Iterable[str]) -> str:
+        """Outbox dedup key for `event` about the payment requests `ids`."""
+        return f"{event}:{uuid5(_CHARGE_NAMESPACE, ','.join(sorted(ids))).hex}"
 
     def update(self, payment_request_id: str, account_id: str, item: BulkPutPaymentRequest) -> dict[str, Any] | None:
         existing = self.get(payment_request_id, account_id)
@@ -83,19 +214,19 @@ class PaymentRequestService:
         updates = self._get_needed_updates(item)
         if not updates:
             return existing
-        self.repo.update(payment_request_id, account_id, updates)
         user = item.paymentRequestTo[0]
+        notification_fields_changed = self._get_notification_fields_changed(existing, self._updated(existing, updates))
+        intents = [self.outbox.intent(
+            "payment_updated",
+            email=user["email"],
+            user_name=user["name"],
+            concept=updates.get("concept", existing["concept"]),
+            changes=notification_fields_changed
+        )] if notification_fields_changed else []
+        self._commit_update(payment_request_id, account_id, updates, intents)
         new_item = self.get(payment_request_id, account_id)
         if not new_item:
             raise ValueError(f"Payment Request {payment_request_id} not found after update.")
-        notification_fields_changed = self._get_notification_fields_changed(existing, new_item)
-        if notification_fields_changed:
-            self.notifier.payment_updated(
-                email=user["email"],
-                user_name=user["name"],
-                concept=new_item['concept'],
-                changes=notification_fields_changed
-            )
         if existing.get("status") != new_item.get("status"):
             self._append_order_event_for_status(new_item, account_id)
         return new_item
@@ -105,10 +236,10 @@ class PaymentRequestService:
 
     def generate_put_presigned_urls(self, payment_request_id: str, account_id: str, files: list[FileSpec]) -> dict[str, dict[str, str]]:
         presigned_urls = {}
-        payment_request = self.get(payment_request_id, account_id)
+        payment_request = self.repo.get(payment_request_id, account_id, fields=["user_id"])
         if not payment_request:
             raise ValueError(f"Payment Request {payment_request_id} not found")
-        user_id = payment_request["userId"]
+        user_id = payment_request.get("user_id")
         for file in files:
             if not isinstance(file, FileSpec):
                 raise TypeError("Each file must be an instance of FileSpec.")
@@ -136,76 +267,131 @@ class PaymentRequestService:
         for file_name in file_names:
             key = self.s3._kb.invoice_file(account_id, existing["userId"], payment_request_id, file_name)
             images.append(key)
-        self.repo.update(
-            payment_request_id,
-            account_id,
-            {
-                "payment_status": PaymentRequestStatus.APPROVAL_PENDING,
-                "images": images
-            }
-        )
+        updates = {
+            "payment_status": PaymentRequestStatus.APPROVAL_PENDING,
+            "images": images
+        }
+        user = existing["paymentRequestTo"]
+        notification_fields_changed = self._get_notification_fields_changed(existing, self._updated(existing, updates))
+        intents = [self.outbox.intent(
+            "payment_updated",
+            email=user["email"],
+            user_name=user["name"],
+            concept=existing["concept"],
+            changes=notification_fields_changed,
+            notify_admins=True
+        )] if notification_fields_changed else []
+        self._commit_update(payment_request_id, account_id, updates, intents)
 
         new_item = self.get(payment_request_id, account_id)
         if not new_item:
             raise ValueError(f"Payment Request {payment_request_id} not found after update.")
-        user = existing["paymentRequestTo"]
-        notification_fields_changed = self._get_notification_fields_changed(existing, new_item)
-
-        if notification_fields_changed:
-            self.notifier.payment_updated(
-                email=user["email"],
-                user_name=user["name"],
-                concept=new_item['concept'],
-                changes=notification_fields_changed,
-                notify_admins=True
-            )
         if existing.get("status") != new_item.get("status"):
             self._append_order_event_for_status(new_item, account_id)
         return payment_request_id
 
-    def process_overdue_payments(self) -> list[dict[str, Any]]:
-        accounts = ['vittoriacd']
-        overdue_payments = []
-        for account_id in accounts:
-            pending_items = self.repo.list_by_status(PaymentRequestStatus.PENDING, account_id)
-            datetime_now = datetime.now()
-            account_overdue_payments = []
-            for item in pending_items:
-                due_datetime = datetime.fromisoformat(item["due_date"])
-                due_datetime = due_datetime.replace(tzinfo=None)
-                if due_datetime < datetime_now:
-                    overdue_price = item.get("overdue_price", 0)
-                    new_price = item["user_price"] if overdue_price == 0 else overdue_price
-                    self.repo.update(
-                        item["id"],
-                        account_id,
-                        {
-                            "payment_status": PaymentRequestStatus.OVERDUE,
-                            "user_price": new_price
-                        }
-                    )
-                    order_id = item.get("order_id")
-                    if order_id:
-                        self._append_order_event(
-                            order_id,
-                            account_id,
-                            PaymentRequestStatus.OVERDUE.value,
-                        )
-                    account_overdue_payments.append({
-                        "id": item["id"],
-                        "concept": item["concept"],
-                        "user_price": new_price,
-                        "to_name": item["payment_request_to"]["name"],
-                        "to_email": item["payment_request_to"]["email"]
-                    })
-            overdue_payments.extend(account_overdue_payments)
-            self.notifier.overdue_payments_processed(
+    def _commit_update(
+        self, payment_request_id: str, account_id: str, updates: dict[str, Any], intents: list[dict[str, Any]]
+    ) -> None:
+        """Write `updates` and record `intents` in one transaction, so the
+        change and its notification land together or not at all."""
+        try:
+            self.outbox.commit([self.repo.update_op(payment_request_id, account_id, updates)], intents)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            raise ValueError(f"Payment request {payment_request_id} not found in account {account_id}")
+
+    @staticmethod
+    def _updated(existing: dict[str, Any], updates: dict[str, Any]) -> dict[str, Any]:
+        """`existing` (mapped) with the stored-name `updates` applied, as far
+        as `_get_notification_fields_changed` looks."""
+        return {**existing, **{f: updates[s] for f, s in _NOTIFIED_FIELDS.items() if s in updates}}
+
+    def process_overdue_payments(self, deadline: float | None = None) -> dict[str, Any]:
+        """Mark every pending payment request past its due date as overdue,
+        across all accounts.
+
+        Past-due rows are read oldest first from the status/due-date index,
+        a page at a time, and marked by a pool of `OVERDUE_WORKERS`. Errors
+        are collected per account, so one failing tenant doesn't stop the
+        rest. Marked rows leave the index, which makes it the checkpoint: a
+        run that reaches `deadline` (time.monotonic()) stops after the
+        current page with `complete` False, and the next run carries on.
+        Each account's summary is recorded in the notification outbox.
+
+        Returns `{"payments", "accounts", "errors", "complete"}`.
+        """
+        now = datetime.now()
+        found: dict[str, int] = {}
+        marked: dict[str, list[dict[str, Any]]] = {}
+        errors: dict[str, str] = {}
+        complete = True
+        start_key = None
+        while True:
+            if deadline is not None and monotonic() >= deadline:
+                complete = False
+                break
+            items, start_key = self.repo.list_due(
+                PaymentRequestStatus.PENDING,
+                now.isoformat(),
+                limit=_OVERDUE_PAGE_SIZE,
+                start_key=start_key,
+                fields=_OVERDUE_FIELDS,
+            )
+            for item, (payment, error) in zip(items, fan_map(lambda i: self._mark_overdue(i, now), items, limit=OVERDUE_WORKERS)):
+                account_id = item["account_id"]
+                found[account_id] = found.get(account_id, 0) + 1
+                if payment:
+                    marked.setdefault(account_id, []).append(payment)
+                if error:
+                    print(f"[pr] failed to mark payment request {item['id']} overdue: {error}")
+                    errors.setdefault(account_id, error)
+            if not start_key:
+                break
+
+        for account_id, count in found.items():
+            payments = marked.get(account_id, [])
+            self.outbox.enqueue(
+                "overdue_payments_processed",
+                dedup_key=self._dedup_key(
+                    f"overdue_payments_processed:{account_id}:{now.date().isoformat()}", [p["id"] for p in payments]
+                ),
                 account_id=account_id,
                 user_name=self._payments_username,
-                pending_count=len(list(pending_items)),
-                overdue_payments=account_overdue_payments,
+                pending_count=count,
+                overdue_payments=payments,
             )
-        return overdue_payments
+        return {
+            "payments": [p for payments in marked.values() for p in payments],
+            "accounts": {a: {"found": n, "overdue": len(marked.get(a, []))} for a, n in found.items()},
+            "errors": errors,
+            "complete": complete,
+        }
+
+    def _mark_overdue(self, item: dict[str, Any], now: datetime) -> tuple[dict[str, Any] | None, str | None]:
+        """(overdue payment summary, error) for one past-due row. Neither is
+        set when the row changed since it was read."""
+        try:
+            due_datetime = datetime.fromisoformat(item["due_date"]).replace(tzinfo=None)
+            if due_datetime >= now:
+                return None, None
+            overdue_price = item.get("overdue_price", 0)
+            new_price = item["user_price"] if overdue_price == 0 else overdue_price
+            if not self.repo.mark_overdue(item["id"], item["account_id"], new_price):
+                return None, None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+        order_id = item.get("order_id")
+        if order_id:
+            self._append_order_event(order_id, item["account_id"], PaymentRequestStatus.OVERDUE.value)
+        return {
+            "id": item["id"],
+            "concept": item["concept"],
+            "user_price": new_price,
+            "to_name": item["payment_request_to"]["name"],
+            "to_email": item["payment_request_to"]["email"]
+        }, None
 
     def _append_order_event_for_status(self, pr_item: dict[str, Any], account_id: str) -> None:
         order_id = pr_item.get("orderId")
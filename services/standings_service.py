@@ -9,14 +9,113 @@ on the invariant that during group stage each team plays only within its
 own group — knockout-round matches don't contribute to `team.stats` (the
 match service skips matches with a `round` value). So `team.stats` is
 the team's group-stage record.
+
+Ranking follows the tournament's `tiebreaker_order` (points always
+first): teams still level after one criterion are split by the next.
+Head-to-head is resolved as a mini-league among the tied teams using the
+pairwise counters the match service keeps on each team's stats (see
+`tournament_aggregator.h2h_key`), so no match is rescanned. Ranked tables
+are cached per group, keyed on the tournament's read-cache `version`.
 """
 
+import copy
+import os
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
+from core.cache import TTLCache
+from core.concurrency import fan_out
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
-from services.tournament_aggregator import default_team_stats
+from services.tournament_aggregator import default_team_stats, head_to_head
+
+# ── Tiebreakers ────────────────────────────────────────────────────────
+
+DEFAULT_TIEBREAKER_ORDER = ("points", "goal_difference", "goals_for")
+
+_TIEBREAKER_ALIASES = {
+    "pts": "points",
+    "gd": "goal_difference",
+    "goal_diff": "goal_difference",
+    "gf": "goals_for",
+    "ga": "goals_against",
+    "won": "wins",
+    "h2h": "head_to_head",
+    "head2head": "head_to_head",
+    "direct": "head_to_head",
+    "cards": "fair_play",
+    "discipline": "fair_play",
+}
+
+# Criterion -> key(entry, stats, tied_ids); lower sorts first.
+_Criterion = Callable[[dict[str, Any], dict[str, Any], frozenset[str]], Any]
+
+
+def _h2h_key(entry: dict[str, Any], stats: dict[str, Any], tied: frozenset[str]) -> tuple[int, int, int]:
+    pts = gf = ga = 0
+    for opp in tied:
+        if opp != entry["team_id"]:
+            p, f, a = head_to_head(stats, opp)
+            pts, gf, ga = pts + p, gf + f, ga + a
+    return (-pts, -(gf - ga), -gf)
+
+
+_TIEBREAKERS: dict[str, _Criterion] = {
+    "points": lambda e, s, t: -e["points"],
+    "goal_difference": lambda e, s, t: -e["goal_difference"],
+    "goals_for": lambda e, s, t: -e["goals_for"],
+    "goals_against": lambda e, s, t: e["goals_against"],
+    "wins": lambda e, s, t: -e["won"],
+    "head_to_head": _h2h_key,
+    # Fewer cards ranks higher; a red weighs as three yellows.
+    "fair_play": lambda e, s, t: int(s.get("yellow_cards") or 0) + 3 * int(s.get("red_cards") or 0),
+}
+
+
+def normalize_tiebreaker_order(order: list[str] | None) -> tuple[str, ...]:
+    """Canonical criteria from a tournament's `tiebreaker_order`: aliases
+    resolved, unknown/duplicate names dropped, `points` always first.
+    Empty → DEFAULT_TIEBREAKER_ORDER."""
+    result = ["points"]
+    for name in order or ():
+        key = _TIEBREAKER_ALIASES.get(str(name).strip().lower(), str(name).strip().lower())
+        if key in _TIEBREAKERS and key not in result:
+            result.append(key)
+    return tuple(result) if len(result) > 1 else DEFAULT_TIEBREAKER_ORDER
+
+
+def rank_entries(
+    entries: list[dict[str, Any]],
+    order: tuple[str, ...],
+    stats_by_team: dict[str, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Order standings rows by `order`. Each criterion only splits teams
+    still level on every earlier one, which is what makes head-to-head a
+    mini-league among exactly the tied teams. Teams level on everything
+    keep their input order."""
+
+    def refine(cluster: list[dict[str, Any]], criteria: tuple[str, ...]) -> list[dict[str, Any]]:
+        if len(cluster) <= 1 or not criteria:
+            return cluster
+        criterion = _TIEBREAKERS[criteria[0]]
+        tied = frozenset(e["team_id"] for e in cluster)
+        keyed = sorted(
+            ((criterion(e, stats_by_team.get(e["team_id"]) or {}, tied), i, e) for i, e in enumerate(cluster)),
+            key=lambda k: (k[0], k[1]),
+        )
+        out: list[dict[str, Any]] = []
+        run: list[dict[str, Any]] = []
+        prev = object()
+        for key, _, e in keyed:
+            if run and key != prev:
+                out.extend(refine(run, criteria[1:]))
+                run = []
+            run.append(e)
+            prev = key
+        out.extend(refine(run, criteria[1:]))
+        return out
+
+    return refine(list(entries), order)
 
 
 class StandingsService:
@@ -24,9 +123,17 @@ class StandingsService:
         self,
         match_repo: TournamentMatchRepo,
         team_repo: TournamentTeamRepo | None = None,
+        cache: TTLCache | None = None,
     ):
         self.match_repo = match_repo
         self.team_repo = team_repo
+        # Ranked tables per (tournament, version, group, tiebreakers). The
+        # version changes on every write that can move a table, so the TTL
+        # only bounds memory.
+        self._cache = cache or TTLCache(
+            maxsize=int(os.getenv("STANDINGS_CACHE_SIZE", "512")),
+            ttl=float(os.getenv("STANDINGS_CACHE_TTL", "300")),
+        )
 
     def get_standings(
         self,
@@ -34,20 +141,34 @@ class StandingsService:
         rules: dict[str, Any],
         group_id: str | None = None,
         group_team_ids: list[str] | None = None,
+        teams: list[dict[str, Any]] | None = None,
+        tiebreaker_order: list[str] | None = None,
+        version: int | None = None,
     ) -> dict[str, Any]:
         """Return ranked standings for the tournament (or a group).
 
-        Cost: 1 query (list teams) when team_repo is wired. Falls back to
-        the pre-materialization match-scan path if team_repo is missing
-        — only used by tests / older wiring.
+        Cost: 1 query (list teams) when team_repo is wired, 0 when the
+        caller already fetched `teams` (e.g. concurrently with the
+        tournament), and no ranking at all when `version` (the
+        tournament's) is given and the table is cached. Falls back to the
+        pre-materialization match-scan path if team_repo is missing — only
+        used by tests / older wiring.
         """
-        if self.team_repo is None:
-            return self._fallback_compute(tournament_id, rules, group_id, group_team_ids)
+        order = normalize_tiebreaker_order(tiebreaker_order)
+        if self.team_repo is None and teams is None:
+            return self._fallback_compute(tournament_id, rules, group_id, group_team_ids, order)
 
-        teams = self.team_repo.list_by_tournament(tournament_id)
+        scope = ("teams", tuple(sorted(group_team_ids))) if group_team_ids is not None else group_id
+        cached = self._cached(tournament_id, version, scope, order)
+        if cached is not None:
+            return cached
+
+        if teams is None:
+            teams = self.team_repo.list_by_tournament(tournament_id)
         teams = self._filter_for_group(teams, group_id=group_id, group_team_ids=group_team_ids)
-        entries = [self._row_from_team(t) for t in teams]
-        return self._rank_and_pack(entries)
+        table = self._rank_and_pack(teams, order)
+        self._store(tournament_id, version, scope, order, table)
+        return table
 
     def get_all_standings(
         self,
@@ -55,23 +176,47 @@ class StandingsService:
         rules: dict[str, Any],
         groups: list[dict[str, Any]],
         teams: list[dict[str, Any]],
+        tiebreaker_order: list[str] | None = None,
+        version: int | None = None,
     ) -> dict[str, Any]:
-        """Return per-group + tournament-wide standings in one shot."""
+        """Return per-group + tournament-wide standings in one shot. Each
+        table is cached separately (see `get_standings`)."""
+        order = normalize_tiebreaker_order(tiebreaker_order)
         result: dict[str, Any] = {"groups": {}}
 
+        teams_by_group: dict[str, list[dict[str, Any]]] = {}
+        for t in teams:
+            teams_by_group.setdefault(t.get("group_id"), []).append(t)
+
         for group in groups:
             gid = group["id"]
-            group_teams = [t for t in teams if t.get("group_id") == gid]
-            entries = [self._row_from_team(t) for t in group_teams]
-            result["groups"][gid] = {
-                "group_name": group.get("name", ""),
-                **self._rank_and_pack(entries),
-            }
-
-        all_entries = [self._row_from_team(t) for t in teams]
-        result["tournament"] = self._rank_and_pack(all_entries)
+            table = self._cached(tournament_id, version, gid, order)
+            if table is None:
+                table = self._rank_and_pack(teams_by_group.get(gid, []), order)
+                self._store(tournament_id, version, gid, order, table)
+            result["groups"][gid] = {"group_name": group.get("name", ""), **table}
+
+        table = self._cached(tournament_id, version, None, order)
+        if table is None:
+            table = self._rank_and_pack(teams, order)
+            self._store(tournament_id, version, None, order, table)
+        result["tournament"] = table
         return result
 
+    # ── cache ────────────────────────────────────────────────────────
+
+    def _cached(self, tournament_id: str, version: int | None, scope: Any, order: tuple[str, ...]) -> dict | None:
+        if version is None:
+            return None
+        table = self._cache.get((tournament_id, int(version), scope, order))
+        return copy.deepcopy(table) if table is not None else None
+
+    def _store(
+        self, tournament_id: str, version: int | None, scope: Any, order: tuple[str, ...], table: dict
+    ) -> None:
+        if version is not None:
+            self._cache.set((tournament_id, int(version), scope, order), copy.deepcopy(table))
+
     # ── helpers ──────────────────────────────────────────────────────
 
     @staticmethod
@@ -108,9 +253,16 @@ class StandingsService:
             ],
         }
 
+    @classmethod
+    def _rank_and_pack(
+        cls, teams: list[dict[str, Any]], order: tuple[str, ...] = DEFAULT_TIEBREAKER_ORDER
+    ) -> dict[str, Any]:
+        entries = [cls._row_from_team(t) for t in teams]
+        stats_by_team = {t["id"]: t.get("stats") or {} for t in teams}
+        return cls._pack(rank_entries(entries, order, stats_by_team))
+
     @staticmethod
-    def _rank_and_pack(entries: list[dict[str, Any]]) -> dict[str, Any]:
-        entries.sort(key=lambda e: (-e["points"], -e["goal_difference"], -e["goals_for"]))
+    def _pack(entries: list[dict[str, Any]]) -> dict[str, Any]:
         for i, e in enumerate(entries, 1):
             e["rank"] = i
         return {"as_of": datetime.utcnow().isoformat(), "items": entries}
@@ -123,14 +275,15 @@ class StandingsService:
         rules: dict[str, Any],
         group_id: str | None,
         group_team_ids: list[str] | None,
+        order: tuple[str, ...] = DEFAULT_TIEBREAKER_ORDER,
     ) -> dict[str, Any]:
         """Legacy path — used only when team_repo isn't wired. Kept short
-        because new wiring always passes a team_repo."""
-        finished = self.match_repo.list_by_tournament(
-            tournament_id, status="finished", group_id=group_id if not group_team_ids else None
-        )
-        live = self.match_repo.list_by_tournament(
-            tournament_id, status="live", group_id=group_id if not group_team_ids else None
+        because new wiring always passes a team_repo. Head-to-head and
+        fair-play criteria see no data here and never split a tie."""
+        gid = group_id if not group_team_ids else None
+        finished, live = fan_out(
+            lambda: self.match_repo.list_by_tournament(tournament_id, status="finished", group_id=gid),
+            lambda: self.match_repo.list_by_tournament(tournament_id, status="live", group_id=gid),
         )
         matches = finished + live
         if group_team_ids:
@@ -184,4 +337,4 @@ class StandingsService:
                 "goal_difference": t["goals_for"] - t["goals_against"],
                 "points": t["points"], "form": t["results"][-5:],
             })
-        return self._rank_and_pack(entries)
+        return self._pack(rank_entries(entries, order, {}))
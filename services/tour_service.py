@@ -21,10 +21,12 @@ class TourService:
         self._booker_bool_fields = {"approved", "late", "yellowCard", "redCard", "mvp"}
         self._booker_int_fields = {"goals", "assists"}
 
-    def get(self, tour_id: str, account_id: str) -> dict[str, Any] | None:
-        item = self.repo.get(tour_id, account_id)
+    def get(self, tour_id: str, account_id: str, fields: list[str] | None = None) -> dict[str, Any] | None:
+        """The mapped tour; with `fields` (stored names), only those are
+        read and no image URLs are built — for guards."""
+        item = self.repo.get(tour_id, account_id, fields=fields)
         if item:
-            return self._map_tour(item)
+            return self._map_tour(item, get_presigned_url=fields is None)
         return None
 
     def list_tours(self, account_id: str, *, group: str | None = None, tour_type: str | None = None) -> list[dict[str, Any]]:
@@ -77,8 +79,7 @@ class TourService:
     def generate_put_presigned_urls(self, tour_id: str, account_id: str, files: list[FileSpec]) -> dict[str, dict[str, str]]:
         # TODO failing with multiple files in different calls - check why
         presigned_urls = {}
-        tour = self.get(tour_id, account_id)
-        if not tour:
+        if not self.repo.exists_for_account(tour_id, account_id):
             raise ValueError(f"Tour {tour_id} not found")
         # TODO Extract into S3Adapter method or other service. Works for payments too
         for file in files:
@@ -100,8 +101,7 @@ class TourService:
         return presigned_urls
 
     def add_images(self, tour_id: str, account_id: str, file_names: list[str]) -> list[str]:
-        existing = self.get(tour_id, account_id)
-        if not existing:
+        if not self.repo.exists_for_account(tour_id, account_id):
             raise ValueError(f"Tour {tour_id} not found")
         images = []
         for file_name in file_names:
@@ -117,7 +117,7 @@ class TourService:
         return images
 
     def update_booker_property(self, tour_id: str, account_id: str, booker_id: str, patch_property: PatchProperty) -> dict[str, Any] | None:
-        existing = self.repo.get(tour_id, account_id)
+        existing = self.repo.get(tour_id, account_id, fields=["bookers"])
         if not existing:
             return None
         bookers = existing.get("bookers", {})
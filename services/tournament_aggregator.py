@@ -3,16 +3,22 @@ to materialized `stats` fields on Tournament / TournamentTeam / TournamentPlayer
 items when an event or match changes.
 
 Design notes:
-- `event_delta` returns a dict of {player, team, tournament} deltas. Caller
-  fetches current `stats` for each and applies the delta (`apply_delta`),
-  then persists via `*_repo.update_stats`.
+- `event_delta` returns a dict of {player, team, tournament} deltas. Live
+  writes hand them to `*_repo.stats_delta` / `repositories.ddb_stats`,
+  which ADD the counters atomically in DynamoDB (no read first).
+  `apply_delta` is the in-memory equivalent, used by the full recompute.
 - `match_outcome_delta` covers the W/D/L + goals_for/against + points + form
   side of the picture. Only **group-stage** matches contribute to team
   standings (matches with no `round` set, i.e. not knockouts). Tournament
   totals (`matches_played`, `total_goals`) include all matches.
+- Group-stage outcomes also maintain a pairwise results matrix on each
+  team (`h2h:<opponent>:pts|gf|ga` counters, see `h2h_key`), which the
+  standings use for head-to-head tiebreaks.
 - `second_yellow` events count toward `red_cards` (matches the existing
   convention in stats_service:60 and player_service:133).
 - All functions here are pure — no I/O. They return dicts of deltas.
+  (Except `recompute_tournament`, the admin helper at the bottom, which
+  reads and persists around the pure `aggregate_tournament`.)
 
 Sign convention: `sign=+1` adds the contribution, `sign=-1` reverses it.
 This lets callers handle event/match deletion and updates symmetrically
@@ -23,6 +29,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from core.concurrency import fan_out
+
 # ── Event-type sets ────────────────────────────────────────────────────
 
 GOAL_TYPES = ("goal", "penalty_scored")  # counted as goals_for
@@ -150,9 +158,52 @@ def event_delta(event: dict[str, Any], sign: int = 1) -> dict[str, dict[str, Any
     }
 
 
+def score_delta(
+    event: dict[str, Any],
+    home_team_id: str | None,
+    away_team_id: str | None,
+    sign: int = 1,
+) -> tuple[int, int]:
+    """(home, away) score change for an event being added (`sign=+1`) or
+    removed (`sign=-1`). Goals and penalties count for the event's team;
+    own goals count for the opponent."""
+    etype = event.get("type", "")
+    team_id = event.get("team_id", "")
+    s = int(sign)
+    if etype in GOAL_TYPES:
+        if team_id == home_team_id:
+            return s, 0
+        if team_id == away_team_id:
+            return 0, s
+    elif etype == "own_goal":
+        if team_id == home_team_id:
+            return 0, s
+        if team_id == away_team_id:
+            return s, 0
+    return 0, 0
+
+
 # ── Match-driven deltas ────────────────────────────────────────────────
 
 
+def h2h_key(opponent_id: str, metric: str) -> str:
+    """Team-stats key of one head-to-head counter against `opponent_id`
+    (`metric` is "pts", "gf" or "ga"). Kept as flat counters in the
+    `stats` map so they are ADDed atomically like every other counter."""
+    return f"h2h:{opponent_id}:{metric}"
+
+
+def head_to_head(stats: dict[str, Any] | None, opponent_id: str) -> tuple[int, int, int]:
+    """(points, goals_for, goals_against) a team has taken off `opponent_id`
+    in group-stage matches."""
+    s = stats or {}
+    return (
+        int(s.get(h2h_key(opponent_id, "pts")) or 0),
+        int(s.get(h2h_key(opponent_id, "gf")) or 0),
+        int(s.get(h2h_key(opponent_id, "ga")) or 0),
+    )
+
+
 def _is_group_stage_match(match: dict[str, Any]) -> bool:
     """Group-stage matches are matchweek-driven and have no `round` set.
     Knockout matches carry a `round` like 'quarterfinals' / 'semiFinals' /
@@ -242,22 +293,32 @@ def match_outcome_delta(
 
     if sh > sa:
         home["won"] += 1 * s
-        home["points"] += ppw * s
         away["lost"] += 1 * s
-        away["points"] += ppl * s
+        home_points, away_points = ppw, ppl
         home_result, away_result = "W", "L"
     elif sh < sa:
         away["won"] += 1 * s
-        away["points"] += ppw * s
         home["lost"] += 1 * s
-        home["points"] += ppl * s
+        home_points, away_points = ppl, ppw
         home_result, away_result = "L", "W"
     else:
         home["drawn"] += 1 * s
         away["drawn"] += 1 * s
-        home["points"] += ppd * s
-        away["points"] += ppd * s
+        home_points, away_points = ppd, ppd
         home_result, away_result = "D", "D"
+    home["points"] += home_points * s
+    away["points"] += away_points * s
+
+    # Pairwise record for head-to-head tiebreaks (see `h2h_key`), so the
+    # standings never have to rescan matches to resolve a tie.
+    if home_id and away_id:
+        for side, opp, pts, gf, ga in (
+            (home, away_id, home_points, sh, sa),
+            (away, home_id, away_points, sa, sh),
+        ):
+            side[h2h_key(opp, "pts")] = pts * s
+            side[h2h_key(opp, "gf")] = gf * s
+            side[h2h_key(opp, "ga")] = ga * s
 
     # `form` entries are tagged with `match_id` so a reversal (sign=-1, e.g.
     # reopening a finished match) can remove the exact entry it added
@@ -339,84 +400,153 @@ def derive_average_goals_per_match(tournament_stats: dict[str, Any] | None) -> f
 # ── Full recompute (admin helper) ──────────────────────────────────────
 
 
-def recompute_tournament(
-    tournament_id: str,
-    *,
-    match_repo: Any,
-    event_repo: Any,
-    team_repo: Any,
-    player_repo: Any,
-    tournament_repo: Any,
-) -> dict[str, int]:
-    """Walk all matches + events for a tournament, rebuild stats from
-    scratch, and persist them on the tournament/team/player items.
+def _match_order(match: dict[str, Any]) -> tuple[str, int]:
+    # Replay finished matches chronologically so `form` ends up holding the
+    # most recent results, as it does when built live.
+    return (match.get("date") or "", int(match.get("matchweek") or 0))
 
-    Returns a summary dict: {teams_updated, players_updated, events_processed,
-    matches_processed}.
-    """
-    tournament = tournament_repo.get(tournament_id) or {}
-    rules = tournament.get("rules") or {}
 
-    teams = team_repo.list_by_tournament(tournament_id)
-    players = player_repo.list_by_tournament(tournament_id)
-    matches = match_repo.list_by_tournament(tournament_id)
+def aggregate_tournament(
+    rules: dict[str, Any],
+    teams: list[dict[str, Any]],
+    players: list[dict[str, Any]],
+    matches: list[dict[str, Any]],
+    events_by_match: dict[str, list[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Rebuild every stats map from raw matches + events in one pass over
+    the matches. Pure — callers fetch the inputs and persist the result.
 
+    Returns: {
+        "tournament": dict, "teams": {team_id: dict},
+        "players": {player_id: dict},
+        "matches_processed": int, "events_processed": int,
+    }
+    """
     team_stats: dict[str, dict] = {t["id"]: default_team_stats() for t in teams}
     player_stats: dict[str, dict] = {p["id"]: default_player_stats() for p in players}
     tournament_stats = default_tournament_stats()
     tournament_stats["total_matches"] = len(matches)
 
-    counted_matches = [m for m in matches if m.get("status") == "finished"]
-
-    # Apply outcome deltas for finished matches
-    for m in counted_matches:
-        d = match_outcome_delta(m, rules, sign=1)
-        if d["home_team_id"] in team_stats:
-            team_stats[d["home_team_id"]] = apply_delta(
-                team_stats[d["home_team_id"]], d["home_delta"]
-            )
-        if d["away_team_id"] in team_stats:
-            team_stats[d["away_team_id"]] = apply_delta(
-                team_stats[d["away_team_id"]], d["away_delta"]
-            )
-        tournament_stats = apply_delta(tournament_stats, d["tournament_delta"])
-
-    # Apply event deltas across all matches (so player cards in non-finished
-    # matches still register — though typically events are added during/after
-    # the match).
-    counted_match_ids = [m["id"] for m in matches if m.get("status") in ("finished", "live")]
-    events_by_match = event_repo.batch_list_by_matches(counted_match_ids)
-    events_processed = 0
-    for events in events_by_match.values():
-        for ev in events:
+    def _add_team(team_id: str | None, delta: dict[str, Any]) -> None:
+        if team_id in team_stats:
+            team_stats[team_id] = apply_delta(team_stats[team_id], delta)
+
+    def _add_player(player_id: str | None, delta: dict[str, Any]) -> None:
+        if player_id in player_stats:
+            player_stats[player_id] = apply_delta(player_stats[player_id], delta)
+
+    matches_processed = events_processed = 0
+    for m in sorted(matches, key=_match_order):
+        status = m.get("status")
+        # Outcome deltas only for finished matches; event deltas for live
+        # ones too, so cards in a match still being played register.
+        if status == "finished":
+            matches_processed += 1
+            d = match_outcome_delta(m, rules, sign=1)
+            _add_team(d["home_team_id"], d["home_delta"])
+            _add_team(d["away_team_id"], d["away_delta"])
+            tournament_stats = apply_delta(tournament_stats, d["tournament_delta"])
+        if status not in ("finished", "live"):
+            continue
+        for ev in events_by_match.get(m["id"], ()):
             events_processed += 1
             d = event_delta(ev, sign=1)
-            if d["player_id"] and d["player_id"] in player_stats:
-                player_stats[d["player_id"]] = apply_delta(
-                    player_stats[d["player_id"]], d["player_delta"]
-                )
-            if d["assist_player_id"] and d["assist_player_id"] in player_stats:
-                player_stats[d["assist_player_id"]] = apply_delta(
-                    player_stats[d["assist_player_id"]], d["assist_player_delta"]
-                )
-            if d["team_id"] and d["team_id"] in team_stats:
-                team_stats[d["team_id"]] = apply_delta(
-                    team_stats[d["team_id"]], d["team_delta"]
-                )
+            _add_player(d["player_id"], d["player_delta"])
+            _add_player(d["assist_player_id"], d["assist_player_delta"])
+            _add_team(d["team_id"], d["team_delta"])
             tournament_stats = apply_delta(tournament_stats, d["tournament_delta"])
 
-    tournament_stats = update_average_goals_per_match(tournament_stats)
+    return {
+        "tournament": tournament_stats,
+        "teams": team_stats,
+        "players": player_stats,
+        "matches_processed": matches_processed,
+        "events_processed": events_processed,
+    }
+
+
+def _changed_items(
+    items: list[dict[str, Any]], new_stats: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Items whose stored `stats` differ from the recomputed ones, with the
+    new stats swapped in. (DynamoDB numbers come back as Decimal, which
+    compares equal to the int counters.)"""
+    return [
+        {**item, "stats": new_stats[item["id"]]}
+        for item in items
+        if item.get("stats") != new_stats[item["id"]]
+    ]
 
-    # Persist
-    for tid, stats in team_stats.items():
-        team_repo.update_stats(tid, stats)
-    for pid, stats in player_stats.items():
-        player_repo.update_stats(pid, stats)
-    tournament_repo.update_stats(tournament_id, tournament_stats)
+
+def recompute_tournament(
+    tournament_id: str,
+    *,
+    match_repo: Any,
+    event_repo: Any,
+    team_repo: Any,
+    player_repo: Any,
+    tournament_repo: Any,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Walk all matches + events for a tournament, rebuild stats from
+    scratch, and persist the ones that changed on the tournament/team/player
+    items.
+
+    The tournament is read first; its teams, players, matches and — for
+    tournaments flagged `events_indexed` — events (the event
+    `tournament_index`) are then read concurrently in one round-trip.
+    Unflagged tournaments may still have events without `tournament_id`
+    (written before the index existed, until
+    `migrations/backfill_event_tournament_id.py` has covered them), so
+    their events are listed match by match instead — rebuilding from a
+    partial event set would zero those players' stats. Only the `stats` (and
+    leaderboard keys) of changed teams and players are written, with one
+    concurrent UpdateItem each (`update_stats`), so edits made to those
+    items meanwhile are left alone; unchanged ones aren't written at all.
+    `dry_run=True` computes the diff without writing.
+
+    Returns a summary dict: {teams_updated, players_updated,
+    teams_unchanged, players_unchanged, tournament_updated,
+    events_processed, matches_processed}.
+    """
+    tournament = tournament_repo.get(tournament_id) or {}
+    events_indexed = bool(tournament.get("events_indexed"))
+    teams, players, matches, events = fan_out(
+        lambda: team_repo.list_by_tournament(tournament_id),
+        lambda: player_repo.list_by_tournament(tournament_id),
+        lambda: match_repo.list_by_tournament(tournament_id),
+        lambda: event_repo.list_by_tournament(tournament_id) if events_indexed else [],
+    )
+    rules = tournament.get("rules") or {}
+    if events_indexed:
+        events_by_match = event_repo.group_by_match(events)
+    else:
+        events_by_match = event_repo.batch_list_by_matches([m["id"] for m in matches])
+
+    result = aggregate_tournament(rules, teams, players, matches, events_by_match)
+
+    changed_teams = _changed_items(teams, result["teams"])
+    changed_players = _changed_items(players, result["players"])
+    tournament_changed = bool(tournament) and tournament.get("stats") != result["tournament"]
+
+    if not dry_run:
+        fan_out(
+            *(lambda t=t: team_repo.update_stats(t["id"], t["stats"]) for t in changed_teams),
+            *(lambda p=p: player_repo.update_stats(p["id"], p["stats"]) for p in changed_players),
+        )
+        # Team/player updates don't touch the tournament item, so bump its
+        # read-cache version explicitly when only teams/players changed.
+        if tournament_changed:
+            tournament_repo.update_stats(tournament_id, result["tournament"])
+        elif changed_teams or changed_players:
+            tournament_repo.bump_version(tournament_id)
 
     return {
-        "teams_updated": len(team_stats),
-        "players_updated": len(player_stats),
-        "events_processed": events_processed,
-        "matches_processed": len(counted_matches),
+        "teams_updated": len(changed_teams),
+        "players_updated": len(changed_players),
+        "teams_unchanged": len(teams) - len(changed_teams),
+        "players_unchanged": len(players) - len(changed_players),
+        "tournament_updated": int(tournament_changed),
+        "events_processed": result["events_processed"],
+        "matches_processed": result["matches_processed"],
     }
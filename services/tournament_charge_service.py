@@ -0,0 +1,210 @@
+"""Card charges for finished tournament matches.
+
+`charge_match` is the charge-generation stage shared by the automatic
+charge on match finish and the manual "Generar Cobros" endpoint:
+
+- the match's card events are read once and grouped per team;
+- teams, players and each team's recipient are looked up once, in
+  parallel, instead of once per card;
+- every charge is written in one `PaymentRequestService.create_charges`
+  pass (BatchWriteItem), with ids derived from the card event id, so a
+  re-run only writes the cards not charged yet (the card event id is also
+  kept as the charge's `reference`);
+- nothing is notified inline. One `payment_created` intent per team
+  recipient is recorded in the notification outbox
+  (`PaymentRequestService.notify_payment_created`) and delivered by its
+  worker.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from api.schemas.payments import BulkPutPaymentRequest
+from core.concurrency import fan_map, fan_out
+from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
+from repositories.tournament_player_repo_ddb import TournamentPlayerRepo
+from repositories.tournament_team_repo_ddb import TournamentTeamRepo
+from repositories.user_repo_ddb import UserRepo
+from services.account_service import AccountService
+from services.payment_request_service import PaymentRequestService
+
+CARD_YELLOW_TYPES = frozenset({"yellow_card"})
+CARD_RED_TYPES = frozenset({"red_card", "second_yellow"})
+
+_TEAM_FIELDS = ["id", "name", "owner_user_id", "contact_email"]
+_DUE_DAYS = 30
+
+
+class TournamentChargeService:
+    def __init__(
+        self,
+        event_repo: TournamentMatchEventRepo,
+        team_repo: TournamentTeamRepo,
+        player_repo: TournamentPlayerRepo,
+        user_repo: UserRepo,
+        account_svc: AccountService,
+        pr_svc: PaymentRequestService,
+    ):
+        self.event_repo = event_repo
+        self.team_repo = team_repo
+        self.player_repo = player_repo
+        self.user_repo = user_repo
+        self.account_svc = account_svc
+        self.pr_svc = pr_svc
+
+    def charge_match(
+        self,
+        tournament: dict[str, Any],
+        match: dict[str, Any],
+        account_id: str,
+        check_legacy: bool = False,
+    ) -> dict[str, Any]:
+        """Create the card charges of a finished match.
+
+        With `check_legacy`, cards charged under ids that predate
+        `PaymentRequestService.charge_id` are found by their `reference`
+        too (a filtered scan, so only the manual endpoint asks for it).
+        Raises ValueError when the account has no default workspace to file
+        the charges under.
+
+        Returns the counters of the manual endpoint.
+        """
+        rules = tournament.get("rules") or {}
+        yellow_fee = int(rules.get("yellow_card_fee") or 0)
+        red_fee = int(rules.get("red_card_fee") or 0)
+        result: dict[str, Any] = {
+            "created": 0,
+            "card_events_found": 0,
+            "skipped_already_charged": 0,
+            "skipped_no_team": 0,
+            "skipped_no_manager": 0,
+            "skipped_fee_zero": 0,
+        }
+
+        card_events = [
+            ev for ev in self.event_repo.list_by_match(match["id"])
+            if ev.get("type") in (CARD_YELLOW_TYPES | CARD_RED_TYPES)
+        ]
+        result["card_events_found"] = len(card_events)
+        if not card_events or (yellow_fee == 0 and red_fee == 0):
+            result["skipped_fee_zero"] = len(card_events)
+            return result
+
+        # Charges must land in the account's real workspace ("group" means
+        # workspace_id everywhere else; tournaments have none of their own).
+        workspace_id = self._default_workspace(account_id)
+        if not workspace_id:
+            raise ValueError("Account has no default workspace configured")
+
+        skip = (
+            self.pr_svc.repo.list_references(account_id, [ev["id"] for ev in card_events])
+            if check_legacy else set()
+        )
+        by_team: dict[str, list[dict[str, Any]]] = {}
+        for ev in card_events:
+            if ev.get("id") in skip:
+                result["skipped_already_charged"] += 1
+            else:
+                by_team.setdefault(ev.get("team_id") or "", []).append(ev)
+
+        team_ids = {t for t in (match.get("home_team_id"), match.get("away_team_id"), *by_team) if t}
+        player_ids = {ev["player_id"] for evs in by_team.values() for ev in evs if ev.get("player_id")}
+        teams, players = fan_out(
+            lambda: self._get_all(team_ids, lambda t: self.team_repo.get(t, fields=_TEAM_FIELDS)),
+            lambda: self._get_all(player_ids, self.player_repo.get),
+        )
+        recipients = self._get_all(
+            [t for t in by_team if t in teams],
+            lambda t: self._recipient(teams[t], account_id),
+        )
+
+        now = datetime.utcnow()
+        today = now.date().isoformat()
+        due = (now + timedelta(days=_DUE_DAYS)).date().isoformat()
+        tournament_name = tournament.get("name", "Torneo")
+        home_name = (teams.get(match.get("home_team_id")) or {}).get("name") or match.get("home_team_id", "")
+        away_name = (teams.get(match.get("away_team_id")) or {}).get("name") or match.get("away_team_id", "")
+        description = f"{tournament_name} - Partido {(match.get('date') or '')[:10]}: {home_name} vs {away_name}"
+
+        charges: list[BulkPutPaymentRequest] = []
+        for team_id, events in by_team.items():
+            team = teams.get(team_id)
+            if not team:
+                result["skipped_no_team"] += len(events)
+                continue
+            recipient = recipients.get(team_id)
+            if not recipient:
+                result["skipped_no_manager"] += len(events)
+                continue
+            for ev in events:
+                is_red = ev.get("type") in CARD_RED_TYPES
+                fee = red_fee if is_red else yellow_fee
+                if fee == 0:
+                    result["skipped_fee_zero"] += 1
+                    continue
+                card_label = "Tarjeta Roja" if is_red else "Tarjeta Amarilla"
+                player_name = (players.get(ev.get("player_id")) or {}).get("name") or "Jugador sin nombre"
+                charges.append(BulkPutPaymentRequest(
+                    createDate=today,
+                    dueDate=due,
+                    concept=f"{card_label} - {player_name} ({team.get('name', 'Equipo')})",
+                    description=description,
+                    category="tournament_fine",
+                    group=workspace_id,
+                    paymentRequestTo=[recipient],
+                    userPrice=fee,
+                    reference=ev["id"],
+                ))
+
+        created = self.pr_svc.create_charges(charges, account_id) if charges else []
+        result["created"] = len(created)
+        result["skipped_already_charged"] += len(charges) - len(created)
+        self.pr_svc.notify_payment_created(self._notices(created, tournament_name, due))
+        return result
+
+    def _default_workspace(self, account_id: str) -> str | None:
+        account = self.account_svc.get(account_id)
+        return (account.get("settings") or {}).get("default_workspace") if account else None
+
+    @staticmethod
+    def _get_all(ids: Iterable[str], get: Any) -> dict[str, dict[str, Any]]:
+        ids = list(ids)
+        return {i: item for i, item in zip(ids, fan_map(get, ids)) if item}
+
+    def _recipient(self, team: dict[str, Any], account_id: str) -> dict[str, Any] | None:
+        """Who gets billed for a team's cards: the invitation-accepted owner,
+        else the user behind contact_email, else contact_email itself."""
+        team_name = team.get("name", "Equipo")
+        owner_id = team.get("owner_user_id")
+        if owner_id:
+            user = self.user_repo.get(owner_id, account_id)
+            if user:
+                return {"id": user["id"], "name": user.get("name") or team_name, "email": user.get("email", "")}
+        contact_email = (team.get("contact_email") or "").strip()
+        if not contact_email:
+            return None
+        user = self.user_repo.get_by_email(contact_email)
+        if user:
+            return {"id": user["id"], "name": user.get("name") or team_name, "email": user.get("email", contact_email)}
+        return {"id": team["id"], "name": team_name, "email": contact_email}
+
+    @staticmethod
+    def _notices(created: list[dict[str, Any]], tournament_name: str, due: str) -> list[dict[str, Any]]:
+        """One `payment_created` notice per recipient, summing their cards."""
+        by_email: dict[str, list[dict[str, Any]]] = {}
+        for pr in created:
+            to = pr.get("paymentRequestTo") or {}
+            if to.get("email"):
+                by_email.setdefault(to["email"], []).append(pr)
+        notices = []
+        for email, prs in by_email.items():
+            concept = prs[0]["concept"] if len(prs) == 1 else f"{len(prs)} tarjetas - {tournament_name}"
+            notices.append({
+                "email": email,
+                "user_name": prs[0]["paymentRequestTo"].get("name", ""),
+                "concept": concept,
+                "amount": sum(int(pr.get("totalAmount") or 0) for pr in prs),
+                "due_date": due,
+                "payment_request_ids": [pr["id"] for pr in prs],
+            })
+        return notices
@@ -2,30 +2,39 @@
 
 Each event mutation (create/update/delete) applies a delta to the
 materialized stats on TournamentPlayer, TournamentTeam, and Tournament
-items via the aggregator. The parent match score is also auto-synced
-for goal-type events so the score stays correct.
+items via the aggregator, and moves the parent match score for goal-type
+events.
+
+Ingestion path for a new event (live scoring from a phone), at most three
+DynamoDB calls:
+1. get the match (live check, team ids, tournament id);
+2. one conditional update on the match that reserves the next
+   `event_index` from its `event_seq` counter and ADDs the score change —
+   it only succeeds while the match is still `live`;
+3. one transaction that puts the event and ADDs the player / assist /
+   team / tournament stats deltas.
 """
 
+import logging
 from uuid import uuid4
 from datetime import datetime
 from typing import Any
 
 from api.schemas.tournaments import CreateMatchEvent, PatchMatchEvent
+from repositories.ddb_stats import apply_stats_deltas
 from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
 from repositories.tournament_player_repo_ddb import TournamentPlayerRepo
 from repositories.tournament_repo_ddb import TournamentRepo
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
-from services.tournament_aggregator import (
-    apply_delta,
-    default_player_stats,
-    default_team_stats,
-    default_tournament_stats,
-    event_delta,
-    update_average_goals_per_match,
+from services.tournament_aggregator import event_delta, score_delta
+
+_NOT_LIVE = (
+    "Match events can only be edited while the match is in progress. "
+    "Reopen the match first."
 )
 
-_GOAL_TYPES = {"goal", "own_goal", "penalty_scored"}
+logger = logging.getLogger(__name__)
 
 
 class TournamentMatchEventService:
@@ -44,33 +53,45 @@ class TournamentMatchEventService:
         self.tournament_repo = tournament_repo
 
     def create_event(self, match_id: str, body: CreateMatchEvent) -> dict[str, Any]:
-        self._require_live_match(match_id)
+        match = self._require_live_match(match_id)
         self._validate_players(body.type.value, body.player_id, body.assist_player_id)
 
-        event_index = body.event_index
-        if event_index is None:
-            existing = self.repo.list_by_match(match_id)
-            event_index = max((e.get("event_index", 0) for e in existing), default=0) + 1
-
         item = {
             "id": f"mev_{uuid4().hex}",
             "match_id": match_id,
+            "tournament_id": (match or {}).get("tournament_id"),
             "type": body.type.value,
             "minute": body.minute,
             "stoppage_time": body.stoppage_time,
             "player_id": body.player_id,
             "assist_player_id": body.assist_player_id,
             "team_id": body.team_id,
-            "event_index": event_index,
+            "event_index": body.event_index,
             "created_at": datetime.utcnow().isoformat(),
         }
-        self.repo.put(item)
 
-        self._apply_event(item, sign=+1)
-
-        if body.type.value in _GOAL_TYPES:
-            self._sync_match_score(match_id)
+        dh, da = self._score_change(match, added=item)
+        if match is not None:
+            updated = self._record_on_match(
+                match,
+                next_index=body.event_index is None,
+                score_home_delta=dh,
+                score_away_delta=da,
+            )
+            if body.event_index is None:
+                item["event_index"] = int(updated["event_seq"])
+        elif item["event_index"] is None:
+            existing = self.repo.list_by_match(match_id)
+            item["event_index"] = max((e.get("event_index", 0) for e in existing), default=0) + 1
 
+        try:
+            apply_stats_deltas(
+                self._stats_deltas(item, +1, match),
+                extra_items=[self.repo.put_op(item)],
+            )
+        except Exception:
+            self._undo_score(match, dh, da)
+            raise
         return item
 
     def get_event(self, event_id: str) -> dict[str, Any] | None:
@@ -83,8 +104,11 @@ class TournamentMatchEventService:
         existing = self.repo.get(event_id)
         if not existing:
             return None
-        self._require_live_match(existing["match_id"])
-        updates = body.dict(exclude_unset=True, exclude_none=True)
+        match = self._require_live_match(existing["match_id"])
+        updates = {
+            k: getattr(v, "value", v)
+            for k, v in body.dict(exclude_unset=True, exclude_none=True).items()
+        }
         if not updates:
             return existing
 
@@ -94,81 +118,123 @@ class TournamentMatchEventService:
             updates.get("assist_player_id", existing.get("assist_player_id")),
         )
 
-        # Reverse the old event's contribution before persisting the change,
-        # then apply the new one.
-        self._apply_event(existing, sign=-1)
-        result = self.repo.update(event_id, updates)
-        if result:
-            self._apply_event(result, sign=+1)
-
-        old_is_goal = existing.get("type", "") in _GOAL_TYPES
-        new_is_goal = (result or existing).get("type", "") in _GOAL_TYPES
-        if old_is_goal or new_is_goal:
-            self._sync_match_score(existing["match_id"])
-
+        result = {**existing, **updates}
+        if match is not None and not result.get("tournament_id"):
+            # Events created before `tournament_id` was stamped pick it up
+            # on their next edit.
+            result["tournament_id"] = match.get("tournament_id")
+        dh, da = self._score_change(match, removed=existing, added=result)
+        if match is not None and (dh or da):
+            self._record_on_match(match, next_index=False, score_home_delta=dh, score_away_delta=da)
+
+        # Reverse the old event's contribution and apply the new one in the
+        # same transaction as the event rewrite (deltas on the same item
+        # are folded together).
+        try:
+            apply_stats_deltas(
+                self._stats_deltas(existing, -1, match) + self._stats_deltas(result, +1, match),
+                extra_items=[self.repo.replace_op(result)],
+            )
+        except Exception:
+            self._undo_score(match, dh, da)
+            raise
         return result
 
     def delete_event(self, event_id: str) -> bool:
         existing = self.repo.get(event_id)
         if not existing:
             return False
-        self._require_live_match(existing["match_id"])
-
-        self._apply_event(existing, sign=-1)
-        self.repo.delete(event_id)
+        match = self._require_live_match(existing["match_id"])
 
-        if existing.get("type", "") in _GOAL_TYPES:
-            self._sync_match_score(existing["match_id"])
+        dh, da = self._score_change(match, removed=existing)
+        if match is not None and (dh or da):
+            self._record_on_match(match, next_index=False, score_home_delta=dh, score_away_delta=da)
 
+        try:
+            apply_stats_deltas(
+                self._stats_deltas(existing, -1, match),
+                extra_items=[self.repo.delete_op(event_id)],
+            )
+        except Exception:
+            self._undo_score(match, dh, da)
+            raise
         return True
 
     # ── Aggregator hook ──────────────────────────────────────────────
 
-    def _apply_event(self, event: dict[str, Any], sign: int) -> None:
-        """Apply (or reverse) this event's contribution to the materialized
-        stats on Player / Team / Tournament items. No-ops if the relevant
-        repos weren't injected (e.g., older test wiring)."""
+    def _stats_deltas(
+        self, event: dict[str, Any], sign: int, match: dict[str, Any] | None
+    ) -> list:
+        """This event's contribution (or its reversal) to the materialized
+        stats on Player / Team / Tournament items, as `StatsDelta`s for
+        `apply_stats_deltas`. Skips repos that weren't injected (e.g.,
+        older test wiring)."""
         d = event_delta(event, sign=sign)
+        tournament_id = (match or {}).get("tournament_id")
 
-        match = None
-        tournament_id = None
-        if self.match_repo and event.get("match_id"):
-            match = self.match_repo.get(event["match_id"])
-            tournament_id = (match or {}).get("tournament_id")
-
+        deltas = []
         if self.player_repo and d["player_id"]:
-            current = (self.player_repo.get(d["player_id"]) or {}).get(
-                "stats"
-            ) or default_player_stats()
-            self.player_repo.update_stats(
-                d["player_id"], apply_delta(current, d["player_delta"])
-            )
-
+            deltas.append(self.player_repo.stats_delta(d["player_id"], d["player_delta"]))
         if self.player_repo and d["assist_player_id"]:
-            current = (self.player_repo.get(d["assist_player_id"]) or {}).get(
-                "stats"
-            ) or default_player_stats()
-            self.player_repo.update_stats(
-                d["assist_player_id"],
-                apply_delta(current, d["assist_player_delta"]),
+            deltas.append(
+                self.player_repo.stats_delta(d["assist_player_id"], d["assist_player_delta"])
             )
-
         if self.team_repo and d["team_id"]:
-            current = (self.team_repo.get(d["team_id"]) or {}).get(
-                "stats"
-            ) or default_team_stats()
-            self.team_repo.update_stats(
-                d["team_id"], apply_delta(current, d["team_delta"])
-            )
-
+            deltas.append(self.team_repo.stats_delta(d["team_id"], d["team_delta"]))
         if self.tournament_repo and tournament_id:
-            current = (self.tournament_repo.get(tournament_id) or {}).get(
-                "stats"
-            ) or default_tournament_stats()
-            merged = apply_delta(current, d["tournament_delta"])
-            self.tournament_repo.update_stats(
-                tournament_id, update_average_goals_per_match(merged)
+            deltas.append(self.tournament_repo.stats_delta(tournament_id, d["tournament_delta"]))
+        return deltas
+
+    # ── Match score / index ──────────────────────────────────────────
+
+    @staticmethod
+    def _score_change(
+        match: dict[str, Any] | None,
+        *,
+        removed: dict[str, Any] | None = None,
+        added: dict[str, Any] | None = None,
+    ) -> tuple[int, int]:
+        if match is None:
+            return 0, 0
+        home_id = match.get("home_team_id")
+        away_id = match.get("away_team_id")
+        dh = da = 0
+        if removed is not None:
+            h, a = score_delta(removed, home_id, away_id, sign=-1)
+            dh, da = dh + h, da + a
+        if added is not None:
+            h, a = score_delta(added, home_id, away_id, sign=+1)
+            dh, da = dh + h, da + a
+        return dh, da
+
+    def _record_on_match(self, match: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        """Reserve an event index / move the score on the match. Fails if
+        the match left `live` since it was read."""
+        index_base = 0
+        if kwargs.get("next_index") and "event_seq" not in match:
+            # Matches whose events predate the counter: seed it once from
+            # the highest existing index.
+            existing = self.repo.list_by_match(match["id"])
+            index_base = max((e.get("event_index", 0) for e in existing), default=0)
+        updated = self.match_repo.record_event(match["id"], index_base=index_base, **kwargs)
+        if updated is None:
+            raise ValueError(_NOT_LIVE)
+        return updated
+
+    def _undo_score(self, match: dict[str, Any] | None, dh: int, da: int) -> None:
+        """Compensate the score change if the event/stats write failed.
+        The compensation is conditioned on the match being live too; if it
+        finished meanwhile the score stays off by (dh, da) and is logged
+        for a manual fix."""
+        if match is not None and (dh or da):
+            undone = self.match_repo.record_event(
+                match["id"], next_index=False, score_home_delta=-dh, score_away_delta=-da
             )
+            if undone is None:
+                logger.error(
+                    "could not undo score change (%+d, %+d) on match %s: no longer live",
+                    dh, da, match["id"],
+                )
 
     # ── Helpers ──────────────────────────────────────────────────────
 
@@ -185,53 +251,21 @@ class TournamentMatchEventService:
         if assist_player_id and assist_player_id == player_id:
             raise ValueError("The two players in this event must be different.")
 
-    def _require_live_match(self, match_id: str) -> None:
+    def _require_live_match(self, match_id: str) -> dict[str, Any] | None:
         """Events may only be added/edited/deleted while the match is
         `live`. Once a match is `finished`, its W/D/L/points are
         materialized on the team via match_outcome_delta — editing events
-        at that point would drift the match's score (via _sync_match_score)
+        at that point would drift the match's score (via the score deltas)
         without ever updating those materialized stats. Admins must use
         "reopen" to bring the match back to `live` before correcting events;
-        that flow properly reverses/reapplies the outcome delta."""
-        if not self.match_repo:
-            return
-        match = self.match_repo.get(match_id)
-        if match and match.get("status") != "live":
-            raise ValueError(
-                "Match events can only be edited while the match is in progress. "
-                "Reopen the match first."
-            )
+        that flow properly reverses/reapplies the outcome delta.
 
-    def _sync_match_score(self, match_id: str) -> None:
-        """Recompute score from all events and update the match record."""
+        Returns the match so callers can reuse it."""
         if not self.match_repo:
-            return
+            return None
         match = self.match_repo.get(match_id)
         if not match:
-            return
-
-        home_team_id = match.get("home_team_id")
-        away_team_id = match.get("away_team_id")
-        events = self.repo.list_by_match(match_id)
-
-        score_home = 0
-        score_away = 0
-        for ev in events:
-            etype = ev.get("type", "")
-            team_id = ev.get("team_id", "")
-
-            if etype in ("goal", "penalty_scored"):
-                if team_id == home_team_id:
-                    score_home += 1
-                elif team_id == away_team_id:
-                    score_away += 1
-            elif etype == "own_goal":
-                if team_id == home_team_id:
-                    score_away += 1
-                elif team_id == away_team_id:
-                    score_home += 1
-
-        self.match_repo.update(match_id, {
-            "score_home": score_home,
-            "score_away": score_away,
-        })
+            raise ValueError("Match not found")
+        if match.get("status") != "live":
+            raise ValueError(_NOT_LIVE)
+        return match
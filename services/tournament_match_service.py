@@ -1,22 +1,19 @@
 """Business logic for Match management including fixture generation."""
 
 from uuid import uuid4
-from datetime import datetime, timedelta
+from datetime import datetime, time
 from typing import Any
-from itertools import combinations
 
 from api.schemas.tournaments import CreateMatch, PatchMatch, GenerateScheduleRequest, BulkMatchesRequest
+from core.concurrency import fan_out
+from repositories.ddb_batch import BatchWriteError
+from repositories.ddb_stats import apply_stats_deltas
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
 from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
 from repositories.tournament_repo_ddb import TournamentRepo
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
-from services.tournament_aggregator import (
-    apply_delta,
-    default_team_stats,
-    default_tournament_stats,
-    match_outcome_delta,
-    update_average_goals_per_match,
-)
+from services.fixture_scheduler import SlotPlanner, merge_groups
+from services.tournament_aggregator import match_outcome_delta
 
 
 # Valid status transitions
@@ -28,6 +25,11 @@ _STATUS_TRANSITIONS = {
 }
 
 
+class MatchStatusConflict(Exception):
+    """The match's status changed between reading it and writing the new
+    one (e.g. two concurrent "finish" requests)."""
+
+
 class TournamentMatchService:
     def __init__(
         self,
@@ -68,6 +70,8 @@ class TournamentMatchService:
             "created_at": datetime.utcnow().isoformat(),
         }
         self.repo.put(item)
+        self._touch(tournament_id)
+        self._track_open(tournament_id, {item["matchweek"]: 1})
         return item
 
     def get_match(self, match_id: str) -> dict[str, Any] | None:
@@ -130,7 +134,16 @@ class TournamentMatchService:
         if not updates:
             return existing
 
-        result = self.repo.update(match_id, updates)
+        if "status" in updates:
+            # The counters and outcome below are derived from `old_status`,
+            # so the write only goes through if nobody moved it meanwhile.
+            result = self.repo.update(match_id, updates, expected_status=old_status)
+            if result is None:
+                raise MatchStatusConflict(
+                    f"Match status changed from '{old_status}' since it was read; reload and retry"
+                )
+        else:
+            result = self.repo.update(match_id, updates)
 
         # Propagate to materialized stats if the match crossed the finished
         # boundary. Use the freshly-persisted row so scores are current.
@@ -138,13 +151,17 @@ class TournamentMatchService:
         was_finished = old_status == "finished"
         is_finished = new_status == "finished"
         if was_finished != is_finished:
+            # The outcome path bumps the tournament version itself.
             self._apply_match_outcome(
                 existing if was_finished else (result or existing),
                 sign=-1 if was_finished else +1,
             )
+        else:
+            self._touch(existing.get("tournament_id"))
 
         if "status" in updates and existing.get("matchweek"):
-            self._advance_current_matchweek(existing.get("tournament_id"))
+            delta = int(new_status != "finished") - int(old_status != "finished")
+            self._track_open(existing.get("tournament_id"), {existing["matchweek"]: delta})
 
         return result
 
@@ -184,13 +201,24 @@ class TournamentMatchService:
         if existing.get("status") == "finished":
             self._apply_match_outcome(existing, sign=-1)
         self.repo.delete(match_id)
+        self._touch(existing.get("tournament_id"))
+        if existing.get("status") != "finished":
+            self._track_open(existing.get("tournament_id"), {existing.get("matchweek"): -1})
         return True
 
+    def _touch(self, tournament_id: str | None) -> None:
+        """Invalidate cached public reads of the tournament (version bump)."""
+        if self.tournament_repo and tournament_id:
+            self.tournament_repo.bump_version(tournament_id)
+
     # ── Aggregator hook ──────────────────────────────────────────────
 
     def _apply_match_outcome(self, match: dict[str, Any], sign: int) -> None:
         """Apply (or reverse) this match's outcome contribution to the
-        materialized stats on the two teams + the tournament item."""
+        materialized stats on the two teams + the tournament item.
+
+        Counters for all three items are ADDed in one transaction; the
+        teams' `form` lists are then updated with conditional writes."""
         if not (self.team_repo and self.tournament_repo):
             return
         tournament_id = match.get("tournament_id")
@@ -201,41 +229,73 @@ class TournamentMatchService:
 
         d = match_outcome_delta(match, rules, sign=sign)
 
-        for team_key, delta_key in (("home_team_id", "home_delta"), ("away_team_id", "away_delta")):
-            team_id = d.get(team_key)
-            if not team_id:
-                continue
-            current = (self.team_repo.get(team_id) or {}).get("stats") or default_team_stats()
-            self.team_repo.update_stats(team_id, apply_delta(current, d[delta_key]))
-
-        t_current = tournament.get("stats") or default_tournament_stats()
-        merged = apply_delta(t_current, d["tournament_delta"])
-        self.tournament_repo.update_stats(tournament_id, update_average_goals_per_match(merged))
-
-    def _advance_current_matchweek(self, tournament_id: str | None) -> None:
-        """Recompute the tournament's `current_matchweek` as the earliest
-        matchweek that still has a non-finished match, so the tournaments
-        list reflects real progress instead of freezing at the matchweek
-        set when the schedule was generated. Once every matchweek is
-        finished, pins it to the last one (knockout phase takes over from
-        there on the frontend)."""
+        teams = [
+            (d[team_key], d[delta_key])
+            for team_key, delta_key in (("home_team_id", "home_delta"), ("away_team_id", "away_delta"))
+            if d.get(team_key)
+        ]
+        apply_stats_deltas(
+            [self.team_repo.stats_delta(team_id, delta) for team_id, delta in teams]
+            + [self.tournament_repo.stats_delta(tournament_id, d["tournament_delta"])]
+        )
+        fan_out(*(
+            (lambda team_id=team_id, delta=delta: self.team_repo.update_form(team_id, delta))
+            for team_id, delta in teams
+        ))
+        if teams:
+            # The transaction above already bumped the version, but `form`
+            # lands after it — bump again so nothing cached in between
+            # (public views, standings) outlives the form change.
+            self._touch(tournament_id)
+
+    # ── Current matchweek ────────────────────────────────────────────
+    # The tournament's `current_matchweek` is the earliest matchweek that
+    # still has a non-finished match, so the tournaments list reflects real
+    # progress instead of freezing at the matchweek set when the schedule
+    # was generated. Once every matchweek is finished it stays on the last
+    # one (knockout phase takes over from there on the frontend).
+    #
+    # Rather than listing the tournament's matches on every status change,
+    # the tournament item keeps a `matchweek_open` counter per matchweek
+    # (see TournamentRepo.adjust_open_matches): each match write ADDs its
+    # delta and gets the whole map back, and `current_matchweek` is only
+    # written when the derived value moves.
+
+    def _track_open(self, tournament_id: str | None, deltas: dict[Any, int]) -> None:
+        """ADD per-matchweek deltas to the open-match counters and move
+        `current_matchweek` if needed. Matchweek 0 (knockout / unscheduled
+        matches) is not tracked."""
         if not (tournament_id and self.tournament_repo):
             return
-
-        matches = self.repo.list_by_tournament(tournament_id)
-        matchweeks = [m.get("matchweek") for m in matches if m.get("matchweek")]
-        if not matchweeks:
+        deltas = {int(mw): d for mw, d in deltas.items() if mw and d}
+        if not deltas:
             return
-
-        unfinished = [
-            m.get("matchweek") for m in matches
-            if m.get("matchweek") and m.get("status") != "finished"
-        ]
-        new_current = min(unfinished) if unfinished else max(matchweeks)
-
-        tournament = self.tournament_repo.get(tournament_id) or {}
+        tournament = self.tournament_repo.adjust_open_matches(tournament_id, deltas)
+        if tournament is None:
+            # Tournament predates the counters: seed them from a one-time
+            # listing, which already reflects the write that got us here.
+            counts = self._open_counts(self.repo.list_by_tournament(tournament_id))
+            tournament = self.tournament_repo.seed_open_matches(tournament_id, counts)
+        if tournament:
+            self._sync_current_matchweek(tournament)
+
+    @staticmethod
+    def _open_counts(matches: list[dict[str, Any]]) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for m in matches:
+            if m.get("matchweek"):
+                mw = int(m["matchweek"])
+                counts[mw] = counts.get(mw, 0) + int(m.get("status") != "finished")
+        return counts
+
+    def _sync_current_matchweek(self, tournament: dict[str, Any]) -> None:
+        open_counts = {int(k): v for k, v in (tournament.get("matchweek_open") or {}).items()}
+        if not open_counts:
+            return
+        unfinished = [mw for mw, n in open_counts.items() if n > 0]
+        new_current = min(unfinished) if unfinished else max(open_counts)
         if tournament.get("current_matchweek") != new_current:
-            self.tournament_repo.update(tournament_id, {"current_matchweek": new_current})
+            self.tournament_repo.update(tournament["id"], {"current_matchweek": new_current})
 
     # ── Fixture Generation ───────────────────────────────────────────
 
@@ -246,78 +306,97 @@ class TournamentMatchService:
         body: GenerateScheduleRequest,
         legs: int = 2,
     ) -> dict[str, Any]:
-        """Generate round-robin schedule for a league tournament.
+        """Generate a round-robin schedule for one league / group. See
+        `generate_group_schedules`."""
+        return self.generate_group_schedules(
+            tournament_id, [(body.group_id or "", team_ids)], body, legs=legs
+        )
 
-        Uses a classic round-robin algorithm. If legs=2, each pair plays
-        twice (home/away swapped in the second half).
+    def generate_group_schedules(
+        self,
+        tournament_id: str,
+        groups: list[tuple[str, list[str]]],
+        body: GenerateScheduleRequest,
+        legs: int = 2,
+    ) -> dict[str, Any]:
+        """Generate round-robin schedules for several groups at once.
+
+        Round N of every group is matchweek N, and all of them are placed
+        on one calendar (see `services.fixture_scheduler`): venues from
+        `body.venues` and kickoffs from `body.time_slots` are never
+        double-booked, no team plays twice on a day, and matches already
+        in the tournament count as booked. Odd groups get byes; home/away
+        is balanced per team. With `body.dry_run` the planned matches are
+        returned instead of saved.
+
+        Cost: 1 query (existing matches) + ceil(matches / 25)
+        BatchWriteItem calls, sent concurrently.
         """
-        n = len(team_ids)
-        if n < 2:
+        groups = [(gid, list(ids)) for gid, ids in groups if len(ids) >= 2]
+        if not groups:
             raise ValueError("Need at least 2 teams to generate a schedule")
 
-        legs = int(legs)  # DynamoDB returns Decimal; range() needs int
-
-        # If odd number of teams, add a bye
-        teams = list(team_ids)
-        if n % 2 == 1:
-            teams.append(None)  # bye
-            n += 1
-
-        matches_to_create: list[dict] = []
-        matchweek = 0
-        start_date = datetime.fromisoformat(body.start_date)
-
-        for leg in range(legs):
-            fixed = teams[0]
-            rotating = teams[1:]
-            for rnd in range(n - 1):
-                matchweek += 1
-                round_date = start_date + timedelta(days=body.match_interval_days * (matchweek - 1))
-                date_str = round_date.isoformat()
-
-                for i in range(n // 2):
-                    if i == 0:
-                        home, away = fixed, rotating[0]
-                    else:
-                        home, away = rotating[i], rotating[-(i)]
-                    if home is None or away is None:
-                        continue  # bye week
-
-                    # Swap home/away for second leg
-                    if leg == 1:
-                        home, away = away, home
-
-                    match = {
-                        "id": f"mtc_{uuid4().hex}",
-                        "tournament_id": tournament_id,
-                        "home_team_id": home,
-                        "away_team_id": away,
-                        "date": date_str,
-                        "venue": body.default_venue or "",
-                        "matchweek": matchweek,
-                        "round": "",
-                        "group_id": body.group_id or "",
-                        "status": "scheduled",
-                        "score_home": 0,
-                        "score_away": 0,
-                        "created_at": datetime.utcnow().isoformat(),
-                    }
-                    matches_to_create.append(match)
-
-                # Rotate
-                rotating.append(rotating.pop(0))
-
-        if matches_to_create:
-            self.repo.put_batch(matches_to_create)
-
-        return {
-            "matches_created": len(matches_to_create),
-            "matchweeks_generated": matchweek,
+        start = datetime.fromisoformat(body.start_date)
+        time_slots = body.time_slots
+        if not time_slots and start.time() != time():
+            time_slots = [start.strftime("%H:%M")]  # keep an explicit start time
+        planner = SlotPlanner(
+            start.date(),
+            body.match_interval_days,
+            venues=body.venues,
+            time_slots=time_slots,
+            default_venue=body.default_venue or "",
+        )
+        planner.book_existing(self.repo.list_by_tournament(tournament_id))
+
+        weeks = merge_groups(groups, legs=int(legs))  # DynamoDB returns Decimal
+        created_at = datetime.utcnow().isoformat()
+        matches: list[dict[str, Any]] = []
+        byes: list[dict[str, Any]] = []
+        for week in weeks:
+            matchweek = week["matchweek"]
+            placed = planner.place_matchweek(
+                matchweek, [(home, away) for _, home, away in week["fixtures"]]
+            )
+            for (group_id, home, away), (kickoff, venue) in zip(week["fixtures"], placed):
+                matches.append({
+                    "id": f"mtc_{uuid4().hex}",
+                    "tournament_id": tournament_id,
+                    "home_team_id": home,
+                    "away_team_id": away,
+                    "date": kickoff,
+                    "venue": venue,
+                    "matchweek": matchweek,
+                    "round": "",
+                    "group_id": group_id,
+                    "status": "scheduled",
+                    "score_home": 0,
+                    "score_away": 0,
+                    "created_at": created_at,
+                })
+            byes.extend(
+                {"matchweek": matchweek, "group_id": group_id, "team_id": team_id}
+                for group_id, team_id in week["byes"]
+            )
+
+        result: dict[str, Any] = {
+            "matches_created": 0 if body.dry_run else len(matches),
+            "matchweeks_generated": len(weeks),
+            "byes": byes,
         }
+        if body.dry_run:
+            result["dry_run"] = True
+            result["matches"] = matches
+            return result
+
+        if matches:
+            self._put_matches(tournament_id, matches)
+        return result
 
     def bulk_create(self, tournament_id: str, body: BulkMatchesRequest) -> dict[str, Any]:
         created = []
         errors = []
+        indices: dict[str, int] = {}
         for i, m in enumerate(body.matches):
             try:
                 if m.home_team_id == m.away_team_id:
@@ -338,10 +417,40 @@ class TournamentMatchService:
                     "created_at": datetime.utcnow().isoformat(),
                 }
                 created.append(item)
+                indices[item["id"]] = i
             except Exception as e:
                 errors.append({"index": i, "error": str(e)})
 
+        written = len(created)
         if created:
-            self.repo.put_batch(created)
+            try:
+                self._put_matches(tournament_id, created)
+            except BatchWriteError as e:
+                unwritten = {r["PutRequest"]["Item"]["id"] for r in e.unprocessed}
+                written -= len(unwritten)
+                errors.extend(
+                    {"index": indices[m["id"]], "error": "Write was throttled, retry"}
+                    for m in created if m["id"] in unwritten
+                )
 
-        return {"created": len(created), "errors": errors}
+        return {"created": written, "errors": errors}
+
+    def _put_matches(self, tournament_id: str, matches: list[dict[str, Any]]) -> None:
+        """`put_batch` new matches and account for every one that got
+        written (version bump, open-match counters) even when some chunks
+        fail; the write error is re-raised after that bookkeeping."""
+        try:
+            self.repo.put_batch(matches)
+        except Exception as e:
+            if isinstance(e, BatchWriteError):
+                unwritten = {r["PutRequest"]["Item"]["id"] for r in e.unprocessed}
+            else:
+                # A chunk failed outright; find out which ones went through.
+                unwritten = {m["id"] for m in matches} - self.repo.existing_ids([m["id"] for m in matches])
+            written = [m for m in matches if m["id"] not in unwritten]
+            if written:
+                self._touch(tournament_id)
+                self._track_open(tournament_id, self._open_counts(written))
+            raise
+        self._touch(tournament_id)
+        self._track_open(tournament_id, self._open_counts(matches))
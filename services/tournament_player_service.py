@@ -13,6 +13,7 @@ from repositories.s3_adapter import S3Adapter
 from repositories.tournament_player_repo_ddb import TournamentPlayerRepo
 from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
+from repositories.tournament_repo_ddb import TournamentRepo
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
 
 
@@ -24,12 +25,19 @@ class TournamentPlayerService:
         event_repo: TournamentMatchEventRepo,
         s3: S3Adapter | None = None,
         team_repo: TournamentTeamRepo | None = None,
+        tournament_repo: TournamentRepo | None = None,
     ):
         self.repo = repo
         self.match_repo = match_repo
         self.event_repo = event_repo
         self.s3 = s3
         self.team_repo = team_repo
+        self.tournament_repo = tournament_repo
+
+    def _touch(self, tournament_id: str | None) -> None:
+        """Invalidate cached public reads of the tournament (version bump)."""
+        if self.tournament_repo and tournament_id:
+            self.tournament_repo.bump_version(tournament_id)
 
     # ── Ownership guard ──────────────────────────────────────────────────
 
@@ -64,6 +72,7 @@ class TournamentPlayerService:
             "created_at": datetime.utcnow().isoformat(),
         }
         self.repo.put(item)
+        self._touch(tournament_id)
         return self._with_stats(item)
 
     def get_player(self, player_id: str) -> dict[str, Any] | None:
@@ -108,6 +117,7 @@ class TournamentPlayerService:
         if not updates:
             return self._with_stats(existing)
         updated = self.repo.update(player_id, updates)
+        self._touch(existing.get("tournament_id"))
         return self._with_stats(updated) if updated else None
 
     def delete_player(
@@ -123,6 +133,7 @@ class TournamentPlayerService:
         if acting_role == "team_owner":
             self._assert_team_ownership(existing["team_id"], acting_user_id)
         self.repo.delete(player_id)
+        self._touch(existing.get("tournament_id"))
         return True
 
     def generate_avatar_upload_url(
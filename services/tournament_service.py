@@ -4,6 +4,7 @@ from uuid import uuid4
 from datetime import datetime
 from typing import Any
 
+from core.concurrency import fan_out
 from api.schemas.tournaments import (
     CreateTournament,
     PatchTournament,
@@ -17,14 +18,11 @@ from repositories.s3_adapter import S3Adapter
 from repositories.tournament_repo_ddb import TournamentRepo
 from repositories.tournament_team_repo_ddb import TournamentTeamRepo
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
+from services import bracket_engine
 
 
 _DEFAULT_RULES = TournamentRules().dict()
 
-# Canonical progression order — used to sort bracket rounds correctly regardless
-# of the key order DynamoDB returns (which is not guaranteed to match insertion order).
-_BRACKET_ROUND_ORDER = ['roundOf32', 'roundOf16', 'quarterFinals', 'semiFinals', 'final']
-
 
 class TournamentService:
     def __init__(
@@ -79,9 +77,8 @@ class TournamentService:
             "status": "draft",
             "is_public": body.is_public,
             "current_matchweek": 0,
+            "matchweek_open": {},  # open matches per matchweek, see TournamentRepo.adjust_open_matches
             "rules": rules,
-            "groups": [],
-            "bracket": {},
             "sport": body.sport or "",
             "teams_per_group": body.teams_per_group,
             "num_teams": body.num_teams,
@@ -94,20 +91,70 @@ class TournamentService:
             "location": body.location or "",
             "created_at": datetime.utcnow().isoformat(),
             "payments_enabled": body.payments_enabled,
+            # Every event of a new tournament carries tournament_id, so
+            # recompute can read them from the event tournament_index.
+            "events_indexed": True,
         }
         self.repo.put(item)
         return self._resolve_logo(item)
 
-    def get_tournament(self, tournament_id: str, account_id: str) -> dict[str, Any] | None:
-        item = self.repo.get(tournament_id)
+    def get_tournament(
+        self, tournament_id: str, account_id: str, fields: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        """The tournament header (no groups / bracket — see
+        `get_tournament_detail`), or only `fields` of it."""
+        if fields is not None:
+            fields = [*fields, "account_id"]
+        item = self.repo.get(tournament_id, fields=fields)
         if item and item.get("account_id") == account_id:
             return self._resolve_logo(item)
         return None
 
-    def get_public_tournament(self, tournament_id: str) -> dict[str, Any] | None:
-        item = self.repo.get(tournament_id)
+    def owns_tournament(self, tournament_id: str, account_id: str) -> bool:
+        """Ownership check for routes that don't need the tournament
+        itself — reads only `account_id`."""
+        return self.repo.exists_for_account(tournament_id, account_id)
+
+    def get_tournament_detail(self, tournament_id: str, account_id: str) -> dict[str, Any] | None:
+        """Header plus `groups` and `bracket`, read concurrently."""
+        item, groups, bracket = fan_out(
+            lambda: self.repo.get(tournament_id),
+            lambda: self.repo.list_groups(tournament_id),
+            lambda: self.repo.get_bracket(tournament_id),
+        )
+        if not item or item.get("account_id") != account_id:
+            return None
+        return self._with_parts(item, groups, bracket)
+
+    def get_public_tournament(self, tournament_id: str, detail: bool = False) -> dict[str, Any] | None:
+        if not detail:
+            item = self.repo.get(tournament_id)
+            return self._resolve_logo(item) if item and item.get("is_public") else None
+        item, groups, bracket = fan_out(
+            lambda: self.repo.get(tournament_id),
+            lambda: self.repo.list_groups(tournament_id),
+            lambda: self.repo.get_bracket(tournament_id),
+        )
+        if not item or not item.get("is_public"):
+            return None
+        return self._with_parts(item, groups, bracket)
+
+    def _with_parts(
+        self, item: dict[str, Any], groups: list[dict], bracket: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        # The repo reads fall back to a not-yet-migrated tournament's
+        # embedded groups / bracket; drop the header's own copies.
+        item["groups"] = groups
+        item["bracket"] = (bracket or {}).get("bracket") or {}
+        item.pop("bracket_index", None)
+        return self._resolve_logo(item)
+
+    def get_public_version(self, tournament_id: str) -> int | None:
+        """Read-cache version of a public tournament; None if it isn't
+        public (or doesn't exist). One projected GetItem."""
+        item = self.repo.get_version(tournament_id)
         if item and item.get("is_public"):
-            return self._resolve_logo(item)
+            return int(item.get("version") or 0)
         return None
 
     def list_public_tournaments(self, status: str | None = None) -> dict[str, Any]:
@@ -148,15 +195,25 @@ class TournamentService:
         if not existing:
             return False
         self.repo.delete(tournament_id)
+        if self.s3:
+            self.s3.delete_tournament_snapshot(tournament_id)
         return True
 
-    # ── Groups (embedded in tournament item) ─────────────────────────
+    # ── Groups (TournamentParts items) ───────────────────────────────
+
+    def get_groups(self, tournament_id: str) -> list[dict]:
+        """Groups of a tournament, no ownership check (callers have done
+        it, usually concurrently with this read)."""
+        return self.repo.list_groups(tournament_id)
 
     def list_groups(self, tournament_id: str, account_id: str) -> list[dict] | None:
-        t = self.get_tournament(tournament_id, account_id)
+        t, groups = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.list_groups(tournament_id),
+        )
         if not t:
             return None
-        return t.get("groups", [])
+        return groups
 
     def create_group(self, tournament_id: str, account_id: str, body: CreateGroup) -> dict | None:
         t = self.get_tournament(tournament_id, account_id)
@@ -168,44 +225,30 @@ class TournamentService:
             "advancement_slots": body.advancement_slots,
             "teams": [],
         }
-        groups = t.get("groups", [])
-        groups.append(group)
-        self.repo.update(tournament_id, {"groups": groups})
+        self.repo.put_group(tournament_id, group)
         return group
 
     def update_group(self, tournament_id: str, account_id: str, group_id: str, body: PatchGroup) -> dict | None:
         t = self.get_tournament(tournament_id, account_id)
         if not t:
             return None
-        groups = t.get("groups", [])
-        target = next((g for g in groups if g["id"] == group_id), None)
-        if not target:
-            return None
         updates = body.dict(exclude_unset=True, exclude_none=True)
-        target.update(updates)
-        self.repo.update(tournament_id, {"groups": groups})
-        return target
+        return self.repo.update_group(tournament_id, group_id, updates)
 
     def delete_group(self, tournament_id: str, account_id: str, group_id: str) -> bool:
         t = self.get_tournament(tournament_id, account_id)
         if not t:
             return False
-        groups = t.get("groups", [])
-        new_groups = [g for g in groups if g["id"] != group_id]
-        if len(new_groups) == len(groups):
-            return False
-        self.repo.update(tournament_id, {"groups": new_groups})
-        return True
+        return self.repo.delete_group(tournament_id, group_id)
 
     def assign_team_to_group(
         self, tournament_id: str, account_id: str, group_id: str, team_id: str, seed: int | None = None
     ) -> dict | None:
-        t = self.get_tournament(tournament_id, account_id)
-        if not t:
-            return None
-        groups = t.get("groups", [])
-        target = next((g for g in groups if g["id"] == group_id), None)
-        if not target:
+        t, target = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.get_group(tournament_id, group_id),
+        )
+        if not t or not target:
             return None
         # Avoid duplicates
         if any(te["team_id"] == team_id for te in target.get("teams", [])):
@@ -213,48 +256,57 @@ class TournamentService:
         entry = {"team_id": team_id}
         if seed is not None:
             entry["seed"] = seed
-        target.setdefault("teams", []).append(entry)
-        self.repo.update(tournament_id, {"groups": groups})
+        writes = [lambda: self.repo.add_group_team(tournament_id, group_id, entry)]
         # Keep team record in sync so group_index GSI stays accurate
         if self.team_repo:
-            self.team_repo.update(team_id, {"group_id": group_id})
-        return target
+            writes.append(lambda: self.team_repo.update(team_id, {"group_id": group_id}))
+        return fan_out(*writes)[0]
 
     def remove_team_from_group(
         self, tournament_id: str, account_id: str, group_id: str, team_id: str
     ) -> bool:
-        t = self.get_tournament(tournament_id, account_id)
-        if not t:
-            return False
-        groups = t.get("groups", [])
-        target = next((g for g in groups if g["id"] == group_id), None)
-        if not target:
+        t, target = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.get_group(tournament_id, group_id),
+        )
+        if not t or not target:
             return False
-        original = len(target.get("teams", []))
-        target["teams"] = [te for te in target.get("teams", []) if te["team_id"] != team_id]
-        if len(target["teams"]) == original:
+        index = next(
+            (i for i, te in enumerate(target.get("teams", [])) if te["team_id"] == team_id), None
+        )
+        if index is None:
             return False
-        self.repo.update(tournament_id, {"groups": groups})
+        writes = [lambda: self.repo.remove_group_team(tournament_id, group_id, index, team_id)]
         # Clear group_id on the team record so group_index GSI stays accurate
         if self.team_repo:
-            self.team_repo.clear_group(team_id)
-        return True
+            writes.append(lambda: self.team_repo.clear_group(team_id))
+        return fan_out(*writes)[0] is not None
 
-    # ── Bracket (embedded in tournament item) ────────────────────────
+    # ── Bracket (TournamentParts item) ───────────────────────────────
 
     def get_bracket(self, tournament_id: str, account_id: str) -> dict | None:
-        t = self.get_tournament(tournament_id, account_id)
+        t, item = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.get_bracket(tournament_id),
+        )
         if not t:
             return None
-        return t.get("bracket", {})
+        return (item or {}).get("bracket") or {}
+
+    def get_bracket_rounds(self, tournament_id: str, rounds: list[str]) -> dict | None:
+        """Just `rounds` of the bracket, no ownership check; None if the
+        tournament has no bracket."""
+        item = self.repo.get_bracket(tournament_id, rounds=rounds)
+        return None if item is None else item.get("bracket") or {}
 
     def generate_bracket(
         self, tournament_id: str, account_id: str, body: GenerateBracketRequest
     ) -> dict | None:
         """Generate a knockout bracket from seeds or group results.
 
-        For now, produces a simple single-elimination structure
-        from the provided teams (sorted by seed).
+        Single or double elimination (`body.format`), optionally with a
+        third-place match; byes are advanced right away. See
+        `services.bracket_engine`.
         """
         t = self.get_tournament(tournament_id, account_id)
         if not t:
@@ -269,16 +321,24 @@ class TournamentService:
         elif body.source == "groups":
             # Rank teams using real standings per group; interleave to avoid
             # same-group first-round matchups: [A1, B1, A2, B2, ...]
-            groups = t.get("groups", [])
+            groups = self.repo.list_groups(tournament_id)
             rules = t.get("rules", {})
             group_qualifiers: list[list[str]] = []
+            # One team listing for every group's table.
+            all_teams = (
+                self.team_repo.list_by_tournament(tournament_id)
+                if self.team_repo and self.standings_service else None
+            )
             for g in groups:
                 slots = int(g.get("advancement_slots", 2))
                 group_team_ids = [te["team_id"] for te in g.get("teams", [])]
                 if self.standings_service:
                     standings = self.standings_service.get_standings(
                         tournament_id, rules, group_id=g["id"],
-                        group_team_ids=group_team_ids
+                        group_team_ids=group_team_ids,
+                        teams=all_teams,
+                        tiebreaker_order=t.get("tiebreaker_order"),
+                        version=t.get("version"),
                     )
                     ranked = standings.get("items", [])
                     group_qualifiers.append([e["team_id"] for e in ranked[:slots]])
@@ -302,192 +362,108 @@ class TournamentService:
         else:
             team_ids = []
 
-        # Build bracket rounds
-        bracket = self._build_bracket_structure(team_ids, seed_map=seed_map)
-        self.repo.update(tournament_id, {"bracket": bracket})
+        bracket = bracket_engine.build_bracket(
+            team_ids, seed_map=seed_map, fmt=body.format, third_place=body.third_place
+        )
+        self.repo.put_bracket(tournament_id, bracket)
         return bracket
 
     def update_bracket(
         self, tournament_id: str, account_id: str, body: BracketOverride
     ) -> dict | None:
-        t = self.get_tournament(tournament_id, account_id)
-        if not t:
+        t, item = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.get_bracket(tournament_id),
+        )
+        if not t or not item:
             return None
-        bracket = t.get("bracket", {})
+        bracket = item["bracket"]
         round_matches = bracket.get(body.round, [])
         if body.match_index < 0 or body.match_index >= len(round_matches):
             return None
         match_slot = round_matches[body.match_index]
-        if body.team1_id is not None:
-            match_slot["team1_id"] = body.team1_id
-        if body.team2_id is not None:
-            match_slot["team2_id"] = body.team2_id
+        changes: dict[str, Any] = {}
+        for side, team_id in (("team1", body.team1_id), ("team2", body.team2_id)):
+            if team_id is not None:
+                changes[f"{side}_id"] = team_id
+                if match_slot.get(f"{side}_bye"):
+                    changes[f"{side}_bye"] = False
+        index_entries = None
         if body.match_id is not None:
-            match_slot["match_id"] = body.match_id
-        self.repo.update(tournament_id, {"bracket": bracket})
-        return bracket
+            changes["match_id"] = body.match_id
+            index_entries = {body.match_id: {"round": body.round, "index": body.match_index}}
+        updated = self._write_bracket_slots(
+            tournament_id, item, {(body.round, body.match_index): changes}, index_entries
+        )
+        return (updated or {}).get("bracket")
 
     def advance_winner(
         self, tournament_id: str, account_id: str, match_id: str, winner_team_id: str
     ) -> dict | None:
         """Advance the winner of a knockout match to the next bracket round.
 
-        Finds the match_id in the bracket structure and places the winner
-        in the corresponding next-round slot.
+        The slot comes from the bracket's `bracket_index`; the winner
+        (and the loser, into a third-place / losers-bracket slot) move on
+        along the slot's links, and only the touched slot fields are
+        written back. The tournament, bracket and match are read
+        concurrently.
         """
-        t = self.get_tournament(tournament_id, account_id)
-        if not t:
+        # Match data is used for both fallback search and score sync
+        t, item, match_data = fan_out(
+            lambda: self.get_tournament(tournament_id, account_id),
+            lambda: self.repo.get_bracket(tournament_id),
+            lambda: self.match_repo.get(match_id) if self.match_repo else None,
+        )
+        if not t or not item:
             return None
-        bracket = t.get("bracket", {})
-        # Build round order using canonical progression; unknown rounds go at the end.
-        known = [r for r in _BRACKET_ROUND_ORDER if r in bracket]
-        unknown = [r for r in bracket if r not in _BRACKET_ROUND_ORDER]
-        round_order = known + unknown
-
-        # Look up match data once — used for both fallback search and score sync
-        match_data = None
-        if self.match_repo:
-            match_data = self.match_repo.get(match_id)
-
-        def _apply_winner(ri, round_name, mi, slot):
-            valid_teams = {slot.get("team1_id"), slot.get("team2_id")} - {None}
-            if valid_teams and winner_team_id not in valid_teams:
-                raise ValueError(
-                    f"winner_team_id '{winner_team_id}' is not a participant in this match"
-                )
-            # Self-heal: persist match_id if it was missing from the slot
-            if not slot.get("match_id"):
-                slot["match_id"] = match_id
-            slot["winner_team_id"] = winner_team_id
-            slot["status"] = "finished"
-            # Sync match score into the bracket slot for display
-            if match_data:
-                sh = match_data.get("score_home", -1)
-                sa = match_data.get("score_away", -1)
-                if sh is not None and sa is not None and int(sh) >= 0:
-                    home_id = match_data.get("home_team_id")
-                    if slot.get("team1_id") == home_id:
-                        slot["score"] = {"team1": int(sh), "team2": int(sa)}
-                    else:
-                        slot["score"] = {"team1": int(sa), "team2": int(sh)}
-            # Advance to next round
-            if ri + 1 < len(round_order):
-                next_round = round_order[ri + 1]
-                next_idx = mi // 2
-                next_matches = bracket[next_round]
-                if next_idx < len(next_matches):
-                    next_slot = next_matches[next_idx]
-                    if mi % 2 == 0:
-                        next_slot["team1_id"] = winner_team_id
-                    else:
-                        next_slot["team2_id"] = winner_team_id
-            self.repo.update(tournament_id, {"bracket": bracket})
-            return bracket
-
-        # Primary search: match by match_id stored in the bracket slot
-        for ri, round_name in enumerate(round_order):
-            for mi, slot in enumerate(bracket[round_name]):
-                if slot.get("match_id") == match_id:
-                    return _apply_winner(ri, round_name, mi, slot)
-
-        # Fallback: match_id was never saved to the slot (created before the fix).
-        # Identify the slot by the participating teams from the actual match record.
-        if match_data:
-            home_id = match_data.get("home_team_id")
-            away_id = match_data.get("away_team_id")
-            if home_id and away_id:
-                for ri, round_name in enumerate(round_order):
-                    for mi, slot in enumerate(bracket[round_name]):
-                        if {slot.get("team1_id"), slot.get("team2_id")} == {home_id, away_id}:
-                            return _apply_winner(ri, round_name, mi, slot)
-
-        return None
+        bracket = item["bracket"]
+        teams = (
+            (match_data.get("home_team_id"), match_data.get("away_team_id"))
+            if match_data else None
+        )
 
-    # ── Helpers ──────────────────────────────────────────────────────
+        loc, from_index = bracket_engine.locate(
+            bracket, item.get("bracket_index"), match_id, teams
+        )
+        if loc is None:
+            return None
+        slot = bracket[loc[0]][loc[1]]
 
-    @staticmethod
-    def _bracket_seed_positions(size: int) -> list[int]:
-        """Return the position indices for standard bracket seeding.
+        # Sync match score into the bracket slot for display
+        score = None
+        if match_data:
+            sh = match_data.get("score_home", -1)
+            sa = match_data.get("score_away", -1)
+            if sh is not None and sa is not None and int(sh) >= 0:
+                if slot.get("team1_id") == match_data.get("home_team_id"):
+                    score = {"team1": int(sh), "team2": int(sa)}
+                else:
+                    score = {"team1": int(sa), "team2": int(sh)}
 
-        Produces the ordering so that consecutive pairs give:
-          (seed 1 vs seed N), (seed 4 vs seed N-3), (seed 2 vs seed N-1), ...
-        ensuring top seeds never meet until later rounds.
-        """
-        if size == 1:
-            return [0]
-        half = size // 2
-        top = TournamentService._bracket_seed_positions(half)
-        bottom = [size - 1 - i for i in top]
-        return [x for pair in zip(top, bottom) for x in pair]
-
-    @staticmethod
-    def _build_bracket_structure(
-        team_ids: list[str], seed_map: dict | None = None
-    ) -> dict:
-        """Build a simple single-elimination bracket.
-
-        When seed_map is provided teams are reordered using standard bracket
-        seeding so that seed 1 faces the lowest seed, seed 2 faces the second
-        lowest, etc.  This produces correct cross-group matchups for hybrid
-        tournaments (e.g. Group A 1st vs Group B 2nd).
-        """
-        n = len(team_ids)
-        if n < 2:
-            return {}
-
-        # Pad to next power of 2
-        size = 1
-        while size < n:
-            size *= 2
-
-        if seed_map:
-            # Sort teams by seed (unseeded / None last), then apply standard
-            # bracket seeding order so top seeds are on opposite sides.
-            seeded_teams = sorted(
-                [t for t in team_ids if t is not None],
-                key=lambda t: seed_map.get(t, 9999),
-            )
-            seed_ordered = seeded_teams + [None] * (size - len(seeded_teams))
-            positions = TournamentService._bracket_seed_positions(size)
-            padded = [seed_ordered[i] for i in positions]
-        else:
-            padded = team_ids + [None] * (size - n)
-
-        round_names = []
-        remaining = size
-        while remaining > 1:
-            if remaining == 2:
-                round_names.append("final")
-            elif remaining == 4:
-                round_names.append("semiFinals")
-            elif remaining == 8:
-                round_names.append("quarterFinals")
-            else:
-                round_names.append(f"roundOf{remaining}")
-            remaining //= 2
-
-        bracket: dict = {}
-        current_teams = padded
-        first_round = True
-        for rnd in round_names:
-            matches = []
-            for i in range(0, len(current_teams), 2):
-                t1 = current_teams[i]
-                t2 = current_teams[i + 1] if i + 1 < len(current_teams) else None
-                slot: dict = {
-                    "team1_id": t1,
-                    "team2_id": t2,
-                    "match_id": None,
-                    "winner_team_id": None,
-                    "score": {"team1": None, "team2": None},
-                    "status": "pending",
-                }
-                if first_round and seed_map:
-                    slot["seed1"] = seed_map.get(t1) if t1 else None
-                    slot["seed2"] = seed_map.get(t2) if t2 else None
-                matches.append(slot)
-            bracket[rnd] = matches
-            current_teams = [None] * len(matches)
-            first_round = False
+        changes = bracket_engine.advance(
+            bracket, loc, winner_team_id, match_id=match_id, score=score
+        )
+        index_entries = None
+        if not from_index:
+            index_entries = {match_id: {"round": loc[0], "index": loc[1]}}
+        updated = self._write_bracket_slots(tournament_id, item, changes, index_entries)
+        return (updated or {}).get("bracket")
 
-        return bracket
+    def _write_bracket_slots(
+        self,
+        tournament_id: str,
+        item: dict[str, Any],
+        changes: dict[tuple[str, int], dict[str, Any]],
+        index_entries: dict[str, dict[str, Any]] | None,
+    ) -> dict[str, Any] | None:
+        # Brackets generated before `bracket_index` existed get the whole
+        # index written once, rebuilt from the match_ids already in slots.
+        replace_index = index_entries is not None and "bracket_index" not in item
+        if replace_index:
+            index_entries = {
+                **bracket_engine.build_index(item.get("bracket") or {}),
+                **index_entries,
+            }
+        return self.repo.update_bracket_slots(
+            tournament_id, changes, index_entries, replace_index=replace_index
+        )
@@ -0,0 +1,157 @@
+"""Public tournament snapshot — everything the public tournament page
+renders (tournament, groups, bracket, teams, players, matches, standings,
+stats, top scorers) as one document.
+
+The snapshot is materialized into S3 and tagged with the tournament's
+read-cache `version` (bumped by every write to the tournament or its
+teams, players, matches and events — see `TournamentRepo.bump_version`).
+A write therefore marks the stored snapshot stale; the next read rebuilds
+it once and stores it for every container. A burst of writes (a live
+match) costs one rebuild per read, not one per write.
+
+Presigned logo / avatar URLs inside the snapshot expire after an hour, so
+a snapshot older than `SNAPSHOT_MAX_AGE_SECONDS` is rebuilt even when the
+version still matches.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from core.concurrency import fan_out
+from repositories.s3_adapter import S3Adapter
+from services.standings_service import StandingsService
+from services.tournament_match_service import TournamentMatchService
+from services.tournament_player_service import TournamentPlayerService
+from services.tournament_service import TournamentService
+from services.tournament_stats_service import TournamentStatsService
+from services.tournament_team_service import TournamentTeamService
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("SNAPSHOT_MAX_AGE_SECONDS", "1800"))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class TournamentSnapshotService:
+    def __init__(
+        self,
+        tournament_svc: TournamentService,
+        team_svc: TournamentTeamService,
+        player_svc: TournamentPlayerService,
+        match_svc: TournamentMatchService,
+        standings_svc: StandingsService,
+        stats_svc: TournamentStatsService,
+        s3: S3Adapter | None = None,
+        max_age: int = SNAPSHOT_MAX_AGE_SECONDS,
+    ):
+        self.tournament_svc = tournament_svc
+        self.team_svc = team_svc
+        self.player_svc = player_svc
+        self.match_svc = match_svc
+        self.standings_svc = standings_svc
+        self.stats_svc = stats_svc
+        self.s3 = s3
+        self.max_age = max_age
+
+    def get_snapshot(self, tournament_id: str, version: int) -> dict[str, Any] | None:
+        """Snapshot of a public tournament at `version`.
+
+        Cost on a fresh stored snapshot: 1 S3 GET. Otherwise the snapshot
+        is rebuilt (see `build`) and written back. None if the tournament
+        is not public.
+        """
+        stored = self._load(tournament_id)
+        if stored is not None and stored.get("version") == version and not self._expired(stored):
+            return stored
+
+        snapshot = self.build(tournament_id, version)
+        if snapshot is not None:
+            self._store(tournament_id, snapshot)
+        return snapshot
+
+    def build(self, tournament_id: str, version: int) -> dict[str, Any] | None:
+        """Render the snapshot from the live tables: the tournament item,
+        then teams / players / matches / top scorers concurrently, then
+        standings and stats (which reuse the tournament and teams)."""
+        tournament = self.tournament_svc.get_public_tournament(tournament_id, detail=True)
+        if not tournament:
+            return None
+
+        teams, players, matches, top_scorers = fan_out(
+            lambda: self.team_svc.list_teams(tournament_id),
+            lambda: self.player_svc.list_players(tournament_id),
+            lambda: self.match_svc.list_matches(tournament_id),
+            lambda: self.stats_svc.get_top_scorers(tournament_id),
+        )
+
+        rules = tournament.get("rules", {})
+        groups = tournament.get("groups", [])
+        tiebreakers = tournament.get("tiebreaker_order")
+        if groups:
+            standings = self.standings_svc.get_all_standings(
+                tournament_id, rules, groups, teams, tiebreaker_order=tiebreakers, version=version
+            )
+        else:
+            standings = self.standings_svc.get_standings(
+                tournament_id, rules, teams=teams, tiebreaker_order=tiebreakers, version=version
+            )
+        stats = self.stats_svc.get_stats(
+            tournament_id,
+            current_matchweek=tournament.get("current_matchweek", 0),
+            total_matchweeks=rules.get("total_matchweeks"),
+            tournament=tournament,
+            teams=teams,
+        )
+
+        return {
+            "version": version,
+            "built_at": datetime.utcnow().isoformat(),
+            "tournament": tournament,
+            "groups": groups,
+            "bracket": tournament.get("bracket") or {},
+            "teams": teams,
+            "players": players,
+            "matches": matches,
+            "standings": standings,
+            "stats": stats,
+            "top_scorers": top_scorers,
+        }
+
+    # ── Storage ──────────────────────────────────────────────────────
+
+    def _expired(self, snapshot: dict[str, Any]) -> bool:
+        try:
+            built_at = datetime.fromisoformat(snapshot["built_at"])
+        except (KeyError, TypeError, ValueError):
+            return True
+        return (datetime.utcnow() - built_at).total_seconds() > self.max_age
+
+    def _load(self, tournament_id: str) -> dict[str, Any] | None:
+        if not self.s3:
+            return None
+        try:
+            return self.s3.get_tournament_snapshot(tournament_id)
+        except Exception:
+            logger.exception("snapshot read failed for %s; rebuilding", tournament_id)
+            return None
+
+    def _store(self, tournament_id: str, snapshot: dict[str, Any]) -> None:
+        """Best-effort: a failed write only means the next read rebuilds."""
+        if not self.s3:
+            return
+        try:
+            body = json.dumps(snapshot, default=_json_default).encode()
+            self.s3.put_tournament_snapshot(tournament_id, body)
+        except Exception:
+            logger.exception("snapshot write failed for %s", tournament_id)
@@ -6,6 +6,10 @@ The materialized stats are kept in sync by:
 - TournamentMatchEventService (event lifecycle: create/update/delete)
 - TournamentMatchService (match lifecycle: status transitions, delete)
 
+Leaderboards (top scorers, assists, cards) are read a page at a time
+from sparse GSIs that the same stats writes keep ordered — see
+`repositories.ddb_leaderboard`.
+
 For local data that pre-dates this refactor, run
 `POST /tournaments/{id}:recompute-stats` to rebuild the stats fields from
 the raw events.
@@ -14,6 +18,8 @@ the raw events.
 from datetime import datetime
 from typing import Any
 
+from core.concurrency import fan_out
+from repositories.ddb_cursor import decode_cursor, encode_cursor
 from repositories.tournament_match_event_repo_ddb import TournamentMatchEventRepo
 from repositories.tournament_match_repo_ddb import TournamentMatchRepo
 from repositories.tournament_player_repo_ddb import TournamentPlayerRepo
@@ -25,6 +31,9 @@ from services.tournament_aggregator import (
     derive_average_goals_per_match,
 )
 
+PLAYER_BOARDS = ("scorers", "assists", "cards")
+_TEAM_NAME_FIELDS = ["id", "name", "short_name"]
+
 
 class TournamentStatsService:
     def __init__(
@@ -47,14 +56,19 @@ class TournamentStatsService:
         current_matchweek: int = 0,
         total_matchweeks: int | None = None,
         tournament: dict[str, Any] | None = None,
+        teams: list[dict[str, Any]] | None = None,
+        bracket: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Read tournament-level aggregates from the materialized `stats`
         field on the Tournament item. Augments with current matchweek,
         total matchweeks, total teams (read once), and champion (from
-        bracket). Cost: 2 queries (tournament if not passed in, teams).
+        bracket — `bracket`, or the tournament's embedded one; only its
+        final is needed). Cost: 2 queries (tournament if not passed in,
+        teams if not passed in — routers fetch both concurrently).
         """
         stats = (tournament or {}).get("stats") or default_tournament_stats()
-        teams = self.team_repo.list_by_tournament(tournament_id)
+        if teams is None:
+            teams = self.team_repo.list_by_tournament(tournament_id)
 
         total_matches = stats.get("total_matches") or 0
         matches_played = stats.get("matches_played") or 0
@@ -62,7 +76,9 @@ class TournamentStatsService:
 
         champion = None
         if tournament:
-            final = (tournament.get("bracket") or {}).get("final") or []
+            if bracket is None:
+                bracket = tournament.get("bracket") or {}
+            final = bracket.get("final") or []
             winner_id = final[0].get("winner_team_id") if final else None
             if winner_id:
                 teams_map = {t["id"]: t for t in teams}
@@ -93,46 +109,35 @@ class TournamentStatsService:
 
     def get_team_discipline(self, tournament_id: str) -> list[dict[str, Any]]:
         """Per-team yellow/red counts with per-player counts (no per-card
-        drill-down — see `get_team_cards` for that).
+        drill-down — see `get_team_cards` for that). Every team has a row;
+        players without cards are left out.
 
-        Cost: 2 queries (teams + players). No event scan.
+        Cost: 2 concurrent queries — the teams, and the player card
+        leaderboard (only the players that have been booked). No event scan.
         """
-        teams = self.team_repo.list_by_tournament(tournament_id)
-        players = self.player_repo.list_by_tournament(tournament_id)
+        teams, (players, _) = fan_out(
+            lambda: self.team_repo.list_by_tournament(tournament_id),
+            lambda: self.player_repo.leaderboard_page(tournament_id, "cards"),
+        )
 
-        # Group players by team
         players_by_team: dict[str, list[dict[str, Any]]] = {}
         for p in players:
-            players_by_team.setdefault(p.get("team_id"), []).append(p)
-
-        result: list[dict[str, Any]] = []
-        for team in teams:
-            tstats = team.get("stats") or default_team_stats()
-            player_rows = []
-            for p in players_by_team.get(team["id"], []):
-                pstats = p.get("stats") or default_player_stats()
-                if (pstats.get("yellow_cards") or 0) == 0 and (pstats.get("red_cards") or 0) == 0:
-                    continue
-                player_rows.append({
-                    "player_id": p["id"],
-                    "name": p.get("name", ""),
-                    "number": p.get("number"),
-                    "yellow_cards": pstats.get("yellow_cards", 0),
-                    "red_cards": pstats.get("red_cards", 0),
-                })
-            player_rows.sort(key=lambda r: (-r["red_cards"], -r["yellow_cards"], r["name"]))
-            yellow = tstats.get("yellow_cards", 0)
-            red = tstats.get("red_cards", 0)
-            result.append({
-                "team_id": team["id"],
-                "name": team.get("name", ""),
-                "short_name": team.get("short_name"),
-                "yellow_cards": yellow,
-                "red_cards": red,
-                "total_cards": yellow + red,
-                "players": player_rows,
+            pstats = p.get("stats") or default_player_stats()
+            players_by_team.setdefault(p.get("team_id"), []).append({
+                "player_id": p["id"],
+                "name": p.get("name", ""),
+                "number": p.get("number"),
+                "yellow_cards": pstats.get("yellow_cards", 0),
+                "red_cards": pstats.get("red_cards", 0),
             })
 
+        result = [self._discipline_row(team) for team in teams]
+        for row in result:
+            row["players"] = sorted(
+                players_by_team.get(row["team_id"], []),
+                key=lambda r: (-r["red_cards"], -r["yellow_cards"], r["name"]),
+            )
+        # The index orders by (total, reds); names break the remaining ties.
         result.sort(
             key=lambda r: (-r["total_cards"], -r["red_cards"], -r["yellow_cards"], r["name"])
         )
@@ -144,11 +149,16 @@ class TournamentStatsService:
         """Return the per-card drill-down for one team: each card event
         with the match it happened in.
 
-        Cost: 1 query (matches involving this team) + N queries (events per
-        match the team appears in). Used by the Sanciones drawer only when
-        a team row is expanded.
+        Cost: 4 concurrent queries (matches, teams, players, the team's
+        events via the event `team_index`) — one round-trip. Used by the
+        Sanciones drawer only when a team row is expanded.
         """
-        all_matches = self.match_repo.list_by_tournament(tournament_id)
+        all_matches, teams, player_items, team_events = fan_out(
+            lambda: self.match_repo.list_by_tournament(tournament_id),
+            lambda: self.team_repo.list_by_tournament(tournament_id),
+            lambda: self.player_repo.list_by_tournament(tournament_id),
+            lambda: self.event_repo.list_by_team(team_id),
+        )
         team_matches = [
             m for m in all_matches
             if m.get("status") in ("finished", "live")
@@ -156,11 +166,14 @@ class TournamentStatsService:
         ]
         match_index = {m["id"]: m for m in team_matches}
 
-        teams = self.team_repo.list_by_tournament(tournament_id)
         team_lookup = {t["id"]: t for t in teams}
-        players = {p["id"]: p for p in self.player_repo.list_by_tournament(tournament_id)}
+        players = {p["id"]: p for p in player_items}
 
-        events_by_match = self.event_repo.batch_list_by_matches([m["id"] for m in team_matches])
+        events_by_match = {
+            mid: evs
+            for mid, evs in self.event_repo.group_by_match(team_events).items()
+            if mid in match_index
+        }
 
         # player_id -> {name, number, cards: [...]}
         by_player: dict[str, dict] = {}
@@ -218,37 +231,109 @@ class TournamentStatsService:
         rows.sort(key=lambda r: (-len(r["cards"]), r["name"]))
         return rows
 
-    # ── Top scorers ───────────────────────────────────────────────────
+    # ── Leaderboards ──────────────────────────────────────────────────
 
     def get_top_scorers(self, tournament_id: str, limit: int = 50) -> list[dict[str, Any]]:
-        """Read top scorers from the materialized `stats.goals` on each
-        player item. Cost: 2 queries (players + teams)."""
-        players = self.player_repo.list_by_tournament(tournament_id)
-        teams = {t["id"]: t for t in self.team_repo.list_by_tournament(tournament_id)}
+        """Players with a goal, penalty or own goal, most goals first.
 
-        scorers: list[dict[str, Any]] = []
-        for p in players:
-            stats = p.get("stats") or default_player_stats()
-            goals = stats.get("goals") or 0
-            penalties = stats.get("penalties") or 0
-            own_goals = stats.get("own_goals") or 0
-            if goals == 0 and penalties == 0 and own_goals == 0:
-                continue
-            team = teams.get(p.get("team_id") or "") or {}
-            scorers.append({
-                "player_id": p["id"],
-                "team_id": p.get("team_id", ""),
-                "goals": goals,
-                "penalties": penalties,
-                "own_goals": own_goals,
-                "player_name": p.get("name", ""),
-                "player_number": p.get("number", ""),
-                "team_name": team.get("name", ""),
-                "team_short_name": team.get("short_name", ""),
-            })
+        The scorers leaderboard serves players with goals. Players with only
+        penalties / own goals aren't on it and rank after them, so only
+        when it runs out before `limit` are the tournament's players listed
+        for the rest.
+        """
+        page = self.get_leaderboard(tournament_id, "scorers", limit=limit)
+        rows = page["items"]
+        if page["next_cursor"] is not None or len(rows) >= limit:
+            return rows
+        listed = {r["player_id"] for r in rows}
+        extra = [
+            p for p in self.player_repo.list_by_tournament(tournament_id)
+            if p["id"] not in listed and any(
+                (p.get("stats") or {}).get(c) for c in ("goals", "penalties", "own_goals")
+            )
+        ][:limit - len(rows)]
+        if not extra:
+            return rows
+        team_ids = [p["team_id"] for p in extra if p.get("team_id")]
+        teams = {
+            t["id"]: t
+            for t in (self.team_repo.get_many(team_ids, fields=_TEAM_NAME_FIELDS) if team_ids else [])
+        }
+        for p in extra:
+            rows.append({**self._player_row(p, teams.get(p.get("team_id") or "") or {}), "rank": len(rows) + 1})
+        return rows
 
-        scorers.sort(key=lambda s: -s["goals"])
-        scorers = scorers[:limit]
-        for i, entry in enumerate(scorers, 1):
-            entry["rank"] = i
-        return scorers
+    def get_leaderboard(
+        self,
+        tournament_id: str,
+        board: str,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> dict[str, Any]:
+        """One page of a leaderboard: player boards "scorers", "assists",
+        "cards", or "team_cards". Rows carry their overall `rank`;
+        `next_cursor` resumes after the last row (None on the last page).
+
+        Cost: one query on the board's sparse GSI for `limit` rows, plus
+        one BatchGetItem for the page's team names on player boards.
+        Raises ValueError for an unknown board or a malformed cursor.
+        """
+        if board not in PLAYER_BOARDS and board != "team_cards":
+            raise ValueError(f"Unknown leaderboard: {board}")
+        state = decode_cursor(cursor) or {}
+        if not isinstance(state.get("key") or {}, dict) or not isinstance(state.get("rank") or 0, int):
+            raise ValueError("Invalid cursor")
+        offset = state.get("rank") or 0
+
+        if board == "team_cards":
+            items, last_key = self.team_repo.leaderboard_page(
+                tournament_id, "cards", limit, state.get("key")
+            )
+            rows = [self._discipline_row(team) for team in items]
+        else:
+            items, last_key = self.player_repo.leaderboard_page(
+                tournament_id, board, limit, state.get("key")
+            )
+            team_ids = [p["team_id"] for p in items if p.get("team_id")]
+            teams = {
+                t["id"]: t
+                for t in (self.team_repo.get_many(team_ids, fields=_TEAM_NAME_FIELDS) if team_ids else [])
+            }
+            rows = [self._player_row(p, teams.get(p.get("team_id") or "") or {}) for p in items]
+
+        for i, row in enumerate(rows, offset + 1):
+            row["rank"] = i
+        next_cursor = encode_cursor({"key": last_key, "rank": offset + len(rows)}) if last_key else None
+        return {"items": rows, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _player_row(player: dict[str, Any], team: dict[str, Any]) -> dict[str, Any]:
+        stats = player.get("stats") or default_player_stats()
+        return {
+            "player_id": player["id"],
+            "team_id": player.get("team_id", ""),
+            "goals": stats.get("goals") or 0,
+            "penalties": stats.get("penalties") or 0,
+            "own_goals": stats.get("own_goals") or 0,
+            "assists": stats.get("assists") or 0,
+            "yellow_cards": stats.get("yellow_cards") or 0,
+            "red_cards": stats.get("red_cards") or 0,
+            "player_name": player.get("name", ""),
+            "player_number": player.get("number", ""),
+            "team_name": team.get("name", ""),
+            "team_short_name": team.get("short_name", ""),
+        }
+
+    @staticmethod
+    def _discipline_row(team: dict[str, Any]) -> dict[str, Any]:
+        tstats = team.get("stats") or default_team_stats()
+        yellow = tstats.get("yellow_cards", 0)
+        red = tstats.get("red_cards", 0)
+        return {
+            "team_id": team["id"],
+            "name": team.get("name", ""),
+            "short_name": team.get("short_name"),
+            "yellow_cards": yellow,
+            "red_cards": red,
+            "total_cards": yellow + red,
+        }
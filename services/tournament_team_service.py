@@ -82,6 +82,7 @@ class TournamentTeamService:
         if not updates:
             return self._resolve_documents(self._resolve_logo(existing))
         updated = self.repo.update(team_id, updates)
+        self._touch(existing.get("tournament_id"))
         if updated and updates.get("contact_email"):
             self._trigger_invitation(updated)
         return self._resolve_documents(self._resolve_logo(updated)) if updated else None
@@ -150,6 +151,7 @@ class TournamentTeamService:
         })
         docs[doc_type] = file_list
         updated = self.repo.update(team_id, {"documents": docs})
+        self._touch(item.get("tournament_id"))
         return self._resolve_documents(updated) if updated else None
 
     def remove_document(self, team_id: str, doc_type: str, key: str) -> dict[str, Any] | None:
@@ -160,6 +162,7 @@ class TournamentTeamService:
         file_list = [f for f in docs.get(doc_type, []) if f.get("key") != key]
         docs[doc_type] = file_list
         updated = self.repo.update(team_id, {"documents": docs})
+        self._touch(item.get("tournament_id"))
         # Delete from S3 asynchronously (best-effort)
         if self.s3:
             try:
@@ -170,6 +173,12 @@ class TournamentTeamService:
 
     # ── Helpers ──────────────────────────────────────────────────────
 
+    def _touch(self, tournament_id: str | None) -> None:
+        """Invalidate cached public reads of the tournament (version bump).
+        create/delete already bump it via the team-count update."""
+        if self.tournament_repo and tournament_id:
+            self.tournament_repo.bump_version(tournament_id)
+
     def _resolve_documents(self, item: dict[str, Any]) -> dict[str, Any]:
         """Convert stored S3 keys to presigned GET URLs for all document files."""
         if not self.s3:
@@ -256,13 +265,13 @@ class TournamentTeamService:
             pass  # best-effort — don't fail team creation if notification fails
 
     def is_team_manager(self, team_id: str, user_id: str) -> bool:
-        team = self.repo.get(team_id)
+        team = self.repo.get(team_id, fields=["manager_user_ids"])
         if not team:
             return False
         return user_id in team.get("manager_user_ids", [])
 
     def belongs_to_tournament(self, team_id: str, tournament_id: str) -> bool:
-        team = self.repo.get(team_id)
+        team = self.repo.get(team_id, fields=["tournament_id"])
         if not team:
             return False
         return team.get("tournament_id") == tournament_id
@@ -7,6 +7,7 @@ from zoneinfo import ZoneInfo
 from repositories.votation_repo_ddb import VotationRepo
 from repositories.tour_repo_ddb import TourRepo
 from services.notification_orchestator import Notifications
+from services.notification_outbox import NotificationOutbox
 
 BOGOTA_TZ = ZoneInfo("America/Bogota")  # UTC-5
 
@@ -52,11 +53,13 @@ class VotationService:
         tour_repo: TourRepo,
         user_svc,
         notifier: Notifications,
+        outbox: NotificationOutbox,
     ):
         self.repo = repo
         self.tour_repo = tour_repo
         self.user_svc = user_svc
         self.notifier = notifier
+        self.outbox = outbox
 
     # ── Candidate preview ────────────────────────────────────────────────
 
@@ -200,7 +203,9 @@ class VotationService:
             users = self.user_svc.list_users(account_id, group=workspace_id)
             user_emails = [u["email"] for u in users if u.get("email")]
             if user_emails:
-                self.notifier.votation_opened(
+                self.outbox.enqueue(
+                    "votation_opened",
+                    dedup_key=f"votation_opened:{item['id']}",
                     user_emails=user_emails,
                     period_type=period_type,
                     month=month,